@@ -0,0 +1,281 @@
+"""partition daily metrics tables by month
+
+Revision ID: 3b7e2c1f9a04
+Revises:
+Create Date: 2026-10-17 00:00:00
+
+campaign_daily_metrics and campaign_breakdown_daily_metrics become
+RANGE-partitioned parents with one partition per month (+ a default
+partition), see app.meta_insights.services.metrics_partition_service.
+
+Existing plain tables are rebuilt in place:
+- the old table (and its indexes) are renamed *_unpartitioned
+- the partitioned parent copies the old columns / defaults / checks
+- monthly partitions cover every month with data, plus
+  METRICS_PARTITION_MONTHS_AHEAD months ahead
+- rows are copied, then the primary key becomes (id, <partition key>)
+  and the old foreign keys are recreated under their names
+- indexes are created from the current model definitions (not copied:
+  a plain table's unique indexes need not include the partition key).
+  Rows violating a unique index are removed first, keeping the most
+  recently written one; indexes on columns added by later revisions
+  are left to those revisions
+- the old table is dropped
+
+The copy runs inside the migration transaction: on large tables,
+schedule it in a maintenance window (writers block on the rename).
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import visitors
+
+from app.core.config import settings
+from app.meta_insights.services.metrics_partition_service import (
+    PARTITIONED_TABLES,
+    add_months,
+    create_default_partition_sql,
+    create_partition_sql,
+    month_start,
+    months_between,
+)
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7e2c1f9a04'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+OLD_SUFFIX = "_unpartitioned"
+
+
+# =========================================================
+# CATALOG HELPERS
+# =========================================================
+def _relkind(bind, table):
+    return bind.execute(
+        sa.text("SELECT CAST(relkind AS TEXT) FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": table},
+    ).scalar()
+
+
+def _indexes(bind, table):
+    # (name, definition) of every index but the primary key's
+    return bind.execute(
+        sa.text(
+            """
+            SELECT i.indexname, i.indexdef
+            FROM pg_indexes i
+            WHERE i.schemaname = current_schema()
+              AND i.tablename = :table
+              AND NOT EXISTS (
+                    SELECT 1 FROM pg_constraint c
+                    WHERE c.conrelid = CAST(:table AS regclass)
+                      AND c.contype = 'p'
+                      AND c.conname = i.indexname
+              )
+            """
+        ),
+        {"table": table},
+    ).fetchall()
+
+
+def _columns(bind, table):
+    return set(
+        bind.execute(
+            sa.text(
+                """
+                SELECT column_name FROM information_schema.columns
+                WHERE table_schema = current_schema() AND table_name = :table
+                """
+            ),
+            {"table": table},
+        ).scalars()
+    )
+
+
+def _constraints(bind, table, contype):
+    return bind.execute(
+        sa.text(
+            """
+            SELECT conname, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE conrelid = CAST(:table AS regclass)
+              AND CAST(contype AS TEXT) = :contype
+            """
+        ),
+        {"table": table, "contype": contype},
+    ).fetchall()
+
+
+def _rename_indexes(bind, table, suffix):
+    names = bind.execute(
+        sa.text(
+            """
+            SELECT indexname FROM pg_indexes
+            WHERE schemaname = current_schema() AND tablename = :table
+            """
+        ),
+        {"table": table},
+    ).scalars().all()
+
+    for name in names:
+        # Identifiers are capped at 63 bytes
+        op.execute(f'ALTER INDEX "{name}" RENAME TO "{name[:63 - len(suffix)]}{suffix}"')
+
+
+def _rebuild(bind, table, key, *, partitioned, model_table=None):
+    """
+    Copies table into a new (partitioned or plain) table of the same
+    name and drops the old one. Indexes come from model_table when
+    given, otherwise they are copied from the old table.
+    """
+
+    old = f"{table}{OLD_SUFFIX}"
+    indexes = _indexes(bind, table)
+    foreign_keys = _constraints(bind, table, "f")
+    primary_key = _constraints(bind, table, "p")
+    pk_name = primary_key[0][0] if primary_key else f"{table}_pkey"
+
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    _rename_indexes(bind, old, OLD_SUFFIX)
+
+    op.execute(
+        f"""
+        CREATE TABLE {table} (
+            LIKE {old}
+            INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE INCLUDING COMMENTS
+        ){f" PARTITION BY RANGE ({key})" if partitioned else ""}
+        """
+    )
+
+    if partitioned:
+        first, last = bind.execute(sa.text(f"SELECT MIN({key}), MAX({key}) FROM {old}")).one()
+        _create_partitions(table, first, last)
+
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+
+    pk_columns = f"id, {key}" if partitioned else "id"
+    op.execute(f'ALTER TABLE {table} ADD CONSTRAINT "{pk_name}" PRIMARY KEY ({pk_columns})')
+
+    if model_table is not None:
+        _create_model_indexes(bind, table, key, model_table)
+    else:
+        for _, definition in indexes:
+            # Partitioned parents report "ON ONLY <table>"
+            op.execute(definition.replace(" ON ONLY ", " ON "))
+
+    for name, definition in foreign_keys:
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT "{name}" {definition}')
+
+    op.execute(f"DROP TABLE {old} CASCADE")
+
+
+def _create_model_indexes(bind, table, key, model_table):
+    columns = _columns(bind, table)
+
+    for index in sorted(model_table.indexes, key=lambda index: index.name):
+        indexed = {
+            element.name
+            for expression in index.expressions
+            for element in visitors.iterate(expression)
+            if isinstance(element, sa.Column)
+        }
+        if not indexed <= columns:
+            continue
+
+        if index.unique:
+            _delete_duplicates(bind, table, key, index, columns)
+
+        op.execute(sa.schema.CreateIndex(index))
+
+
+def _delete_duplicates(bind, table, key, index, columns):
+    index_key = ", ".join(
+        str(expression.compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True}))
+        for expression in index.expressions
+    )
+    newest_first = ", ".join(
+        f"{column} DESC"
+        for column in ("meta_fetched_at", "updated_at", "created_at", "id")
+        if column in columns
+    )
+
+    # key (partition key) is part of the primary key
+    op.execute(
+        f"""
+        DELETE FROM {table}
+        WHERE (id, {key}) IN (
+            SELECT id, {key}
+            FROM (
+                SELECT
+                    id,
+                    {key},
+                    row_number() OVER (
+                        PARTITION BY {index_key}
+                        ORDER BY {newest_first}
+                    ) AS rank
+                FROM {table}
+            ) ranked
+            WHERE ranked.rank > 1
+        )
+        """
+    )
+
+
+def _create_partitions(table, first=None, last=None):
+    current = month_start(date.today())
+    first = min(first or current, current)
+    last = max(last or current, add_months(current, settings.METRICS_PARTITION_MONTHS_AHEAD))
+
+    for month in months_between(first, last):
+        op.execute(create_partition_sql(table, month))
+    op.execute(create_default_partition_sql(table))
+
+
+# =========================================================
+# MIGRATION
+# =========================================================
+def upgrade():
+    # Fresh database: tables come from the models (they declare the
+    # partitioning); campaigns is their foreign key target
+    import app.campaigns.models  # noqa: F401
+    from app.meta_insights.models.campaign_breakdown_daily_metrics import (
+        CampaignBreakdownDailyMetrics,
+    )
+    from app.meta_insights.models.campaign_daily_metrics import CampaignDailyMetrics
+
+    models = {
+        model.__tablename__: model
+        for model in (CampaignDailyMetrics, CampaignBreakdownDailyMetrics)
+    }
+    bind = op.get_bind()
+
+    for table, key in PARTITIONED_TABLES.items():
+        relkind = _relkind(bind, table)
+
+        if relkind is None:
+            models[table].__table__.create(bind)
+            _create_partitions(table)
+        elif relkind == "p":
+            _create_partitions(table)
+        else:
+            _rebuild(
+                bind,
+                table,
+                key,
+                partitioned=True,
+                model_table=models[table].__table__,
+            )
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    for table, key in PARTITIONED_TABLES.items():
+        if _relkind(bind, table) == "p":
+            # Detached / archived partitions are left untouched
+            _rebuild(bind, table, key, partitioned=False)
@@ -0,0 +1,72 @@
+"""config cache versions + change notification
+
+Revision ID: 4f8b3a2d6e10
+Revises: 9e2a6d4c1b37
+Create Date: 2026-10-17 00:00:00
+
+Every statement writing global_settings / plans bumps
+config_versions.version for the table and sends
+NOTIFY config_cache '<table>:<version>' (delivered on commit), see
+app.core.config_cache.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '4f8b3a2d6e10'
+down_revision = '9e2a6d4c1b37'
+branch_labels = None
+depends_on = None
+
+
+CHANNEL = "config_cache"
+
+TABLES = ("global_settings", "plans")
+
+
+def upgrade():
+    from app.admin.models import ConfigVersion
+
+    ConfigVersion.__table__.create(op.get_bind(), checkfirst=True)
+
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION bump_config_version() RETURNS trigger AS $$
+        DECLARE
+            new_version integer;
+        BEGIN
+            INSERT INTO config_versions AS v (name, version, changed_at)
+            VALUES (TG_TABLE_NAME, 1, now())
+            ON CONFLICT (name) DO UPDATE
+            SET version = v.version + 1, changed_at = now()
+            RETURNING v.version INTO new_version;
+
+            PERFORM pg_notify('{CHANNEL}', TG_TABLE_NAME || ':' || new_version);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+    for table in TABLES:
+        op.execute(
+            f"INSERT INTO config_versions (name, version) VALUES ('{table}', 0) "
+            "ON CONFLICT (name) DO NOTHING"
+        )
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_config_version ON {table}")
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_config_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_config_version()
+            """
+        )
+
+
+def downgrade():
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_config_version ON {table}")
+
+    op.execute("DROP FUNCTION IF EXISTS bump_config_version()")
+    op.execute("DROP TABLE IF EXISTS config_versions")
@@ -0,0 +1,93 @@
+"""auth context cache invalidation triggers
+
+Revision ID: 7c4d1e8b2f65
+Revises: 3b7e2c1f9a04
+Create Date: 2026-10-17 00:00:00
+
+Every write that changes what app.auth.context_cache holds sends
+NOTIFY auth_context (delivered on commit, from any writer: API, scripts,
+webhooks, admin SQL):
+
+- sessions / users / subscriptions / user_meta_ad_accounts rows
+  → 'user:<user id>'
+- plans / global_settings statements → 'all'
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '7c4d1e8b2f65'
+down_revision = '3b7e2c1f9a04'
+branch_labels = None
+depends_on = None
+
+
+CHANNEL = "auth_context"
+
+# table → column holding the user id
+USER_TABLES = {
+    "sessions": "user_id",
+    "users": "id",
+    "subscriptions": "user_id",
+    "user_meta_ad_accounts": "user_id",
+}
+
+GLOBAL_TABLES = ("plans", "global_settings")
+
+
+def upgrade():
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION notify_auth_context_user() RETURNS trigger AS $$
+        DECLARE
+            row_data jsonb := to_jsonb(CASE WHEN TG_OP = 'DELETE' THEN OLD ELSE NEW END);
+        BEGIN
+            PERFORM pg_notify('{CHANNEL}', 'user:' || (row_data ->> TG_ARGV[0]));
+            IF TG_OP = 'UPDATE' AND (to_jsonb(OLD) ->> TG_ARGV[0])
+                    IS DISTINCT FROM (row_data ->> TG_ARGV[0]) THEN
+                PERFORM pg_notify('{CHANNEL}', 'user:' || (to_jsonb(OLD) ->> TG_ARGV[0]));
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION notify_auth_context_all() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('{CHANNEL}', 'all');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+    for table, column in USER_TABLES.items():
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_auth_context ON {table}")
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_auth_context
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION notify_auth_context_user('{column}')
+            """
+        )
+
+    for table in GLOBAL_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_auth_context ON {table}")
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_auth_context
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_auth_context_all()
+            """
+        )
+
+
+def downgrade():
+    for table in (*USER_TABLES, *GLOBAL_TABLES):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_auth_context ON {table}")
+
+    op.execute("DROP FUNCTION IF EXISTS notify_auth_context_user()")
+    op.execute("DROP FUNCTION IF EXISTS notify_auth_context_all()")
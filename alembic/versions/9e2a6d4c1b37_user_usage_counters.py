@@ -0,0 +1,245 @@
+"""materialized per-user usage counters
+
+Revision ID: 9e2a6d4c1b37
+Revises: 7c4d1e8b2f65
+Create Date: 2026-10-17 00:00:00
+
+user_usage_counters (app.plans.usage_counter_models) is kept current
+by triggers, in the writing transaction:
+
+- refresh_user_usage_counters(uuid[]) recounts users; it first locks
+  their counter rows (in user id order), so concurrent writers queue
+  and each recount's snapshot includes the previous writer's commit
+- campaigns: users with the campaign's ad account selected, when
+  ad_account_id / ai_active / is_archived change
+- user_meta_ad_accounts: the link's users
+- campaign_action_logs: +n to today's optimization / expansion
+  counters (first-time users are recounted instead)
+
+Every existing user is counted at upgrade.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e2a6d4c1b37'
+down_revision = '7c4d1e8b2f65'
+branch_labels = None
+depends_on = None
+
+
+TODAY_SQL = "CAST(timezone('utc', now()) AS date)"
+
+REFRESH_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION refresh_user_usage_counters(user_ids uuid[]) RETURNS void AS $$
+BEGIN
+    IF user_ids IS NULL OR cardinality(user_ids) = 0 THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO user_usage_counters (user_id)
+    SELECT u.id FROM users u WHERE u.id = ANY(user_ids)
+    ORDER BY u.id
+    ON CONFLICT (user_id) DO NOTHING;
+
+    PERFORM 1 FROM user_usage_counters
+    WHERE user_id = ANY(user_ids)
+    ORDER BY user_id
+    FOR UPDATE;
+
+    UPDATE user_usage_counters c
+    SET linked_ad_accounts = counts.linked_ad_accounts,
+        selected_ad_accounts = counts.selected_ad_accounts,
+        campaigns = counts.campaigns,
+        active_ai_campaigns = counts.active_ai_campaigns,
+        actions_date = {TODAY_SQL},
+        optimizations_today = counts.optimizations_today,
+        expansions_today = counts.expansions_today,
+        updated_at = timezone('utc', now())
+    FROM (
+        SELECT
+            ids.user_id,
+            (
+                SELECT count(*) FROM user_meta_ad_accounts a
+                WHERE a.user_id = ids.user_id
+            ) AS linked_ad_accounts,
+            (
+                SELECT count(*) FROM user_meta_ad_accounts a
+                WHERE a.user_id = ids.user_id AND a.is_selected
+            ) AS selected_ad_accounts,
+            (
+                SELECT count(*) FROM campaigns cm
+                JOIN user_meta_ad_accounts a ON a.meta_ad_account_id = cm.ad_account_id
+                WHERE a.user_id = ids.user_id AND a.is_selected AND NOT cm.is_archived
+            ) AS campaigns,
+            (
+                SELECT count(*) FROM campaigns cm
+                JOIN user_meta_ad_accounts a ON a.meta_ad_account_id = cm.ad_account_id
+                WHERE a.user_id = ids.user_id AND a.is_selected AND NOT cm.is_archived
+                  AND cm.ai_active
+            ) AS active_ai_campaigns,
+            (
+                SELECT count(*) FROM campaign_action_logs l
+                WHERE l.user_id = ids.user_id AND l.action_type = 'optimization'
+                  AND l.created_at >= {TODAY_SQL}
+            ) AS optimizations_today,
+            (
+                SELECT count(*) FROM campaign_action_logs l
+                WHERE l.user_id = ids.user_id AND l.action_type = 'expansion'
+                  AND l.created_at >= {TODAY_SQL}
+            ) AS expansions_today
+        FROM (SELECT DISTINCT unnest(user_ids) AS user_id) ids
+    ) counts
+    WHERE c.user_id = counts.user_id;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+CAMPAIGNS_FUNCTION = """
+CREATE OR REPLACE FUNCTION usage_counters_campaigns() RETURNS trigger AS $$
+DECLARE
+    account_ids uuid[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT ad_account_id) INTO account_ids FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(DISTINCT ad_account_id) INTO account_ids FROM old_rows;
+    ELSE
+        SELECT array_agg(DISTINCT account_id) INTO account_ids
+        FROM old_rows o
+        JOIN new_rows n ON n.id = o.id
+        CROSS JOIN LATERAL (VALUES (o.ad_account_id), (n.ad_account_id)) v(account_id)
+        WHERE (o.ad_account_id, o.ai_active, o.is_archived)
+              IS DISTINCT FROM (n.ad_account_id, n.ai_active, n.is_archived);
+    END IF;
+
+    IF account_ids IS NOT NULL THEN
+        PERFORM refresh_user_usage_counters(ARRAY(
+            SELECT DISTINCT user_id FROM user_meta_ad_accounts
+            WHERE meta_ad_account_id = ANY(account_ids) AND is_selected
+        ));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+AD_ACCOUNT_LINKS_FUNCTION = """
+CREATE OR REPLACE FUNCTION usage_counters_ad_account_links() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM refresh_user_usage_counters(ARRAY(SELECT DISTINCT user_id FROM new_rows));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM refresh_user_usage_counters(ARRAY(SELECT DISTINCT user_id FROM old_rows));
+    ELSE
+        PERFORM refresh_user_usage_counters(ARRAY(
+            SELECT user_id FROM old_rows UNION SELECT user_id FROM new_rows
+        ));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+ACTION_LOGS_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION usage_counters_action_logs() RETURNS trigger AS $$
+DECLARE
+    new_users uuid[];
+BEGIN
+    -- Users without a row yet: recount (includes these inserts)
+    SELECT array_agg(DISTINCT n.user_id) INTO new_users
+    FROM new_rows n
+    WHERE n.action_type IN ('optimization', 'expansion')
+      AND NOT EXISTS (SELECT 1 FROM user_usage_counters c WHERE c.user_id = n.user_id);
+
+    PERFORM refresh_user_usage_counters(new_users);
+
+    INSERT INTO user_usage_counters AS c
+        (user_id, actions_date, optimizations_today, expansions_today)
+    SELECT
+        n.user_id,
+        {TODAY_SQL},
+        count(*) FILTER (WHERE n.action_type = 'optimization'),
+        count(*) FILTER (WHERE n.action_type = 'expansion')
+    FROM new_rows n
+    WHERE n.action_type IN ('optimization', 'expansion')
+      AND n.created_at >= {TODAY_SQL}
+      AND n.user_id <> ALL(coalesce(new_users, '{{}}'))
+    GROUP BY n.user_id
+    ORDER BY n.user_id
+    ON CONFLICT (user_id) DO UPDATE
+    SET optimizations_today = EXCLUDED.optimizations_today
+            + CASE WHEN c.actions_date = EXCLUDED.actions_date
+                   THEN c.optimizations_today ELSE 0 END,
+        expansions_today = EXCLUDED.expansions_today
+            + CASE WHEN c.actions_date = EXCLUDED.actions_date
+                   THEN c.expansions_today ELSE 0 END,
+        actions_date = EXCLUDED.actions_date,
+        updated_at = timezone('utc', now());
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# table → (function, events)
+TRIGGERS = {
+    "campaigns": ("usage_counters_campaigns", ("INSERT", "UPDATE", "DELETE")),
+    "user_meta_ad_accounts": ("usage_counters_ad_account_links", ("INSERT", "UPDATE", "DELETE")),
+    "campaign_action_logs": ("usage_counters_action_logs", ("INSERT",)),
+}
+
+TRANSITION_TABLES = {
+    "INSERT": "NEW TABLE AS new_rows",
+    "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "DELETE": "OLD TABLE AS old_rows",
+}
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    from app.plans.usage_counter_models import UserUsageCounter
+
+    UserUsageCounter.__table__.create(bind, checkfirst=True)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_campaign_action_log_user_time "
+        "ON campaign_action_logs (user_id, created_at)"
+    )
+
+    for function_sql in (
+        REFRESH_FUNCTION,
+        CAMPAIGNS_FUNCTION,
+        AD_ACCOUNT_LINKS_FUNCTION,
+        ACTION_LOGS_FUNCTION,
+    ):
+        op.execute(function_sql)
+
+    # One trigger per event: transition tables can't be shared
+    for table, (function, events) in TRIGGERS.items():
+        for event in events:
+            name = f"{table}_usage_counters_{event.lower()}"
+            op.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+            op.execute(
+                f"""
+                CREATE TRIGGER {name}
+                AFTER {event} ON {table}
+                REFERENCING {TRANSITION_TABLES[event]}
+                FOR EACH STATEMENT EXECUTE FUNCTION {function}()
+                """
+            )
+
+    bind.execute(sa.text("SELECT refresh_user_usage_counters(ARRAY(SELECT id FROM users))"))
+
+
+def downgrade():
+    for table, (function, events) in TRIGGERS.items():
+        for event in events:
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_usage_counters_{event.lower()} ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {function}()")
+
+    op.execute("DROP FUNCTION IF EXISTS refresh_user_usage_counters(uuid[])")
+    op.execute("DROP INDEX IF EXISTS ix_campaign_action_log_user_time")
+    op.execute("DROP TABLE IF EXISTS user_usage_counters")
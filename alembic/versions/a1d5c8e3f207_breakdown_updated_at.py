@@ -0,0 +1,64 @@
+"""breakdown updated_at + incremental aggregation indexes
+
+Revision ID: a1d5c8e3f207
+Revises: c3a7f1d5e928
+Create Date: 2026-10-17 00:00:00
+
+The incremental aggregation mode (CampaignMetricsAggregationService /
+CampaignBreakdownAggregationService, incremental=True) compares daily
+updated_at with the aggregates' updated_at to find late-arriving rows:
+
+- campaign_breakdown_daily_metrics.updated_at and
+  campaign_breakdown_aggregates.updated_at (existing rows get now())
+- updated_at indexes on both daily tables (late-row scans)
+- (window_type, window_end_date) on campaign_breakdown_aggregates
+  (previous day's lifetime rows)
+
+Indexes on the partitioned daily parents cascade to every partition.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1d5c8e3f207'
+down_revision = 'c3a7f1d5e928'
+branch_labels = None
+depends_on = None
+
+
+UPDATED_AT_TABLES = (
+    "campaign_breakdown_daily_metrics",
+    "campaign_breakdown_aggregates",
+)
+
+INDEXES = {
+    "ix_campaign_daily_metrics_updated_at":
+        "campaign_daily_metrics (updated_at)",
+    "ix_campaign_breakdown_daily_updated_at":
+        "campaign_breakdown_daily_metrics (updated_at)",
+    "ix_campaign_breakdown_aggregates_window_end":
+        "campaign_breakdown_aggregates (window_type, window_end_date)",
+}
+
+
+def upgrade():
+    for table in UPDATED_AT_TABLES:
+        op.execute(
+            f"""
+            ALTER TABLE {table}
+            ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITHOUT TIME ZONE
+            NOT NULL DEFAULT timezone('utc', now())
+            """
+        )
+
+    for name, target in INDEXES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+
+def downgrade():
+    for name in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    for table in UPDATED_AT_TABLES:
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS updated_at")
@@ -0,0 +1,39 @@
+"""ai action snapshot fingerprint indexes
+
+Revision ID: a9c3e5f7b214
+Revises: f4a8c2e6b913
+Create Date: 2026-10-17 00:00:00
+
+The inputs fingerprint of AIActionSnapshotService (every GET
+/ai/actions) reads the global MAX(updated_at) of industry_benchmarks
+and MAX(last_updated_at) of ml_category_breakdown_stats; both were
+full scans without an index on the timestamp.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9c3e5f7b214'
+down_revision = 'f4a8c2e6b913'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = {
+    "ix_industry_benchmark_updated_at": ("industry_benchmarks", "updated_at"),
+    "ix_ml_category_breakdown_stats_last_updated_at": (
+        "ml_category_breakdown_stats",
+        "last_updated_at",
+    ),
+}
+
+
+def upgrade():
+    for name, (table, column) in INDEXES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({column})")
+
+
+def downgrade():
+    for name in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
@@ -0,0 +1,74 @@
+"""NULL-safe unique key on campaign_breakdown_daily_metrics
+
+Revision ID: b2e6d9f4a318
+Revises: a1d5c8e3f207
+Create Date: 2026-10-17 00:00:00
+
+ux_campaign_breakdown_daily_unique is a plain unique index over
+nullable breakdown dimensions: NULLs never collide, so re-ingesting a
+day inserted duplicate slices. It is replaced by
+ux_campaign_breakdown_daily_dims on COALESCE(dim, ''), the ON CONFLICT
+target of CampaignBreakdownDailyMetricsWriter.
+
+Existing duplicates (same key after COALESCE) are removed first,
+keeping the most recently fetched row. Writers are locked out for the
+duration (dedupe + index build).
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2e6d9f4a318'
+down_revision = 'a1d5c8e3f207'
+branch_labels = None
+depends_on = None
+
+
+TABLE = "campaign_breakdown_daily_metrics"
+
+DIMENSIONS = ("ad_id", "platform", "placement", "age_group", "gender", "region")
+
+DIMS_KEY = ", ".join(
+    ["campaign_id", "metric_date"] + [f"COALESCE({dim}, '')" for dim in DIMENSIONS]
+)
+
+
+def upgrade():
+    op.execute(f"LOCK TABLE {TABLE} IN SHARE ROW EXCLUSIVE MODE")
+
+    # metric_date (partition key) is part of the key: duplicates of a
+    # slice always live in the same partition
+    op.execute(
+        f"""
+        DELETE FROM {TABLE}
+        WHERE (id, metric_date) IN (
+            SELECT id, metric_date
+            FROM (
+                SELECT
+                    id,
+                    metric_date,
+                    row_number() OVER (
+                        PARTITION BY {DIMS_KEY}
+                        ORDER BY meta_fetched_at DESC, updated_at DESC, id DESC
+                    ) AS rank
+                FROM {TABLE}
+            ) ranked
+            WHERE ranked.rank > 1
+        )
+        """
+    )
+
+    op.execute("DROP INDEX IF EXISTS ux_campaign_breakdown_daily_unique")
+    op.execute(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS ux_campaign_breakdown_daily_dims "
+        f"ON {TABLE} ({DIMS_KEY})"
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ux_campaign_breakdown_daily_dims")
+    op.execute(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS ux_campaign_breakdown_daily_unique "
+        f"ON {TABLE} (campaign_id, metric_date, {', '.join(DIMENSIONS)})"
+    )
@@ -0,0 +1,30 @@
+"""razorpay webhook inbox
+
+Revision ID: b6d2e9f4a813
+Revises: 4f8b3a2d6e10
+Create Date: 2026-10-17 00:00:00
+
+razorpay_webhook_events (app.billing.webhook_event_models): the
+webhook route stores verified deliveries here, keyed by event id;
+app.billing.webhook_worker applies them.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d2e9f4a813'
+down_revision = '4f8b3a2d6e10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    from app.billing.webhook_event_models import RazorpayWebhookEvent
+
+    # Table + its indexes (pending partial index, processed_at, status)
+    RazorpayWebhookEvent.__table__.create(op.get_bind(), checkfirst=True)
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS razorpay_webhook_events")
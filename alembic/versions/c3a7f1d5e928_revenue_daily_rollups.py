@@ -0,0 +1,124 @@
+"""revenue daily rollups
+
+Revision ID: c3a7f1d5e928
+Revises: b6d2e9f4a813
+Create Date: 2026-10-17 00:00:00
+
+revenue_daily_rollups (app.billing.revenue_rollup_models) is kept
+current by statement triggers on payments, in the writing transaction
+(webhook handlers, checkout verification, admin edits alike):
+
+- INSERT: + amount / + 1 on the new rows' keys
+- DELETE: - amount / - 1 on the old rows' keys
+- UPDATE: both, for rows whose day / payment_for / status / currency /
+  amount changed
+
+Deltas are upserted in key order (concurrent writers lock rollup rows
+in the same order). Filled from payments at upgrade.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3a7f1d5e928'
+down_revision = 'b6d2e9f4a813'
+branch_labels = None
+depends_on = None
+
+
+KEY_COLUMNS = "CAST({p}.created_at AS date), {p}.payment_for, {p}.status, {p}.currency"
+
+DELTA_UPSERT = """
+        INSERT INTO revenue_daily_rollups AS r
+            (day, payment_for, status, currency, amount_total, payment_count, updated_at)
+        SELECT day, payment_for, status, currency, sum(amount), sum(n), timezone('utc', now())
+        FROM ({deltas}) d (day, payment_for, status, currency, amount, n)
+        GROUP BY day, payment_for, status, currency
+        ORDER BY day, payment_for, status, currency
+        ON CONFLICT (day, payment_for, status, currency) DO UPDATE
+        SET amount_total = r.amount_total + EXCLUDED.amount_total,
+            payment_count = r.payment_count + EXCLUDED.payment_count,
+            updated_at = EXCLUDED.updated_at;
+"""
+
+INSERT_DELTAS = f"SELECT {KEY_COLUMNS.format(p='n')}, n.amount, 1 FROM new_rows n"
+DELETE_DELTAS = f"SELECT {KEY_COLUMNS.format(p='o')}, -o.amount, -1 FROM old_rows o"
+UPDATE_DELTAS = f"""
+            SELECT {KEY_COLUMNS.format(p='o')}, -o.amount, -1
+            FROM old_rows o JOIN new_rows n ON n.id = o.id
+            WHERE ({KEY_COLUMNS.format(p='o')}, o.amount)
+                  IS DISTINCT FROM ({KEY_COLUMNS.format(p='n')}, n.amount)
+            UNION ALL
+            SELECT {KEY_COLUMNS.format(p='n')}, n.amount, 1
+            FROM old_rows o JOIN new_rows n ON n.id = o.id
+            WHERE ({KEY_COLUMNS.format(p='o')}, o.amount)
+                  IS DISTINCT FROM ({KEY_COLUMNS.format(p='n')}, n.amount)
+"""
+
+PAYMENTS_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION revenue_rollups_payments() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {DELTA_UPSERT.format(deltas=INSERT_DELTAS)}
+    ELSIF TG_OP = 'DELETE' THEN
+        {DELTA_UPSERT.format(deltas=DELETE_DELTAS)}
+    ELSE
+        {DELTA_UPSERT.format(deltas=UPDATE_DELTAS)}
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+TRANSITION_TABLES = {
+    "INSERT": "NEW TABLE AS new_rows",
+    "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "DELETE": "OLD TABLE AS old_rows",
+}
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    from app.billing.revenue_rollup_models import RevenueDailyRollup
+
+    RevenueDailyRollup.__table__.create(bind, checkfirst=True)
+
+    op.execute(PAYMENTS_FUNCTION)
+
+    # One trigger per event: transition tables can't be shared
+    for event in TRANSITION_TABLES:
+        name = f"payments_revenue_rollups_{event.lower()}"
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON payments")
+        op.execute(
+            f"""
+            CREATE TRIGGER {name}
+            AFTER {event} ON payments
+            REFERENCING {TRANSITION_TABLES[event]}
+            FOR EACH STATEMENT EXECUTE FUNCTION revenue_rollups_payments()
+            """
+        )
+
+    bind.execute(
+        sa.text(
+            """
+            INSERT INTO revenue_daily_rollups
+                (day, payment_for, status, currency, amount_total, payment_count, updated_at)
+            SELECT CAST(created_at AS date), payment_for, status, currency,
+                   sum(amount), count(*), timezone('utc', now())
+            FROM payments
+            GROUP BY 1, 2, 3, 4
+            ON CONFLICT DO NOTHING
+            """
+        )
+    )
+
+
+def downgrade():
+    for event in TRANSITION_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS payments_revenue_rollups_{event.lower()} ON payments")
+
+    op.execute("DROP FUNCTION IF EXISTS revenue_rollups_payments()")
+    op.execute("DROP TABLE IF EXISTS revenue_daily_rollups")
@@ -0,0 +1,64 @@
+"""unique slice key on campaign_breakdown_aggregates
+
+Revision ID: c5f8a2e7d463
+Revises: b2e6d9f4a318
+Create Date: 2026-10-17 00:00:00
+
+ux_campaign_breakdown_aggregate_slice (campaign × window × COALESCE'd
+slice dimensions) is the ON CONFLICT target of the set-based breakdown
+aggregation (CampaignBreakdownAggregationService).
+
+The previous per-row insert path never enforced one row per slice, so
+duplicates are removed first, keeping the most recently updated row.
+Writers are locked out for the duration (dedupe + index build).
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5f8a2e7d463'
+down_revision = 'b2e6d9f4a318'
+branch_labels = None
+depends_on = None
+
+
+TABLE = "campaign_breakdown_aggregates"
+
+DIMENSIONS = ("creative_id", "placement", "region", "gender", "age_group", "platform")
+
+SLICE_KEY = ", ".join(
+    ["campaign_id", "window_type"] + [f"COALESCE({dim}, '')" for dim in DIMENSIONS]
+)
+
+
+def upgrade():
+    op.execute(f"LOCK TABLE {TABLE} IN SHARE ROW EXCLUSIVE MODE")
+
+    op.execute(
+        f"""
+        DELETE FROM {TABLE}
+        WHERE id IN (
+            SELECT id
+            FROM (
+                SELECT
+                    id,
+                    row_number() OVER (
+                        PARTITION BY {SLICE_KEY}
+                        ORDER BY updated_at DESC, created_at DESC, id DESC
+                    ) AS rank
+                FROM {TABLE}
+            ) ranked
+            WHERE ranked.rank > 1
+        )
+        """
+    )
+
+    op.execute(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS ux_campaign_breakdown_aggregate_slice "
+        f"ON {TABLE} ({SLICE_KEY})"
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ux_campaign_breakdown_aggregate_slice")
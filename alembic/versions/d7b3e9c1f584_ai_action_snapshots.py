@@ -0,0 +1,32 @@
+"""precomputed AI action snapshots
+
+Revision ID: d7b3e9c1f584
+Revises: c5f8a2e7d463
+Create Date: 2026-10-17 00:00:00
+
+ai_action_snapshots (app.ai_engine.models.ai_action_snapshots): one
+row per (ad account, as_of_date, rule version), unique on that key
+(ON CONFLICT target of AIActionSnapshotService.compute_and_store).
+GET /ai/actions reads and upserts it on every call.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7b3e9c1f584'
+down_revision = 'c5f8a2e7d463'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # meta_ad_accounts is the foreign key target
+    import app.meta_api.models  # noqa: F401
+    from app.ai_engine.models.ai_action_snapshots import AIActionSnapshot
+
+    AIActionSnapshot.__table__.create(op.get_bind(), checkfirst=True)
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS ai_action_snapshots")
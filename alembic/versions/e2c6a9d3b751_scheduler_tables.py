@@ -0,0 +1,33 @@
+"""job scheduler state and run history
+
+Revision ID: e2c6a9d3b751
+Revises: d7b3e9c1f584
+Create Date: 2026-10-17 00:00:00
+
+scheduled_jobs (one row per registered job: cron, enabled, last handled
+slot) and scheduled_job_runs (one row per execution), see
+app.scheduler.models. JobScheduler.register() upserts scheduled_jobs
+at startup.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2c6a9d3b751'
+down_revision = 'd7b3e9c1f584'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    from app.scheduler.models import ScheduledJob, ScheduledJobRun
+
+    bind = op.get_bind()
+    ScheduledJob.__table__.create(bind, checkfirst=True)
+    ScheduledJobRun.__table__.create(bind, checkfirst=True)
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS scheduled_job_runs")
+    op.execute("DROP TABLE IF EXISTS scheduled_jobs")
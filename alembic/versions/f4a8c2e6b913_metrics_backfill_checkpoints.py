@@ -0,0 +1,34 @@
+"""metrics backfill checkpoints
+
+Revision ID: f4a8c2e6b913
+Revises: e2c6a9d3b751
+Create Date: 2026-10-17 00:00:00
+
+metrics_backfill_checkpoints (app.meta_insights.models.
+metrics_backfill_checkpoints): one row per finished backfill unit,
+unique on (kind, ad account, chunk_start, chunk_end). A restarted
+backfill skips every unit that already has a row.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4a8c2e6b913'
+down_revision = 'e2c6a9d3b751'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # meta_ad_accounts is the foreign key target
+    import app.meta_api.models  # noqa: F401
+    from app.meta_insights.models.metrics_backfill_checkpoints import (
+        MetricsBackfillCheckpoint,
+    )
+
+    MetricsBackfillCheckpoint.__table__.create(op.get_bind(), checkfirst=True)
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS metrics_backfill_checkpoints")
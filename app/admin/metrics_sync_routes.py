@@ -4,7 +4,8 @@ Admin Routes — Campaign Daily Metrics Sync
 Purpose:
 - Manually trigger Meta Insights → DB sync
 - Used only for Phase 6.5 verification
-- No scheduler, no cron
+- Scheduled runs: sync_daily_metrics job (app.scheduler.jobs), or the
+  nightly_pipeline job when NIGHTLY_PIPELINE_ENABLED
 """
 
 from datetime import date
@@ -202,3 +202,21 @@ class GlobalSettings(Base):
         onupdate=datetime.utcnow,
         nullable=False,
     )
+
+
+# =====================================================
+# CONFIG TABLE VERSIONS (CONFIG CACHE)
+# =====================================================
+class ConfigVersion(Base):
+    """
+    Change counter per cached configuration table (global_settings,
+    plans). Bumped by a statement trigger on every write, which also
+    NOTIFYs config_cache with "<name>:<version>"; see
+    app.core.config_cache.
+    """
+
+    __tablename__ = "config_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    changed_at = Column(DateTime(timezone=True), nullable=True)
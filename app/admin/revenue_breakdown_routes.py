@@ -2,10 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, case
 
-from app.core.db_session import get_db
+from app.core.db_session import get_read_db
 from app.auth.dependencies import require_user
 from app.users.models import User
-from app.billing.payment_models import Payment
+from app.billing.revenue_rollup_models import RevenueDailyRollup
+from app.billing.revenue_rollup_service import rollup_amount_sum
 
 
 router = APIRouter(prefix="/admin/revenue", tags=["Admin Revenue"])
@@ -19,19 +20,20 @@ def require_admin(user: User):
 
 @router.get("/by-source")
 async def revenue_by_source(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_user),
 ):
     require_admin(current_user)
 
     result = await db.execute(
         select(
-            Payment.payment_for,
-            func.coalesce(func.sum(Payment.amount), 0).label("total"),
-            func.count(Payment.id).label("count"),
+            RevenueDailyRollup.payment_for,
+            rollup_amount_sum().label("total"),
+            func.coalesce(func.sum(RevenueDailyRollup.payment_count), 0).label("count"),
         )
-        .where(Payment.status == "paid")
-        .group_by(Payment.payment_for)
+        .where(RevenueDailyRollup.status == "paid")
+        .group_by(RevenueDailyRollup.payment_for)
+        .having(func.sum(RevenueDailyRollup.payment_count) > 0)
     )
 
     return [
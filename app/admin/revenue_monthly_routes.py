@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, cast, DateTime
 from datetime import datetime
 
-from app.core.db_session import get_db
+from app.core.db_session import get_read_db
 from app.auth.dependencies import require_user
 from app.users.models import User
-from app.billing.payment_models import Payment
+from app.billing.revenue_rollup_models import RevenueDailyRollup
+from app.billing.revenue_rollup_service import rollup_amount_sum
 
 
 router = APIRouter(prefix="/admin/revenue", tags=["Admin Revenue"])
@@ -20,19 +21,24 @@ def require_admin(user: User):
 
 @router.get("/monthly")
 async def monthly_revenue(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_user),
 ):
     require_admin(current_user)
 
+    # Truncate a naive timestamp: date_trunc on a date returns
+    # timestamptz in the session timezone
+    month = func.date_trunc("month", cast(RevenueDailyRollup.day, DateTime))
+
     result = await db.execute(
         select(
-            func.date_trunc("month", Payment.created_at).label("month"),
-            func.coalesce(func.sum(Payment.amount), 0).label("total"),
+            month.label("month"),
+            rollup_amount_sum().label("total"),
         )
-        .where(Payment.status == "paid")
-        .group_by(func.date_trunc("month", Payment.created_at))
-        .order_by(func.date_trunc("month", Payment.created_at))
+        .where(RevenueDailyRollup.status == "paid")
+        .group_by(month)
+        .having(func.sum(RevenueDailyRollup.payment_count) > 0)
+        .order_by(month)
     )
 
     return [
@@ -3,10 +3,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, case
 from datetime import datetime, date
 
-from app.core.db_session import get_db
+from app.core.db_session import get_read_db
 from app.auth.dependencies import require_user
 from app.users.models import User
-from app.billing.payment_models import Payment
+from app.billing.revenue_rollup_models import RevenueDailyRollup
+from app.billing.revenue_rollup_service import rollup_amount_sum
 from app.billing.invoice_models import Invoice
 
 
@@ -27,34 +28,19 @@ def require_admin(user: User):
 # ==========================================================
 @router.get("/summary")
 async def get_revenue_summary(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_user),
 ):
     require_admin(current_user)
 
+    # Lifetime totals from revenue_daily_rollups (rows per day, not per payment)
     result = await db.execute(
         select(
-            func.coalesce(func.sum(Payment.amount), 0).label("total"),
-            func.coalesce(
-                func.sum(
-                    case(
-                        (Payment.payment_for == "subscription", Payment.amount),
-                        else_=0,
-                    )
-                ),
-                0,
-            ).label("subscriptions"),
-            func.coalesce(
-                func.sum(
-                    case(
-                        (Payment.payment_for == "addon", Payment.amount),
-                        else_=0,
-                    )
-                ),
-                0,
-            ).label("addons"),
-            func.count(Payment.id).label("payment_count"),
-        ).where(Payment.status == "paid")
+            rollup_amount_sum().label("total"),
+            rollup_amount_sum("subscription").label("subscriptions"),
+            rollup_amount_sum("addon").label("addons"),
+            func.coalesce(func.sum(RevenueDailyRollup.payment_count), 0).label("payment_count"),
+        ).where(RevenueDailyRollup.status == "paid")
     )
 
     row = result.one()
@@ -76,7 +62,7 @@ async def get_daily_revenue(
     *,
     start_date: date = Query(...),
     end_date: date = Query(...),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_user),
 ):
     require_admin(current_user)
@@ -84,36 +70,23 @@ async def get_daily_revenue(
     if start_date > end_date:
         raise HTTPException(400, "start_date must be <= end_date")
 
+    # Day-keyed rollups: the range predicate is an index range scan
     stmt = (
         select(
-            func.date(Payment.created_at).label("day"),
-            func.coalesce(func.sum(Payment.amount), 0).label("total"),
-            func.coalesce(
-                func.sum(
-                    case(
-                        (Payment.payment_for == "subscription", Payment.amount),
-                        else_=0,
-                    )
-                ),
-                0,
-            ).label("subscriptions"),
-            func.coalesce(
-                func.sum(
-                    case(
-                        (Payment.payment_for == "addon", Payment.amount),
-                        else_=0,
-                    )
-                ),
-                0,
-            ).label("addons"),
+            RevenueDailyRollup.day.label("day"),
+            rollup_amount_sum().label("total"),
+            rollup_amount_sum("subscription").label("subscriptions"),
+            rollup_amount_sum("addon").label("addons"),
         )
         .where(
-            Payment.status == "paid",
-            func.date(Payment.created_at) >= start_date,
-            func.date(Payment.created_at) <= end_date,
+            RevenueDailyRollup.status == "paid",
+            RevenueDailyRollup.day >= start_date,
+            RevenueDailyRollup.day <= end_date,
         )
-        .group_by(func.date(Payment.created_at))
-        .order_by(func.date(Payment.created_at))
+        .group_by(RevenueDailyRollup.day)
+        # Days whose paid payments all changed status since
+        .having(func.sum(RevenueDailyRollup.payment_count) > 0)
+        .order_by(RevenueDailyRollup.day)
     )
 
     result = await db.execute(stmt)
@@ -134,7 +107,7 @@ async def get_daily_revenue(
 # ==========================================================
 @router.get("/invoice-health")
 async def get_invoice_health(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_user),
 ):
     require_admin(current_user)
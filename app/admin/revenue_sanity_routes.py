@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 
-from app.core.db_session import get_db
+from app.core.db_session import get_read_db
 from app.auth.dependencies import require_user
 from app.users.models import User
 from app.billing.payment_models import Payment
@@ -20,7 +20,7 @@ def require_admin(user: User):
 
 @router.get("/sanity")
 async def revenue_sanity_check(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_user),
 ):
     require_admin(current_user)
@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, desc
 from datetime import datetime, timedelta
 
-from app.core.db_session import get_db
+from app.core.db_session import get_read_db
 from app.auth.dependencies import require_user
 from app.users.models import User
 from app.campaigns.models import Campaign, CampaignActionLog
@@ -25,7 +25,7 @@ def require_admin(user: User):
 # ==========================================================
 @router.get("/summary")
 async def get_risk_summary(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_user),
 ):
     require_admin(current_user)
@@ -93,7 +93,7 @@ async def get_risk_summary(
 # ==========================================================
 @router.get("/timeline")
 async def get_risk_timeline(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_user),
     limit: int = 50,
 ):
@@ -3,7 +3,7 @@ from datetime import datetime
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db_session import get_db
+from app.core.db_session import get_read_db
 from app.auth.dependencies import require_user
 from app.users.models import User
 
@@ -28,7 +28,7 @@ def require_admin(user: User):
 # =========================
 @router.get("/dashboard")
 async def get_admin_dashboard(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_user),
 ):
     require_admin(current_user)
@@ -41,7 +41,7 @@ async def get_admin_dashboard(
 # =========================
 @router.get("/metrics/sync-status")
 async def get_metrics_sync_status(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_user),
 ):
     require_admin(current_user)
@@ -6,6 +6,7 @@ from app.auth.dependencies import require_user
 from app.users.models import User
 from app.admin.rbac import assert_admin_permission
 from app.plans.models import Plan
+from app.core.config_cache import config_cache, PLANS
 
 router = APIRouter(prefix="/plans", tags=["Admin Plans"])
 
@@ -74,4 +75,5 @@ async def update_plan(
         result.max_ai_campaigns = int(payload["max_ai_campaigns"])
 
     await db.commit()
+    config_cache.invalidate(PLANS)
     return {"status": "ok"}
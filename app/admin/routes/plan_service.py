@@ -2,6 +2,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 
 from app.plans.models import Plan
+from app.core.config_cache import config_cache, PLANS
 
 
 class PlanService:
@@ -38,3 +39,4 @@ class PlanService:
         )
 
         await db.commit()
+        config_cache.invalidate(PLANS)
@@ -4,7 +4,7 @@ from sqlalchemy import select
 from uuid import UUID
 from datetime import datetime
 
-from app.core.db_session import get_db
+from app.core.db_session import get_db, get_read_db
 from app.auth.dependencies import require_user
 from app.users.models import User
 
@@ -48,7 +48,7 @@ async def get_risk_timeline(
 
 @router.get("/risk/alerts")
 async def get_risk_alerts(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_user),
 ):
     require_admin(current_user)
@@ -11,6 +11,7 @@ from app.admin.models import (
 from app.campaigns.models import Campaign
 from app.users.models import User
 from app.plans.subscription_models import Subscription
+from app.core.config_cache import config_cache, GLOBAL_SETTINGS
 
 
 # =====================================================
@@ -221,6 +222,7 @@ class AdminOverrideService:
 
         db.add(audit)
         await db.commit()
+        config_cache.invalidate(GLOBAL_SETTINGS)
         await db.refresh(settings)
         return settings
 
@@ -369,3 +371,4 @@ class AdminOverrideService:
 
         db.add(rollback_audit)
         await db.commit()
+        config_cache.invalidate(GLOBAL_SETTINGS)
@@ -112,3 +112,42 @@ class KPINormalizer:
             "secondary_rate": lead_rate,
             "roas": None,
         }
+
+    @classmethod
+    def normalize_daily_row(
+        cls,
+        *,
+        insights: Dict,
+    ) -> Dict:
+        """
+        Map ONE raw Meta insights row (campaign × day) to the
+        campaign_daily_metrics payload.
+
+        Unlike normalize(), leads never fall back to clicks:
+        raw daily rows store what Meta actually reported.
+
+        Returns:
+            {
+              "impressions": int,
+              "clicks": int,
+              "spend": float,
+              "leads": int,
+              "purchases": int,
+              "purchase_value": float
+            }
+        """
+
+        actions = insights.get("actions", [])
+        values = insights.get("action_values", [])
+
+        return {
+            "impressions": int(insights.get("impressions", 0)),
+            "clicks": int(insights.get("clicks", 0)),
+            "spend": float(insights.get("spend", 0)),
+            "leads": (
+                cls._extract_action_count(actions, "lead")
+                or cls._extract_action_count(actions, "onsite_conversion.messaging_conversation_started_7d")
+            ),
+            "purchases": cls._extract_action_count(actions, "purchase"),
+            "purchase_value": cls._extract_action_value(values, "purchase"),
+        }
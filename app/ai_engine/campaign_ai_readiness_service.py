@@ -50,14 +50,36 @@ class CampaignAIReadinessService:
         if not short or not long:
             return {"status": "insufficient_data"}
 
-        score = self._score_performance(short, long)
-        signals = self._detect_signals(short, long)
-
         benchmark = await self._get_industry_benchmark(
             campaign_id=campaign_id,
             window=short_window,
         )
 
+        return self.build_campaign_ai_score(
+            campaign_id=campaign_id,
+            short=short,
+            long=long,
+            benchmark=benchmark,
+        )
+
+    def build_campaign_ai_score(
+        self,
+        *,
+        campaign_id: str,
+        short: Dict | None,
+        long: Dict | None,
+        benchmark: Dict | None,
+    ) -> Dict:
+        """
+        Scores already-loaded window rows (used by the decision
+        runner's prefetched context).
+        """
+        if not short or not long:
+            return {"status": "insufficient_data"}
+
+        score = self._score_performance(short, long)
+        signals = self._detect_signals(short, long)
+
         benchmark_ctx = self._build_benchmark_context(
             campaign_window=short,
             benchmark=benchmark,
@@ -155,7 +177,7 @@ class CampaignAIReadinessService:
                     b.campaign_count
                 FROM industry_benchmarks b
                 WHERE b.category = (
-                    SELECT category
+                    SELECT final_category
                     FROM campaign_category_map
                     WHERE campaign_id = :campaign_id
                 )
@@ -0,0 +1,728 @@
+"""
+Decision Rule Backtest
+
+PHASE 21 — OFFLINE REPLAY OF RULE THRESHOLDS
+
+Purpose:
+- Replay the campaign-level threshold rules day by day over stored
+  campaign_daily_metrics history (windows rebuilt per replay day)
+- Score every suggestion against the later outcome recorded in
+  ml_action_outcomes
+- Run many threshold variants in parallel (process pool), reporting
+  precision / recall per rule and per confidence band
+
+Replayed rules:
+- LeadPerformanceDropRule, SalesROASDropRule (7d vs 30d, complete
+  windows, banded like AIDecisionRunner; LOW is suppressed there)
+- CampaignDecisionService lead / sales (3D vs 14D, banded by
+  MIN_IMPRESSIONS)
+
+Not replayed:
+- Feedback calibration (user trust is a fixed parameter)
+- Breakdown rules (no outcome labels per slice)
+
+Scoring:
+- One labelled event = one ml_action_outcomes row with a known
+  outcome at the chosen horizon, matched on action type
+- A rule "hits" an event when it fired for that campaign on the
+  decision day or up to `tolerance` days before
+- precision = improved hits / labelled hits
+- recall    = improved hits / improved events
+
+Inputs (same columns either way):
+- Postgres (load_tables)
+- Parquet export directory (read_parquet / write_parquet; needs pyarrow)
+
+Read-only.
+"""
+
+import itertools
+import logging
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.ai_engine.decision_engine.campaign_decision_service import (
+    CampaignDecisionService,
+)
+from app.ai_engine.decision_engine.decision_runner import CONFIDENCE_BANDS
+from app.ai_engine.decision_engine.vectorized_rules import (
+    CampaignWindowArrays,
+    VectorizedRuleEngine,
+    _float_array,
+    _truthy,
+)
+from app.ai_engine.models.action_models import AIActionType
+
+logger = logging.getLogger(__name__)
+
+
+REPLAY_WINDOWS = {"3d": 3, "7d": 7, "14d": 14, "30d": 30}
+HISTORY_DAYS = max(REPLAY_WINDOWS.values()) - 1
+
+DAILY_METRICS = ("impressions", "clicks", "spend", "leads", "purchases", "revenue")
+HORIZONS = ("7d", "14d", "30d")
+
+BANDS = {"LOW": 1, "MEDIUM": 2, "HIGH": 3}
+
+# Default user trust (UserTrustService neutral score)
+NEUTRAL_TRUST = 0.5
+
+# rule → (action types matched in ml_action_outcomes, lowest emitted band)
+BACKTEST_RULES: Dict[str, Tuple[Tuple[str, ...], str]] = {
+    "LeadPerformanceDropRule": ((AIActionType.REDUCE_BUDGET.value,), "MEDIUM"),
+    "SalesROASDropRule": ((AIActionType.REDUCE_BUDGET.value,), "MEDIUM"),
+    "CampaignDecisionService.lead": ((AIActionType.PAUSE_CAMPAIGN.value,), "LOW"),
+    # The service emits "BUDGET_DECREASE"; outcomes store AIActionType
+    "CampaignDecisionService.sales": ((AIActionType.REDUCE_BUDGET.value,), "LOW"),
+}
+
+# table → columns (Postgres extract == Parquet export layout)
+TABLES: Dict[str, Tuple[str, ...]] = {
+    "campaigns": ("id", "objective"),
+    "campaign_category_map": ("campaign_id", "final_category"),
+    "campaign_daily_metrics": ("campaign_id", "date", *DAILY_METRICS),
+    "industry_benchmarks": (
+        "category",
+        "objective_type",
+        "as_of_date",
+        "avg_cpl",
+        "avg_roas",
+    ),
+    "ml_action_outcomes": (
+        "campaign_id",
+        "action_type",
+        "decided_at",
+        "outcome_7d",
+        "outcome_14d",
+        "outcome_30d",
+    ),
+}
+
+
+# =========================================================
+# PARAMETERS
+# =========================================================
+def baseline_parameters() -> Dict[str, float]:
+    """
+    Current hand-tuned values; variants override a subset.
+    """
+
+    engine = VectorizedRuleEngine()
+    lead, sales = engine.lead_rule, engine.sales_rule
+
+    return {
+        "LeadPerformanceDropRule.CTR_DROP_THRESHOLD": lead.CTR_DROP_THRESHOLD,
+        "LeadPerformanceDropRule.CPL_INCREASE_THRESHOLD": lead.CPL_INCREASE_THRESHOLD,
+        "LeadPerformanceDropRule.BENCHMARK_CPL_DELTA": lead.BENCHMARK_CPL_DELTA,
+        "SalesROASDropRule.MIN_PROFITABLE_ROAS": sales.MIN_PROFITABLE_ROAS,
+        "SalesROASDropRule.ROAS_DROP_THRESHOLD": sales.ROAS_DROP_THRESHOLD,
+        "SalesROASDropRule.BENCHMARK_ROAS_DELTA": sales.BENCHMARK_ROAS_DELTA,
+        **{
+            f"LEAD_RULES.{key}": value
+            for key, value in CampaignDecisionService.LEAD_RULES.items()
+        },
+        **{
+            f"SALES_RULES.{key}": value
+            for key, value in CampaignDecisionService.SALES_RULES.items()
+        },
+        **{
+            f"MIN_IMPRESSIONS.{key}": value
+            for key, value in CampaignDecisionService.MIN_IMPRESSIONS.items()
+        },
+        "CONFIDENCE_BANDS.MEDIUM": CONFIDENCE_BANDS["MEDIUM"],
+        "CONFIDENCE_BANDS.HIGH": CONFIDENCE_BANDS["HIGH"],
+        "user_trust": NEUTRAL_TRUST,
+    }
+
+
+def build_variants(grid: Dict[str, List[float]]) -> List[Dict[str, float]]:
+    """
+    Cartesian product of the grid; variant 0 is always the baseline.
+    """
+
+    baseline = baseline_parameters()
+
+    unknown = sorted(set(grid) - set(baseline))
+    if unknown:
+        raise ValueError(f"Unknown backtest parameters: {', '.join(unknown)}")
+
+    variants = [{}]
+    names = sorted(grid)
+    for values in itertools.product(*(grid[name] for name in names)):
+        overrides = dict(zip(names, values))
+        if any(baseline[name] != value for name, value in overrides.items()):
+            variants.append(overrides)
+    return variants
+
+
+# =========================================================
+# DATASET
+# =========================================================
+class BacktestDataset:
+    """
+    Columnar history for one replay range.
+
+    daily[metric]   float64 (campaigns × days), 0 when no row
+    present         bool (campaigns × days), daily row exists
+    Day 0 is HISTORY_DAYS before `start` so every window is complete
+    on the first replay day.
+    """
+
+    def __init__(self, *, start: date, end: date, tables: Dict[str, Dict[str, list]]):
+        if end < start:
+            raise ValueError("end must not be before start")
+
+        self.start = start
+        self.end = end
+        self.first_day = start - timedelta(days=HISTORY_DAYS)
+        self.day_count = (end - self.first_day).days + 1
+        self.replay_days = (end - start).days + 1
+
+        campaigns = tables["campaigns"]
+        self.campaign_ids: List[str] = [str(value) for value in campaigns["id"]]
+        self.index = {campaign_id: i for i, campaign_id in enumerate(self.campaign_ids)}
+        self.objectives = np.array(
+            [value or "" for value in campaigns["objective"]],
+            dtype=object,
+        )
+
+        category_map = tables["campaign_category_map"]
+        self.categories = np.full(len(self.campaign_ids), None, dtype=object)
+        for campaign_id, category in zip(
+            category_map["campaign_id"],
+            category_map["final_category"],
+        ):
+            position = self.index.get(str(campaign_id))
+            if position is not None:
+                self.categories[position] = category
+
+        self._load_daily(tables["campaign_daily_metrics"])
+        self._load_outcomes(tables["ml_action_outcomes"])
+        self.benchmarks = tables["industry_benchmarks"]
+
+    def __len__(self) -> int:
+        return len(self.campaign_ids)
+
+    def _positions(self, campaign_ids: Iterable, days: Iterable) -> Tuple[np.ndarray, np.ndarray]:
+        campaign_positions = np.array(
+            [self.index.get(str(value), -1) for value in campaign_ids],
+            dtype=np.int64,
+        )
+        day_offsets = np.array(
+            [
+                (_as_date(value) - self.first_day).days
+                for value in days
+            ],
+            dtype=np.int64,
+        )
+        return campaign_positions, day_offsets
+
+    def _load_daily(self, daily: Dict[str, list]) -> None:
+        shape = (len(self.campaign_ids), self.day_count)
+        self.daily = {metric: np.zeros(shape) for metric in DAILY_METRICS}
+        self.present = np.zeros(shape, dtype=bool)
+
+        rows, days = self._positions(daily["campaign_id"], daily["date"])
+        keep = (rows >= 0) & (days >= 0) & (days < self.day_count)
+
+        self.present[rows[keep], days[keep]] = True
+        for metric in DAILY_METRICS:
+            values = np.array(
+                [float(value or 0) for value in daily[metric]],
+                dtype=np.float64,
+            )
+            self.daily[metric][rows[keep], days[keep]] = values[keep]
+
+    def _load_outcomes(self, outcomes: Dict[str, list]) -> None:
+        rows, days = self._positions(outcomes["campaign_id"], outcomes["decided_at"])
+        replay_days = days - HISTORY_DAYS
+        keep = (rows >= 0) & (replay_days >= 0) & (replay_days < self.replay_days)
+
+        self.outcome_campaigns = rows[keep]
+        self.outcome_days = replay_days[keep]
+        self.outcome_action_types = np.array(
+            [str(value) for value in outcomes["action_type"]],
+            dtype=object,
+        )[keep]
+        # Enum labels arrive as names ("IMPROVED") or values ("improved")
+        self.outcome_labels = {
+            horizon: np.array(
+                [str(value or "unknown").lower() for value in outcomes[f"outcome_{horizon}"]],
+                dtype=object,
+            )[keep]
+            for horizon in HORIZONS
+        }
+
+
+# =========================================================
+# REPLAY
+# =========================================================
+class ReplayWindows:
+    """
+    Window metrics for every campaign × replay day, rebuilt from daily
+    rows with cumulative sums (same ratios as CampaignAggregationService).
+    Variant-independent: computed once per worker.
+    """
+
+    def __init__(self, dataset: BacktestDataset):
+        self.dataset = dataset
+        ends = np.arange(HISTORY_DAYS, dataset.day_count) + 1
+
+        cumulative = {
+            metric: _cumsum(values) for metric, values in dataset.daily.items()
+        }
+        covered = _cumsum(dataset.present.astype(np.float64))
+
+        self.windows: Dict[str, Dict[str, np.ndarray]] = {}
+        for window, days in REPLAY_WINDOWS.items():
+            sums = {
+                metric: values[:, ends] - values[:, ends - days]
+                for metric, values in cumulative.items()
+            }
+            self.windows[window] = {
+                "impressions": sums["impressions"],
+                "ctr": _ratio(sums["clicks"], sums["impressions"]),
+                "cpl": _ratio(sums["spend"], sums["leads"]),
+                "cpa": _ratio(sums["spend"], sums["purchases"]),
+                "roas": _ratio(sums["revenue"], sums["spend"]),
+                "complete": (covered[:, ends] - covered[:, ends - days]) >= days,
+            }
+
+        self.benchmark_cpl, self.benchmark_roas = self._benchmarks()
+
+    def _benchmarks(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Latest 7d benchmark with as_of_date <= replay day, per
+        (campaign category, campaign objective).
+        """
+
+        dataset = self.dataset
+        shape = (len(dataset), dataset.replay_days)
+        benchmark_cpl = np.full(shape, np.nan)
+        benchmark_roas = np.full(shape, np.nan)
+
+        series: Dict[Tuple[str, str], List[Tuple[date, Any, Any]]] = {}
+        rows = dataset.benchmarks
+        for category, objective, as_of_date, avg_cpl, avg_roas in zip(
+            rows["category"],
+            rows["objective_type"],
+            rows["as_of_date"],
+            rows["avg_cpl"],
+            rows["avg_roas"],
+        ):
+            series.setdefault((category, objective), []).append(
+                (_as_date(as_of_date), avg_cpl, avg_roas)
+            )
+
+        replay_dates = np.array(
+            [dataset.start + timedelta(days=i) for i in range(dataset.replay_days)],
+            dtype="datetime64[D]",
+        )
+
+        for (category, objective), points in series.items():
+            members = np.flatnonzero(
+                (dataset.categories == category) & (dataset.objectives == objective)
+            )
+            if not len(members):
+                continue
+
+            points.sort(key=lambda point: point[0])
+            dates = np.array([point[0] for point in points], dtype="datetime64[D]")
+            latest = np.searchsorted(dates, replay_dates, side="right") - 1
+            known = latest >= 0
+
+            for target, values in (
+                (benchmark_cpl, _float_array(point[1] for point in points)),
+                (benchmark_roas, _float_array(point[2] for point in points)),
+            ):
+                target[np.ix_(members, np.flatnonzero(known))] = values[latest[known]]
+
+        return benchmark_cpl, benchmark_roas
+
+    def runner_arrays(self) -> CampaignWindowArrays:
+        """
+        Flattened (campaign × day) input for VectorizedRuleEngine.
+        """
+
+        dataset = self.dataset
+        columns: Dict[str, np.ndarray] = {}
+        for window in ("7d", "30d"):
+            columns[f"has_{window}"] = self.windows[window]["complete"].ravel()
+            for metric in ("impressions", "ctr", "cpl", "cpa", "roas"):
+                columns[f"{metric}_{window}"] = self.windows[window][metric].ravel()
+        columns["benchmark_cpl"] = self.benchmark_cpl.ravel()
+        columns["benchmark_roas"] = self.benchmark_roas.ravel()
+
+        positions = np.repeat(np.arange(len(dataset)), dataset.replay_days)
+        objectives = np.array(
+            [objective.upper() for objective in dataset.objectives],
+            dtype=object,
+        )
+        return CampaignWindowArrays(
+            list(positions),
+            objectives[positions],
+            columns,
+        )
+
+
+def replay_variant(
+    replay: ReplayWindows,
+    arrays: CampaignWindowArrays,
+    parameters: Dict[str, float],
+) -> Dict[str, np.ndarray]:
+    """
+    Band code per rule (campaigns × replay days); 0 = did not fire.
+    """
+
+    shape = (len(replay.dataset), replay.dataset.replay_days)
+
+    engine = VectorizedRuleEngine()
+    for name, value in parameters.items():
+        owner, _, attribute = name.partition(".")
+        if owner == "LeadPerformanceDropRule":
+            setattr(engine.lead_rule, attribute, value)
+        elif owner == "SalesROASDropRule":
+            setattr(engine.sales_rule, attribute, value)
+
+    trust_factor = 0.8 + (parameters["user_trust"] * 0.4)
+    bands = {"MEDIUM": parameters["CONFIDENCE_BANDS.MEDIUM"], "HIGH": parameters["CONFIDENCE_BANDS.HIGH"]}
+
+    # -------------------------------------------------
+    # AIDecisionRunner rules (base confidence → trust → band)
+    # -------------------------------------------------
+    lead = engine.lead_mask(arrays)
+    lead_worse = _truthy(arrays["benchmark_cpl"]) & (
+        arrays["cpl_7d"] > arrays["benchmark_cpl"] * engine.lead_rule.BENCHMARK_CPL_DELTA
+    )
+    sales = engine.sales_mask(arrays)
+    sales_worse = _truthy(arrays["benchmark_roas"]) & (
+        arrays["roas_7d"] < arrays["benchmark_roas"] * engine.sales_rule.BENCHMARK_ROAS_DELTA
+    )
+
+    results = {
+        "LeadPerformanceDropRule": _runner_bands(
+            lead["fires"], lead["fatigue"], lead_worse, trust_factor, bands
+        ).reshape(shape),
+        "SalesROASDropRule": _runner_bands(
+            sales["fires"], sales["decay"], sales_worse, trust_factor, bands
+        ).reshape(shape),
+    }
+
+    # -------------------------------------------------
+    # CampaignDecisionService rules (impressions → band)
+    # -------------------------------------------------
+    short, stable = replay.windows["3d"], replay.windows["14d"]
+    objectives = np.array(
+        [objective.upper() for objective in replay.dataset.objectives],
+        dtype=object,
+    )[:, None]
+
+    cpl_change = _change_pct(short["cpl"], stable["cpl"])
+    cpa_change = _change_pct(short["cpa"], stable["cpa"])
+
+    with np.errstate(invalid="ignore"):
+        lead_fires = (
+            (objectives == "LEAD")
+            & ~np.isnan(short["ctr"])
+            & (short["ctr"] < parameters["LEAD_RULES.ctr_min"])
+            & (cpl_change > parameters["LEAD_RULES.cpl_increase_pct"])
+        )
+        sales_fires = (
+            (objectives == "SALES")
+            & ~np.isnan(short["roas"])
+            & (short["roas"] < parameters["SALES_RULES.roas_min"])
+            & (cpa_change > parameters["SALES_RULES.cpa_increase_pct"])
+        )
+
+    impression_band = np.where(
+        short["impressions"] >= parameters["MIN_IMPRESSIONS.HIGH"],
+        BANDS["HIGH"],
+        np.where(
+            short["impressions"] >= parameters["MIN_IMPRESSIONS.MEDIUM"],
+            BANDS["MEDIUM"],
+            BANDS["LOW"],
+        ),
+    ).astype(np.int8)
+
+    results["CampaignDecisionService.lead"] = np.where(lead_fires, impression_band, 0)
+    results["CampaignDecisionService.sales"] = np.where(sales_fires, impression_band, 0)
+
+    return results
+
+
+def score_rule(
+    dataset: BacktestDataset,
+    rule_name: str,
+    bands: np.ndarray,
+    *,
+    horizon: str,
+    tolerance: int,
+) -> List[Dict[str, Any]]:
+    action_types, emitted_band = BACKTEST_RULES[rule_name]
+    emitted = BANDS[emitted_band]
+
+    # Highest band fired on the decision day or `tolerance` days before
+    recent = bands.copy()
+    for shift in range(1, tolerance + 1):
+        recent[:, shift:] = np.maximum(recent[:, shift:], bands[:, :-shift])
+
+    labels = dataset.outcome_labels[horizon]
+    events = np.isin(dataset.outcome_action_types, action_types) & (labels != "unknown")
+    improved = labels[events] == "improved"
+    hit_bands = recent[dataset.outcome_campaigns[events], dataset.outcome_days[events]]
+    positives = int(improved.sum())
+
+    rows = []
+    for band_name, fired, hits in [
+        ("ALL", bands >= emitted, hit_bands >= emitted),
+        *[
+            (name, bands == code, hit_bands == code)
+            for name, code in sorted(BANDS.items(), key=lambda item: -item[1])
+        ],
+    ]:
+        tp = int((hits & improved).sum())
+        fp = int((hits & ~improved).sum())
+        rows.append(
+            {
+                "rule": rule_name,
+                "band": band_name,
+                "emitted": band_name == "ALL" or BANDS[band_name] >= emitted,
+                "suggestions": int(fired.sum()),
+                "events": int(events.sum()),
+                "positives": positives,
+                "tp": tp,
+                "fp": fp,
+                "precision": round(tp / (tp + fp), 4) if tp + fp else None,
+                "recall": round(tp / positives, 4) if positives else None,
+            }
+        )
+    return rows
+
+
+# =========================================================
+# PARALLEL VARIANTS
+# =========================================================
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(dataset: BacktestDataset) -> None:
+    # Dataset is pickled once per worker; windows are built once per worker
+    replay = ReplayWindows(dataset)
+    _worker_state["replay"] = replay
+    _worker_state["arrays"] = replay.runner_arrays()
+
+
+def _run_variant(job: Tuple[int, Dict[str, float], str, int]) -> List[Dict[str, Any]]:
+    index, overrides, horizon, tolerance = job
+    replay: ReplayWindows = _worker_state["replay"]
+
+    parameters = {**baseline_parameters(), **overrides}
+    fired = replay_variant(replay, _worker_state["arrays"], parameters)
+
+    rows = []
+    for rule_name, bands in fired.items():
+        for row in score_rule(
+            replay.dataset,
+            rule_name,
+            bands,
+            horizon=horizon,
+            tolerance=tolerance,
+        ):
+            rows.append({"variant": index, "parameters": overrides, **row})
+    return rows
+
+
+def run_backtest(
+    dataset: BacktestDataset,
+    variants: List[Dict[str, float]],
+    *,
+    workers: Optional[int] = None,
+    horizon: str = "7d",
+    tolerance: int = 1,
+) -> List[Dict[str, Any]]:
+    if horizon not in HORIZONS:
+        raise ValueError(f"horizon must be one of {', '.join(HORIZONS)}")
+
+    jobs = [
+        (index, overrides, horizon, tolerance)
+        for index, overrides in enumerate(variants)
+    ]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+
+    if workers <= 1:
+        _init_worker(dataset)
+        batches = map(_run_variant, jobs)
+        return [row for batch in batches for row in batch]
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(dataset,),
+    ) as pool:
+        return [row for batch in pool.map(_run_variant, jobs) for row in batch]
+
+
+# =========================================================
+# INPUTS
+# =========================================================
+async def load_tables(
+    db: AsyncSession,
+    *,
+    start: date,
+    end: date,
+) -> Dict[str, Dict[str, list]]:
+    """
+    Replay range extract from Postgres (one query per table).
+    """
+
+    first_day = start - timedelta(days=HISTORY_DAYS)
+    params = {"first_day": first_day, "start": start, "end": end}
+
+    campaigns_in_range = """
+        SELECT DISTINCT campaign_id
+        FROM campaign_daily_metrics
+        WHERE date BETWEEN :first_day AND :end
+    """
+    queries = {
+        "campaigns": f"""
+            SELECT id, objective
+            FROM campaigns
+            WHERE id IN ({campaigns_in_range})
+            ORDER BY id
+        """,
+        "campaign_category_map": f"""
+            SELECT campaign_id, final_category
+            FROM campaign_category_map
+            WHERE campaign_id IN ({campaigns_in_range})
+        """,
+        "campaign_daily_metrics": """
+            SELECT campaign_id, date, impressions, clicks, spend, leads, purchases, revenue
+            FROM campaign_daily_metrics
+            WHERE date BETWEEN :first_day AND :end
+        """,
+        "industry_benchmarks": """
+            SELECT category, objective_type, as_of_date, avg_cpl, avg_roas
+            FROM industry_benchmarks
+            WHERE window_type = '7d'
+              AND as_of_date <= :end
+        """,
+        "ml_action_outcomes": """
+            SELECT
+                campaign_id,
+                action_type,
+                decided_at,
+                CAST(outcome_7d AS TEXT)  AS outcome_7d,
+                CAST(outcome_14d AS TEXT) AS outcome_14d,
+                CAST(outcome_30d AS TEXT) AS outcome_30d
+            FROM ml_action_outcomes
+            WHERE decided_at >= :start
+              AND decided_at < CAST(:end AS DATE) + 1
+        """,
+    }
+
+    tables = {}
+    for name, sql in queries.items():
+        result = await db.execute(text(sql), params)
+        rows = result.fetchall()
+        tables[name] = {
+            column: [_plain(row._mapping[column]) for row in rows]
+            for column in TABLES[name]
+        }
+        logger.info("Backtest extract %s: %d rows", name, len(rows))
+
+    return tables
+
+
+def read_parquet(directory: str) -> Dict[str, Dict[str, list]]:
+    parquet = _pyarrow_parquet()
+    return {
+        name: parquet.read_table(
+            os.path.join(directory, f"{name}.parquet"),
+            columns=list(columns),
+        ).to_pydict()
+        for name, columns in TABLES.items()
+    }
+
+
+def write_parquet(tables: Dict[str, Dict[str, list]], directory: str) -> None:
+    parquet = _pyarrow_parquet()
+    import pyarrow
+
+    os.makedirs(directory, exist_ok=True)
+    for name, columns in TABLES.items():
+        parquet.write_table(
+            pyarrow.table({column: tables[name][column] for column in columns}),
+            os.path.join(directory, f"{name}.parquet"),
+        )
+
+
+# =========================================================
+# HELPERS
+# =========================================================
+def _pyarrow_parquet():
+    try:
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise RuntimeError(
+            "Parquet input/output needs pyarrow (pip install pyarrow)"
+        ) from exc
+    return pyarrow.parquet
+
+
+def _plain(value):
+    # UUID → str, Decimal → float (Parquet-friendly, picklable)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if value is None or isinstance(value, (str, int, float, date)):
+        return value
+    return float(value)
+
+
+def _as_date(value) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _cumsum(values: np.ndarray) -> np.ndarray:
+    # Leading zero column: window sum = cs[:, end] - cs[:, end - days]
+    return np.concatenate(
+        [np.zeros((values.shape[0], 1)), np.cumsum(values, axis=1)],
+        axis=1,
+    )
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+def _change_pct(short: np.ndarray, stable: np.ndarray) -> np.ndarray:
+    # CampaignDecisionService: 0 unless both values are truthy
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = ((short - stable) / stable) * 100
+    return np.where(_truthy(short) & _truthy(stable), change, 0.0)
+
+
+def _runner_bands(
+    fires: np.ndarray,
+    signal: np.ndarray,
+    worse_than_benchmark: np.ndarray,
+    trust_factor: float,
+    bands: Dict[str, float],
+) -> np.ndarray:
+    # Rule base confidence, then AIDecisionRunner trust adjustment
+    base = np.minimum(0.75 + 0.05 * signal + 0.10 * worse_than_benchmark, 0.95)
+    adjusted = np.round(np.clip(base * trust_factor, 0.0, 1.0), 2)
+
+    band = np.where(
+        adjusted >= bands["HIGH"],
+        BANDS["HIGH"],
+        np.where(adjusted >= bands["MEDIUM"], BANDS["MEDIUM"], BANDS["LOW"]),
+    ).astype(np.int8)
+    return np.where(fires, band, 0).astype(np.int8)
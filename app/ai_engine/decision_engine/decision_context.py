@@ -0,0 +1,366 @@
+"""
+Decision Context Prefetch
+
+PHASE 21 — ACCOUNT-LEVEL SNAPSHOT FOR THE DECISION RUNNER
+
+Purpose:
+- Load everything the rules read for ALL campaigns of an ad account
+  with a fixed number of set queries (independent of campaign count)
+- Rules evaluate against the in-memory snapshot (no per-rule queries)
+- Read-only
+
+Loaded sets:
+- campaign_metrics_aggregates (complete windows)
+- campaign_breakdown_aggregates (7d)
+- campaign_category_map
+- industry_benchmarks (latest per category × objective × window)
+- approved ai_action_feedback (counts per campaign × rule × action)
+- ml_category_breakdown_stats (top rows per category)
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import desc, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.campaigns.models import Campaign
+from app.ai_engine.models.ml_category_breakdown_stats import (
+    MLCategoryBreakdownStat,
+)
+
+
+CAMPAIGN_WINDOWS = ("7d", "30d")
+BREAKDOWN_WINDOW = "7d"
+BENCHMARK_WINDOWS = ("7d", "30d")
+
+# Rule thresholds that shape what is prefetched
+CATEGORY_MIN_CONFIDENCE = 0.70
+CATEGORY_MAX_RECOMMENDATIONS = 3
+
+
+class DecisionContext:
+    """
+    In-memory snapshot for one set of campaigns.
+
+    Lookups mirror the per-campaign queries the rules used to run.
+    """
+
+    def __init__(self) -> None:
+        # campaign_id → window_type → aggregate row
+        self.windows: Dict[UUID, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        # campaign_id → 7d breakdown aggregate rows
+        self.breakdowns: Dict[UUID, List[Dict[str, Any]]] = defaultdict(list)
+        # campaign_id → {final_category, confidence_score}
+        self.categories: Dict[UUID, Dict[str, Any]] = {}
+        # (category, objective_type, window_type) → latest benchmark row
+        self.benchmarks: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        # (campaign_id, rule_name, action_type) → (helpful, unhelpful)
+        self.feedback: Dict[Tuple[UUID, str, str], Tuple[int, int]] = {}
+        # category → top breakdown stats
+        self.category_stats: Dict[str, List[MLCategoryBreakdownStat]] = {}
+
+        self.query_count = 0
+
+    # =========================================================
+    # LOOKUPS
+    # =========================================================
+    def campaign_window(self, campaign_id: UUID, window: str) -> Optional[Dict]:
+        return self.windows.get(campaign_id, {}).get(window)
+
+    def category(self, campaign_id: UUID) -> Optional[str]:
+        category_map = self.categories.get(campaign_id)
+        return category_map["final_category"] if category_map else None
+
+    def benchmark(
+        self,
+        campaign_id: UUID,
+        window: str,
+        objective: Optional[str] = None,
+    ) -> Optional[Dict]:
+        """
+        Latest benchmark for the campaign's category; any objective
+        when objective is None.
+        """
+
+        category = self.category(campaign_id)
+        if category is None:
+            return None
+
+        if objective is not None:
+            return self.benchmarks.get((category, objective, window))
+
+        candidates = [
+            row
+            for (row_category, _, row_window), row in self.benchmarks.items()
+            if row_category == category and row_window == window
+        ]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda row: row["as_of_date"])
+
+    def best_breakdown(
+        self,
+        campaign_id: UUID,
+        *,
+        include: Callable[[Dict[str, Any]], bool],
+        by_ctr: bool = False,
+    ) -> Optional[Dict]:
+        """
+        ORDER BY roas DESC NULLS LAST, cpl ASC NULLS LAST
+        [, ctr DESC NULLS LAST] LIMIT 1
+        """
+
+        rows = [
+            row for row in self.breakdowns.get(campaign_id, []) if include(row)
+        ]
+        if not rows:
+            return None
+
+        def sort_key(row: Dict[str, Any]):
+            key = (
+                row["roas"] is None,
+                -(row["roas"] or 0),
+                row["cpl"] is None,
+                row["cpl"] or 0,
+            )
+            if by_ctr:
+                key += (row["ctr"] is None, -(row["ctr"] or 0))
+            return key
+
+        return min(rows, key=sort_key)
+
+    def feedback_counts(
+        self,
+        campaign_id: UUID,
+        rule_name: str,
+        action_type: str,
+    ) -> Optional[Tuple[int, int]]:
+        return self.feedback.get((campaign_id, rule_name, action_type))
+
+
+class DecisionContextLoader:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    # =========================================================
+    # PUBLIC ENTRY POINT
+    # =========================================================
+    async def load(self, campaigns: Iterable[Campaign]) -> DecisionContext:
+        context = DecisionContext()
+
+        campaign_ids = [campaign.id for campaign in campaigns]
+        if not campaign_ids:
+            return context
+
+        await self._load_windows(context, campaign_ids)
+        await self._load_breakdowns(context, campaign_ids)
+        await self._load_categories(context, campaign_ids)
+        await self._load_feedback(context, campaign_ids)
+
+        categories = sorted(
+            {row["final_category"] for row in context.categories.values()}
+        )
+        if categories:
+            await self._load_benchmarks(context, categories)
+            await self._load_category_stats(context, categories)
+
+        return context
+
+    async def load_feedback(self, campaign_ids: List[UUID]) -> DecisionContext:
+        """
+        Feedback-only context (confidence calibration for campaigns
+        scored outside the runner, e.g. the vectorized fleet run).
+        """
+
+        context = DecisionContext()
+        if campaign_ids:
+            await self._load_feedback(context, campaign_ids)
+        return context
+
+    # =========================================================
+    # SET QUERIES
+    # =========================================================
+    async def _fetch(self, context: DecisionContext, sql: str, params: Dict):
+        context.query_count += 1
+        result = await self.db.execute(text(sql), params)
+
+        # NUMERIC columns arrive as Decimal; rules do float math
+        # (the models declare these columns as float)
+        return [
+            {
+                key: float(value) if isinstance(value, Decimal) else value
+                for key, value in row._mapping.items()
+            }
+            for row in result.fetchall()
+        ]
+
+    async def _load_windows(
+        self,
+        context: DecisionContext,
+        campaign_ids: List[UUID],
+    ) -> None:
+        rows = await self._fetch(
+            context,
+            """
+            SELECT *
+            FROM campaign_metrics_aggregates
+            WHERE campaign_id = ANY(CAST(:campaign_ids AS UUID[]))
+              AND window_type = ANY(CAST(:windows AS VARCHAR[]))
+              AND is_complete_window = true
+            """,
+            {"campaign_ids": campaign_ids, "windows": list(CAMPAIGN_WINDOWS)},
+        )
+        for row in rows:
+            context.windows[row["campaign_id"]][row["window_type"]] = row
+
+    async def _load_breakdowns(
+        self,
+        context: DecisionContext,
+        campaign_ids: List[UUID],
+    ) -> None:
+        rows = await self._fetch(
+            context,
+            """
+            SELECT
+                campaign_id,
+                creative_id,
+                placement,
+                region,
+                age_group,
+                gender,
+                impressions,
+                conversions,
+                roas,
+                cpl,
+                ctr
+            FROM campaign_breakdown_aggregates
+            WHERE campaign_id = ANY(CAST(:campaign_ids AS UUID[]))
+              AND window_type = :window
+            """,
+            {"campaign_ids": campaign_ids, "window": BREAKDOWN_WINDOW},
+        )
+        for row in rows:
+            context.breakdowns[row["campaign_id"]].append(row)
+
+    async def _load_categories(
+        self,
+        context: DecisionContext,
+        campaign_ids: List[UUID],
+    ) -> None:
+        rows = await self._fetch(
+            context,
+            """
+            SELECT campaign_id, final_category, confidence_score
+            FROM campaign_category_map
+            WHERE campaign_id = ANY(CAST(:campaign_ids AS UUID[]))
+            """,
+            {"campaign_ids": campaign_ids},
+        )
+        for row in rows:
+            context.categories[row["campaign_id"]] = row
+
+    async def _load_feedback(
+        self,
+        context: DecisionContext,
+        campaign_ids: List[UUID],
+    ) -> None:
+        rows = await self._fetch(
+            context,
+            """
+            SELECT
+                campaign_id,
+                rule_name,
+                action_type,
+                COUNT(*) FILTER (WHERE is_helpful IS TRUE)  AS helpful,
+                COUNT(*) FILTER (WHERE is_helpful IS FALSE) AS unhelpful
+            FROM ai_action_feedback
+            WHERE campaign_id = ANY(CAST(:campaign_ids AS UUID[]))
+              AND approval_status = 'APPROVED'
+            GROUP BY campaign_id, rule_name, action_type
+            """,
+            {"campaign_ids": campaign_ids},
+        )
+        for row in rows:
+            context.feedback[
+                (row["campaign_id"], row["rule_name"], row["action_type"])
+            ] = (row["helpful"], row["unhelpful"])
+
+    async def _load_benchmarks(
+        self,
+        context: DecisionContext,
+        categories: List[str],
+    ) -> None:
+        rows = await self._fetch(
+            context,
+            """
+            SELECT DISTINCT ON (category, objective_type, window_type)
+                category,
+                objective_type,
+                window_type,
+                as_of_date,
+                avg_ctr,
+                avg_cpl,
+                avg_cpa,
+                avg_roas,
+                p25_roas,
+                p50_roas,
+                p75_roas,
+                campaign_count
+            FROM industry_benchmarks
+            WHERE category = ANY(CAST(:categories AS VARCHAR[]))
+              AND window_type = ANY(CAST(:windows AS VARCHAR[]))
+            ORDER BY category, objective_type, window_type, as_of_date DESC
+            """,
+            {"categories": categories, "windows": list(BENCHMARK_WINDOWS)},
+        )
+        for row in rows:
+            context.benchmarks[
+                (row["category"], row["objective_type"], row["window_type"])
+            ] = row
+
+    async def _load_category_stats(
+        self,
+        context: DecisionContext,
+        categories: List[str],
+    ) -> None:
+        """
+        Top CATEGORY_MAX_RECOMMENDATIONS stats per category, ranked like
+        CategoryStrategyRule (avg_roas DESC, confidence_score DESC).
+        """
+
+        context.query_count += 1
+
+        rank = (
+            func.row_number()
+            .over(
+                partition_by=MLCategoryBreakdownStat.business_category,
+                order_by=(
+                    desc(MLCategoryBreakdownStat.avg_roas),
+                    desc(MLCategoryBreakdownStat.confidence_score),
+                ),
+            )
+            .label("rank")
+        )
+        ranked = (
+            select(MLCategoryBreakdownStat.id, rank)
+            .where(
+                MLCategoryBreakdownStat.business_category.in_(categories),
+                MLCategoryBreakdownStat.confidence_score >= CATEGORY_MIN_CONFIDENCE,
+            )
+            .subquery()
+        )
+
+        result = await self.db.execute(
+            select(MLCategoryBreakdownStat)
+            .join(ranked, ranked.c.id == MLCategoryBreakdownStat.id)
+            .where(ranked.c.rank <= CATEGORY_MAX_RECOMMENDATIONS)
+            .order_by(MLCategoryBreakdownStat.business_category, ranked.c.rank)
+        )
+
+        for stat in result.scalars().all():
+            context.category_stats.setdefault(stat.business_category, []).append(
+                stat
+            )
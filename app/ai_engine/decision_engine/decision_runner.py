@@ -1,4 +1,4 @@
-from typing import List, Dict
+from typing import List
 from datetime import datetime
 from uuid import UUID
 
@@ -6,24 +6,28 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.campaigns.models import Campaign
-from app.ai_engine.models.action_models import AIAction, AIActionSet
-
-from app.ai_engine.rules.lead_rules import LeadPerformanceDropRule
-from app.ai_engine.rules.sales_rules import SalesROASDropRule
-from app.ai_engine.rules.breakdown_rules import (
-    BestCreativeRule,
-    BestPlacementRule,
-    BestAudienceSegmentRule,
+from app.ai_engine.models.action_models import (
+    AIAction,
+    AIActionSet,
+    ConfidenceBand,
 )
+
 from app.ai_engine.rules.category_strategy_rules import CategoryStrategyRule
 
-from app.ai_engine.campaign_ai_readiness_service import (
-    CampaignAIReadinessService,
-)
-from app.ai_engine.services.campaign_vs_benchmark_service import (
-    CampaignVsBenchmarkService,
-)
 from app.ai_engine.services.user_trust_service import UserTrustService
+from app.ai_engine.decision_engine.decision_context import DecisionContextLoader
+from app.ai_engine.decision_engine.vectorized_rules import (
+    BreakdownArrays,
+    CampaignWindowArrays,
+    VectorizedRuleEngine,
+)
+
+
+# =====================================================
+# RULE VERSION — BUMP WHEN RULES / THRESHOLDS CHANGE
+# (precomputed action sets are keyed on it)
+# =====================================================
+RULE_VERSION = "21.1"
 
 
 # =====================================================
@@ -44,17 +48,16 @@ class AIDecisionRunner:
     - No user-wide leakage
     - No DB writes
     - No Meta mutation
+    - Context for ALL campaigns is prefetched with a fixed number of
+      set queries
+    - Threshold rules (lead, sales, best breakdown) are evaluated as
+      vectorized masks over that snapshot; the category strategy rule
+      runs per campaign
     """
 
     def __init__(self) -> None:
-        self.rules = [
-            LeadPerformanceDropRule(),
-            SalesROASDropRule(),
-            BestCreativeRule(),
-            BestPlacementRule(),
-            BestAudienceSegmentRule(),
-            CategoryStrategyRule(),
-        ]
+        self.engine = VectorizedRuleEngine()
+        self.category_rule = CategoryStrategyRule()
 
     # -------------------------------------------------
     # 🔒 PRIMARY ENTRY — SELECTED AD ACCOUNT ONLY
@@ -87,75 +90,80 @@ class AIDecisionRunner:
             user_id=user_id,
         )
 
-        ai_service = CampaignAIReadinessService(db)
-        benchmark_service = CampaignVsBenchmarkService(db)
-
-        action_sets: List[AIActionSet] = []
         now = datetime.utcnow()
 
-        for campaign in campaigns:
-            # ---------------------------------------------
-            # HARD EXECUTION LOCKS
-            # ---------------------------------------------
-            if campaign.ai_execution_locked:
-                continue
-
-            if campaign.ai_execution_window_start and now < campaign.ai_execution_window_start:
-                continue
-
-            if campaign.ai_execution_window_end and now > campaign.ai_execution_window_end:
-                continue
-
-            # ---------------------------------------------
-            # AI CONTEXT
-            # ---------------------------------------------
-            ai_context: Dict = await ai_service.get_campaign_ai_score(
-                campaign_id=str(campaign.id),
-                short_window="7d",
-                long_window="30d",
+        # -------------------------------------------------
+        # HARD EXECUTION LOCKS
+        # -------------------------------------------------
+        eligible: List[Campaign] = [
+            campaign
+            for campaign in campaigns
+            if not campaign.ai_execution_locked
+            and not (
+                campaign.ai_execution_window_start
+                and now < campaign.ai_execution_window_start
             )
-
-            benchmark_context = await benchmark_service.compare(
-                campaign_id=str(campaign.id),
-                window_type="30d",
+            and not (
+                campaign.ai_execution_window_end
+                and now > campaign.ai_execution_window_end
             )
+        ]
 
-            ai_context["industry_benchmark"] = benchmark_context
+        if not eligible:
+            return []
 
-            actions: List[AIAction] = []
+        # -------------------------------------------------
+        # PREFETCH — ONE SNAPSHOT FOR THE WHOLE ACCOUNT
+        # -------------------------------------------------
+        context = await DecisionContextLoader(db).load(eligible)
+
+        arrays = CampaignWindowArrays.from_context(eligible, context)
+        threshold_actions = await self.engine.evaluate(
+            arrays,
+            BreakdownArrays.from_context(context, arrays),
+            context=context,
+            db=db,
+        )
+
+        action_sets: List[AIActionSet] = []
 
-            for rule in self.rules:
-                rule_actions = await rule.evaluate(
+        for campaign in eligible:
+            rule_actions: List[AIAction] = [
+                *threshold_actions.get(campaign.id, []),
+                *await self.category_rule.evaluate(
                     db=db,
                     campaign=campaign,
-                    ai_context=ai_context,
-                )
+                    ai_context={"decision_context": context},
+                ),
+            ]
 
-                for action in rule_actions:
-                    base_score = action.confidence.score
-                    adjusted_score = round(
-                        min(
-                            1.0,
-                            max(0.0, base_score * (0.8 + (user_trust_score * 0.4))),
-                        ),
-                        2,
-                    )
+            actions: List[AIAction] = []
 
-                    if adjusted_score >= CONFIDENCE_BANDS["HIGH"]:
-                        band = "HIGH"
-                    elif adjusted_score >= CONFIDENCE_BANDS["MEDIUM"]:
-                        band = "MEDIUM"
-                    else:
-                        continue  # 🔕 suppress LOW confidence
-
-                    action.confidence.score = adjusted_score
-                    action.confidence.band = band
-                    action.confidence.reason += (
-                        f" | Trust-adjusted ({trust_reason})"
-                        f" | Confidence band: {band}"
-                    )
+            for action in rule_actions:
+                base_score = action.confidence.score
+                adjusted_score = round(
+                    min(
+                        1.0,
+                        max(0.0, base_score * (0.8 + (user_trust_score * 0.4))),
+                    ),
+                    2,
+                )
+
+                if adjusted_score >= CONFIDENCE_BANDS["HIGH"]:
+                    band = "HIGH"
+                elif adjusted_score >= CONFIDENCE_BANDS["MEDIUM"]:
+                    band = "MEDIUM"
+                else:
+                    continue  # 🔕 suppress LOW confidence
+
+                action.confidence.score = adjusted_score
+                action.confidence.band = ConfidenceBand(band)
+                action.confidence.reason += (
+                    f" | Trust-adjusted ({trust_reason})"
+                    f" | Confidence band: {band}"
+                )
 
-                    actions.append(action)
+                actions.append(action)
 
             if actions:
                 action_sets.append(
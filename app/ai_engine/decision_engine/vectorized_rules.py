@@ -0,0 +1,648 @@
+"""
+Vectorized Rule Engine
+
+PHASE 21 — COLUMNAR THRESHOLD RULES
+
+Purpose:
+- Hold 7d / 30d campaign windows (impressions, ctr, cpl, cpa, roas)
+  and the 7d industry benchmark for N campaigns as NumPy arrays
+- Evaluate every threshold rule as ONE boolean mask over all campaigns
+  (fire() → RuleFirings, columnar: positions only)
+- Build AIAction objects ONLY for fired rows of the campaigns asked for
+  (build_actions()), through the rules' own build_action(), so output
+  matches rule.evaluate()
+
+Rules covered:
+- LeadPerformanceDropRule, SalesROASDropRule (campaign windows)
+- BestCreativeRule, BestPlacementRule, BestAudienceSegmentRule
+  (best 7d breakdown slice per campaign via one lexsort)
+
+Thresholds are read from the rule classes; NULL metrics are NaN.
+
+Used by:
+- AIDecisionRunner (arrays built from the prefetched DecisionContext)
+- Nightly fleet scoring: VectorizedRuleEngine.evaluate_fleet() loads
+  every AI-active campaign with one query per table and returns the
+  columnar RuleFirings (no AIAction per fired row)
+"""
+
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.campaigns.models import Campaign
+from app.ai_engine.decision_engine.decision_context import (
+    DecisionContext,
+    DecisionContextLoader,
+)
+from app.ai_engine.models.action_models import AIAction
+from app.ai_engine.rules.breakdown_rules import (
+    BestAudienceSegmentRule,
+    BestBreakdownRule,
+    BestCreativeRule,
+    BestPlacementRule,
+)
+from app.ai_engine.rules.lead_rules import LeadPerformanceDropRule
+from app.ai_engine.rules.sales_rules import SalesROASDropRule
+
+logger = logging.getLogger(__name__)
+
+
+WINDOW_METRICS = ("impressions", "ctr", "cpl", "cpa", "roas")
+SHORT_WINDOW = "7d"
+LONG_WINDOW = "30d"
+
+BREAKDOWN_DIMENSIONS = ("creative_id", "placement", "region", "age_group", "gender")
+
+
+def _float_array(values: Iterable) -> np.ndarray:
+    # None → NaN; Decimal / int → float64
+    return np.array(
+        [np.nan if value is None else float(value) for value in values],
+        dtype=np.float64,
+    )
+
+
+def _truthy(values: np.ndarray) -> np.ndarray:
+    # Python truthiness of an optional number: not NULL and not 0
+    return ~np.isnan(values) & (values != 0)
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+# =========================================================
+# COLUMNAR CAMPAIGN WINDOWS
+# =========================================================
+class CampaignWindowArrays:
+    """
+    One position per campaign (per campaign × day in the backtest).
+
+    columns["{metric}_{window}"]   float64, NaN when NULL / missing
+    columns["has_{window}"]        bool, complete window row exists
+    columns["benchmark_cpl"]       float64, latest 7d category benchmark
+    columns["benchmark_roas"]      float64
+    """
+
+    def __init__(
+        self,
+        campaign_ids: List[UUID],
+        objectives: np.ndarray,
+        columns: Dict[str, np.ndarray],
+    ):
+        self.campaign_ids = campaign_ids
+        self.index: Dict[UUID, int] = {
+            campaign_id: position
+            for position, campaign_id in enumerate(campaign_ids)
+        }
+        self.objectives = objectives
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.campaign_ids)
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self.columns[key]
+
+    # -----------------------------------------------------
+    # BUILDERS
+    # -----------------------------------------------------
+    @classmethod
+    def from_rows(cls, rows: List[Dict]) -> "CampaignWindowArrays":
+        columns: Dict[str, np.ndarray] = {}
+        for window in (SHORT_WINDOW, LONG_WINDOW):
+            columns[f"has_{window}"] = np.array(
+                [bool(row[f"has_{window}"]) for row in rows],
+                dtype=bool,
+            )
+            for metric in WINDOW_METRICS:
+                key = f"{metric}_{window}"
+                columns[key] = _float_array(row[key] for row in rows)
+
+        for key in ("benchmark_cpl", "benchmark_roas"):
+            columns[key] = _float_array(row[key] for row in rows)
+
+        return cls(
+            [row["campaign_id"] for row in rows],
+            np.array(
+                [(row["objective"] or "").upper() for row in rows],
+                dtype=object,
+            ),
+            columns,
+        )
+
+    @classmethod
+    def from_context(
+        cls,
+        campaigns: Iterable[Campaign],
+        context: DecisionContext,
+    ) -> "CampaignWindowArrays":
+        rows = []
+
+        for campaign in campaigns:
+            row = {"campaign_id": campaign.id, "objective": campaign.objective}
+
+            for window in (SHORT_WINDOW, LONG_WINDOW):
+                window_row = context.campaign_window(campaign.id, window)
+                row[f"has_{window}"] = bool(window_row)
+                for metric in WINDOW_METRICS:
+                    row[f"{metric}_{window}"] = (
+                        window_row.get(metric) if window_row else None
+                    )
+
+            benchmark = context.benchmark(campaign.id, SHORT_WINDOW, campaign.objective)
+            row["benchmark_cpl"] = benchmark["avg_cpl"] if benchmark else None
+            row["benchmark_roas"] = benchmark["avg_roas"] if benchmark else None
+
+            rows.append(row)
+
+        return cls.from_rows(rows)
+
+    @classmethod
+    async def load(
+        cls,
+        db: AsyncSession,
+        *,
+        ad_account_ids: Optional[List[UUID]] = None,
+    ) -> "CampaignWindowArrays":
+        """
+        Every AI-active, unlocked, in-window campaign in ONE query.
+        """
+
+        pivot = ",\n".join(
+            f"MAX(a.{metric}) FILTER (WHERE a.window_type = '{window}') "
+            f"AS {metric}_{window}"
+            for window in (SHORT_WINDOW, LONG_WINDOW)
+            for metric in WINDOW_METRICS
+        )
+        account_filter = (
+            ""
+            if ad_account_ids is None
+            else "AND c.ad_account_id = ANY(CAST(:ad_account_ids AS UUID[]))"
+        )
+
+        result = await db.execute(
+            text(
+                f"""
+                WITH bench AS (
+                    SELECT DISTINCT ON (category, objective_type)
+                        category,
+                        objective_type,
+                        avg_cpl,
+                        avg_roas
+                    FROM industry_benchmarks
+                    WHERE window_type = '{SHORT_WINDOW}'
+                    ORDER BY category, objective_type, as_of_date DESC
+                )
+                SELECT
+                    c.id AS campaign_id,
+                    c.objective,
+                    BOOL_OR(a.window_type = '{SHORT_WINDOW}') AS has_{SHORT_WINDOW},
+                    BOOL_OR(a.window_type = '{LONG_WINDOW}') AS has_{LONG_WINDOW},
+                    {pivot},
+                    MAX(b.avg_cpl) AS benchmark_cpl,
+                    MAX(b.avg_roas) AS benchmark_roas
+                FROM campaigns c
+                LEFT JOIN campaign_metrics_aggregates a
+                    ON a.campaign_id = c.id
+                   AND a.window_type IN ('{SHORT_WINDOW}', '{LONG_WINDOW}')
+                   AND a.is_complete_window = true
+                LEFT JOIN campaign_category_map m
+                    ON m.campaign_id = c.id
+                LEFT JOIN bench b
+                    ON b.category = m.final_category
+                   AND b.objective_type = c.objective
+                WHERE c.ai_active = TRUE
+                  AND c.is_archived = FALSE
+                  AND c.ai_execution_locked = FALSE
+                  AND (c.ai_execution_window_start IS NULL
+                       OR c.ai_execution_window_start <= (now() AT TIME ZONE 'utc'))
+                  AND (c.ai_execution_window_end IS NULL
+                       OR c.ai_execution_window_end >= (now() AT TIME ZONE 'utc'))
+                  {account_filter}
+                GROUP BY c.id, c.objective
+                ORDER BY c.id
+                """
+            ),
+            {"ad_account_ids": ad_account_ids},
+        )
+
+        return cls.from_rows([dict(row._mapping) for row in result.fetchall()])
+
+
+# =========================================================
+# COLUMNAR 7D BREAKDOWN SLICES
+# =========================================================
+class BreakdownArrays:
+    """
+    One position per breakdown row; rows stay available for
+    build_action() of the rows that win.
+    """
+
+    def __init__(self, rows: List[Dict], campaigns: CampaignWindowArrays):
+        self.rows = rows
+
+        self.campaign = np.array(
+            [campaigns.index.get(row["campaign_id"], -1) for row in rows],
+            dtype=np.int64,
+        )
+        self.impressions = _float_array(row["impressions"] for row in rows)
+        self.conversions = _float_array(row["conversions"] for row in rows)
+
+        self.rank_nulls: Dict[str, np.ndarray] = {}
+        self.rank_values: Dict[str, np.ndarray] = {}
+        for metric in ("roas", "cpl", "ctr"):
+            values = _float_array(row[metric] for row in rows)
+            self.rank_nulls[metric] = np.isnan(values)
+            self.rank_values[metric] = np.nan_to_num(values)
+
+        self.not_null: Dict[str, np.ndarray] = {
+            dim: np.array([row[dim] is not None for row in rows], dtype=bool)
+            for dim in BREAKDOWN_DIMENSIONS
+        }
+
+    @classmethod
+    def from_context(
+        cls,
+        context: DecisionContext,
+        campaigns: CampaignWindowArrays,
+    ) -> "BreakdownArrays":
+        rows = [
+            row
+            for campaign_id in campaigns.campaign_ids
+            for row in context.breakdowns.get(campaign_id, [])
+        ]
+        return cls(rows, campaigns)
+
+    @classmethod
+    async def load(
+        cls,
+        db: AsyncSession,
+        campaigns: CampaignWindowArrays,
+    ) -> "BreakdownArrays":
+        if not len(campaigns):
+            return cls([], campaigns)
+
+        result = await db.execute(
+            text(
+                """
+                SELECT
+                    campaign_id,
+                    creative_id,
+                    placement,
+                    region,
+                    age_group,
+                    gender,
+                    impressions,
+                    conversions,
+                    roas,
+                    cpl,
+                    ctr
+                FROM campaign_breakdown_aggregates
+                WHERE window_type = '7d'
+                  AND campaign_id = ANY(CAST(:campaign_ids AS UUID[]))
+                ORDER BY campaign_id
+                """
+            ),
+            {"campaign_ids": campaigns.campaign_ids},
+        )
+        return cls([dict(row._mapping) for row in result.fetchall()], campaigns)
+
+    def best_rows(self, rule: BestBreakdownRule) -> np.ndarray:
+        """
+        Index of the best qualifying row per campaign:
+        roas DESC, cpl ASC[, ctr DESC], NULLS LAST — ties keep row
+        order (lexsort is stable), like min() over the row list.
+        """
+
+        include = np.zeros(len(self.rows), dtype=bool)
+        for dim in rule.DIMENSIONS:
+            include |= self.not_null[dim]
+        include &= self.campaign >= 0
+
+        candidates = np.flatnonzero(include)
+        if not len(candidates):
+            return candidates
+
+        # np.lexsort: LAST key is the primary key
+        keys = []
+        if rule.RANK_BY_CTR:
+            keys += [-self.rank_values["ctr"], self.rank_nulls["ctr"]]
+        keys += [
+            self.rank_values["cpl"],
+            self.rank_nulls["cpl"],
+            -self.rank_values["roas"],
+            self.rank_nulls["roas"],
+            self.campaign,
+        ]
+
+        order = candidates[np.lexsort([key[candidates] for key in keys])]
+        _, first = np.unique(self.campaign[order], return_index=True)
+        return order[first]
+
+
+# =========================================================
+# ENGINE
+# =========================================================
+class VectorizedRuleEngine:
+    def __init__(self) -> None:
+        self.lead_rule = LeadPerformanceDropRule()
+        self.sales_rule = SalesROASDropRule()
+        self.breakdown_rules: List[BestBreakdownRule] = [
+            BestCreativeRule(),
+            BestPlacementRule(),
+            BestAudienceSegmentRule(),
+        ]
+
+    # -----------------------------------------------------
+    # MASKS
+    # -----------------------------------------------------
+    def lead_mask(self, arrays: CampaignWindowArrays) -> Dict[str, np.ndarray]:
+        rule = self.lead_rule
+        short_ctr, long_ctr = arrays["ctr_7d"], arrays["ctr_30d"]
+        short_cpl, long_cpl = arrays["cpl_7d"], arrays["cpl_30d"]
+
+        eligible = (
+            np.isin(arrays.objectives, rule.OBJECTIVES)
+            & arrays["has_7d"]
+            & arrays["has_30d"]
+            & _truthy(short_ctr)
+            & _truthy(long_ctr)
+            & _truthy(short_cpl)
+            & _truthy(long_cpl)
+        )
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ctr_ratio = short_ctr / long_ctr
+            cpl_change_pct = ((short_cpl - long_cpl) / long_cpl) * 100
+
+        return {
+            "fires": eligible
+            & (ctr_ratio < rule.CTR_DROP_THRESHOLD)
+            & (cpl_change_pct >= rule.CPL_INCREASE_THRESHOLD),
+            # CampaignAIReadinessService._detect_signals
+            "fatigue": short_ctr < long_ctr * 0.8,
+        }
+
+    def sales_mask(self, arrays: CampaignWindowArrays) -> Dict[str, np.ndarray]:
+        rule = self.sales_rule
+        short_roas, long_roas = arrays["roas_7d"], arrays["roas_30d"]
+
+        eligible = (
+            np.isin(arrays.objectives, rule.OBJECTIVES)
+            & arrays["has_7d"]
+            & arrays["has_30d"]
+            & _truthy(short_roas)
+            & _truthy(long_roas)
+        )
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            roas_ratio = short_roas / long_roas
+
+        return {
+            "fires": eligible
+            & (short_roas < rule.MIN_PROFITABLE_ROAS)
+            & (roas_ratio < rule.ROAS_DROP_THRESHOLD),
+            # CampaignAIReadinessService._detect_signals
+            "decay": short_roas < long_roas * 0.75,
+        }
+
+    def breakdown_winners(
+        self,
+        rule: BestBreakdownRule,
+        arrays: CampaignWindowArrays,
+        breakdowns: BreakdownArrays,
+    ) -> np.ndarray:
+        best = breakdowns.best_rows(rule)
+
+        fires = (
+            (breakdowns.impressions[best] >= rule.MIN_IMPRESSIONS)
+            & (breakdowns.conversions[best] >= rule.MIN_CONVERSIONS)
+        )
+        if rule.REQUIRES_CAMPAIGN_DATA:
+            positions = breakdowns.campaign[best]
+            fires &= arrays["has_7d"][positions] & arrays["has_30d"][positions]
+
+        return best[fires]
+
+    # -----------------------------------------------------
+    # EVALUATION
+    # -----------------------------------------------------
+    def fire(
+        self,
+        arrays: CampaignWindowArrays,
+        breakdowns: Optional[BreakdownArrays] = None,
+    ) -> "RuleFirings":
+        """
+        Masks only: which campaigns / breakdown rows fire, no AIAction.
+        """
+
+        lead = self.lead_mask(arrays)
+        sales = self.sales_mask(arrays)
+
+        winners = (
+            [
+                (rule, self.breakdown_winners(rule, arrays, breakdowns))
+                for rule in self.breakdown_rules
+            ]
+            if breakdowns is not None
+            else []
+        )
+
+        return RuleFirings(arrays, breakdowns, lead, sales, winners)
+
+    async def build_actions(
+        self,
+        firings: "RuleFirings",
+        *,
+        campaign_ids: Optional[Iterable[UUID]] = None,
+        context: Optional[DecisionContext] = None,
+        db: Optional[AsyncSession] = None,
+    ) -> Dict[UUID, List[AIAction]]:
+        """
+        AIAction objects for the fired rows of campaign_ids (default:
+        every campaign that fired), in rule order: lead, sales,
+        creative, placement, audience.
+
+        Feedback calibration reads context; when omitted, feedback is
+        loaded for the selected fired campaigns only (requires db).
+        """
+
+        arrays, breakdowns = firings.arrays, firings.breakdowns
+        lead, sales = firings.lead, firings.sales
+
+        lead_fired, sales_fired = firings.lead_fired, firings.sales_fired
+        winners = firings.winners
+        if campaign_ids is not None:
+            selected = np.zeros(len(arrays), dtype=bool)
+            selected[[arrays.index[c] for c in campaign_ids if c in arrays.index]] = True
+            lead_fired = lead_fired[selected[lead_fired]]
+            sales_fired = sales_fired[selected[sales_fired]]
+            winners = [
+                (rule, rows[selected[breakdowns.campaign[rows]]])
+                for rule, rows in winners
+            ]
+
+        if context is None:
+            calibrated_ids = [
+                arrays.campaign_ids[i]
+                for i in np.union1d(lead_fired, sales_fired)
+            ]
+            context = await DecisionContextLoader(db).load_feedback(calibrated_ids)
+
+        actions: Dict[UUID, List[AIAction]] = defaultdict(list)
+
+        for i in lead_fired:
+            campaign_id = arrays.campaign_ids[i]
+            actions[campaign_id].append(
+                await self.lead_rule.build_action(
+                    db=db,
+                    campaign_id=campaign_id,
+                    short_ctr=float(arrays["ctr_7d"][i]),
+                    long_ctr=float(arrays["ctr_30d"][i]),
+                    short_cpl=float(arrays["cpl_7d"][i]),
+                    long_cpl=float(arrays["cpl_30d"][i]),
+                    fatigue=bool(lead["fatigue"][i]),
+                    benchmark_cpl=_benchmark(arrays["benchmark_cpl"][i]),
+                    context=context,
+                )
+            )
+
+        for i in sales_fired:
+            campaign_id = arrays.campaign_ids[i]
+            actions[campaign_id].append(
+                await self.sales_rule.build_action(
+                    db=db,
+                    campaign_id=campaign_id,
+                    short_roas=float(arrays["roas_7d"][i]),
+                    long_roas=float(arrays["roas_30d"][i]),
+                    decay=bool(sales["decay"][i]),
+                    benchmark_roas=_benchmark(arrays["benchmark_roas"][i]),
+                    context=context,
+                )
+            )
+
+        for rule, rows in winners:
+            for row_index in rows:
+                row = breakdowns.rows[row_index]
+                campaign_id = arrays.campaign_ids[breakdowns.campaign[row_index]]
+                actions[campaign_id].append(rule.build_action(campaign_id, row))
+
+        return dict(actions)
+
+    async def evaluate(
+        self,
+        arrays: CampaignWindowArrays,
+        breakdowns: Optional[BreakdownArrays] = None,
+        *,
+        context: Optional[DecisionContext] = None,
+        db: Optional[AsyncSession] = None,
+    ) -> Dict[UUID, List[AIAction]]:
+        """
+        Returns actions per campaign (only campaigns that fire), in
+        rule order: lead, sales, creative, placement, audience.
+
+        Builds an AIAction for every fired row; callers scoring many
+        campaigns use fire() and build_actions() for the ones served.
+        """
+
+        return await self.build_actions(
+            self.fire(arrays, breakdowns),
+            context=context,
+            db=db,
+        )
+
+    async def evaluate_fleet(
+        self,
+        db: AsyncSession,
+        *,
+        ad_account_ids: Optional[List[UUID]] = None,
+    ) -> "RuleFirings":
+        """
+        Nightly entry: loads and scores every AI-active campaign.
+
+        Columnar result (no AIAction objects): build_actions() turns
+        the firings of the campaigns actually served into actions.
+        """
+
+        started = time.perf_counter()
+        arrays = await CampaignWindowArrays.load(db, ad_account_ids=ad_account_ids)
+        breakdowns = await BreakdownArrays.load(db, arrays)
+        loaded = time.perf_counter()
+
+        firings = self.fire(arrays, breakdowns)
+
+        logger.info(
+            "Vectorized rules: %d campaigns, %d breakdown rows, %d fired %s "
+            "(load %.2fs, evaluate %.2fs)",
+            len(arrays),
+            len(breakdowns.rows),
+            len(firings),
+            firings.counts(),
+            loaded - started,
+            time.perf_counter() - loaded,
+        )
+        return firings
+
+
+# =========================================================
+# COLUMNAR RESULT
+# =========================================================
+class RuleFirings:
+    """
+    Positions that fired, per rule:
+
+    lead_fired / sales_fired   campaign positions in arrays
+    winners                    (rule, breakdown row indexes) per
+                               breakdown rule, one row per campaign
+    """
+
+    def __init__(
+        self,
+        arrays: CampaignWindowArrays,
+        breakdowns: Optional[BreakdownArrays],
+        lead: Dict[str, np.ndarray],
+        sales: Dict[str, np.ndarray],
+        winners: List,
+    ):
+        self.arrays = arrays
+        self.breakdowns = breakdowns
+        self.lead = lead
+        self.sales = sales
+        self.lead_fired = np.flatnonzero(lead["fires"])
+        self.sales_fired = np.flatnonzero(sales["fires"])
+        self.winners = winners
+
+    def campaign_positions(self) -> np.ndarray:
+        positions = [self.lead_fired, self.sales_fired]
+        positions += [self.breakdowns.campaign[rows] for _, rows in self.winners]
+        return np.unique(np.concatenate(positions))
+
+    @property
+    def campaign_ids(self) -> List[UUID]:
+        return [self.arrays.campaign_ids[i] for i in self.campaign_positions()]
+
+    def counts(self) -> Dict[str, int]:
+        counts = {
+            "LeadPerformanceDropRule": len(self.lead_fired),
+            "SalesROASDropRule": len(self.sales_fired),
+        }
+        for rule, rows in self.winners:
+            counts[rule.rule_name] = len(rows)
+        return counts
+
+    def __len__(self) -> int:
+        return len(self.campaign_positions())
+
+
+def _benchmark(value: float) -> Optional[float]:
+    # Rules treat a missing or zero benchmark as "no benchmark"
+    value = _optional(value)
+    return value if value else None
@@ -0,0 +1,163 @@
+"""
+Background job: Precompute AI action sets for every selected ad account.
+
+Writes ai_action_snapshots for (ad account, as_of_date, rule version),
+so GET /ai/actions is served from the table.
+
+SAFE TO RUN:
+- systemd timer (after the nightly aggregation)
+- manual CLI
+- repeated executions: accounts whose snapshot inputs are unchanged
+  are skipped unless --force is given
+
+Usage:
+    python -m app.ai_engine.jobs.precompute_ai_actions
+    python -m app.ai_engine.jobs.precompute_ai_actions --workers 8 --force
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import date, datetime
+from typing import Collection, Dict, List, Optional
+from uuid import UUID
+
+# =========================================================
+# 🔴 CRITICAL: FORCE ORM REGISTRATION (DO NOT REMOVE)
+# =========================================================
+import app.models
+import app.meta_api.models
+import app.campaigns.models
+
+from sqlalchemy import select
+
+from app.core.db_session import BatchSessionLocal
+from app.meta_api.models import MetaAdAccount, UserMetaAdAccount
+from app.ai_engine.services.ai_action_snapshot_service import (
+    AIActionSnapshotService,
+)
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [ai-precompute] %(levelname)s: %(message)s",
+)
+logger = logging.getLogger("ai-precompute")
+
+
+async def _get_selected_account_ids() -> List[UUID]:
+    async with BatchSessionLocal() as db:
+        result = await db.execute(
+            select(MetaAdAccount.id)
+            .join(
+                UserMetaAdAccount,
+                UserMetaAdAccount.meta_ad_account_id == MetaAdAccount.id,
+            )
+            .where(
+                UserMetaAdAccount.is_selected.is_(True),
+                MetaAdAccount.is_active.is_(True),
+            )
+            .distinct()
+        )
+        return list(result.scalars().all())
+
+
+async def _precompute_account(
+    ad_account_id: UUID,
+    as_of_date: date,
+    *,
+    force: bool,
+    stats: Dict[str, int],
+) -> None:
+    # One session per account: sessions are never shared across tasks
+    async with BatchSessionLocal() as db:
+        service = AIActionSnapshotService(db)
+
+        fresh, fingerprint = await service.is_fresh(
+            ad_account_id=ad_account_id,
+            as_of_date=as_of_date,
+        )
+        if fresh and not force:
+            stats["skipped"] += 1
+            return
+
+        await service.compute_and_store(
+            ad_account_id=ad_account_id,
+            as_of_date=as_of_date,
+            fingerprint=fingerprint,
+        )
+        stats["computed"] += 1
+
+
+async def precompute_all(
+    *,
+    as_of_date: date,
+    workers: int = 4,
+    force: bool = False,
+    ad_account_ids: Optional[Collection[UUID]] = None,
+) -> Dict[str, int]:
+    started = time.perf_counter()
+    account_ids = await _get_selected_account_ids()
+
+    if ad_account_ids is not None:
+        wanted = set(ad_account_ids)
+        account_ids = [account_id for account_id in account_ids if account_id in wanted]
+
+    stats = {"accounts": len(account_ids), "computed": 0, "skipped": 0, "failed": 0}
+    semaphore = asyncio.Semaphore(max(1, workers))
+
+    async def run(ad_account_id: UUID) -> None:
+        async with semaphore:
+            try:
+                await _precompute_account(
+                    ad_account_id,
+                    as_of_date,
+                    force=force,
+                    stats=stats,
+                )
+            except Exception as exc:
+                stats["failed"] += 1
+                logger.error("Account %s failed → %r", ad_account_id, exc)
+
+    await asyncio.gather(*[run(ad_account_id) for ad_account_id in account_ids])
+
+    logger.info(
+        "Precompute %s finished in %.1fs: %s",
+        as_of_date,
+        time.perf_counter() - started,
+        stats,
+    )
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--as-of-date",
+        type=date.fromisoformat,
+        default=None,
+        help="Snapshot date (default: today, UTC)",
+    )
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Recompute even when the stored snapshot is current",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(
+        precompute_all(
+            as_of_date=args.as_of_date or datetime.utcnow().date(),
+            workers=args.workers,
+            force=args.force,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
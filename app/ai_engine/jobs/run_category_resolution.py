@@ -1,13 +1,13 @@
 import asyncio
 
-from app.core.db_session import AsyncSessionLocal
+from app.core.db_session import BatchSessionLocal
 from app.ai_engine.services.category_resolution_service import (
     CategoryResolutionService,
 )
 
 
 async def main():
-    async with AsyncSessionLocal() as db:
+    async with BatchSessionLocal() as db:
         service = CategoryResolutionService(db)
         result = await service.run()
         print("Category resolution job completed:", result)
@@ -0,0 +1,108 @@
+from sqlalchemy import (
+    String,
+    Integer,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+)
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import date, datetime
+import uuid
+
+from app.core.database import Base
+
+
+# =========================================================
+# PRECOMPUTED AI ACTION SETS (PHASE 21)
+# =========================================================
+class AIActionSnapshot(Base):
+    """
+    Materialized AIDecisionRunner output for one ad account.
+
+    One row = one ad account × one as_of_date × one rule version.
+
+    Written by the precompute job (and by on-demand recompute when
+    inputs_fingerprint no longer matches the live inputs); read by
+    GET /ai/actions.
+    """
+
+    __tablename__ = "ai_action_snapshots"
+
+    # -------------------------
+    # IDENTITY
+    # -------------------------
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+
+    # -------------------------
+    # KEY
+    # -------------------------
+    ad_account_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("meta_ad_accounts.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    as_of_date: Mapped[date] = mapped_column(
+        Date,
+        nullable=False,
+    )
+
+    rule_version: Mapped[str] = mapped_column(
+        String,
+        nullable=False,
+    )
+
+    # -------------------------
+    # PAYLOAD
+    # -------------------------
+    action_sets: Mapped[list] = mapped_column(
+        JSONB,
+        nullable=False,
+        doc="List[AIActionSet] in JSON mode",
+    )
+
+    inputs_fingerprint: Mapped[str] = mapped_column(
+        String,
+        nullable=False,
+        doc="md5 of the decision inputs at compute time",
+    )
+
+    campaign_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        doc="Campaigns with at least one action",
+    )
+
+    compute_ms: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    # -------------------------
+    # AUDIT
+    # -------------------------
+    computed_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False,
+    )
+
+
+# =========================================================
+# INDEXES
+# =========================================================
+Index(
+    "ux_ai_action_snapshots_account_date_version",
+    AIActionSnapshot.ad_account_id,
+    AIActionSnapshot.as_of_date,
+    AIActionSnapshot.rule_version,
+    unique=True,
+)
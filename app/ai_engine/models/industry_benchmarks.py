@@ -171,3 +171,9 @@ Index(
     IndustryBenchmark.as_of_date,
     unique=True,
 )
+
+# MAX(updated_at): AI action snapshot inputs fingerprint
+Index(
+    "ix_industry_benchmark_updated_at",
+    IndustryBenchmark.updated_at,
+)
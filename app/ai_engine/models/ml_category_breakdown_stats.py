@@ -147,3 +147,9 @@ Index(
     MLCategoryBreakdownStat.device,
     unique=True,
 )
+
+# MAX(last_updated_at): AI action snapshot inputs fingerprint
+Index(
+    "ix_ml_category_breakdown_stats_last_updated_at",
+    MLCategoryBreakdownStat.last_updated_at,
+)
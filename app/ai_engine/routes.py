@@ -9,7 +9,9 @@ from app.core.db_session import get_db
 from app.auth.dependencies import get_session_context, require_user
 from app.users.models import User
 
-from app.ai_engine.decision_engine.decision_runner import AIDecisionRunner
+from app.ai_engine.services.ai_action_snapshot_service import (
+    AIActionSnapshotService,
+)
 from app.ai_engine.models.action_models import AIActionSet
 from app.ai_engine.models.ml_action_outcomes import MLActionOutcome
 from app.ai_engine.models.ml_campaign_features import MLCampaignFeatures
@@ -46,6 +48,9 @@ async def list_ai_actions(
     AI Actions
     - STRICT selected ad account only
     - ZERO user-wide leakage
+    - Served from ai_action_snapshots; when the snapshot is missing or
+      its inputs changed, this GET recomputes it and COMMITS the upsert
+      (AIActionSnapshotService.get_action_sets)
     """
 
     ad_account = session["ad_account"]
@@ -53,9 +58,7 @@ async def list_ai_actions(
     if not ad_account:
         return []
 
-    runner = AIDecisionRunner()
-    return await runner.run_for_ad_account(
-        db=db,
+    return await AIActionSnapshotService(db).get_action_sets(
         ad_account_id=UUID(ad_account["id"]),
     )
 
@@ -12,7 +12,9 @@ from app.users.models import User
 from app.meta_api.models import MetaAdAccount, UserMetaAdAccount
 from app.campaigns.models import Campaign
 
-from app.ai_engine.decision_engine.decision_runner import AIDecisionRunner
+from app.ai_engine.services.ai_action_snapshot_service import (
+    AIActionSnapshotService,
+)
 from app.ai_engine.models.action_models import (
     AIActionSet,
     ActionApprovalStatus,
@@ -88,11 +90,10 @@ async def list_ai_actions(
             detail=e.to_dict(),
         )
 
-    # === run AI engine ===
-    runner = AIDecisionRunner()
-    action_sets = await runner.run_for_user(
-        db=db,
-        user_id=user.id,
+    # === precomputed AI action sets (recomputed only if inputs changed) ===
+    # A recompute upserts ai_action_snapshots and COMMITS inside this GET
+    action_sets = await AIActionSnapshotService(db).get_action_sets(
+        ad_account_id=selected_ad_account_id,
     )
 
     filtered_sets: List[AIActionSet] = []
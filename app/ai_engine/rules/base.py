@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 from sqlalchemy import select
@@ -15,6 +15,10 @@ from app.ai_engine.models.ai_action_feedback import (
     AIActionFeedback,
     ActionApprovalStatus,
 )
+from app.ai_engine.decision_engine.decision_context import (
+    DecisionContext,
+    DecisionContextLoader,
+)
 
 
 class BaseRule(ABC):
@@ -24,6 +28,10 @@ class BaseRule(ABC):
     Phase 12:
     - Feedback-weighted confidence
     - Trust-aware rule calibration
+
+    Phase 21:
+    - Rules read from the DecisionContext in ai_context["decision_context"]
+      (prefetched once per ad account by the decision runner)
     """
 
     # -----------------------------------------
@@ -79,6 +87,27 @@ class BaseRule(ABC):
         )
         return action
 
+    # -----------------------------------------
+    # PHASE 21 — PREFETCHED DECISION CONTEXT
+    # -----------------------------------------
+    async def get_decision_context(
+        self,
+        *,
+        db: AsyncSession,
+        campaign,
+        ai_context: Dict,
+    ) -> DecisionContext:
+        """
+        Snapshot prefetched by the runner; loaded for this single
+        campaign when a rule is evaluated on its own.
+        """
+
+        context = ai_context.get("decision_context")
+        if context is None:
+            context = await DecisionContextLoader(db).load([campaign])
+            ai_context["decision_context"] = context
+        return context
+
     # -----------------------------------------
     # PHASE 12 — FEEDBACK-WEIGHTED CONFIDENCE
     # -----------------------------------------
@@ -89,11 +118,25 @@ class BaseRule(ABC):
         base_score: float,
         campaign_id,
         action_type: str,
+        context: Optional[DecisionContext] = None,
     ) -> ConfidenceScore:
         """
         Adjust confidence using historical approval + helpful feedback.
         """
 
+        if context is not None:
+            counts = context.feedback_counts(
+                campaign_id,
+                self.rule_name,
+                action_type,
+            )
+            return self._calibrate_from_counts(
+                base_score=base_score,
+                has_feedback=counts is not None,
+                helpful_count=counts[0] if counts else 0,
+                unhelpful_count=counts[1] if counts else 0,
+            )
+
         stmt = select(AIActionFeedback).where(
             AIActionFeedback.campaign_id == campaign_id,
             AIActionFeedback.rule_name == self.rule_name,
@@ -104,23 +147,35 @@ class BaseRule(ABC):
         result = await db.execute(stmt)
         feedback_rows = result.scalars().all()
 
-        if not feedback_rows:
+        return self._calibrate_from_counts(
+            base_score=base_score,
+            has_feedback=bool(feedback_rows),
+            helpful_count=len([f for f in feedback_rows if f.is_helpful is True]),
+            unhelpful_count=len([f for f in feedback_rows if f.is_helpful is False]),
+        )
+
+    def _calibrate_from_counts(
+        self,
+        *,
+        base_score: float,
+        has_feedback: bool,
+        helpful_count: int,
+        unhelpful_count: int,
+    ) -> ConfidenceScore:
+        if not has_feedback:
             return ConfidenceScore(
                 score=base_score,
                 reason="No historical feedback; base confidence used",
             )
 
-        helpful = [f for f in feedback_rows if f.is_helpful is True]
-        unhelpful = [f for f in feedback_rows if f.is_helpful is False]
-
-        total = len(helpful) + len(unhelpful)
+        total = helpful_count + unhelpful_count
         if total == 0:
             return ConfidenceScore(
                 score=base_score,
                 reason="No helpfulness signal; base confidence used",
             )
 
-        helpful_ratio = len(helpful) / total
+        helpful_ratio = helpful_count / total
 
         calibrated_score = round(
             min(1.0, max(0.0, base_score * (0.7 + helpful_ratio))),
@@ -1,4 +1,5 @@
-from typing import List, Dict
+from typing import List, Dict, Tuple
+from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -14,19 +15,33 @@ from app.ai_engine.models.action_models import (
 
 
 # =========================================================
-# BEST CREATIVE RULE
+# SHARED — BEST 7D BREAKDOWN SLICE
 # =========================================================
-class BestCreativeRule(BaseRule):
+class BestBreakdownRule(BaseRule):
     """
-    Phase 9.3.3 — Best Creative Intelligence
+    Picks the best 7D slice on DIMENSIONS
+    (roas DESC, cpl ASC[, ctr DESC], NULLS LAST) and fires when it
+    has enough volume.
 
-    Uses:
-    - campaign_breakdown_aggregates
-    - 7D window
+    The class attributes are also read by the vectorized engine.
     """
 
-    MIN_IMPRESSIONS = 500
-    MIN_CONVERSIONS = 3
+    # A slice qualifies when ANY of these is NOT NULL
+    DIMENSIONS: Tuple[str, ...] = ()
+    RANK_BY_CTR = False
+    REQUIRES_CAMPAIGN_DATA = False
+
+    MIN_IMPRESSIONS = 300
+    MIN_CONVERSIONS = 0
+
+    def includes(self, row: Dict) -> bool:
+        return any(row[dim] is not None for dim in self.DIMENSIONS)
+
+    def has_volume(self, row: Dict) -> bool:
+        return (
+            row["impressions"] >= self.MIN_IMPRESSIONS
+            and row["conversions"] >= self.MIN_CONVERSIONS
+        )
 
     async def evaluate(
         self,
@@ -36,209 +51,140 @@ class BestCreativeRule(BaseRule):
         ai_context: Dict,
     ) -> List[AIAction]:
 
-        if ai_context.get("status") == "insufficient_data":
+        if (
+            self.REQUIRES_CAMPAIGN_DATA
+            and ai_context.get("status") == "insufficient_data"
+        ):
             return []
 
-        result = await db.execute(
-            """
-            SELECT
-                creative_id,
-                impressions,
-                conversions,
-                roas,
-                cpl,
-                ctr
-            FROM campaign_breakdown_aggregates
-            WHERE campaign_id = :campaign_id
-              AND window_type = '7d'
-              AND creative_id IS NOT NULL
-            ORDER BY
-                roas DESC NULLS LAST,
-                cpl ASC NULLS LAST,
-                ctr DESC NULLS LAST
-            LIMIT 1
-            """,
-            {"campaign_id": str(campaign.id)},
+        context = await self.get_decision_context(
+            db=db,
+            campaign=campaign,
+            ai_context=ai_context,
+        )
+        best = context.best_breakdown(
+            campaign.id,
+            include=self.includes,
+            by_ctr=self.RANK_BY_CTR,
         )
-        best = result.first()
 
-        if not best:
+        if not best or not self.has_volume(best):
             return []
 
-        if best.impressions < self.MIN_IMPRESSIONS or best.conversions < self.MIN_CONVERSIONS:
-            return []
+        return [self.build_action(campaign.id, best)]
 
-        metric = "roas" if best.roas is not None else "cpl"
-        value = best.roas if best.roas is not None else best.cpl
-
-        return [
-            AIAction(
-                campaign_id=campaign.id,
-                action_type=AIActionType.SHIFT_CREATIVE,
-                summary="One creative is clearly outperforming others.",
-                breakdowns=[
-                    BreakdownEvidence(
-                        dimension="creative_id",
-                        key=best.creative_id,
-                        metrics=[
-                            MetricEvidence(
-                                metric=metric,
-                                window="7D",
-                                value=round(float(value), 3),
-                            )
-                        ],
-                    )
-                ],
-                confidence=ConfidenceScore(
-                    score=0.85,
-                    reason="High efficiency with sufficient volume over 7 days.",
-                ),
-            )
-        ]
+    def build_action(self, campaign_id: UUID, best: Dict) -> AIAction:
+        raise NotImplementedError
+
+    def _best_metric(self, best: Dict) -> MetricEvidence:
+        metric = "roas" if best["roas"] is not None else "cpl"
+        value = best["roas"] if best["roas"] is not None else best["cpl"]
+
+        return MetricEvidence(
+            metric=metric,
+            window="7D",
+            value=round(float(value), 3),
+        )
 
 
 # =========================================================
-# BEST PLACEMENT RULE
+# BEST CREATIVE RULE
 # =========================================================
-class BestPlacementRule(BaseRule):
+class BestCreativeRule(BestBreakdownRule):
     """
-    Phase 9.3.3 — Best Placement Intelligence
+    Phase 9.3.3 — Best Creative Intelligence
+
+    Uses:
+    - campaign_breakdown_aggregates
+    - 7D window
     """
 
-    async def evaluate(
-        self,
-        *,
-        db: AsyncSession,
-        campaign: Campaign,
-        ai_context: Dict,
-    ) -> List[AIAction]:
+    DIMENSIONS = ("creative_id",)
+    RANK_BY_CTR = True
+    REQUIRES_CAMPAIGN_DATA = True
+
+    MIN_IMPRESSIONS = 500
+    MIN_CONVERSIONS = 3
 
-        result = await db.execute(
-            """
-            SELECT
-                placement,
-                impressions,
-                conversions,
-                roas,
-                cpl
-            FROM campaign_breakdown_aggregates
-            WHERE campaign_id = :campaign_id
-              AND window_type = '7d'
-              AND placement IS NOT NULL
-            ORDER BY
-                roas DESC NULLS LAST,
-                cpl ASC NULLS LAST
-            LIMIT 1
-            """,
-            {"campaign_id": str(campaign.id)},
+    def build_action(self, campaign_id: UUID, best: Dict) -> AIAction:
+        return AIAction(
+            campaign_id=campaign_id,
+            action_type=AIActionType.SHIFT_CREATIVE,
+            summary="One creative is clearly outperforming others.",
+            breakdowns=[
+                BreakdownEvidence(
+                    dimension="creative_id",
+                    key=best["creative_id"],
+                    metrics=[self._best_metric(best)],
+                )
+            ],
+            confidence=ConfidenceScore(
+                score=0.85,
+                reason="High efficiency with sufficient volume over 7 days.",
+            ),
         )
-        best = result.first()
 
-        if not best or best.impressions < 300:
-            return []
 
-        metric = "roas" if best.roas is not None else "cpl"
-        value = best.roas if best.roas is not None else best.cpl
-
-        return [
-            AIAction(
-                campaign_id=campaign.id,
-                action_type=AIActionType.SHIFT_PLACEMENT,
-                summary="A specific placement is outperforming others.",
-                breakdowns=[
-                    BreakdownEvidence(
-                        dimension="placement",
-                        key=best.placement,
-                        metrics=[
-                            MetricEvidence(
-                                metric=metric,
-                                window="7D",
-                                value=round(float(value), 3),
-                            )
-                        ],
-                    )
-                ],
-                confidence=ConfidenceScore(
-                    score=0.78,
-                    reason="Consistent performance advantage by placement.",
-                ),
-            )
-        ]
+# =========================================================
+# BEST PLACEMENT RULE
+# =========================================================
+class BestPlacementRule(BestBreakdownRule):
+    """
+    Phase 9.3.3 — Best Placement Intelligence
+    """
+
+    DIMENSIONS = ("placement",)
+
+    def build_action(self, campaign_id: UUID, best: Dict) -> AIAction:
+        return AIAction(
+            campaign_id=campaign_id,
+            action_type=AIActionType.SHIFT_PLACEMENT,
+            summary="A specific placement is outperforming others.",
+            breakdowns=[
+                BreakdownEvidence(
+                    dimension="placement",
+                    key=best["placement"],
+                    metrics=[self._best_metric(best)],
+                )
+            ],
+            confidence=ConfidenceScore(
+                score=0.78,
+                reason="Consistent performance advantage by placement.",
+            ),
+        )
 
 
 # =========================================================
 # BEST AUDIENCE SEGMENT RULE
 # =========================================================
-class BestAudienceSegmentRule(BaseRule):
+class BestAudienceSegmentRule(BestBreakdownRule):
     """
     Phase 9.3.3 — Best Region / Age / Gender Intelligence
     """
 
-    async def evaluate(
-        self,
-        *,
-        db: AsyncSession,
-        campaign: Campaign,
-        ai_context: Dict,
-    ) -> List[AIAction]:
-
-        result = await db.execute(
-            """
-            SELECT
-                region,
-                age_group,
-                gender,
-                impressions,
-                conversions,
-                roas,
-                cpl
-            FROM campaign_breakdown_aggregates
-            WHERE campaign_id = :campaign_id
-              AND window_type = '7d'
-              AND (region IS NOT NULL OR age_group IS NOT NULL OR gender IS NOT NULL)
-            ORDER BY
-                roas DESC NULLS LAST,
-                cpl ASC NULLS LAST
-            LIMIT 1
-            """,
-            {"campaign_id": str(campaign.id)},
-        )
-        best = result.first()
-
-        if not best or best.impressions < 300:
-            return []
-
-        metric = "roas" if best.roas is not None else "cpl"
-        value = best.roas if best.roas is not None else best.cpl
+    DIMENSIONS = ("region", "age_group", "gender")
 
+    def build_action(self, campaign_id: UUID, best: Dict) -> AIAction:
         key = " / ".join(
             filter(
                 None,
-                [best.region, best.age_group, best.gender],
+                [best["region"], best["age_group"], best["gender"]],
             )
         )
 
-        return [
-            AIAction(
-                campaign_id=campaign.id,
-                action_type=AIActionType.SHIFT_AUDIENCE,
-                summary="A specific audience segment is outperforming others.",
-                breakdowns=[
-                    BreakdownEvidence(
-                        dimension="audience_segment",
-                        key=key,
-                        metrics=[
-                            MetricEvidence(
-                                metric=metric,
-                                window="7D",
-                                value=round(float(value), 3),
-                            )
-                        ],
-                    )
-                ],
-                confidence=ConfidenceScore(
-                    score=0.75,
-                    reason="Audience segment shows better efficiency over last 7 days.",
-                ),
-            )
-        ]
+        return AIAction(
+            campaign_id=campaign_id,
+            action_type=AIActionType.SHIFT_AUDIENCE,
+            summary="A specific audience segment is outperforming others.",
+            breakdowns=[
+                BreakdownEvidence(
+                    dimension="audience_segment",
+                    key=key,
+                    metrics=[self._best_metric(best)],
+                )
+            ],
+            confidence=ConfidenceScore(
+                score=0.75,
+                reason="Audience segment shows better efficiency over last 7 days.",
+            ),
+        )
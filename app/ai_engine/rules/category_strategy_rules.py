@@ -1,7 +1,6 @@
 from typing import List
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
 
 from app.campaigns.models import Campaign
 from app.ai_engine.rules.base import BaseRule
@@ -12,9 +11,9 @@ from app.ai_engine.models.action_models import (
     MetricEvidence,
     ConfidenceScore,
 )
-from app.ai_engine.models.campaign_category_map import CampaignCategoryMap
-from app.ai_engine.models.ml_category_breakdown_stats import (
-    MLCategoryBreakdownStat,
+from app.ai_engine.decision_engine.decision_context import (
+    CATEGORY_MAX_RECOMMENDATIONS,
+    CATEGORY_MIN_CONFIDENCE,
 )
 
 
@@ -28,8 +27,8 @@ class CategoryStrategyRule(BaseRule):
     - Informational only
     """
 
-    MIN_CONFIDENCE = 0.70
-    MAX_RECOMMENDATIONS = 3
+    MIN_CONFIDENCE = CATEGORY_MIN_CONFIDENCE
+    MAX_RECOMMENDATIONS = CATEGORY_MAX_RECOMMENDATIONS
 
     async def evaluate(
         self,
@@ -42,35 +41,23 @@ class CategoryStrategyRule(BaseRule):
         # --------------------------------------------------
         # Resolve campaign category
         # --------------------------------------------------
-        result = await db.execute(
-            select(CampaignCategoryMap).where(
-                CampaignCategoryMap.campaign_id == campaign.id
-            )
+        context = await self.get_decision_context(
+            db=db,
+            campaign=campaign,
+            ai_context=ai_context,
         )
-        category_map = result.scalar_one_or_none()
+        category_map = context.categories.get(campaign.id)
 
-        if not category_map or category_map.confidence_score < self.MIN_CONFIDENCE:
+        if not category_map or category_map["confidence_score"] < self.MIN_CONFIDENCE:
             return []
 
-        category = category_map.final_category
+        category = category_map["final_category"]
 
         # --------------------------------------------------
-        # Fetch top-performing category breakdowns
+        # Top-performing category breakdowns (prefetched,
+        # ranked by avg_roas, confidence_score)
         # --------------------------------------------------
-        result = await db.execute(
-            select(MLCategoryBreakdownStat)
-            .where(
-                MLCategoryBreakdownStat.business_category == category,
-                MLCategoryBreakdownStat.confidence_score >= self.MIN_CONFIDENCE,
-            )
-            .order_by(
-                desc(MLCategoryBreakdownStat.avg_roas),
-                desc(MLCategoryBreakdownStat.confidence_score),
-            )
-            .limit(self.MAX_RECOMMENDATIONS)
-        )
-
-        rows = result.scalars().all()
+        rows = context.category_stats.get(category, [])
         if not rows:
             return []
 
@@ -1,10 +1,11 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
+from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
 
 from app.campaigns.models import Campaign
 from app.ai_engine.rules.base import BaseRule
+from app.ai_engine.decision_engine.decision_context import DecisionContext
 from app.ai_engine.models.action_models import (
     AIAction,
     AIActionType,
@@ -24,6 +25,14 @@ class LeadPerformanceDropRule(BaseRule):
     - Feedback-weighted confidence
     """
 
+    OBJECTIVES = (
+        "LEAD",
+        "LEAD_GENERATION",
+        "OUTCOME_LEADS",
+        "MESSAGES",
+        "TRAFFIC",
+    )
+
     CTR_DROP_THRESHOLD = 0.8        # 20% drop vs self baseline
     CPL_INCREASE_THRESHOLD = 25.0   # % increase vs self baseline
     BENCHMARK_CPL_DELTA = 1.20      # 20% worse than industry avg
@@ -39,13 +48,7 @@ class LeadPerformanceDropRule(BaseRule):
         # -------------------------------------------------
         # Eligibility
         # -------------------------------------------------
-        if campaign.objective.upper() not in (
-            "LEAD",
-            "LEAD_GENERATION",
-            "OUTCOME_LEADS",
-            "MESSAGES",
-            "TRAFFIC",
-        ):
+        if campaign.objective.upper() not in self.OBJECTIVES:
             return []
 
         if ai_context.get("status") == "insufficient_data":
@@ -72,40 +75,18 @@ class LeadPerformanceDropRule(BaseRule):
         # -------------------------------------------------
         # INDUSTRY BENCHMARK
         # -------------------------------------------------
-        benchmark_result = await db.execute(
-            text(
-                """
-                SELECT avg_cpl
-                FROM industry_benchmarks
-                WHERE category = (
-                    SELECT category
-                    FROM campaign_category_map
-                    WHERE campaign_id = :campaign_id
-                )
-                  AND objective_type = :objective
-                  AND window_type = '7d'
-                ORDER BY as_of_date DESC
-                LIMIT 1
-                """
-            ),
-            {
-                "campaign_id": str(campaign.id),
-                "objective": campaign.objective,
-            },
+        context = await self.get_decision_context(
+            db=db,
+            campaign=campaign,
+            ai_context=ai_context,
         )
-
-        benchmark_row = benchmark_result.fetchone()
+        benchmark_row = context.benchmark(campaign.id, "7d", campaign.objective)
         benchmark_cpl = (
-            float(benchmark_row.avg_cpl)
-            if benchmark_row and benchmark_row.avg_cpl
+            float(benchmark_row["avg_cpl"])
+            if benchmark_row and benchmark_row["avg_cpl"]
             else None
         )
 
-        worse_than_benchmark = (
-            benchmark_cpl
-            and short_cpl > benchmark_cpl * self.BENCHMARK_CPL_DELTA
-        )
-
         # -------------------------------------------------
         # Decision logic
         # -------------------------------------------------
@@ -113,91 +94,138 @@ class LeadPerformanceDropRule(BaseRule):
             ctr_ratio < self.CTR_DROP_THRESHOLD
             and cpl_change_pct >= self.CPL_INCREASE_THRESHOLD
         ):
-            reason = "Lead efficiency dropped compared to 30-day baseline."
-            base_confidence = 0.75
-
-            explain_steps = [
-                f"7D CTR = {round(short_ctr, 4)}",
-                f"30D CTR = {round(long_ctr, 4)}",
-                f"CTR change = {round((ctr_ratio - 1) * 100, 2)}%",
-                f"7D CPL = {round(short_cpl, 2)}",
-                f"30D CPL = {round(long_cpl, 2)}",
-                f"CPL change = {round(cpl_change_pct, 2)}%",
+            return [
+                await self.build_action(
+                    db=db,
+                    campaign_id=campaign.id,
+                    short_ctr=short_ctr,
+                    long_ctr=long_ctr,
+                    short_cpl=short_cpl,
+                    long_cpl=long_cpl,
+                    fatigue=bool(signals.get("fatigue")),
+                    benchmark_cpl=benchmark_cpl,
+                    context=context,
+                )
             ]
 
-            if signals.get("fatigue"):
-                reason += " Fatigue signal detected."
-                base_confidence += 0.05
-                explain_steps.append("Fatigue detected from CTR trend")
+        return []
 
-            if worse_than_benchmark:
-                reason += " Performance is worse than industry benchmark."
-                base_confidence += 0.10
-                explain_steps.append(
-                    f"Industry benchmark CPL ≈ {round(benchmark_cpl, 2)}"
-                )
+    # -------------------------------------------------
+    # ACTION BUILDER (shared with the vectorized engine)
+    # -------------------------------------------------
+    def is_worse_than_benchmark(
+        self,
+        short_cpl: float,
+        benchmark_cpl: Optional[float],
+    ) -> bool:
+        return bool(
+            benchmark_cpl
+            and short_cpl > benchmark_cpl * self.BENCHMARK_CPL_DELTA
+        )
 
-            # -------------------------------------------------
-            # Phase 12 — Feedback-calibrated confidence
-            # -------------------------------------------------
-            calibrated_confidence = await self.calibrate_confidence(
-                db=db,
-                base_score=min(base_confidence, 0.95),
-                campaign_id=campaign.id,
-                action_type=AIActionType.REDUCE_BUDGET.value,
-            )
+    async def build_action(
+        self,
+        *,
+        db: Optional[AsyncSession],
+        campaign_id: UUID,
+        short_ctr: float,
+        long_ctr: float,
+        short_cpl: float,
+        long_cpl: float,
+        fatigue: bool,
+        benchmark_cpl: Optional[float],
+        context: Optional[DecisionContext] = None,
+    ) -> AIAction:
+        """
+        Builds the REDUCE_BUDGET action for a campaign that fired.
+        """
 
-            action = AIAction(
-                campaign_id=campaign.id,
-                action_type=AIActionType.REDUCE_BUDGET,
-                summary=(
-                    "Reduce budget: CPL increased and CTR dropped "
-                    "relative to historical and industry benchmarks."
-                ),
-                metrics=[
-                    MetricEvidence(
-                        metric="ctr",
-                        window="7D",
-                        value=round(short_ctr, 4),
-                        baseline=round(long_ctr, 4),
-                        delta_pct=round((ctr_ratio - 1) * 100, 2),
-                        source="campaign",
-                    ),
-                    MetricEvidence(
-                        metric="cpl",
-                        window="7D",
-                        value=round(short_cpl, 2),
-                        baseline=round(long_cpl, 2),
-                        delta_pct=round(cpl_change_pct, 2),
-                        source="campaign",
-                    ),
-                    *(
-                        [
-                            MetricEvidence(
-                                metric="industry_cpl",
-                                window="7D",
-                                value=round(benchmark_cpl, 2),
-                                source="industry",
-                            )
-                        ]
-                        if benchmark_cpl
-                        else []
-                    ),
-                ],
-                confidence=calibrated_confidence,
+        ctr_ratio = short_ctr / long_ctr if long_ctr else 1.0
+        cpl_change_pct = ((short_cpl - long_cpl) / long_cpl) * 100
+        worse_than_benchmark = self.is_worse_than_benchmark(short_cpl, benchmark_cpl)
+
+        reason = "Lead efficiency dropped compared to 30-day baseline."
+        base_confidence = 0.75
+
+        explain_steps = [
+            f"7D CTR = {round(short_ctr, 4)}",
+            f"30D CTR = {round(long_ctr, 4)}",
+            f"CTR change = {round((ctr_ratio - 1) * 100, 2)}%",
+            f"7D CPL = {round(short_cpl, 2)}",
+            f"30D CPL = {round(long_cpl, 2)}",
+            f"CPL change = {round(cpl_change_pct, 2)}%",
+        ]
+
+        if fatigue:
+            reason += " Fatigue signal detected."
+            base_confidence += 0.05
+            explain_steps.append("Fatigue detected from CTR trend")
+
+        if worse_than_benchmark:
+            reason += " Performance is worse than industry benchmark."
+            base_confidence += 0.10
+            explain_steps.append(
+                f"Industry benchmark CPL ≈ {round(benchmark_cpl, 2)}"
             )
 
-            return [
-                self.attach_explainability(
-                    action,
-                    steps=explain_steps,
-                    benchmark_used=bool(benchmark_cpl),
-                    trust_note=(
-                        "Confirmed by industry benchmark"
-                        if worse_than_benchmark
-                        else "Based on campaign performance trend"
-                    ),
-                )
-            ]
+        # -------------------------------------------------
+        # Phase 12 — Feedback-calibrated confidence
+        # -------------------------------------------------
+        calibrated_confidence = await self.calibrate_confidence(
+            db=db,
+            base_score=min(base_confidence, 0.95),
+            campaign_id=campaign_id,
+            action_type=AIActionType.REDUCE_BUDGET.value,
+            context=context,
+        )
 
-        return []
+        action = AIAction(
+            campaign_id=campaign_id,
+            action_type=AIActionType.REDUCE_BUDGET,
+            summary=(
+                "Reduce budget: CPL increased and CTR dropped "
+                "relative to historical and industry benchmarks."
+            ),
+            metrics=[
+                MetricEvidence(
+                    metric="ctr",
+                    window="7D",
+                    value=round(short_ctr, 4),
+                    baseline=round(long_ctr, 4),
+                    delta_pct=round((ctr_ratio - 1) * 100, 2),
+                    source="campaign",
+                ),
+                MetricEvidence(
+                    metric="cpl",
+                    window="7D",
+                    value=round(short_cpl, 2),
+                    baseline=round(long_cpl, 2),
+                    delta_pct=round(cpl_change_pct, 2),
+                    source="campaign",
+                ),
+                *(
+                    [
+                        MetricEvidence(
+                            metric="industry_cpl",
+                            window="7D",
+                            value=round(benchmark_cpl, 2),
+                            source="industry",
+                        )
+                    ]
+                    if benchmark_cpl
+                    else []
+                ),
+            ],
+            confidence=calibrated_confidence,
+        )
+
+        return self.attach_explainability(
+            action,
+            steps=explain_steps,
+            benchmark_used=bool(benchmark_cpl),
+            trust_note=(
+                "Confirmed by industry benchmark"
+                if worse_than_benchmark
+                else "Based on campaign performance trend"
+            ),
+        )
@@ -1,10 +1,11 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
+from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
 
 from app.campaigns.models import Campaign
 from app.ai_engine.rules.base import BaseRule
+from app.ai_engine.decision_engine.decision_context import DecisionContext
 from app.ai_engine.models.action_models import (
     AIAction,
     AIActionType,
@@ -23,6 +24,12 @@ class SalesROASDropRule(BaseRule):
     - Feedback-weighted confidence
     """
 
+    OBJECTIVES = (
+        "SALES",
+        "CONVERSIONS",
+        "OUTCOME_SALES",
+    )
+
     MIN_PROFITABLE_ROAS = 1.2
     ROAS_DROP_THRESHOLD = 0.75        # 25% drop vs self baseline
     BENCHMARK_ROAS_DELTA = 0.80       # 20% worse than industry avg
@@ -38,11 +45,7 @@ class SalesROASDropRule(BaseRule):
         # -------------------------------------------------
         # Eligibility
         # -------------------------------------------------
-        if campaign.objective.upper() not in (
-            "SALES",
-            "CONVERSIONS",
-            "OUTCOME_SALES",
-        ):
+        if campaign.objective.upper() not in self.OBJECTIVES:
             return []
 
         if ai_context.get("status") == "insufficient_data":
@@ -66,40 +69,18 @@ class SalesROASDropRule(BaseRule):
         # -------------------------------------------------
         # INDUSTRY BENCHMARK
         # -------------------------------------------------
-        benchmark_result = await db.execute(
-            text(
-                """
-                SELECT avg_roas
-                FROM industry_benchmarks
-                WHERE category = (
-                    SELECT category
-                    FROM campaign_category_map
-                    WHERE campaign_id = :campaign_id
-                )
-                  AND objective_type = :objective
-                  AND window_type = '7d'
-                ORDER BY as_of_date DESC
-                LIMIT 1
-                """
-            ),
-            {
-                "campaign_id": str(campaign.id),
-                "objective": campaign.objective,
-            },
+        context = await self.get_decision_context(
+            db=db,
+            campaign=campaign,
+            ai_context=ai_context,
         )
-
-        benchmark_row = benchmark_result.fetchone()
+        benchmark_row = context.benchmark(campaign.id, "7d", campaign.objective)
         benchmark_roas = (
-            float(benchmark_row.avg_roas)
-            if benchmark_row and benchmark_row.avg_roas
+            float(benchmark_row["avg_roas"])
+            if benchmark_row and benchmark_row["avg_roas"]
             else None
         )
 
-        worse_than_benchmark = (
-            benchmark_roas
-            and short_roas < benchmark_roas * self.BENCHMARK_ROAS_DELTA
-        )
-
         # -------------------------------------------------
         # Decision logic
         # -------------------------------------------------
@@ -107,80 +88,122 @@ class SalesROASDropRule(BaseRule):
             short_roas < self.MIN_PROFITABLE_ROAS
             and roas_ratio < self.ROAS_DROP_THRESHOLD
         ):
-            reason = "ROAS dropped compared to 30-day baseline."
-            base_confidence = 0.75
-
-            explain_steps = [
-                f"7D ROAS = {round(short_roas, 3)}",
-                f"30D ROAS = {round(long_roas, 3)}",
-                f"ROAS change = {round((roas_ratio - 1) * 100, 2)}%",
+            return [
+                await self.build_action(
+                    db=db,
+                    campaign_id=campaign.id,
+                    short_roas=short_roas,
+                    long_roas=long_roas,
+                    decay=bool(signals.get("decay")),
+                    benchmark_roas=benchmark_roas,
+                    context=context,
+                )
             ]
 
-            if signals.get("decay"):
-                reason += " Performance decay detected."
-                base_confidence += 0.05
-                explain_steps.append("Decay signal detected from trend")
+        return []
 
-            if worse_than_benchmark:
-                reason += " Campaign underperforms industry benchmark."
-                base_confidence += 0.10
-                explain_steps.append(
-                    f"Industry benchmark ROAS ≈ {round(benchmark_roas, 3)}"
-                )
+    # -------------------------------------------------
+    # ACTION BUILDER (shared with the vectorized engine)
+    # -------------------------------------------------
+    def is_worse_than_benchmark(
+        self,
+        short_roas: float,
+        benchmark_roas: Optional[float],
+    ) -> bool:
+        return bool(
+            benchmark_roas
+            and short_roas < benchmark_roas * self.BENCHMARK_ROAS_DELTA
+        )
 
-            # -------------------------------------------------
-            # Phase 12 — Feedback-calibrated confidence
-            # -------------------------------------------------
-            calibrated_confidence = await self.calibrate_confidence(
-                db=db,
-                base_score=min(base_confidence, 0.95),
-                campaign_id=campaign.id,
-                action_type=AIActionType.REDUCE_BUDGET.value,
-            )
+    async def build_action(
+        self,
+        *,
+        db: Optional[AsyncSession],
+        campaign_id: UUID,
+        short_roas: float,
+        long_roas: float,
+        decay: bool,
+        benchmark_roas: Optional[float],
+        context: Optional[DecisionContext] = None,
+    ) -> AIAction:
+        """
+        Builds the REDUCE_BUDGET action for a campaign that fired.
+        """
 
-            action = AIAction(
-                campaign_id=campaign.id,
-                action_type=AIActionType.REDUCE_BUDGET,
-                summary=(
-                    "Reduce budget: ROAS declined below profitable levels "
-                    "relative to historical and industry benchmarks."
-                ),
-                metrics=[
-                    MetricEvidence(
-                        metric="roas",
-                        window="7D",
-                        value=round(short_roas, 3),
-                        baseline=round(long_roas, 3),
-                        delta_pct=round((roas_ratio - 1) * 100, 2),
-                        source="campaign",
-                    ),
-                    *(
-                        [
-                            MetricEvidence(
-                                metric="industry_roas",
-                                window="7D",
-                                value=round(benchmark_roas, 3),
-                                source="industry",
-                            )
-                        ]
-                        if benchmark_roas
-                        else []
-                    ),
-                ],
-                confidence=calibrated_confidence,
+        roas_ratio = short_roas / long_roas if long_roas else 1.0
+        worse_than_benchmark = self.is_worse_than_benchmark(short_roas, benchmark_roas)
+
+        reason = "ROAS dropped compared to 30-day baseline."
+        base_confidence = 0.75
+
+        explain_steps = [
+            f"7D ROAS = {round(short_roas, 3)}",
+            f"30D ROAS = {round(long_roas, 3)}",
+            f"ROAS change = {round((roas_ratio - 1) * 100, 2)}%",
+        ]
+
+        if decay:
+            reason += " Performance decay detected."
+            base_confidence += 0.05
+            explain_steps.append("Decay signal detected from trend")
+
+        if worse_than_benchmark:
+            reason += " Campaign underperforms industry benchmark."
+            base_confidence += 0.10
+            explain_steps.append(
+                f"Industry benchmark ROAS ≈ {round(benchmark_roas, 3)}"
             )
 
-            return [
-                self.attach_explainability(
-                    action,
-                    steps=explain_steps,
-                    benchmark_used=bool(benchmark_roas),
-                    trust_note=(
-                        "Decision confirmed by industry benchmark"
-                        if worse_than_benchmark
-                        else "Decision based on campaign performance trend"
-                    ),
-                )
-            ]
+        # -------------------------------------------------
+        # Phase 12 — Feedback-calibrated confidence
+        # -------------------------------------------------
+        calibrated_confidence = await self.calibrate_confidence(
+            db=db,
+            base_score=min(base_confidence, 0.95),
+            campaign_id=campaign_id,
+            action_type=AIActionType.REDUCE_BUDGET.value,
+            context=context,
+        )
 
-        return []
+        action = AIAction(
+            campaign_id=campaign_id,
+            action_type=AIActionType.REDUCE_BUDGET,
+            summary=(
+                "Reduce budget: ROAS declined below profitable levels "
+                "relative to historical and industry benchmarks."
+            ),
+            metrics=[
+                MetricEvidence(
+                    metric="roas",
+                    window="7D",
+                    value=round(short_roas, 3),
+                    baseline=round(long_roas, 3),
+                    delta_pct=round((roas_ratio - 1) * 100, 2),
+                    source="campaign",
+                ),
+                *(
+                    [
+                        MetricEvidence(
+                            metric="industry_roas",
+                            window="7D",
+                            value=round(benchmark_roas, 3),
+                            source="industry",
+                        )
+                    ]
+                    if benchmark_roas
+                    else []
+                ),
+            ],
+            confidence=calibrated_confidence,
+        )
+
+        return self.attach_explainability(
+            action,
+            steps=explain_steps,
+            benchmark_used=bool(benchmark_roas),
+            trust_note=(
+                "Decision confirmed by industry benchmark"
+                if worse_than_benchmark
+                else "Decision based on campaign performance trend"
+            ),
+        )
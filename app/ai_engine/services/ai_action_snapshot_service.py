@@ -0,0 +1,314 @@
+"""
+AI Action Snapshot Service
+
+PHASE 21 — PRECOMPUTED AI ACTION SETS
+
+Purpose:
+- Materialize AIDecisionRunner output per
+  (ad account, as_of_date, rule version) into ai_action_snapshots
+- Serve GET /ai/actions from that table (one round trip: the
+  snapshot row plus its inputs fingerprint, see "Read cost")
+- Recompute on demand ONLY when the decision inputs changed since
+  the snapshot was computed (fingerprint mismatch) or no snapshot
+  exists yet for today
+
+Inputs fingerprint (md5, computed server-side) covers:
+- the account's campaigns (objective, AI flags, execution windows
+  and whether "now" is inside them)
+- updated_at of campaign / breakdown aggregates and category map
+- industry benchmarks and category breakdown stats
+- approval + helpfulness feedback of the account's campaigns and users
+
+Read cost (every GET): index lookups only. The account's campaigns,
+aggregates, category map and feedback rows (by ad_account_id /
+campaign_id / user_id), plus one backward index scan each for the
+global MAX(updated_at) of industry_benchmarks and MAX(last_updated_at)
+of ml_category_breakdown_stats (alembic a9c3e5f7b214). It grows with
+the account's campaigns and feedback, not with the fleet.
+"""
+
+import logging
+import time
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.ai_engine.decision_engine.decision_runner import (
+    AIDecisionRunner,
+    RULE_VERSION,
+)
+from app.ai_engine.models.action_models import AIActionSet
+
+logger = logging.getLogger(__name__)
+
+
+FINGERPRINT_SQL = """
+    WITH account_campaigns AS (
+        SELECT
+            id,
+            objective,
+            ai_active,
+            ai_execution_locked,
+            ai_execution_window_start,
+            ai_execution_window_end
+        FROM campaigns
+        WHERE ad_account_id = :ad_account_id
+          AND is_archived = FALSE
+    ),
+    account_users AS (
+        SELECT user_id
+        FROM user_meta_ad_accounts
+        WHERE meta_ad_account_id = :ad_account_id
+    )
+    SELECT md5(concat_ws('|',
+        (
+            SELECT string_agg(
+                concat_ws(',',
+                    id,
+                    objective,
+                    ai_active,
+                    ai_execution_locked,
+                    ai_execution_window_start,
+                    ai_execution_window_end,
+                    (ai_execution_window_start IS NULL
+                        OR ai_execution_window_start <= (now() AT TIME ZONE 'utc'))
+                    AND (ai_execution_window_end IS NULL
+                        OR ai_execution_window_end >= (now() AT TIME ZONE 'utc'))
+                ),
+                ';' ORDER BY id
+            )
+            FROM account_campaigns
+        ),
+        (
+            SELECT MAX(updated_at)
+            FROM campaign_metrics_aggregates
+            WHERE campaign_id IN (SELECT id FROM account_campaigns)
+        ),
+        (
+            SELECT MAX(updated_at)
+            FROM campaign_breakdown_aggregates
+            WHERE campaign_id IN (SELECT id FROM account_campaigns)
+        ),
+        (
+            SELECT MAX(updated_at)
+            FROM campaign_category_map
+            WHERE campaign_id IN (SELECT id FROM account_campaigns)
+        ),
+        (SELECT MAX(updated_at) FROM industry_benchmarks),
+        (SELECT MAX(last_updated_at) FROM ml_category_breakdown_stats),
+        (
+            SELECT concat_ws(',',
+                COUNT(*),
+                COUNT(*) FILTER (WHERE approval_status = 'APPROVED'),
+                COUNT(*) FILTER (WHERE approval_status = 'REJECTED'),
+                COUNT(*) FILTER (WHERE is_helpful IS TRUE),
+                COUNT(*) FILTER (WHERE is_helpful IS FALSE),
+                MAX(COALESCE(approved_at, created_at))
+            )
+            FROM ai_action_feedback
+            -- Two index lookups (campaign_id, user_id), not an OR scan
+            WHERE id IN (
+                SELECT id FROM ai_action_feedback
+                WHERE campaign_id IN (SELECT id FROM account_campaigns)
+                UNION
+                SELECT id FROM ai_action_feedback
+                WHERE user_id IN (SELECT user_id FROM account_users)
+            )
+        )
+    ))
+"""
+
+
+class AIActionSnapshotService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    # =========================================================
+    # READ PATH (GET /ai/actions)
+    # =========================================================
+    async def get_action_sets(
+        self,
+        *,
+        ad_account_id: UUID,
+        as_of_date: Optional[date] = None,
+    ) -> List[AIActionSet]:
+        """
+        Serves the stored snapshot when its inputs are unchanged,
+        otherwise recomputes and stores it first.
+
+        Read-only on a hit; a recompute commits the session (callers
+        are GET handlers, documented there).
+        """
+
+        as_of_date = as_of_date or datetime.utcnow().date()
+
+        # Snapshot + live fingerprint in one round trip
+        result = await self.db.execute(
+            text(
+                f"""
+                SELECT
+                    s.action_sets,
+                    s.inputs_fingerprint,
+                    ({FINGERPRINT_SQL}) AS live_fingerprint
+                FROM (SELECT 1) one
+                LEFT JOIN ai_action_snapshots s
+                    ON s.ad_account_id = :ad_account_id
+                   AND s.as_of_date = :as_of_date
+                   AND s.rule_version = :rule_version
+                """
+            ),
+            {
+                "ad_account_id": ad_account_id,
+                "as_of_date": as_of_date,
+                "rule_version": RULE_VERSION,
+            },
+        )
+        row = result.one()
+
+        if (
+            row.action_sets is not None
+            and row.inputs_fingerprint == row.live_fingerprint
+        ):
+            return [AIActionSet.model_validate(item) for item in row.action_sets]
+
+        action_sets, _ = await self.compute_and_store(
+            ad_account_id=ad_account_id,
+            as_of_date=as_of_date,
+            fingerprint=row.live_fingerprint,
+        )
+        return action_sets
+
+    # =========================================================
+    # WRITE PATH (PRECOMPUTE JOB + ON-DEMAND RECOMPUTE)
+    # =========================================================
+    async def is_fresh(
+        self,
+        *,
+        ad_account_id: UUID,
+        as_of_date: date,
+    ) -> Tuple[bool, str]:
+        """
+        Returns (snapshot is current, live fingerprint).
+        """
+
+        live_fingerprint = await self.get_fingerprint(ad_account_id)
+
+        result = await self.db.execute(
+            text(
+                """
+                SELECT inputs_fingerprint
+                FROM ai_action_snapshots
+                WHERE ad_account_id = :ad_account_id
+                  AND as_of_date = :as_of_date
+                  AND rule_version = :rule_version
+                """
+            ),
+            {
+                "ad_account_id": ad_account_id,
+                "as_of_date": as_of_date,
+                "rule_version": RULE_VERSION,
+            },
+        )
+        stored = result.scalar_one_or_none()
+
+        return stored == live_fingerprint, live_fingerprint
+
+    async def get_fingerprint(self, ad_account_id: UUID) -> str:
+        result = await self.db.execute(
+            text(FINGERPRINT_SQL),
+            {"ad_account_id": ad_account_id},
+        )
+        return result.scalar_one()
+
+    async def compute_and_store(
+        self,
+        *,
+        ad_account_id: UUID,
+        as_of_date: date,
+        fingerprint: Optional[str] = None,
+    ) -> Tuple[List[AIActionSet], int]:
+        """
+        Runs the decision runner and upserts the snapshot.
+
+        The fingerprint is taken BEFORE the run, so inputs that change
+        mid-run mark the snapshot stale on the next read.
+
+        Returns (action sets, compute ms). Commits.
+        """
+
+        if fingerprint is None:
+            fingerprint = await self.get_fingerprint(ad_account_id)
+
+        started = time.perf_counter()
+
+        action_sets = await AIDecisionRunner().run_for_ad_account(
+            db=self.db,
+            ad_account_id=ad_account_id,
+        )
+
+        compute_ms = int((time.perf_counter() - started) * 1000)
+
+        await self.db.execute(
+            text(
+                """
+                INSERT INTO ai_action_snapshots (
+                    id,
+                    ad_account_id,
+                    as_of_date,
+                    rule_version,
+                    action_sets,
+                    inputs_fingerprint,
+                    campaign_count,
+                    compute_ms,
+                    computed_at
+                )
+                VALUES (
+                    gen_random_uuid(),
+                    :ad_account_id,
+                    :as_of_date,
+                    :rule_version,
+                    CAST(:action_sets AS JSONB),
+                    :fingerprint,
+                    :campaign_count,
+                    :compute_ms,
+                    :now
+                )
+                ON CONFLICT (ad_account_id, as_of_date, rule_version)
+                DO UPDATE SET
+                    action_sets = EXCLUDED.action_sets,
+                    inputs_fingerprint = EXCLUDED.inputs_fingerprint,
+                    campaign_count = EXCLUDED.campaign_count,
+                    compute_ms = EXCLUDED.compute_ms,
+                    computed_at = EXCLUDED.computed_at
+                """
+            ),
+            {
+                "ad_account_id": ad_account_id,
+                "as_of_date": as_of_date,
+                "rule_version": RULE_VERSION,
+                "action_sets": _dump_action_sets(action_sets),
+                "fingerprint": fingerprint,
+                "campaign_count": len(action_sets),
+                "compute_ms": compute_ms,
+                "now": datetime.utcnow(),
+            },
+        )
+        await self.db.commit()
+
+        logger.info(
+            "AI action snapshot account=%s as_of=%s version=%s sets=%d in %dms",
+            ad_account_id,
+            as_of_date,
+            RULE_VERSION,
+            len(action_sets),
+            compute_ms,
+        )
+
+        return action_sets, compute_ms
+
+
+def _dump_action_sets(action_sets: List[AIActionSet]) -> str:
+    return "[" + ",".join(s.model_dump_json() for s in action_sets) + "]"
@@ -59,7 +59,21 @@ class CampaignVsBenchmarkService:
             window_type=window_type,
         )
 
-        if not benchmark_row or benchmark_row.campaign_count < 3:
+        return self.compare_rows(campaign_row, benchmark_row)
+
+    def compare_rows(
+        self,
+        campaign_row: Optional[Dict],
+        benchmark_row: Optional[Dict],
+    ) -> Dict:
+        """
+        Same as compare() for already-loaded rows (used by the
+        decision runner's prefetched context).
+        """
+        if not campaign_row:
+            return {"status": "insufficient_data"}
+
+        if not benchmark_row or benchmark_row["campaign_count"] < 3:
             return {"status": "benchmark_unavailable"}
 
         return self._build_comparison(campaign_row, benchmark_row)
@@ -81,8 +95,7 @@ class CampaignVsBenchmarkService:
                     cma.cpl,
                     cma.cpa,
                     cma.roas,
-                    cma.objective_type,
-                    ccm.category
+                    ccm.final_category AS category
                 FROM campaign_metrics_aggregates cma
                 JOIN campaign_category_map ccm
                   ON cma.campaign_id = ccm.campaign_id
@@ -108,7 +121,7 @@ class CampaignVsBenchmarkService:
         *,
         campaign_id: str,
         window_type: str,
-    ):
+    ) -> Optional[Dict]:
         result = await self.db.execute(
             text(
                 """
@@ -123,7 +136,7 @@ class CampaignVsBenchmarkService:
                     ib.campaign_count
                 FROM industry_benchmarks ib
                 JOIN campaign_category_map ccm
-                  ON ib.category = ccm.category
+                  ON ib.category = ccm.final_category
                 WHERE ccm.campaign_id = :campaign_id
                   AND ib.window_type = :window_type
                 ORDER BY ib.as_of_date DESC
@@ -136,12 +149,13 @@ class CampaignVsBenchmarkService:
             },
         )
 
-        return result.fetchone()
+        row = result.fetchone()
+        return dict(row._mapping) if row else None
 
     # =========================================================
     # BUILD COMPARISON CONTEXT
     # =========================================================
-    def _build_comparison(self, campaign: Dict, benchmark) -> Dict:
+    def _build_comparison(self, campaign: Dict, benchmark: Dict) -> Dict:
         metrics = {}
 
         def compare_metric(name, campaign_val, benchmark_val):
@@ -161,24 +175,24 @@ class CampaignVsBenchmarkService:
             }
 
         metrics["roas"] = compare_metric(
-            "roas", campaign.get("roas"), benchmark.avg_roas
+            "roas", campaign.get("roas"), benchmark["avg_roas"]
         )
         metrics["ctr"] = compare_metric(
-            "ctr", campaign.get("ctr"), benchmark.avg_ctr
+            "ctr", campaign.get("ctr"), benchmark["avg_ctr"]
         )
         metrics["cpl"] = compare_metric(
-            "cpl", campaign.get("cpl"), benchmark.avg_cpl
+            "cpl", campaign.get("cpl"), benchmark["avg_cpl"]
         )
         metrics["cpa"] = compare_metric(
-            "cpa", campaign.get("cpa"), benchmark.avg_cpa
+            "cpa", campaign.get("cpa"), benchmark["avg_cpa"]
         )
 
         # Relative position (simple & explainable)
         relative_position = "average"
-        if campaign.get("roas") and benchmark.p75_roas:
-            if campaign["roas"] >= benchmark.p75_roas:
+        if campaign.get("roas") and benchmark["p75_roas"]:
+            if campaign["roas"] >= benchmark["p75_roas"]:
                 relative_position = "top_quartile"
-            elif campaign["roas"] < benchmark.p25_roas:
+            elif campaign["roas"] < benchmark["p25_roas"]:
                 relative_position = "bottom_quartile"
 
         return {
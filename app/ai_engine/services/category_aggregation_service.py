@@ -1,6 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from datetime import datetime
+from typing import Collection, Optional
 
 
 class CategoryAggregationService:
@@ -23,14 +24,30 @@ class CategoryAggregationService:
         *,
         db: AsyncSession,
         window_type: str,
+        categories: Optional[Collection[str]] = None,
     ) -> None:
         """
-        Aggregate category stats for a given window (30d / 90d / lifetime).
+        Aggregate category stats for a given window (30d / 90d / lifetime),
+        optionally only for `categories`.
         """
 
+        params = {
+            "window_type": window_type,
+            "min_confidence": self.MIN_CONFIDENCE,
+            "min_sample_size": self.MIN_SAMPLE_SIZE,
+            "now": datetime.utcnow(),
+        }
+        category_filter = ""
+
+        if categories is not None:
+            params["categories"] = list(categories)
+            category_filter = (
+                "AND ccm.final_category = ANY(CAST(:categories AS TEXT[]))"
+            )
+
         await db.execute(
             text(
-                """
+                f"""
                 INSERT INTO ml_category_breakdown_stats (
                     business_category,
                     window_type,
@@ -50,7 +67,7 @@ class CategoryAggregationService:
                 )
                 SELECT
                     ccm.final_category AS business_category,
-                    :window_type AS window_type,
+                    CAST(:window_type AS VARCHAR) AS window_type,
                     mbf.age_range,
                     mbf.gender,
                     mbf.city,
@@ -78,6 +95,7 @@ class CategoryAggregationService:
                 WHERE
                     mbf.window_type = :window_type
                     AND ccm.confidence_score >= :min_confidence
+                    {category_filter}
                 GROUP BY
                     ccm.final_category,
                     mbf.age_range,
@@ -107,12 +125,7 @@ class CategoryAggregationService:
                     last_updated_at = EXCLUDED.last_updated_at
                 """
             ),
-            {
-                "window_type": window_type,
-                "min_confidence": self.MIN_CONFIDENCE,
-                "min_sample_size": self.MIN_SAMPLE_SIZE,
-                "now": datetime.utcnow(),
-            },
+            params,
         )
 
         await db.commit()
@@ -10,7 +10,7 @@ Purpose:
 """
 
 from datetime import date, datetime
-from typing import List, Dict
+from typing import Collection, List, Dict, Optional
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -28,15 +28,21 @@ class IndustryBenchmarkAggregationService:
     # =====================================================
     # ENTRY POINT
     # =====================================================
-    async def compute_for_date(self, as_of_date: date) -> int:
+    async def compute_for_date(
+        self,
+        as_of_date: date,
+        *,
+        categories: Optional[Collection[str]] = None,
+    ) -> int:
         """
-        Compute benchmarks for all categories/objectives/windows.
+        Compute benchmarks for all categories/objectives/windows
+        (or only `categories`).
         Idempotent per (category, objective, window, date).
         """
         rows_inserted = 0
 
         for window in WINDOWS:
-            rows = await self._fetch_aggregates(window, as_of_date)
+            rows = await self._fetch_aggregates(window, as_of_date, categories)
 
             for row in rows:
                 await self._upsert_benchmark(
@@ -58,16 +64,27 @@ class IndustryBenchmarkAggregationService:
         self,
         window: str,
         as_of_date: date,
+        categories: Optional[Collection[str]] = None,
     ) -> List[Dict]:
         """
         Pull aggregated campaign metrics grouped by
         category + objective for a given window.
         """
+        params = {
+            "window": window,
+            "as_of_date": as_of_date,
+        }
+        category_filter = ""
+
+        if categories is not None:
+            params["categories"] = list(categories)
+            category_filter = "AND ccm.final_category = ANY(CAST(:categories AS TEXT[]))"
+
         result = await self.db.execute(
             text(
-                """
+                f"""
                 SELECT
-                    ccm.category                         AS category,
+                    ccm.final_category                   AS category,
                     c.objective                          AS objective_type,
                     COUNT(*)                             AS campaign_count,
                     AVG(a.ctr)                           AS avg_ctr,
@@ -88,13 +105,11 @@ class IndustryBenchmarkAggregationService:
                 WHERE a.window_type = :window
                   AND a.is_complete_window = TRUE
                   AND a.window_end_date = :as_of_date
-                GROUP BY ccm.category, c.objective
+                  {category_filter}
+                GROUP BY ccm.final_category, c.objective
                 """
             ),
-            {
-                "window": window,
-                "as_of_date": as_of_date,
-            },
+            params,
         )
 
         return [dict(row._mapping) for row in result.fetchall()]
@@ -128,7 +143,8 @@ class IndustryBenchmarkAggregationService:
                     p50_roas,
                     p75_roas,
                     campaign_count,
-                    created_at
+                    created_at,
+                    updated_at
                 )
                 VALUES (
                     gen_random_uuid(),
@@ -144,6 +160,7 @@ class IndustryBenchmarkAggregationService:
                     :p50_roas,
                     :p75_roas,
                     :campaign_count,
+                    :now,
                     :now
                 )
                 ON CONFLICT (
@@ -160,7 +177,8 @@ class IndustryBenchmarkAggregationService:
                     p25_roas = EXCLUDED.p25_roas,
                     p50_roas = EXCLUDED.p50_roas,
                     p75_roas = EXCLUDED.p75_roas,
-                    campaign_count = EXCLUDED.campaign_count
+                    campaign_count = EXCLUDED.campaign_count,
+                    updated_at = EXCLUDED.updated_at
                 """
             ),
             {
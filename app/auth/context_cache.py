@@ -0,0 +1,196 @@
+"""
+Auth Context Cache (per process)
+
+Short-TTL cache of what every authenticated request resolves
+(app.auth.dependencies):
+
+- session token → user id (tokens keyed by SHA-256, never stored raw)
+- user id → "user" column snapshot, "subscription", "ad_accounts"
+
+(global settings / plans: app.core.config_cache)
+
+Entries live AUTH_CONTEXT_CACHE_TTL_SECONDS (0 disables the cache).
+
+Invalidation across workers: row triggers on sessions / users /
+subscriptions / user_meta_ad_accounts NOTIFY 'user:<id>' on channel
+auth_context, statement triggers on plans / global_settings NOTIFY
+'all' (alembic 7c4d1e8b2f65). Logout, account switch, subscription
+changes and impersonation targets are all covered by those writes.
+
+While the LISTEN connection is down the cache is bypassed (a missed
+notification would serve stale data); it is cleared on reconnect.
+A load that raced with an invalidation is not stored (generation).
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.pg_listener import pg_listener
+
+logger = logging.getLogger(__name__)
+
+
+AUTH_CONTEXT_CHANNEL = "auth_context"
+
+MISSING = object()
+
+
+def _token_key(session_token: str) -> str:
+    return hashlib.sha256(session_token.encode()).hexdigest()
+
+
+def _session_live(expires_at: datetime) -> bool:
+    if expires_at.tzinfo is None:
+        return expires_at > datetime.utcnow()
+    return expires_at > datetime.now(timezone.utc)
+
+
+class AuthContextCache:
+    def __init__(self, ttl_seconds: float, max_users: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+
+        # token key → (cache expiry, user id, session expires_at)
+        self._tokens: Dict[str, Tuple[float, UUID, datetime]] = {}
+        # user id → {field: (cache expiry, value)}
+        self._users: "OrderedDict[UUID, Dict[str, Tuple[float, Any]]]" = OrderedDict()
+
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and pg_listener.is_listening(AUTH_CONTEXT_CHANNEL)
+
+    # =====================================================
+    # SESSIONS
+    # =====================================================
+    def get_session_user_id(self, session_token: str) -> Optional[UUID]:
+        if not self.enabled:
+            return None
+
+        key = _token_key(session_token)
+        entry = self._tokens.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires, user_id, session_expires_at = entry
+        if expires <= time.monotonic() or not _session_live(session_expires_at):
+            self._tokens.pop(key, None)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return user_id
+
+    def put_session(
+        self,
+        session_token: str,
+        user_id: UUID,
+        session_expires_at: datetime,
+        generation: int,
+    ) -> None:
+        if not self.enabled or generation != self.generation:
+            return
+
+        if len(self._tokens) >= self.max_users:
+            self._evict_expired_tokens()
+
+        self._tokens[_token_key(session_token)] = (
+            time.monotonic() + self.ttl_seconds,
+            user_id,
+            session_expires_at,
+        )
+
+    # =====================================================
+    # PER-USER FIELDS
+    # =====================================================
+    def get(self, user_id: UUID, field: str) -> Any:
+        """
+        Cached value, or MISSING.
+        """
+
+        if not self.enabled:
+            return MISSING
+
+        entry = self._users.get(user_id)
+        cached = entry.get(field) if entry else None
+        if cached is None or cached[0] <= time.monotonic():
+            self.misses += 1
+            return MISSING
+
+        self._users.move_to_end(user_id)
+        self.hits += 1
+        return cached[1]
+
+    def put(self, user_id: UUID, field: str, value: Any, generation: int) -> None:
+        if not self.enabled or generation != self.generation:
+            return
+
+        entry = self._users.get(user_id)
+        if entry is None:
+            entry = self._users[user_id] = {}
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+
+        entry[field] = (time.monotonic() + self.ttl_seconds, value)
+        self._users.move_to_end(user_id)
+
+    # =====================================================
+    # INVALIDATION
+    # =====================================================
+    def invalidate_user(self, user_id: UUID) -> None:
+        self.generation += 1
+        self._users.pop(user_id, None)
+        for key in [k for k, entry in self._tokens.items() if entry[1] == user_id]:
+            del self._tokens[key]
+
+    def invalidate_token(self, session_token: str) -> None:
+        self.generation += 1
+        self._tokens.pop(_token_key(session_token), None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._tokens.clear()
+        self._users.clear()
+
+    def handle_notification(self, payload: str) -> None:
+        # 'user:<uuid>' | 'all'
+        kind, _, value = payload.partition(":")
+        if kind == "user" and value:
+            try:
+                self.invalidate_user(UUID(value))
+                return
+            except ValueError:
+                logger.warning("Bad auth_context payload %r; clearing", payload)
+        self.clear()
+
+    def _evict_expired_tokens(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, entry in self._tokens.items() if entry[0] <= now]:
+            del self._tokens[key]
+
+        # Still full: drop the oldest half (dicts keep insertion order)
+        if len(self._tokens) >= self.max_users:
+            for key in list(self._tokens)[: len(self._tokens) // 2]:
+                del self._tokens[key]
+
+
+auth_context_cache = AuthContextCache(
+    ttl_seconds=settings.AUTH_CONTEXT_CACHE_TTL_SECONDS,
+    max_users=settings.AUTH_CONTEXT_CACHE_MAX_USERS,
+)
+
+pg_listener.subscribe(
+    AUTH_CONTEXT_CHANNEL,
+    auth_context_cache.handle_notification,
+    on_reconnect=auth_context_cache.clear,
+)
@@ -1,10 +1,13 @@
 from fastapi import Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import make_transient_to_detached
 from uuid import UUID
-from datetime import datetime, date
+from datetime import datetime, date, time, timedelta
 
 from app.core.db_session import get_db
+from app.auth.context_cache import MISSING, auth_context_cache
+from app.core.config_cache import config_cache
 from app.users.models import User
 from app.admin.models import GlobalSettings
 from app.meta_api.models import MetaAdAccount, UserMetaAdAccount
@@ -27,15 +30,83 @@ ADMIN_EMAILS = {
 # INTERNAL: LOAD GLOBAL SETTINGS
 # -------------------------------------------------
 async def _get_global_settings(db: AsyncSession) -> GlobalSettings | None:
-    result = await db.execute(select(GlobalSettings).limit(1))
-    return result.scalar_one_or_none()
+    return await config_cache.get_global_settings(db)
 
 
 # -------------------------------------------------
-# INTERNAL: LOAD ACTIVE SUBSCRIPTION (AUTO EXPIRE + TRIAL LOGIC)
+# INTERNAL: CACHED USER SNAPSHOT
+# -------------------------------------------------
+def _cache_user(user: User, generation: int) -> None:
+    columns = {attr.key: getattr(user, attr.key) for attr in User.__mapper__.column_attrs}
+    auth_context_cache.put(user.id, "user", columns, generation)
+
+
+async def _cached_user(db: AsyncSession, user_id: UUID) -> User | None:
+    # Rebuilt from the snapshot and attached without a SELECT
+    columns = auth_context_cache.get(user_id, "user")
+    if columns is MISSING:
+        return None
+
+    user = User(**columns)
+    make_transient_to_detached(user)
+    return await db.merge(user, load=False)
+
+
+async def _load_user(db: AsyncSession, user_id: UUID) -> User | None:
+    user = await _cached_user(db, user_id)
+    if user is not None:
+        return user
+
+    generation = auth_context_cache.generation
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user is not None:
+        _cache_user(user, generation)
+    return user
+
+
+# -------------------------------------------------
+# INTERNAL: LOAD ACTIVE SUBSCRIPTION (TRIAL LOGIC)
 # + Extended Stripe-style metadata
+# A lapsed subscription is persisted as expired on the next
+# load (cache miss); the expire_grace job (SCHEDULER_ENABLED)
+# also sweeps users who never come back.
 # -------------------------------------------------
-async def _load_active_subscription(db: AsyncSession, user: User) -> dict | None:
+def _subscription_lapses_at(sub: Subscription) -> datetime | None:
+    deadlines = []
+
+    if sub.status == "trial" and sub.trial_end:
+        # Trial is valid through trial_end
+        deadlines.append(datetime.combine(sub.trial_end + timedelta(days=1), time.min))
+    if sub.status == "grace" and sub.grace_ends_at:
+        deadlines.append(sub.grace_ends_at)
+    if sub.ends_at and not sub.never_expires:
+        deadlines.append(sub.ends_at)
+
+    return min(deadlines) if deadlines else None
+
+
+async def _get_subscription(db: AsyncSession, user: User) -> dict | None:
+    cached = auth_context_cache.get(user.id, "subscription")
+    if cached is not MISSING:
+        sub, lapses_at = cached
+        if lapses_at is None or lapses_at > datetime.utcnow():
+            return sub
+
+    generation = auth_context_cache.generation
+    sub, lapses_at = await _load_active_subscription(db, user)
+    auth_context_cache.put(user.id, "subscription", (sub, lapses_at), generation)
+    return sub
+
+
+async def _load_active_subscription(
+    db: AsyncSession,
+    user: User,
+) -> tuple[dict | None, datetime | None]:
+    """
+    (subscription metadata or None, when it lapses)
+    """
+
     now = datetime.utcnow()
 
     # ==============================
@@ -52,7 +123,7 @@ async def _load_active_subscription(db: AsyncSession, user: User) -> dict | None
     if not has_sub:
         sub = await TrialService.ensure_trial(db, user.id)
         if sub:
-            plan = await db.scalar(select(Plan).where(Plan.id == sub.plan_id))
+            plan = await config_cache.get_plan(db, sub.plan_id)
             today = date.today()
             days_left = (sub.trial_end - today).days if sub.trial_end else None
 
@@ -75,7 +146,7 @@ async def _load_active_subscription(db: AsyncSession, user: User) -> dict | None
                 "remaining_grace_days": None,
                 "in_grace": False,
                 "is_expiring": False,
-            }
+            }, _subscription_lapses_at(sub)
 
     # ==============================
     # LOAD ACTIVE/TRIAL/GRACE SUB
@@ -92,29 +163,21 @@ async def _load_active_subscription(db: AsyncSession, user: User) -> dict | None
     row = res.first()
 
     if not row:
-        return None
+        return None, None
 
     sub, plan = row[0], row[1]
 
     # ==============================
     # PHASE-8: Trial Expiry Check
-    # ==============================
-    if sub.status == "trial":
-        today = date.today()
-        if sub.trial_end and sub.trial_end < today:
-            sub.status = "expired"
-            sub.is_active = False
-            await db.commit()
-            return None
-
-    # ==============================
     # NORMAL EXPIRY CHECK
+    # GRACE EXPIRY CHECK
     # ==============================
-    if sub.ends_at and not sub.never_expires and sub.ends_at < now:
+    lapses_at = _subscription_lapses_at(sub)
+    if lapses_at and lapses_at <= now:
         sub.status = "expired"
         sub.is_active = False
         await db.commit()
-        return None
+        return None, None
 
     # ==============================
     # STRIPE-STYLE METADATA
@@ -160,7 +223,7 @@ async def _load_active_subscription(db: AsyncSession, user: User) -> dict | None
         "remaining_grace_days": remaining_grace_days,
         "in_grace": in_grace,
         "is_expiring": is_expiring,
-    }
+    }, lapses_at
 
 
 # -------------------------------------------------
@@ -175,12 +238,21 @@ async def _resolve_user_from_session(
     if not session_token:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
-    session = await get_active_session(db, session_token=session_token)
+    user = None
+    user_id = auth_context_cache.get_session_user_id(session_token)
+    if user_id is not None:
+        user = await _cached_user(db, user_id)
 
-    if not session or not session.user:
-        raise HTTPException(status_code=401, detail="Session expired")
+    if user is None:
+        generation = auth_context_cache.generation
+        session = await get_active_session(db, session_token=session_token)
 
-    user = session.user
+        if not session or not session.user:
+            raise HTTPException(status_code=401, detail="Session expired")
+
+        user = session.user
+        auth_context_cache.put_session(session_token, user.id, session.expires_at, generation)
+        _cache_user(user, generation)
 
     # 🔑 HARD ADMIN ROLE (EMAIL BASED)
     user.role = "admin" if user.email in ADMIN_EMAILS else "user"
@@ -229,10 +301,7 @@ async def get_current_user(
                 detail="Invalid impersonation target",
             )
 
-        result = await db.execute(
-            select(User).where(User.id == target_user_id)
-        )
-        target_user = result.scalar_one_or_none()
+        target_user = await _load_user(db, target_user_id)
 
         if not target_user:
             raise HTTPException(
@@ -253,7 +322,7 @@ async def get_current_user(
     # -------------------------------------------------
     # SUBSCRIPTION ENFORCEMENT (NON-ADMIN USERS)
     # -------------------------------------------------
-    sub = await _load_active_subscription(db, user)
+    sub = await _get_subscription(db, user)
     user._subscription = sub
 
     if user.role != "admin":
@@ -273,17 +342,29 @@ async def get_session_context(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ) -> dict:
-    result = await db.execute(
-        select(MetaAdAccount)
-        .join(
-            UserMetaAdAccount,
-            UserMetaAdAccount.meta_ad_account_id == MetaAdAccount.id,
+    ad_accounts = auth_context_cache.get(user.id, "ad_accounts")
+
+    if ad_accounts is MISSING:
+        generation = auth_context_cache.generation
+        result = await db.execute(
+            select(MetaAdAccount)
+            .join(
+                UserMetaAdAccount,
+                UserMetaAdAccount.meta_ad_account_id == MetaAdAccount.id,
+            )
+            .where(UserMetaAdAccount.user_id == user.id)
+            .order_by(MetaAdAccount.account_name)
         )
-        .where(UserMetaAdAccount.user_id == user.id)
-        .order_by(MetaAdAccount.account_name)
-    )
 
-    ad_accounts = result.scalars().all()
+        ad_accounts = [
+            {
+                "id": str(acct.id),
+                "name": acct.account_name,
+                "meta_account_id": acct.meta_account_id,
+            }
+            for acct in result.scalars().all()
+        ]
+        auth_context_cache.put(user.id, "ad_accounts", ad_accounts, generation)
 
     return {
         "is_admin": user.role == "admin",
@@ -299,14 +380,7 @@ async def get_session_context(
             "write_blocked": getattr(user, "_write_blocked", False),
             "subscription": user._subscription,
         },
-        "ad_accounts": [
-            {
-                "id": str(acct.id),
-                "name": acct.account_name,
-                "meta_account_id": acct.meta_account_id,
-            }
-            for acct in ad_accounts
-        ],
+        "ad_accounts": [dict(acct) for acct in ad_accounts],
     }
 
 
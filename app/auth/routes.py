@@ -2,7 +2,7 @@
 Auth Routes (API)
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -10,6 +10,7 @@ from datetime import datetime, timedelta, date
 
 from app.core.db_session import get_db
 from app.auth.service import request_magic_login, verify_magic_login
+from app.auth.sessions import revoke_session
 from app.auth.dependencies import (
     require_user,
     get_session_context,
@@ -136,8 +137,15 @@ async def auth_me(
 # =========================================================
 @router.post("/auth/logout")
 async def logout(
+    request: Request,
     _: User = Depends(require_user),
+    db: AsyncSession = Depends(get_db),
 ):
+    # Revoke server-side too (drops the cached session in every worker)
+    session_token = request.cookies.get("meta_ai_session")
+    if session_token:
+        await revoke_session(db, session_token)
+
     response = RedirectResponse(
         url="/login",
         status_code=status.HTTP_302_FOUND,
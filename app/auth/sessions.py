@@ -21,6 +21,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 from sqlalchemy.orm import selectinload
 
+from app.auth.context_cache import auth_context_cache
 from app.auth.models import Session
 from app.users.models import User
 
@@ -120,6 +121,9 @@ async def revoke_session(
     )
     await db.commit()
 
+    # Other workers drop it on the sessions trigger's NOTIFY
+    auth_context_cache.invalidate_token(session_token)
+
 
 async def revoke_all_sessions_for_user(
     db: AsyncSession,
@@ -136,3 +140,5 @@ async def revoke_all_sessions_for_user(
         )
     )
     await db.commit()
+
+    auth_context_cache.invalidate_user(user_id)
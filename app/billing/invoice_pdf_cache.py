@@ -0,0 +1,235 @@
+"""
+Invoice PDF Cache
+
+Rendered invoice PDFs, content-addressed on local disk:
+
+    INVOICE_PDF_DIR/<invoice id>/<version>.pdf
+
+version = SHA-256 of InvoicePDFService.snapshot() (invoice fields,
+company settings, buyer GST fields, template version), so any change
+to what the PDF shows gets a new file; older versions of the invoice
+are pruned when a new one is stored.
+
+- Rendering (ReportLab, CPU-bound) runs in a process pool of
+  INVOICE_PDF_WORKERS processes, never on the event loop
+- One render per (invoice, version) at a time in this process;
+  files are written to a temp name and renamed (readers never see a
+  partial PDF, concurrent processes just overwrite identical bytes)
+- Downloads stream the stored file (get_path → FileResponse)
+- prerender_recent(): bulk render of newly issued invoices
+  (scheduler job prerender_invoices)
+
+Object storage: InvoicePDFStore is the only place that touches the
+files; a bucket-backed store only needs the same four methods.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.billing.invoice_models import Invoice
+from app.billing.invoice_service import InvoicePDFService, render_invoice_snapshot
+from app.billing.company_settings_service import CompanySettingsService
+from app.users.models import User
+
+logger = logging.getLogger(__name__)
+
+
+def invoice_version(snapshot: dict) -> str:
+    canonical = json.dumps(snapshot, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+# =========================================================
+# STORAGE
+# =========================================================
+class InvoicePDFStore:
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def path(self, invoice_id: UUID, version: str) -> str:
+        return os.path.join(self.root, str(invoice_id), f"{version}.pdf")
+
+    def exists(self, invoice_id: UUID, version: str) -> bool:
+        return os.path.isfile(self.path(invoice_id, version))
+
+    def write(self, invoice_id: UUID, version: str, pdf: bytes) -> str:
+        path = self.path(invoice_id, version)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(pdf)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        return path
+
+    def prune(self, invoice_id: UUID, keep_version: str) -> None:
+        directory = os.path.join(self.root, str(invoice_id))
+        keep = f"{keep_version}.pdf"
+        for name in os.listdir(directory):
+            if name.endswith(".pdf") and name != keep:
+                try:
+                    os.unlink(os.path.join(directory, name))
+                except FileNotFoundError:
+                    pass
+
+
+# =========================================================
+# CACHE
+# =========================================================
+class InvoicePDFCache:
+    def __init__(self, store: InvoicePDFStore, workers: int) -> None:
+        self.store = store
+        self.workers = workers
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # (invoice id, version) → in-flight render in this process
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+
+        self.hits = 0
+        self.renders = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: never fork a process running an event loop / pool threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # =====================================================
+    # READ
+    # =====================================================
+    async def get_path(
+        self,
+        db: AsyncSession,
+        invoice: Invoice,
+        buyer: Optional[User] = None,
+    ) -> str:
+        """
+        Stored PDF for the invoice's current version (rendered on a miss).
+        """
+
+        company = await CompanySettingsService.get(db)
+        if buyer is None:
+            buyer = await db.get(User, invoice.user_id)
+
+        snapshot = InvoicePDFService.snapshot(invoice=invoice, company=company, buyer=buyer)
+        return await self._ensure(invoice.id, snapshot)
+
+    async def _ensure(self, invoice_id: UUID, snapshot: dict) -> str:
+        version = invoice_version(snapshot)
+
+        if self.store.exists(invoice_id, version):
+            self.hits += 1
+            return self.store.path(invoice_id, version)
+
+        key = (invoice_id, version)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            path = await self._render_and_store(invoice_id, version, snapshot)
+            future.set_result(path)
+            return path
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Retrieved here so an unawaited future does not log
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _render_and_store(self, invoice_id: UUID, version: str, snapshot: dict) -> str:
+        loop = asyncio.get_running_loop()
+
+        pdf = await loop.run_in_executor(self._get_executor(), render_invoice_snapshot, snapshot)
+        self.renders += 1
+
+        # Disk I/O off the loop as well
+        path = await asyncio.to_thread(self.store.write, invoice_id, version, pdf)
+        await asyncio.to_thread(self.store.prune, invoice_id, version)
+        return path
+
+    # =====================================================
+    # BULK PRE-RENDER
+    # =====================================================
+    async def prerender_recent(self, db: AsyncSession, *, since: datetime) -> int:
+        """
+        Renders every invoice issued since `since` without a stored
+        PDF for its current version. Returns the number rendered.
+        """
+
+        rows = (
+            await db.execute(
+                select(Invoice, User)
+                .join(User, User.id == Invoice.user_id)
+                .where(Invoice.created_at >= since)
+                .order_by(Invoice.created_at.asc())
+            )
+        ).all()
+        if not rows:
+            return 0
+
+        company = await CompanySettingsService.get(db)
+
+        todo = []
+        for invoice, buyer in rows:
+            snapshot = InvoicePDFService.snapshot(invoice=invoice, company=company, buyer=buyer)
+            if not self.store.exists(invoice.id, invoice_version(snapshot)):
+                todo.append((invoice.id, snapshot))
+
+        # The pool bounds parallelism; one failure does not stop the batch
+        results = await asyncio.gather(
+            *(self._ensure(invoice_id, snapshot) for invoice_id, snapshot in todo),
+            return_exceptions=True,
+        )
+
+        failed = [r for r in results if isinstance(r, BaseException)]
+        for error in failed:
+            logger.error("Invoice PDF pre-render failed → %r", error)
+
+        return len(todo) - len(failed)
+
+
+invoice_pdf_cache = InvoicePDFCache(
+    store=InvoicePDFStore(settings.INVOICE_PDF_DIR),
+    workers=settings.INVOICE_PDF_WORKERS,
+)
+
+
+async def prerender_invoices(db: AsyncSession, *, now: Optional[datetime] = None) -> int:
+    now = now or datetime.utcnow()
+    since = now - timedelta(hours=settings.INVOICE_PDF_PRERENDER_LOOKBACK_HOURS)
+    return await invoice_pdf_cache.prerender_recent(db, since=since)
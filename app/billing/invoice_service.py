@@ -1,5 +1,6 @@
 from io import BytesIO
 from datetime import datetime
+from types import SimpleNamespace
 
 from reportlab.lib.pagesizes import A4
 from reportlab.platypus import (
@@ -25,6 +26,56 @@ class InvoicePDFService:
 
     IGST_RATE = 18  # always IGST @ 18%
 
+    # Bump when the layout changes: every cached PDF is then re-rendered
+    TEMPLATE_VERSION = 1
+
+    INVOICE_FIELDS = (
+        "invoice_number",
+        "invoice_date",
+        "billing_name",
+        "billing_email",
+        "subtotal",
+        "period_from",
+        "period_to",
+    )
+    COMPANY_FIELDS = (
+        "company_name",
+        "address_line1",
+        "address_line2",
+        "state",
+        "state_code",
+        "contact_email",
+        "contact_phone",
+        "gst_registered",
+        "gstin",
+        "sac_code",
+    )
+    BUYER_FIELDS = (
+        "buyer_gstin",
+        "buyer_turnover_below_threshold",
+    )
+
+    @staticmethod
+    def snapshot(
+        *,
+        invoice: Invoice,
+        company: BillingCompanySettings,
+        buyer: User,
+    ) -> dict:
+        """
+        Everything the PDF depends on, as plain (picklable) values.
+        """
+
+        def pick(obj, fields):
+            return {field: getattr(obj, field) for field in fields}
+
+        return {
+            "template_version": InvoicePDFService.TEMPLATE_VERSION,
+            "invoice": pick(invoice, InvoicePDFService.INVOICE_FIELDS),
+            "company": pick(company, InvoicePDFService.COMPANY_FIELDS),
+            "buyer": pick(buyer, InvoicePDFService.BUYER_FIELDS),
+        }
+
     @staticmethod
     def generate_pdf(
         *,
@@ -183,3 +234,16 @@ class InvoicePDFService:
         pdf = buffer.getvalue()
         buffer.close()
         return pdf
+
+
+def render_invoice_snapshot(snapshot: dict) -> bytes:
+    """
+    generate_pdf() from InvoicePDFService.snapshot(); runs in the
+    invoice PDF process pool (app.billing.invoice_pdf_cache).
+    """
+
+    return InvoicePDFService.generate_pdf(
+        invoice=SimpleNamespace(**snapshot["invoice"]),
+        company=SimpleNamespace(**snapshot["company"]),
+        buyer=SimpleNamespace(**snapshot["buyer"]),
+    )
@@ -0,0 +1,49 @@
+from sqlalchemy import BigInteger, String, Integer, Date, DateTime, text
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import date, datetime
+
+from app.core.database import Base
+
+
+class RevenueDailyRollup(Base):
+    """
+    Payment totals per (created day, payment_for, status, currency).
+
+    Kept current by statement triggers on payments, in the writing
+    transaction (alembic c3a7f1d5e928): every insert / update / delete
+    moves amount and count between keys. Admin revenue endpoints read
+    these rows instead of scanning payments.
+
+    Rebuild (from payments): scripts/rebuild_revenue_rollups.py
+    """
+
+    __tablename__ = "revenue_daily_rollups"
+
+    # payments.created_at (UTC) date
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    payment_for: Mapped[str] = mapped_column(String, primary_key=True)
+    status: Mapped[str] = mapped_column(String, primary_key=True)
+    currency: Mapped[str] = mapped_column(String, primary_key=True)
+
+    # Sum of payments.amount
+    amount_total: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        server_default=text("0"),
+    )
+
+    payment_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default=text("0"),
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        server_default=text("timezone('utc', now())"),
+    )
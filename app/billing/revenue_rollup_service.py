@@ -0,0 +1,98 @@
+"""
+Revenue Rollup Service
+
+revenue_daily_rollups is maintained by triggers on payments
+(app.billing.revenue_rollup_models); this service rebuilds it from
+payments (a day range or entirely) and holds the shared aggregate
+expression of the admin revenue endpoints.
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from sqlalchemy import BigInteger, case, cast, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.billing.revenue_rollup_models import RevenueDailyRollup
+
+
+def rollup_amount_sum(payment_for: Optional[str] = None):
+    """
+    sum(amount_total), optionally of one payment_for, as bigint
+    (a bigint sum is numeric → Decimal otherwise).
+    """
+
+    amount = RevenueDailyRollup.amount_total
+    if payment_for is not None:
+        amount = case((RevenueDailyRollup.payment_for == payment_for, amount), else_=0)
+    return cast(func.coalesce(func.sum(amount), 0), BigInteger)
+
+
+class RevenueRollupService:
+
+    @staticmethod
+    async def rebuild(
+        db: AsyncSession,
+        *,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> int:
+        """
+        Recomputes the rollup rows of [start, end] (inclusive, open
+        ends = all days) from payments. Returns the rows written.
+        """
+
+        day_filters = []
+        payment_filters = []
+        params = {}
+
+        if start is not None:
+            day_filters.append("day >= :start")
+            payment_filters.append("created_at >= :start_ts")
+            params["start"] = start
+            params["start_ts"] = datetime.combine(start, time.min)
+        if end is not None:
+            day_filters.append("day <= :end")
+            payment_filters.append("created_at < :end_ts")
+            params["end"] = end
+            params["end_ts"] = datetime.combine(end + timedelta(days=1), time.min)
+
+        day_where = f"WHERE {' AND '.join(day_filters)}" if day_filters else ""
+        payment_where = f"WHERE {' AND '.join(payment_filters)}" if payment_filters else ""
+
+        # Payment writers (their triggers) wait until the rebuild commits;
+        # a writer already in flight is waited for, then counted
+        await db.execute(text("LOCK TABLE revenue_daily_rollups IN EXCLUSIVE MODE"))
+
+        await db.execute(text(f"DELETE FROM revenue_daily_rollups {day_where}"), params)
+
+        result = await db.execute(
+            text(
+                f"""
+                INSERT INTO revenue_daily_rollups (
+                    day,
+                    payment_for,
+                    status,
+                    currency,
+                    amount_total,
+                    payment_count,
+                    updated_at
+                )
+                SELECT
+                    CAST(created_at AS date),
+                    payment_for,
+                    status,
+                    currency,
+                    sum(amount),
+                    count(*),
+                    timezone('utc', now())
+                FROM payments
+                {payment_where}
+                GROUP BY 1, 2, 3, 4
+                """
+            ),
+            params,
+        )
+
+        await db.commit()
+        return result.rowcount
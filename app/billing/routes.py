@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Body
-from fastapi.responses import Response
+from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from datetime import datetime, timedelta, date
@@ -11,7 +11,7 @@ from app.auth.dependencies import require_user
 from app.users.models import User
 from app.billing.service import BillingService
 from app.billing.invoice_models import Invoice
-from app.billing.invoice_service import InvoicePDFService
+from app.billing.invoice_pdf_cache import invoice_pdf_cache
 from app.admin.models_pricing import AdminPricingConfig
 from app.plans.models import Plan
 from app.plans.subscription_models import Subscription, SubscriptionAddon
@@ -204,7 +204,7 @@ async def buy_campaign_slots(
     packs = pricing.slot_packs.values()
     selected = next(
         (p for p in packs if quantity >= p["min_qty"]
-         and ("max_qty" not in p or p["max_qty"] is None or quantity <= p["max_qty"]))),
+         and ("max_qty" not in p or p["max_qty"] is None or quantity <= p["max_qty"])),
         None,
     )
     if not selected:
@@ -245,7 +245,7 @@ async def finalize_campaign_slots(
     packs = pricing.slot_packs.values()
     selected = next(
         (p for p in packs if quantity >= p["min_qty"]
-         and ("max_qty" not in p or p["max_qty"] is None or quantity <= p["max_qty"]))),
+         and ("max_qty" not in p or p["max_qty"] is None or quantity <= p["max_qty"])),
         None,
     )
     if not selected:
@@ -316,12 +316,13 @@ async def download_invoice(
     if not invoice:
         raise HTTPException(404, "Invoice not found")
 
-    pdf_bytes = InvoicePDFService.generate_pdf(invoice)
+    # Rendered once per invoice version (process pool), streamed from storage
+    path = await invoice_pdf_cache.get_path(db, invoice, buyer=current_user)
 
-    return Response(
-        content=pdf_bytes,
+    return FileResponse(
+        path,
         media_type="application/pdf",
-        headers={"Content-Disposition": f'attachment; filename="{invoice.invoice_number}.pdf"'},
+        filename=f"{invoice.invoice_number}.pdf",
     )
 
 
@@ -0,0 +1,83 @@
+from sqlalchemy import BigInteger, String, Integer, Text, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class WebhookEventStatus:
+    PENDING = "pending"
+    PROCESSED = "processed"
+    FAILED = "failed"
+
+
+class RazorpayWebhookEvent(Base):
+    """
+    Durable inbox of verified Razorpay webhook deliveries.
+
+    The webhook route only inserts (event_id = idempotency key) and
+    returns; app.billing.webhook_worker applies the events:
+    - in received order per ordering_key (the Razorpay subscription id,
+      else the payment id)
+    - pending → processed, or back to pending with a later
+      available_at on error, failed after WEBHOOK_MAX_ATTEMPTS
+    """
+
+    __tablename__ = "razorpay_webhook_events"
+
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        autoincrement=True,
+    )
+
+    # X-Razorpay-Event-Id (SHA-256 of the body when absent)
+    event_id: Mapped[str] = mapped_column(String, nullable=False, unique=True)
+
+    event: Mapped[str] = mapped_column(String, nullable=False)
+
+    # subscription:<id> | payment:<id> | event:<event_id>
+    ordering_key: Mapped[str] = mapped_column(String, nullable=False)
+
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    # pending | processed | failed
+    status: Mapped[str] = mapped_column(
+        String,
+        nullable=False,
+        default=WebhookEventStatus.PENDING,
+    )
+
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    received_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False,
+    )
+
+    # Not picked up before (retry backoff)
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False,
+    )
+
+    processed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    # Handler return value
+    result: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+
+# Claim scan + "earlier pending event with the same key" check
+Index(
+    "ix_razorpay_webhook_events_pending",
+    RazorpayWebhookEvent.ordering_key,
+    RazorpayWebhookEvent.id,
+    postgresql_where=RazorpayWebhookEvent.status == WebhookEventStatus.PENDING,
+)
+Index("ix_razorpay_webhook_events_processed_at", RazorpayWebhookEvent.processed_at)
+Index("ix_razorpay_webhook_events_status", RazorpayWebhookEvent.status)
@@ -0,0 +1,489 @@
+"""
+Razorpay Webhook Worker Pool
+
+The webhook route (app.billing.webhooks) verifies the signature,
+stores the event in razorpay_webhook_events and returns 200; these
+workers apply it (dispatch_event) afterwards.
+
+- WEBHOOK_WORKER_CONCURRENCY workers per process; any number of
+  processes may run them (claims use FOR UPDATE SKIP LOCKED)
+- Per ordering_key (Razorpay subscription) events run one at a time,
+  in received order: an event is claimed only while no earlier event
+  with the same key is still pending (including one waiting to retry)
+- One transaction per event: claim (row lock) + handlers + status.
+  The handlers' own commits become savepoints, so an event's effects
+  and its "processed" mark commit together; a worker that dies
+  mid-event leaves it pending (the lock dies with the connection)
+- Handler errors: retried with exponential backoff
+  (WEBHOOK_RETRY_BASE_SECONDS), failed after WEBHOOK_MAX_ATTEMPTS
+  (later events of the same key then proceed)
+- Woken by NOTIFY razorpay_webhook on insert, polls every
+  WEBHOOK_POLL_SECONDS otherwise
+
+Wiring:
+- main.py startup / shutdown: start_webhook_workers() /
+  stop_webhook_workers() (no-op unless WEBHOOK_WORKERS_ENABLED=true)
+- Dedicated process: python -m app.billing.webhook_worker serve
+- Replay: python -m app.billing.webhook_worker replay --status failed
+- Lag / throughput: stats() → GET /api/health/webhooks
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import signal
+import time
+import traceback
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import text, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.core import db_session
+from app.core.db_session import BatchSessionLocal
+from app.core.pg_listener import notify, pg_listener
+from app.billing.webhooks import WEBHOOK_CHANNEL, dispatch_event
+from app.billing.webhook_event_models import RazorpayWebhookEvent, WebhookEventStatus
+
+logger = logging.getLogger(__name__)
+
+
+# Longest error text stored on an event
+MAX_ERROR_LENGTH = 4000
+
+MAX_RETRY_DELAY_SECONDS = 3600
+
+# stats(): throughput / lag window
+STATS_WINDOW_SECONDS = 300
+
+
+CLAIM_SQL = text(
+    """
+    SELECT e.id, e.event_id, e.event, e.payload, e.attempts
+    FROM razorpay_webhook_events e
+    WHERE e.status = :pending
+      AND e.available_at <= :now
+      AND NOT EXISTS (
+          SELECT 1
+          FROM razorpay_webhook_events earlier
+          WHERE earlier.ordering_key = e.ordering_key
+            AND earlier.status = :pending
+            AND earlier.id < e.id
+      )
+    ORDER BY e.id
+    LIMIT 1
+    FOR UPDATE OF e SKIP LOCKED
+    """
+).columns(payload=JSONB)
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    seconds = settings.WEBHOOK_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(seconds, MAX_RETRY_DELAY_SECONDS))
+
+
+class WebhookWorkerPool:
+    def __init__(
+        self,
+        *,
+        engine: Optional[AsyncEngine] = None,
+        concurrency: Optional[int] = None,
+        poll_seconds: Optional[float] = None,
+    ):
+        self.engine = engine or db_session.engine
+        self.concurrency = concurrency or settings.WEBHOOK_WORKER_CONCURRENCY
+        self.poll_seconds = poll_seconds or settings.WEBHOOK_POLL_SECONDS
+
+        self._wake = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+        # Per-process counters (stats() adds the shared queue state)
+        self.processed = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+
+    # =====================================================
+    # LIFECYCLE
+    # =====================================================
+    async def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._worker(n), name=f"webhook-worker:{n}")
+            for n in range(self.concurrency)
+        ]
+        logger.info("Webhook workers started (%d)", self.concurrency)
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """
+        Lets in-flight events finish for up to `timeout`, then cancels
+        (a cancelled event rolls back and stays pending).
+        """
+
+        self._stopping.set()
+        self._wake.set()
+
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+
+        logger.info("Webhook workers stopped")
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    async def _worker(self, n: int) -> None:
+        while not self._stopping.is_set():
+            try:
+                handled = await self.process_next()
+            except Exception:
+                logger.exception("Webhook worker %d failed", n)
+                handled = False
+
+            if handled:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            if not self._stopping.is_set():
+                self._wake.clear()
+
+    # =====================================================
+    # ONE EVENT
+    # =====================================================
+    async def process_next(self) -> bool:
+        """
+        Claims and applies the next eligible event.
+        False = nothing to do.
+        """
+
+        async with self.engine.connect() as conn:
+            async with conn.begin():
+                row = (
+                    await conn.execute(
+                        CLAIM_SQL,
+                        {"pending": WebhookEventStatus.PENDING, "now": datetime.utcnow()},
+                    )
+                ).first()
+
+                if row is None:
+                    return False
+
+                started = time.perf_counter()
+                result = None
+                error: Optional[str] = None
+
+                try:
+                    async with conn.begin_nested():
+                        async with BatchSessionLocal(
+                            bind=conn,
+                            join_transaction_mode="create_savepoint",
+                        ) as db:
+                            result = await dispatch_event(row.payload, db)
+                except Exception:
+                    error = traceback.format_exc()[-MAX_ERROR_LENGTH:]
+                    logger.exception(
+                        "Webhook %s (%s) failed, attempt %d",
+                        row.event_id,
+                        row.event,
+                        row.attempts + 1,
+                    )
+
+                await conn.execute(self._finish(row, result, error))
+
+        self.busy_seconds += time.perf_counter() - started
+        if error is None:
+            self.processed += 1
+        else:
+            self.errors += 1
+        return True
+
+    @staticmethod
+    def _finish(row, result, error: Optional[str]):
+        now = datetime.utcnow()
+        attempts = row.attempts + 1
+        stmt = update(RazorpayWebhookEvent).where(RazorpayWebhookEvent.id == row.id)
+
+        if error is None:
+            return stmt.values(
+                status=WebhookEventStatus.PROCESSED,
+                attempts=attempts,
+                processed_at=now,
+                result=result if isinstance(result, dict) else None,
+                last_error=None,
+            )
+
+        if attempts >= settings.WEBHOOK_MAX_ATTEMPTS:
+            logger.error("Webhook %s failed permanently after %d attempts", row.event_id, attempts)
+            return stmt.values(
+                status=WebhookEventStatus.FAILED,
+                attempts=attempts,
+                processed_at=now,
+                last_error=error,
+            )
+
+        return stmt.values(
+            attempts=attempts,
+            available_at=now + _retry_delay(attempts),
+            last_error=error,
+        )
+
+
+# =========================================================
+# REPLAY
+# =========================================================
+async def replay_events(
+    db: AsyncSession,
+    *,
+    ids: Optional[List[int]] = None,
+    event_ids: Optional[List[str]] = None,
+    status: Optional[str] = WebhookEventStatus.FAILED,
+    since: Optional[datetime] = None,
+) -> int:
+    """
+    Puts matching events back in the queue (pending, attempts reset).
+    Replaying processed events re-applies them: only on purpose.
+    """
+
+    stmt = update(RazorpayWebhookEvent)
+    if ids:
+        stmt = stmt.where(RazorpayWebhookEvent.id.in_(ids))
+    if event_ids:
+        stmt = stmt.where(RazorpayWebhookEvent.event_id.in_(event_ids))
+    if status:
+        stmt = stmt.where(RazorpayWebhookEvent.status == status)
+    if since:
+        stmt = stmt.where(RazorpayWebhookEvent.received_at >= since)
+
+    result = await db.execute(
+        stmt.values(
+            status=WebhookEventStatus.PENDING,
+            attempts=0,
+            available_at=datetime.utcnow(),
+            processed_at=None,
+        )
+    )
+
+    if result.rowcount:
+        await notify(db, WEBHOOK_CHANNEL, "replay")
+    await db.commit()
+    return result.rowcount
+
+
+# =========================================================
+# METRICS
+# =========================================================
+async def stats(db: AsyncSession) -> dict:
+    """
+    Queue state (shared) + this process's worker counters.
+    """
+
+    now = datetime.utcnow()
+    row = (
+        await db.execute(
+            text(
+                """
+                SELECT
+                    count(*) FILTER (WHERE status = :pending) AS pending,
+                    count(*) FILTER (WHERE status = :pending AND attempts > 0) AS retrying,
+                    count(*) FILTER (WHERE status = :failed) AS failed,
+                    EXTRACT(EPOCH FROM :now - min(received_at) FILTER (WHERE status = :pending))
+                        AS oldest_pending_seconds,
+                    count(*) FILTER (WHERE status = :processed AND processed_at >= :window_start)
+                        AS processed_in_window,
+                    avg(EXTRACT(EPOCH FROM processed_at - received_at))
+                        FILTER (WHERE status = :processed AND processed_at >= :window_start)
+                        AS avg_lag_seconds,
+                    max(EXTRACT(EPOCH FROM processed_at - received_at))
+                        FILTER (WHERE status = :processed AND processed_at >= :window_start)
+                        AS max_lag_seconds
+                FROM razorpay_webhook_events
+                WHERE status <> :processed
+                   OR processed_at >= :window_start
+                """
+            ),
+            {
+                "pending": WebhookEventStatus.PENDING,
+                "failed": WebhookEventStatus.FAILED,
+                "processed": WebhookEventStatus.PROCESSED,
+                "now": now,
+                "window_start": now - timedelta(seconds=STATS_WINDOW_SECONDS),
+            },
+        )
+    ).one()
+
+    def seconds(value) -> Optional[float]:
+        return round(float(value), 3) if value is not None else None
+
+    data = {
+        "pending": row.pending,
+        "retrying": row.retrying,
+        "failed": row.failed,
+        "oldest_pending_seconds": seconds(row.oldest_pending_seconds),
+        "window_seconds": STATS_WINDOW_SECONDS,
+        "processed_in_window": row.processed_in_window,
+        "throughput_per_minute": round(row.processed_in_window * 60 / STATS_WINDOW_SECONDS, 2),
+        "avg_lag_seconds": seconds(row.avg_lag_seconds),
+        "max_lag_seconds": seconds(row.max_lag_seconds),
+        "workers": None,
+    }
+
+    if _pool is not None:
+        data["workers"] = {
+            "concurrency": _pool.concurrency,
+            "processed_total": _pool.processed,
+            "errors_total": _pool.errors,
+            "busy_seconds_total": round(_pool.busy_seconds, 3),
+        }
+
+    return data
+
+
+def render_webhook_metrics(data: dict) -> str:
+    """
+    stats() in Prometheus text exposition format.
+    """
+
+    lines = []
+    for name in (
+        "pending",
+        "retrying",
+        "failed",
+        "oldest_pending_seconds",
+        "processed_in_window",
+        "throughput_per_minute",
+        "avg_lag_seconds",
+        "max_lag_seconds",
+    ):
+        if data[name] is not None:
+            lines.append(f"razorpay_webhook_{name} {data[name]}")
+
+    if data["workers"]:
+        for name, value in data["workers"].items():
+            lines.append(f"razorpay_webhook_worker_{name} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+# =========================================================
+# FASTAPI STARTUP / SHUTDOWN HOOKS
+# =========================================================
+_pool: Optional[WebhookWorkerPool] = None
+
+
+def _wake(payload: str) -> None:
+    if _pool is not None:
+        _pool.wake()
+
+
+pg_listener.subscribe(WEBHOOK_CHANNEL, _wake)
+
+
+async def start_webhook_workers() -> Optional[WebhookWorkerPool]:
+    global _pool
+
+    if not settings.WEBHOOK_WORKERS_ENABLED:
+        logger.info("Webhook workers disabled (WEBHOOK_WORKERS_ENABLED=false)")
+        return None
+
+    if _pool is None:
+        _pool = WebhookWorkerPool()
+        await _pool.start()
+    return _pool
+
+
+async def stop_webhook_workers() -> None:
+    global _pool
+
+    if _pool is not None:
+        await _pool.stop()
+        _pool = None
+
+
+# =========================================================
+# DEDICATED PROCESS / CLI
+# =========================================================
+async def _serve() -> None:
+    import app.models  # noqa: F401
+
+    global _pool
+    _pool = WebhookWorkerPool()
+    await pg_listener.start()
+    await _pool.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    await stop.wait()
+    await stop_webhook_workers()
+    await pg_listener.stop()
+
+
+async def _replay(args) -> None:
+    async with BatchSessionLocal() as db:
+        count = await replay_events(
+            db,
+            ids=args.id,
+            event_ids=args.event_id,
+            status=None if args.status == "any" else args.status,
+            since=datetime.fromisoformat(args.since) if args.since else None,
+        )
+    print(f"Requeued {count} event(s)")
+
+
+async def _stats() -> None:
+    async with BatchSessionLocal() as db:
+        print(json.dumps(await stats(db), indent=2))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Razorpay webhook inbox")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("serve", help="Run the worker pool until SIGINT / SIGTERM")
+
+    replay = commands.add_parser("replay", help="Requeue stored events")
+    replay.add_argument("--id", type=int, action="append", help="Inbox row id (repeatable)")
+    replay.add_argument("--event-id", action="append", help="Razorpay event id (repeatable)")
+    replay.add_argument(
+        "--status",
+        default=WebhookEventStatus.FAILED,
+        choices=[
+            WebhookEventStatus.FAILED,
+            WebhookEventStatus.PROCESSED,
+            WebhookEventStatus.PENDING,
+            "any",
+        ],
+        help="Only events in this status (default: failed)",
+    )
+    replay.add_argument("--since", help="Only events received at / after (ISO, UTC)")
+
+    commands.add_parser("stats", help="Print queue lag / throughput")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [webhooks] %(levelname)s: %(message)s",
+    )
+
+    if args.command == "serve":
+        asyncio.run(_serve())
+    elif args.command == "replay":
+        asyncio.run(_replay(args))
+    else:
+        asyncio.run(_stats())
+
+
+if __name__ == "__main__":
+    main()
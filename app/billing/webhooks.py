@@ -8,11 +8,14 @@ import uuid
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.core.db_session import get_db
 from app.core.config import settings
+from app.core.pg_listener import notify
 from app.billing.payment_models import Payment
 from app.billing.invoice_models import Invoice
+from app.billing.webhook_event_models import RazorpayWebhookEvent
 from app.plans.subscription_models import Subscription
 from app.plans.models import Plan
 
@@ -20,6 +23,9 @@ router = APIRouter(prefix="/billing/webhook", tags=["Billing Webhooks"])
 
 IST = ZoneInfo("Asia/Kolkata")
 
+# NOTIFY on insert → app.billing.webhook_worker
+WEBHOOK_CHANNEL = "razorpay_webhook"
+
 
 def ist_now_utc():
     """Generate IST timestamp converted to UTC for DB."""
@@ -35,6 +41,10 @@ async def razorpay_webhook(
     request: Request,
     db: AsyncSession = Depends(get_db),
 ):
+    """
+    Verify + store only; app.billing.webhook_worker applies the event.
+    """
+
     body = await request.body()
     signature = request.headers.get("X-Razorpay-Signature")
 
@@ -50,7 +60,82 @@ async def razorpay_webhook(
     if not hmac.compare_digest(expected_signature, signature):
         raise HTTPException(status_code=400, detail="Invalid signature")
 
-    payload = json.loads(body.decode())
+    try:
+        payload = json.loads(body.decode())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid payload")
+
+    # Razorpay retries a delivery with the same event id
+    event_id = (
+        request.headers.get("X-Razorpay-Event-Id")
+        or hashlib.sha256(body).hexdigest()
+    )
+
+    queued = await enqueue_webhook_event(db, event_id=event_id, payload=payload)
+    return {"status": "queued" if queued else "duplicate"}
+
+
+# ======================================================
+# INBOX
+# ======================================================
+def webhook_ordering_key(payload: dict, event_id: str) -> str:
+    """
+    Events sharing a key are applied one at a time, in received order.
+    """
+
+    entities = payload.get("payload") or {}
+
+    def entity(name: str) -> dict:
+        return (entities.get(name) or {}).get("entity") or {}
+
+    subscription_id = (
+        entity("subscription").get("id")
+        or entity("payment").get("subscription_id")
+        or entity("invoice").get("subscription_id")
+    )
+    if subscription_id:
+        return f"subscription:{subscription_id}"
+
+    payment_id = entity("payment").get("id") or entity("invoice").get("payment_id")
+    if payment_id:
+        return f"payment:{payment_id}"
+
+    return f"event:{event_id}"
+
+
+async def enqueue_webhook_event(db: AsyncSession, *, event_id: str, payload: dict) -> bool:
+    """
+    Inserts the event (once per event_id) and wakes the workers.
+    False = already received.
+    """
+
+    now = datetime.utcnow()
+
+    inserted_id = await db.scalar(
+        pg_insert(RazorpayWebhookEvent)
+        .values(
+            event_id=event_id,
+            event=payload.get("event") or "",
+            ordering_key=webhook_ordering_key(payload, event_id),
+            payload=payload,
+            received_at=now,
+            available_at=now,
+        )
+        .on_conflict_do_nothing(index_elements=["event_id"])
+        .returning(RazorpayWebhookEvent.id)
+    )
+
+    if inserted_id is not None:
+        await notify(db, WEBHOOK_CHANNEL, str(inserted_id))
+
+    await db.commit()
+    return inserted_id is not None
+
+
+# ======================================================
+# DISPATCH (WORKERS / REPLAY)
+# ======================================================
+async def dispatch_event(payload: dict, db: AsyncSession):
     event = payload.get("event")
 
     if event == "subscription.pending":
@@ -1,6 +1,6 @@
-import httpx
 from typing import List, Dict
 
+from app.meta_api.graph_client import GRAPH_BASE, get_graph_client
 from app.meta_api.models import MetaAdAccount, MetaOAuthToken
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -17,7 +17,7 @@ class MetaCampaignClient:
     - Never mutate Meta
     """
 
-    GRAPH_BASE_URL = "https://graph.facebook.com/v19.0"
+    GRAPH_BASE_URL = GRAPH_BASE
 
     @classmethod
     async def fetch_campaigns(
@@ -57,39 +57,40 @@ class MetaCampaignClient:
 
         campaigns: List[Dict] = []
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            while True:
-                response = await client.get(url, params=params)
+        graph = get_graph_client()
 
-                if response.status_code != 200:
-                    raise RuntimeError(
-                        f"Meta API error {response.status_code}: {response.text}"
-                    )
+        while True:
+            response = await graph.get(url, params=params, timeout=30)
 
-                payload = response.json()
+            if response.status_code != 200:
+                raise RuntimeError(
+                    f"Meta API error {response.status_code}: {response.text}"
+                )
 
-                for item in payload.get("data", []):
-                    status = item.get("effective_status", "UNKNOWN")
+            payload = response.json()
 
-                    if status in {"DELETED", "ARCHIVED"}:
-                        continue
+            for item in payload.get("data", []):
+                status = item.get("effective_status", "UNKNOWN")
 
-                    campaigns.append(
-                        {
-                            "id": item["id"],
-                            "name": item.get("name", ""),
-                            "objective": item.get("objective", "UNKNOWN"),
-                            "status": status,
-                        }
-                    )
+                if status in {"DELETED", "ARCHIVED"}:
+                    continue
 
-                paging = payload.get("paging", {})
-                next_url = paging.get("next")
+                campaigns.append(
+                    {
+                        "id": item["id"],
+                        "name": item.get("name", ""),
+                        "objective": item.get("objective", "UNKNOWN"),
+                        "status": status,
+                    }
+                )
 
-                if not next_url:
-                    break
+            paging = payload.get("paging", {})
+            next_url = paging.get("next")
 
-                url = next_url
-                params = None
+            if not next_url:
+                break
+
+            url = next_url
+            params = None
 
         return campaigns
@@ -220,3 +220,9 @@ Index(
     CampaignActionLog.campaign_id,
     CampaignActionLog.created_at,
 )
+
+Index(
+    "ix_campaign_action_log_user_time",
+    CampaignActionLog.user_id,
+    CampaignActionLog.created_at,
+)
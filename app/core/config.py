@@ -20,6 +20,43 @@ class Settings:
     if not DATABASE_URL:
         raise RuntimeError("DATABASE_URL is not set")
 
+    # Pool — per process (every uvicorn worker has its own pool)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+    # asyncpg prepared statements per connection (0 behind transaction-mode pgbouncer)
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))
+
+    # Server-side statement_timeout per session class (0 = no limit)
+    DB_WEB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_WEB_STATEMENT_TIMEOUT_MS", "30000"))
+    DB_BATCH_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_BATCH_STATEMENT_TIMEOUT_MS", "0"))
+
+    DB_APPLICATION_NAME: str = os.getenv("DB_APPLICATION_NAME", "meta-ai")
+
+    # Read replica for analytics reads (get_read_db); unset = primary only
+    DATABASE_REPLICA_URL: Optional[str] = os.getenv("DATABASE_REPLICA_URL") or None
+    DB_REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "30"))
+    DB_REPLICA_LAG_CHECK_SECONDS: float = float(os.getenv("DB_REPLICA_LAG_CHECK_SECONDS", "5"))
+
+    # =================================================
+    # AUTH CONTEXT CACHE (PER PROCESS)
+    # =================================================
+    # Session / user / subscription / ad accounts per request (0 = off)
+    AUTH_CONTEXT_CACHE_TTL_SECONDS: float = float(
+        os.getenv("AUTH_CONTEXT_CACHE_TTL_SECONDS", "30")
+    )
+    AUTH_CONTEXT_CACHE_MAX_USERS: int = int(
+        os.getenv("AUTH_CONTEXT_CACHE_MAX_USERS", "10000")
+    )
+
+    # global_settings / plans cache; changes arrive by NOTIFY (0 = off)
+    CONFIG_CACHE_TTL_SECONDS: float = float(
+        os.getenv("CONFIG_CACHE_TTL_SECONDS", "300")
+    )
+
     # =================================================
     # PUBLIC APP (MAGIC LINK, BRANDING)
     # =================================================
@@ -54,6 +91,43 @@ class Settings:
     META_APP_SECRET: str = os.getenv("META_APP_SECRET", "")
     META_REDIRECT_URI: str = os.getenv("META_REDIRECT_URI", "")
 
+    # =================================================
+    # META INSIGHTS SYNC (GRAPH CONCURRENCY)
+    # =================================================
+    META_INSIGHTS_MAX_CONCURRENCY: int = int(
+        os.getenv("META_INSIGHTS_MAX_CONCURRENCY", "16")
+    )
+    META_INSIGHTS_PER_ACCOUNT_CONCURRENCY: int = int(
+        os.getenv("META_INSIGHTS_PER_ACCOUNT_CONCURRENCY", "4")
+    )
+    META_INSIGHTS_UPSERT_BATCH_SIZE: int = int(
+        os.getenv("META_INSIGHTS_UPSERT_BATCH_SIZE", "5000")
+    )
+
+    # =================================================
+    # DAILY METRICS PARTITIONS (MONTHLY)
+    # =================================================
+    METRICS_PARTITION_MONTHS_AHEAD: int = int(
+        os.getenv("METRICS_PARTITION_MONTHS_AHEAD", "3")
+    )
+    # 0 = never detach (lifetime aggregates need the full history)
+    METRICS_PARTITION_RETENTION_MONTHS: int = int(
+        os.getenv("METRICS_PARTITION_RETENTION_MONTHS", "0")
+    )
+    METRICS_PARTITION_ARCHIVE_SCHEMA: str = os.getenv(
+        "METRICS_PARTITION_ARCHIVE_SCHEMA", "archive"
+    )
+
+    # =================================================
+    # META GRAPH HTTP CLIENT (SHARED POOL)
+    # =================================================
+    META_GRAPH_HTTP2: bool = os.getenv("META_GRAPH_HTTP2", "true").lower() == "true"
+    META_GRAPH_MAX_CONNECTIONS: int = int(os.getenv("META_GRAPH_MAX_CONNECTIONS", "100"))
+    META_GRAPH_MAX_KEEPALIVE: int = int(os.getenv("META_GRAPH_MAX_KEEPALIVE", "20"))
+    META_GRAPH_KEEPALIVE_EXPIRY: float = float(os.getenv("META_GRAPH_KEEPALIVE_EXPIRY", "30"))
+    META_GRAPH_TIMEOUT: float = float(os.getenv("META_GRAPH_TIMEOUT", "30"))
+    META_GRAPH_MAX_RETRIES: int = int(os.getenv("META_GRAPH_MAX_RETRIES", "3"))
+
     # =================================================
     # SMTP (HARD-FAIL IF NOT CORRECT)
     # =================================================
@@ -92,12 +166,37 @@ class Settings:
     # Optional webhook secret
     RAZORPAY_WEBHOOK_SECRET: str = os.getenv("RAZORPAY_WEBHOOK_SECRET", "")
 
+    # Webhook inbox workers (app.billing.webhook_worker), per process
+    WEBHOOK_WORKERS_ENABLED: bool = os.getenv("WEBHOOK_WORKERS_ENABLED", "true").lower() == "true"
+    WEBHOOK_WORKER_CONCURRENCY: int = int(os.getenv("WEBHOOK_WORKER_CONCURRENCY", "4"))
+    WEBHOOK_POLL_SECONDS: float = float(os.getenv("WEBHOOK_POLL_SECONDS", "5"))
+    WEBHOOK_MAX_ATTEMPTS: int = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "8"))
+    WEBHOOK_RETRY_BASE_SECONDS: float = float(os.getenv("WEBHOOK_RETRY_BASE_SECONDS", "30"))
+
     # =================================================
     # BILLING MODE
     # =================================================
     BILLING_MODE: str = os.getenv("BILLING_MODE", "subscriptions")  # subscriptions | prepaid
     BILLING_CURRENCY: str = os.getenv("BILLING_CURRENCY", "INR")
 
+    # Invoice PDFs (app.billing.invoice_pdf_cache)
+    INVOICE_PDF_DIR: str = os.getenv("INVOICE_PDF_DIR", os.path.join("storage", "invoices"))
+    INVOICE_PDF_WORKERS: int = int(os.getenv("INVOICE_PDF_WORKERS", "2"))
+    INVOICE_PDF_PRERENDER_LOOKBACK_HOURS: int = int(
+        os.getenv("INVOICE_PDF_PRERENDER_LOOKBACK_HOURS", "24")
+    )
+
+    # =================================================
+    # JOB SCHEDULER (app.scheduler)
+    # =================================================
+    SCHEDULER_ENABLED: bool = os.getenv("SCHEDULER_ENABLED", "false").lower() == "true"
+    SCHEDULER_TICK_SECONDS: float = float(os.getenv("SCHEDULER_TICK_SECONDS", "30"))
+    SCHEDULER_MAX_CATCH_UP: int = int(os.getenv("SCHEDULER_MAX_CATCH_UP", "7"))
+    # Nightly DAG (app.pipeline.nightly) instead of the standalone daily sync job
+    NIGHTLY_PIPELINE_ENABLED: bool = (
+        os.getenv("NIGHTLY_PIPELINE_ENABLED", "false").lower() == "true"
+    )
+
     # =================================================
     # SYSTEM
     # =================================================
@@ -0,0 +1,186 @@
+"""
+Config Cache (per process)
+
+Read-through cache of the near-static configuration tables:
+
+    global_settings   (single row)
+    plans             (whole catalog)
+
+Every write bumps config_versions.version for the table and NOTIFYs
+config_cache with "<table>:<version>" (statement trigger, alembic
+4f8b3a2d6e10), so every worker drops its copy. An entry is served only
+while:
+- the LISTEN connection is up (pg_listener), and
+- its version is >= the newest version announced, and
+- it is younger than CONFIG_CACHE_TTL_SECONDS (safety net)
+
+Writers in this process invalidate directly after commit
+(read-your-writes without waiting for the notification).
+
+Callers get fresh transient instances: mutating them never touches the
+cache or the database. Code that updates the row must load it from
+the session.
+
+status() compares cached / announced / database versions (staleness
+is observable through GET /api/health/config-cache).
+"""
+
+import copy
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.pg_listener import pg_listener
+
+logger = logging.getLogger(__name__)
+
+
+CONFIG_CACHE_CHANNEL = "config_cache"
+
+GLOBAL_SETTINGS = "global_settings"
+PLANS = "plans"
+
+
+class ConfigCache:
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+
+        # table → (cache expiry, version loaded, rows as column dicts)
+        self._entries: Dict[str, Tuple[float, int, List[Dict[str, Any]]]] = {}
+        # table → newest version announced by NOTIFY / seen on load
+        self.announced: Dict[str, int] = {}
+
+        self.hits = 0
+        self.loads = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and pg_listener.is_listening(CONFIG_CACHE_CHANNEL)
+
+    # =====================================================
+    # READ
+    # =====================================================
+    async def get_global_settings(self, db: AsyncSession):
+        from app.admin.models import GlobalSettings
+
+        rows = await self._rows(db, GLOBAL_SETTINGS, GlobalSettings)
+        return GlobalSettings(**copy.deepcopy(rows[0])) if rows else None
+
+    async def get_plans(self, db: AsyncSession) -> list:
+        from app.plans.models import Plan
+
+        rows = await self._rows(db, PLANS, Plan)
+        return [Plan(**copy.deepcopy(row)) for row in rows]
+
+    async def get_plan(self, db: AsyncSession, plan_id: int):
+        for plan in await self.get_plans(db):
+            if plan.id == plan_id:
+                return plan
+        return None
+
+    async def get_plan_by_name(self, db: AsyncSession, name: str):
+        for plan in await self.get_plans(db):
+            if plan.name == name:
+                return plan
+        return None
+
+    async def _rows(self, db: AsyncSession, name: str, model) -> List[Dict[str, Any]]:
+        entry = self._entries.get(name)
+        if (
+            entry is not None
+            and self.enabled
+            and entry[0] > time.monotonic()
+            and entry[1] >= self.announced.get(name, 0)
+        ):
+            self.hits += 1
+            return entry[2]
+
+        # Version first: a write landing in between leaves the entry
+        # older than the announced version (reloaded next time)
+        version = await self._db_version(db, name)
+
+        # Core select: nothing enters the caller's identity map
+        stmt = model.__table__.select()
+        if name == GLOBAL_SETTINGS:
+            stmt = stmt.limit(1)
+        else:
+            stmt = stmt.order_by(model.__table__.c.id.asc())
+
+        result = await db.execute(stmt)
+        attrs = [(attr.key, attr.columns[0].name) for attr in model.__mapper__.column_attrs]
+        rows = [
+            {key: row._mapping[column] for key, column in attrs}
+            for row in result.fetchall()
+        ]
+        self.loads += 1
+
+        if self.enabled and version >= self.announced.get(name, 0):
+            self._entries[name] = (time.monotonic() + self.ttl_seconds, version, rows)
+            self.announced[name] = version
+
+        return rows
+
+    @staticmethod
+    async def _db_version(db: AsyncSession, name: str) -> int:
+        result = await db.execute(
+            text("SELECT version FROM config_versions WHERE name = :name"),
+            {"name": name},
+        )
+        return result.scalar() or 0
+
+    # =====================================================
+    # INVALIDATION
+    # =====================================================
+    def invalidate(self, name: Optional[str] = None) -> None:
+        if name is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(name, None)
+
+    def handle_notification(self, payload: str) -> None:
+        # "<table>:<version>"
+        name, _, version = payload.partition(":")
+        try:
+            self.announced[name] = max(self.announced.get(name, 0), int(version))
+        except ValueError:
+            logger.warning("Bad config_cache payload %r; clearing", payload)
+            self.invalidate()
+            return
+        self.invalidate(name)
+
+    # =====================================================
+    # OBSERVABILITY
+    # =====================================================
+    async def status(self, db: AsyncSession) -> dict:
+        tables = {}
+        for name in (GLOBAL_SETTINGS, PLANS):
+            entry = self._entries.get(name)
+            db_version = await self._db_version(db, name)
+            cached_version = entry[1] if entry else None
+            tables[name] = {
+                "cached_version": cached_version,
+                "announced_version": self.announced.get(name),
+                "db_version": db_version,
+                "stale": cached_version is not None and cached_version < db_version,
+            }
+
+        return {
+            "enabled": self.enabled,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "loads": self.loads,
+            "tables": tables,
+        }
+
+
+config_cache = ConfigCache(ttl_seconds=settings.CONFIG_CACHE_TTL_SECONDS)
+
+pg_listener.subscribe(
+    CONFIG_CACHE_CHANNEL,
+    config_cache.handle_notification,
+    on_reconnect=config_cache.invalidate,
+)
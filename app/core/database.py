@@ -1,17 +1,216 @@
 """
-Database engine configuration (LAZY INIT)
+Database engine configuration (LAZY INIT, ONE ENGINE PER PROCESS)
 
 IMPORTANT:
 - Engine MUST NOT be created at import time
 - This avoids crashes when DATABASE_URL is not yet loaded
+- get_engine() is the ONLY engine of the process; sessions
+  (app.core.db_session) and direct users all share its pool
+
+Tuning (app.core.config, DB_*):
+- pool_size / max_overflow / pool_timeout / pool_recycle / pool_pre_ping
+  (sized per process: every uvicorn worker has its own pool)
+- asyncpg prepared statement caches (0 behind transaction-mode pgbouncer)
+- statement_timeout: the web limit is the connection default;
+  batch sessions lift it per transaction (see db_session)
+- Pool checkout wait / saturation recorded by InstrumentedAsyncQueuePool
+
+Read replica (optional, DATABASE_REPLICA_URL):
+- get_replica_engine(): same tuning, separate pool
+- ReplicaLagMonitor: cached replay lag; a replica lagging more than
+  DB_REPLICA_MAX_LAG_SECONDS (or unreachable) is bypassed
 """
 
-from typing import Optional
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import exc, text
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
 from app.core.base import Base
 
+logger = logging.getLogger(__name__)
+
+
+# Checkout wait histogram bucket upper bounds (seconds)
+CHECKOUT_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+# =========================================================
+# POOL METRICS
+# =========================================================
+class PoolMetrics:
+    """
+    Checkout counters for one pool (one process).
+
+    saturated_checkouts: checkouts that found no idle connection and
+    no overflow headroom, i.e. had to wait for another task to return
+    a connection.
+    """
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.saturated_checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_sum = 0.0
+        self.wait_seconds_max = 0.0
+        self.wait_buckets = [0] * len(CHECKOUT_WAIT_BUCKETS)
+
+    def record(self, wait_seconds: float, saturated: bool) -> None:
+        self.checkouts += 1
+        self.saturated_checkouts += int(saturated)
+        self.wait_seconds_sum += wait_seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+        for index, bound in enumerate(CHECKOUT_WAIT_BUCKETS):
+            if wait_seconds <= bound:
+                self.wait_buckets[index] += 1
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        saturated = (
+            self.checkedin() == 0
+            and -1 < self._max_overflow <= self.overflow()
+        )
+        started = time.perf_counter()
+
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+
+        self.metrics.record(time.perf_counter() - started, saturated)
+        return entry
+
+
+def pool_stats(engine: Optional[AsyncEngine] = None) -> Dict[str, Any]:
+    """
+    Current pool gauges + checkout counters of this process.
+    """
+
+    pool = (engine or get_engine()).pool
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    metrics: Optional[PoolMetrics] = getattr(pool, "metrics", None)
+
+    stats: Dict[str, Any] = {
+        "pid": os.getpid(),
+        "pool_size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "saturation": round(pool.checkedout() / capacity, 3) if capacity else None,
+    }
+
+    if metrics is not None:
+        stats.update(
+            {
+                "checkouts_total": metrics.checkouts,
+                "saturated_checkouts_total": metrics.saturated_checkouts,
+                "checkout_timeouts_total": metrics.timeouts,
+                "checkout_wait_seconds_sum": round(metrics.wait_seconds_sum, 6),
+                "checkout_wait_seconds_max": round(metrics.wait_seconds_max, 6),
+                "checkout_wait_buckets": dict(
+                    zip(
+                        [str(bound) for bound in CHECKOUT_WAIT_BUCKETS],
+                        metrics.wait_buckets,
+                    )
+                ),
+            }
+        )
+
+    return stats
+
+
+def render_pool_metrics(engine: Optional[AsyncEngine] = None) -> str:
+    """
+    pool_stats() in Prometheus text exposition format.
+    """
+
+    stats = pool_stats(engine)
+    labels = f'pid="{stats["pid"]}"'
+    lines = []
+
+    for name in ("pool_size", "max_overflow", "checked_out", "checked_in", "overflow"):
+        lines.append(f"db_pool_{name}{{{labels}}} {stats[name]}")
+
+    if stats["saturation"] is not None:
+        lines.append(f"db_pool_saturation{{{labels}}} {stats['saturation']}")
+
+    if "checkouts_total" in stats:
+        for name in (
+            "checkouts_total",
+            "saturated_checkouts_total",
+            "checkout_timeouts_total",
+        ):
+            lines.append(f"db_pool_{name}{{{labels}}} {stats[name]}")
+
+        for bound, count in stats["checkout_wait_buckets"].items():
+            lines.append(
+                f'db_pool_checkout_wait_seconds_bucket{{{labels},le="{bound}"}} {count}'
+            )
+        lines.append(
+            f'db_pool_checkout_wait_seconds_bucket{{{labels},le="+Inf"}} '
+            f"{stats['checkouts_total']}"
+        )
+        lines.append(
+            f"db_pool_checkout_wait_seconds_sum{{{labels}}} "
+            f"{stats['checkout_wait_seconds_sum']}"
+        )
+        lines.append(
+            f"db_pool_checkout_wait_seconds_count{{{labels}}} {stats['checkouts_total']}"
+        )
+
+    return "\n".join(lines) + "\n"
+
+
+# =========================================================
+# ENGINE FACTORY
+# =========================================================
+def create_engine(url: Optional[str] = None, **overrides: Any) -> AsyncEngine:
+    """
+    Builds an async engine with the DB_* pool / timeout settings.
+    Prefer get_engine(); this is for tools that need a private pool.
+    """
+
+    url = url or settings.DATABASE_URL
+    if not url:
+        raise RuntimeError("DATABASE_URL is not set")
+
+    server_settings = {"application_name": settings.DB_APPLICATION_NAME}
+    if settings.DB_WEB_STATEMENT_TIMEOUT_MS:
+        server_settings["statement_timeout"] = str(settings.DB_WEB_STATEMENT_TIMEOUT_MS)
+
+    options: Dict[str, Any] = {
+        "echo": False,
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": {
+            # asyncpg's own cache + SQLAlchemy's prepared statement LRU
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "server_settings": server_settings,
+        },
+    }
+    options.update(overrides)
+
+    return create_async_engine(url, **options)
+
 
 # =========================================================
 # LAZY ENGINE (SAFE)
@@ -21,20 +220,93 @@ _engine: Optional[AsyncEngine] = None
 
 def get_engine() -> AsyncEngine:
     """
-    Lazily create and return the async engine.
+    Lazily create and return the process-wide async engine.
     """
     global _engine
 
     if _engine is None:
-        if not settings.DATABASE_URL:
-            raise RuntimeError("DATABASE_URL is not set")
+        _engine = create_engine()
+
+    return _engine
+
+
+# =========================================================
+# READ REPLICA (OPTIONAL)
+# =========================================================
+_replica_engine: Optional[AsyncEngine] = None
 
-        _engine = create_async_engine(
-            settings.DATABASE_URL,
-            echo=False,
+
+def get_replica_engine() -> Optional[AsyncEngine]:
+    """
+    Lazily create the replica engine; None when no replica is configured.
+    """
+    global _replica_engine
+
+    if _replica_engine is None and settings.DATABASE_REPLICA_URL:
+        _replica_engine = create_engine(settings.DATABASE_REPLICA_URL)
+
+    return _replica_engine
+
+
+class ReplicaLagMonitor:
+    """
+    Replay lag of the replica, re-measured at most every
+    DB_REPLICA_LAG_CHECK_SECONDS (one query, shared by all requests of
+    the process).
+
+    A replica that has replayed everything it received counts as 0s
+    behind even when the primary has been idle for a while.
+    """
+
+    LAG_SQL = """
+        SELECT CASE
+            WHEN NOT pg_is_in_recovery() THEN 0
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE COALESCE(
+                EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()),
+                0
+            )
+        END
+    """
+
+    def __init__(self) -> None:
+        self.lag_seconds: Optional[float] = None
+        self.checked_at = 0.0
+        self.healthy = False
+        self._lock = asyncio.Lock()
+
+    async def is_usable(self, engine: AsyncEngine) -> bool:
+        if time.monotonic() - self.checked_at >= settings.DB_REPLICA_LAG_CHECK_SECONDS:
+            async with self._lock:
+                if time.monotonic() - self.checked_at >= settings.DB_REPLICA_LAG_CHECK_SECONDS:
+                    await self._measure(engine)
+        return self.healthy
+
+    async def _measure(self, engine: AsyncEngine) -> None:
+        try:
+            async with engine.connect() as conn:
+                lag = await conn.scalar(text(self.LAG_SQL))
+            self.lag_seconds = float(lag)
+        except Exception as exc_:
+            logger.warning("Replica lag check failed → %r", exc_)
+            self.lag_seconds = None
+
+        healthy = (
+            self.lag_seconds is not None
+            and self.lag_seconds <= settings.DB_REPLICA_MAX_LAG_SECONDS
         )
+        if healthy != self.healthy:
+            logger.warning(
+                "Replica %s (lag=%s)",
+                "back in use" if healthy else "bypassed",
+                self.lag_seconds,
+            )
 
-    return _engine
+        self.healthy = healthy
+        self.checked_at = time.monotonic()
+
+
+replica_lag = ReplicaLagMonitor()
 
 
 # =========================================================
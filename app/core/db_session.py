@@ -1,27 +1,109 @@
 """
 Async database session setup
 (No connection is made until used)
+
+Session classes (same engine, same pool):
+- AsyncSessionLocal: web requests (get_db). Runs under the
+  connection default statement_timeout (DB_WEB_STATEMENT_TIMEOUT_MS)
+- BatchSessionLocal: jobs / scripts / pipeline stages. Every
+  transaction starts with SET LOCAL statement_timeout =
+  DB_BATCH_STATEMENT_TIMEOUT_MS (0 = no limit)
+
+Read routing (get_read_db, read-only analytics endpoints):
+- Reads go to the replica (DATABASE_REPLICA_URL) unless it is not
+  configured, lagging (ReplicaLagMonitor) or unreachable
+- Pinned to the primary once a get_db session of the SAME request
+  commits, so a request never reads around its own write (applies to
+  read transactions that begin after the commit)
 """
 
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
-    create_async_engine,
     async_sessionmaker,
     AsyncSession,
 )
+from sqlalchemy.orm import Session
+
 from app.core.config import settings
+from app.core.database import get_engine, get_replica_engine, replica_lag
+
+
+# =========================================================
+# ASYNC ENGINE (THE PROCESS-WIDE INSTANCE)
+# =========================================================
+engine = get_engine()
+
+
+# =========================================================
+# BATCH SESSION CLASS
+# =========================================================
+class BatchSession(Session):
+    """
+    Sync session class behind BatchSessionLocal.
+    """
+
+
+@event.listens_for(BatchSession, "after_begin")
+def _set_batch_statement_timeout(session, transaction, connection) -> None:
+    # SET does not take bind parameters; the value is an int setting
+    connection.exec_driver_sql(
+        f"SET LOCAL statement_timeout = {int(settings.DB_BATCH_STATEMENT_TIMEOUT_MS)}"
+    )
 
 
 # =========================================================
-# ASYNC ENGINE
+# READ ROUTING (PER REQUEST)
 # =========================================================
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=False,
+class ReadRouting:
+    """
+    Shared by the get_db / get_read_db sessions of one request.
+    """
+
+    def __init__(self) -> None:
+        self.pinned_to_primary = False
+
+
+_read_routing: ContextVar[Optional[ReadRouting]] = ContextVar(
+    "read_routing",
+    default=None,
 )
 
 
+def _request_routing() -> ReadRouting:
+    # Each request runs in its own context copy → one object per request
+    routing = _read_routing.get()
+    if routing is None:
+        routing = ReadRouting()
+        _read_routing.set(routing)
+    return routing
+
+
+@event.listens_for(Session, "after_commit")
+def _pin_reads_to_primary(session) -> None:
+    routing = session.info.get("read_routing")
+    if routing is not None and not isinstance(session, ReadSession):
+        routing.pinned_to_primary = True
+
+
+class ReadSession(Session):
+    """
+    Sync session class behind get_read_db: replica unless pinned.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        routing: Optional[ReadRouting] = self.info.get("read_routing")
+        replica = self.info.get("replica")
+
+        if replica is not None and not (routing and routing.pinned_to_primary):
+            return replica.sync_engine
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
 # =========================================================
-# SESSION FACTORY
+# SESSION FACTORIES
 # =========================================================
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -29,6 +111,20 @@ AsyncSessionLocal = async_sessionmaker(
     class_=AsyncSession,
 )
 
+BatchSessionLocal = async_sessionmaker(
+    engine,
+    expire_on_commit=False,
+    class_=AsyncSession,
+    sync_session_class=BatchSession,
+)
+
+ReadSessionLocal = async_sessionmaker(
+    engine,
+    expire_on_commit=False,
+    class_=AsyncSession,
+    sync_session_class=ReadSession,
+)
+
 
 # =========================================================
 # FASTAPI DEPENDENCY
@@ -37,5 +133,22 @@ async def get_db():
     """
     FastAPI dependency that provides an async DB session.
     """
-    async with AsyncSessionLocal() as session:
+    async with AsyncSessionLocal(info={"read_routing": _request_routing()}) as session:
+        yield session
+
+
+async def get_read_db():
+    """
+    FastAPI dependency for READ-ONLY analytics: replica-backed session
+    (falls back to the primary, see module docstring).
+    """
+    routing = _request_routing()
+    replica = get_replica_engine()
+
+    if replica is not None and not await replica_lag.is_usable(replica):
+        replica = None
+
+    async with ReadSessionLocal(
+        info={"read_routing": routing, "replica": replica}
+    ) as session:
         yield session
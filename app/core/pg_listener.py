@@ -0,0 +1,143 @@
+"""
+Postgres LISTEN / NOTIFY (one connection per process)
+
+Process-local caches register a channel here; the listener keeps ONE
+dedicated asyncpg connection (outside the SQLAlchemy pool) LISTENing on
+every registered channel and calls the handlers with the payload.
+
+- Started / stopped by the app startup / shutdown hooks
+- Reconnects with backoff; notifications sent while disconnected are
+  lost, so on_reconnect handlers run after every (re)connect and
+  is_listening() is False in between (caches must not trust
+  themselves then)
+- notify() sends through a regular session / connection, so delivery
+  happens on commit of the writing transaction
+"""
+
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+RECONNECT_BACKOFF_SECONDS = (1, 2, 5, 10, 30)
+
+NotificationHandler = Callable[[str], None]
+ReconnectHandler = Callable[[], None]
+
+
+async def notify(db, channel: str, payload: str) -> None:
+    """
+    pg_notify inside the caller's transaction (sent on commit).
+    """
+
+    await db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": channel, "payload": payload},
+    )
+
+
+class PgListener:
+    def __init__(self) -> None:
+        self._handlers: Dict[str, List[NotificationHandler]] = {}
+        self._reconnect_handlers: Dict[str, List[ReconnectHandler]] = {}
+        self._connection: Optional[asyncpg.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+        self._listening = False
+
+    # =====================================================
+    # REGISTRATION
+    # =====================================================
+    def subscribe(
+        self,
+        channel: str,
+        handler: NotificationHandler,
+        *,
+        on_reconnect: Optional[ReconnectHandler] = None,
+    ) -> None:
+        self._handlers.setdefault(channel, []).append(handler)
+        if on_reconnect is not None:
+            self._reconnect_handlers.setdefault(channel, []).append(on_reconnect)
+
+    def is_listening(self, channel: str) -> bool:
+        return self._listening and channel in self._handlers
+
+    # =====================================================
+    # LIFECYCLE
+    # =====================================================
+    async def start(self) -> None:
+        if self._task is None and self._handlers:
+            self._task = asyncio.create_task(self._run(), name="pg-listener")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        attempt = 0
+
+        while True:
+            closed = asyncio.Event()
+
+            try:
+                self._connection = await asyncpg.connect(_asyncpg_dsn())
+                self._connection.add_termination_listener(lambda _: closed.set())
+
+                for channel in self._handlers:
+                    await self._connection.add_listener(channel, self._dispatch)
+
+                self._listening = True
+                attempt = 0
+                logger.info("Listening on %s", ", ".join(self._handlers))
+
+                for channel, handlers in self._reconnect_handlers.items():
+                    for handler in handlers:
+                        handler()
+
+                await closed.wait()
+                logger.warning("LISTEN connection closed")
+
+            except asyncio.CancelledError:
+                self._listening = False
+                if self._connection is not None and not self._connection.is_closed():
+                    await self._connection.close()
+                raise
+
+            except Exception as exc:
+                logger.warning("LISTEN connection failed → %r", exc)
+
+            self._listening = False
+            delay = RECONNECT_BACKOFF_SECONDS[min(attempt, len(RECONNECT_BACKOFF_SECONDS) - 1)]
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def _dispatch(self, connection, pid: int, channel: str, payload: str) -> None:
+        for handler in self._handlers.get(channel, []):
+            try:
+                handler(payload)
+            except Exception:
+                logger.exception("Notification handler failed (%s: %s)", channel, payload)
+
+
+def _asyncpg_dsn() -> str:
+    # postgresql+asyncpg://... → postgresql://... (asyncpg.connect DSN)
+    return make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(
+        hide_password=False
+    )
+
+
+pg_listener = PgListener()
@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from uuid import UUID
 
-from app.core.db_session import get_db
+from app.core.db_session import get_read_db
 from app.auth.dependencies import get_session_context
 
 from app.meta_api.models import MetaOAuthToken, UserMetaAdAccount
@@ -18,7 +18,7 @@ router = APIRouter(
 
 @router.get("/summary")
 async def dashboard_summary(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     session: dict = Depends(get_session_context),
 ):
     """
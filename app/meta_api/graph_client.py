@@ -0,0 +1,245 @@
+"""
+Meta Graph HTTP Client (SHARED)
+
+Purpose:
+- ONE process-wide httpx.AsyncClient for every Meta Graph call
+  (keep-alive pool + HTTP/2 → no TLS handshake per request)
+- Retry with jittered backoff on 5xx / transport errors and
+  Graph throttling codes (613, 17, 4)
+- Per-request timing metrics
+
+Lifecycle:
+- main.py opens it on startup and closes it on shutdown
+- Scripts / workers get a lazily created client and should
+  await close_graph_client() before exiting
+
+Callers keep their own status handling: get() returns the
+final response and only raises httpx.HTTPError when the
+network itself kept failing.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import defaultdict
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+GRAPH_BASE = "https://graph.facebook.com/v19.0"
+
+# 613: calls within one hour exceeded, 17: user request limit, 4: app limit
+RETRYABLE_ERROR_CODES = {4, 17, 613}
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class MetaGraphClient:
+    """
+    Thin wrapper over a pooled httpx.AsyncClient.
+
+    - NO database access
+    - NO business logic
+    """
+
+    def __init__(
+        self,
+        *,
+        http_client: Optional[httpx.AsyncClient] = None,
+        max_retries: Optional[int] = None,
+        base_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+    ):
+        self.http = http_client or httpx.AsyncClient(
+            http2=settings.META_GRAPH_HTTP2 and _http2_available(),
+            timeout=settings.META_GRAPH_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.META_GRAPH_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.META_GRAPH_MAX_KEEPALIVE,
+                keepalive_expiry=settings.META_GRAPH_KEEPALIVE_EXPIRY,
+            ),
+        )
+        self.max_retries = (
+            settings.META_GRAPH_MAX_RETRIES if max_retries is None else max_retries
+        )
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._stats: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {
+                "requests": 0,
+                "errors": 0,
+                "retries": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+            }
+        )
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
+
+    # =====================================================
+    # REQUESTS
+    # =====================================================
+    async def get(
+        self,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+    ) -> httpx.Response:
+        return await self.request(
+            "GET",
+            url,
+            params=params,
+            timeout=timeout,
+            max_retries=max_retries,
+        )
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+    ) -> httpx.Response:
+        retries = self.max_retries if max_retries is None else max_retries
+        endpoint = _endpoint(url)
+        stats = self._stats[endpoint]
+        extra = {} if timeout is None else {"timeout": timeout}
+
+        for attempt in range(retries + 1):
+            started = time.perf_counter()
+
+            try:
+                response = await self.http.request(
+                    method,
+                    url,
+                    params=params,
+                    **extra,
+                )
+            except httpx.HTTPError:
+                self._record(stats, started, error=True)
+                if attempt >= retries:
+                    raise
+                stats["retries"] += 1
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+
+            retryable = _is_retryable(response)
+            elapsed_ms = self._record(stats, started, error=retryable)
+
+            logger.debug(
+                "graph %s %s status=%s attempt=%s %.1fms",
+                method,
+                endpoint,
+                response.status_code,
+                attempt + 1,
+                elapsed_ms,
+            )
+
+            if not retryable or attempt >= retries:
+                return response
+
+            stats["retries"] += 1
+            await asyncio.sleep(self._backoff(attempt))
+
+        raise RuntimeError("unreachable: retry loop always returns or raises")
+
+    def _backoff(self, attempt: int) -> float:
+        ceiling = min(self.max_backoff, self.base_backoff * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    # =====================================================
+    # METRICS
+    # =====================================================
+    @staticmethod
+    def _record(stats: Dict[str, float], started: float, *, error: bool) -> float:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        stats["requests"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        if error:
+            stats["errors"] += 1
+        return elapsed_ms
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Per-endpoint request counts and latency (ms)."""
+
+        return {
+            endpoint: {
+                **stats,
+                "avg_ms": (
+                    round(stats["total_ms"] / stats["requests"], 2)
+                    if stats["requests"]
+                    else 0.0
+                ),
+            }
+            for endpoint, stats in self._stats.items()
+        }
+
+
+# =====================================================
+# HELPERS
+# =====================================================
+def _is_retryable(response: httpx.Response) -> bool:
+    if response.status_code in RETRYABLE_STATUS_CODES:
+        return True
+
+    if response.status_code < 400:
+        return False
+
+    try:
+        payload = response.json()
+    except ValueError:
+        return False
+
+    error = payload.get("error") if isinstance(payload, dict) else None
+    return isinstance(error, dict) and error.get("code") in RETRYABLE_ERROR_CODES
+
+
+def _endpoint(url: str) -> str:
+    """
+    Metric key without ids: /v19.0/act_1/insights → insights
+    """
+
+    segments = [s for s in urlsplit(url).path.split("/") if s]
+    return segments[-1] if segments else "/"
+
+
+# =====================================================
+# PROCESS-WIDE INSTANCE
+# =====================================================
+_graph_client: Optional[MetaGraphClient] = None
+
+
+def get_graph_client() -> MetaGraphClient:
+    global _graph_client
+    if _graph_client is None:
+        _graph_client = MetaGraphClient()
+    return _graph_client
+
+
+async def close_graph_client() -> None:
+    global _graph_client
+    if _graph_client is not None:
+        await _graph_client.aclose()
+        _graph_client = None
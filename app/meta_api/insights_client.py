@@ -1,8 +1,8 @@
+import json
 from typing import Dict, List, Optional
 from datetime import date
 
-import httpx
-
+from app.meta_api.graph_client import GRAPH_BASE, get_graph_client
 from app.meta_api.models import MetaAdAccount
 from app.meta_api.meta_client import MetaAPIError
 
@@ -18,7 +18,7 @@ class MetaInsightsClient:
     - Fetch raw campaign performance only
     """
 
-    GRAPH_BASE = "https://graph.facebook.com/v19.0"
+    GRAPH_BASE = GRAPH_BASE
 
     # -----------------------------------------------------
     # FETCH CAMPAIGN INSIGHTS
@@ -62,13 +62,14 @@ class MetaInsightsClient:
         }
 
         if since and until:
-            params["time_range"] = {
-                "since": since.isoformat(),
-                "until": until.isoformat(),
-            }
+            params["time_range"] = json.dumps(
+                {
+                    "since": since.isoformat(),
+                    "until": until.isoformat(),
+                }
+            )
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await client.get(url, params=params)
+        resp = await get_graph_client().get(url, params=params, timeout=30)
 
         if resp.status_code != 200:
             raise MetaAPIError(resp.text)
@@ -1,7 +1,7 @@
 from typing import List, Dict, Optional
-import httpx
 from datetime import datetime
 
+from app.meta_api.graph_client import GRAPH_BASE, get_graph_client
 from app.meta_api.models import MetaAdAccount
 from app.meta_api.models import MetaOAuthToken
 
@@ -18,7 +18,7 @@ class MetaCampaignClient:
     - NO enforcement
     """
 
-    GRAPH_BASE = "https://graph.facebook.com/v19.0"
+    GRAPH_BASE = GRAPH_BASE
 
     # =====================================================
     # INTERNAL: GET ACTIVE USER TOKEN
@@ -59,8 +59,7 @@ class MetaCampaignClient:
             "access_token": access_token,
         }
 
-        async with httpx.AsyncClient(timeout=20) as client:
-            resp = await client.get(url, params=params)
+        resp = await get_graph_client().get(url, params=params, timeout=20)
 
         if resp.status_code != 200:
             raise MetaAPIError(resp.text)
@@ -92,8 +91,7 @@ class MetaCampaignClient:
         if not params["access_token"]:
             raise MetaAPIError("Missing Meta access token")
 
-        async with httpx.AsyncClient(timeout=20) as client:
-            resp = await client.get(url, params=params)
+        resp = await get_graph_client().get(url, params=params, timeout=20)
 
         if resp.status_code != 200:
             raise MetaAPIError(resp.text)
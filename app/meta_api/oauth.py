@@ -1,7 +1,7 @@
 import urllib.parse
-import httpx
 
 from app.core.config import settings
+from app.meta_api.graph_client import get_graph_client
 
 META_AUTH_BASE = "https://www.facebook.com/v19.0/dialog/oauth"
 META_TOKEN_URL = "https://graph.facebook.com/v19.0/oauth/access_token"
@@ -40,16 +40,18 @@ async def exchange_code_for_token(code: str) -> dict:
     if not settings.META_APP_ID or not settings.META_APP_SECRET:
         raise ValueError("Meta OAuth credentials are not configured")
 
-    async with httpx.AsyncClient(timeout=10) as client:
-        response = await client.get(
-            META_TOKEN_URL,
-            params={
-                "client_id": settings.META_APP_ID,
-                "client_secret": settings.META_APP_SECRET,
-                "redirect_uri": settings.META_REDIRECT_URI,
-                "code": code,
-            },
-        )
-
-        response.raise_for_status()
-        return response.json()
+    # OAuth codes are single-use: never retry the exchange
+    response = await get_graph_client().get(
+        META_TOKEN_URL,
+        params={
+            "client_id": settings.META_APP_ID,
+            "client_secret": settings.META_APP_SECRET,
+            "redirect_uri": settings.META_REDIRECT_URI,
+            "code": code,
+        },
+        timeout=10,
+        max_retries=0,
+    )
+
+    response.raise_for_status()
+    return response.json()
@@ -2,7 +2,6 @@ from datetime import datetime, timedelta
 from uuid import UUID, uuid4
 from typing import List
 
-import httpx
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -13,11 +12,13 @@ from app.meta_api.models import (
 )
 from app.campaigns.models import Campaign
 from app.core.config import settings
+from app.meta_api.graph_client import GRAPH_BASE, get_graph_client
 from app.plans.enforcement import EnforcementError
 from app.admin.models import AdminAuditLog, GlobalSettings
+from app.core.config_cache import config_cache, GLOBAL_SETTINGS
 
-META_GRAPH_BASE = "https://graph.facebook.com/v19.0"
-META_TOKEN_URL = "https://graph.facebook.com/v19.0/oauth/access_token"
+META_GRAPH_BASE = GRAPH_BASE
+META_TOKEN_URL = f"{GRAPH_BASE}/oauth/access_token"
 
 
 # =====================================================
@@ -44,18 +45,18 @@ class MetaOAuthService:
     async def _exchange_for_long_lived_token(short_token: str) -> dict:
         assert_meta_sync_enabled()
 
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(
-                META_TOKEN_URL,
-                params={
-                    "grant_type": "fb_exchange_token",
-                    "client_id": settings.META_APP_ID,
-                    "client_secret": settings.META_APP_SECRET,
-                    "fb_exchange_token": short_token,
-                },
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await get_graph_client().get(
+            META_TOKEN_URL,
+            params={
+                "grant_type": "fb_exchange_token",
+                "client_id": settings.META_APP_ID,
+                "client_secret": settings.META_APP_SECRET,
+                "fb_exchange_token": short_token,
+            },
+            timeout=10,
+        )
+        response.raise_for_status()
+        return response.json()
 
     @staticmethod
     async def store_token(
@@ -132,16 +133,16 @@ class MetaAdAccountService:
         if not token:
             raise RuntimeError("Meta account not connected")
 
-        async with httpx.AsyncClient(timeout=15) as client:
-            response = await client.get(
-                f"{META_GRAPH_BASE}/me/adaccounts",
-                params={
-                    "access_token": token.access_token,
-                    "fields": "id,name,account_status",
-                },
-            )
-            response.raise_for_status()
-            data = response.json().get("data", [])
+        response = await get_graph_client().get(
+            f"{META_GRAPH_BASE}/me/adaccounts",
+            params={
+                "access_token": token.access_token,
+                "fields": "id,name,account_status",
+            },
+            timeout=15,
+        )
+        response.raise_for_status()
+        data = response.json().get("data", [])
 
         processed = 0
 
@@ -229,45 +230,47 @@ class MetaCampaignService:
         total = 0
 
         try:
-            async with httpx.AsyncClient(timeout=20) as client:
-                for ad_account in ad_accounts:
-                    response = await client.get(
-                        f"{META_GRAPH_BASE}/{ad_account.meta_account_id}/campaigns",
-                        params={
-                            "access_token": token.access_token,
-                            "fields": "id,name,objective,status",
-                        },
-                    )
-                    response.raise_for_status()
+            graph = get_graph_client()
+
+            for ad_account in ad_accounts:
+                response = await graph.get(
+                    f"{META_GRAPH_BASE}/{ad_account.meta_account_id}/campaigns",
+                    params={
+                        "access_token": token.access_token,
+                        "fields": "id,name,objective,status",
+                    },
+                    timeout=20,
+                )
+                response.raise_for_status()
 
-                    for c in response.json().get("data", []):
-                        result = await db.execute(
-                            select(Campaign).where(
-                                Campaign.meta_campaign_id == c["id"],
-                                Campaign.ad_account_id == ad_account.id,
-                            )
+                for c in response.json().get("data", []):
+                    result = await db.execute(
+                        select(Campaign).where(
+                            Campaign.meta_campaign_id == c["id"],
+                            Campaign.ad_account_id == ad_account.id,
                         )
-                        campaign = result.scalar_one_or_none()
-
-                        if not campaign:
-                            db.add(
-                                Campaign(
-                                    meta_campaign_id=c["id"],
-                                    ad_account_id=ad_account.id,
-                                    name=c["name"],
-                                    objective=c["objective"],
-                                    status=c["status"],
-                                    ai_active=False,
-                                    created_at=datetime.utcnow(),
-                                )
+                    )
+                    campaign = result.scalar_one_or_none()
+
+                    if not campaign:
+                        db.add(
+                            Campaign(
+                                meta_campaign_id=c["id"],
+                                ad_account_id=ad_account.id,
+                                name=c["name"],
+                                objective=c["objective"],
+                                status=c["status"],
+                                ai_active=False,
+                                created_at=datetime.utcnow(),
                             )
-                        else:
-                            campaign.name = c["name"]
-                            campaign.objective = c["objective"]
-                            campaign.status = c["status"]
-                            campaign.last_meta_sync_at = datetime.utcnow()
+                        )
+                    else:
+                        campaign.name = c["name"]
+                        campaign.objective = c["objective"]
+                        campaign.status = c["status"]
+                        campaign.last_meta_sync_at = datetime.utcnow()
 
-                        total += 1
+                    total += 1
 
             await db.commit()
             return total
@@ -342,5 +345,6 @@ class MetaSettingsService:
 
         db.add(audit)
         await db.commit()
+        config_cache.invalidate(GLOBAL_SETTINGS)
         await db.refresh(settings)
         return settings
@@ -3,24 +3,115 @@ Meta Campaign Insights Client
 
 Purpose:
 - Fetch daily campaign insights from Meta
+  (one paginated level=campaign request per ad account)
 - Fetch breakdown-level insights (Phase 8)
 - READ-ONLY
 - NEVER raise
-- Stub-safe for now
+- Safe to call concurrently (rate limited per ad account)
 """
 
+import asyncio
+import json
 from datetime import date, datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List, Optional
+from uuid import UUID
 
+import httpx
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.ai.services.kpi_normalizer import KPINormalizer
 from app.campaigns.models import Campaign
-from app.meta_api.models import MetaAdAccount
+from app.core.config import settings
+from app.meta_api.graph_client import GRAPH_BASE, MetaGraphClient, get_graph_client
+from app.meta_api.models import MetaAdAccount, MetaOAuthToken, UserMetaAdAccount
+from app.meta_insights.clients.meta_rate_limiter import (
+    MetaRateLimiter,
+    RETRYABLE_STATUS_CODES,
+    is_throttle_error,
+)
+
+
+EMPTY_DAILY_INSIGHTS = {
+    "impressions": 0,
+    "clicks": 0,
+    "spend": 0.0,
+    "leads": 0,
+    "purchases": 0,
+    "purchase_value": 0.0,
+}
+
+
+DAILY_INSIGHTS_FIELDS = "impressions,clicks,spend,actions,action_values"
 
 
 class MetaCampaignInsightsClient:
-    def __init__(self, db: AsyncSession):
+    GRAPH_BASE = GRAPH_BASE
+    MAX_ATTEMPTS = 5
+    PAGE_SIZE = 500
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        *,
+        rate_limiter: Optional[MetaRateLimiter] = None,
+        graph_client: Optional[MetaGraphClient] = None,
+    ):
         self.db = db
+        self.rate_limiter = rate_limiter or MetaRateLimiter(
+            max_concurrency=settings.META_INSIGHTS_MAX_CONCURRENCY,
+            per_account_concurrency=settings.META_INSIGHTS_PER_ACCOUNT_CONCURRENCY,
+        )
+        self.graph = graph_client or get_graph_client()
+        self._tokens: Dict[UUID, Optional[str]] = {}
+
+        self.requests_made = 0
+        self.failed_requests = 0
+
+    # =====================================================
+    # ACCESS TOKENS (ONE QUERY, BEFORE ANY FAN-OUT)
+    # =====================================================
+    async def resolve_access_tokens(
+        self,
+        ad_account_ids: Iterable[UUID],
+    ) -> Dict[UUID, Optional[str]]:
+        """
+        Resolves an active user token for every ad account.
+
+        Must be awaited before concurrent fetches: the DB session
+        cannot be shared by concurrent tasks.
+        """
+
+        missing = {aid for aid in ad_account_ids if aid not in self._tokens}
+
+        if missing:
+            result = await self.db.execute(
+                select(
+                    UserMetaAdAccount.meta_ad_account_id,
+                    MetaOAuthToken.access_token,
+                )
+                .join(
+                    MetaOAuthToken,
+                    MetaOAuthToken.user_id == UserMetaAdAccount.user_id,
+                )
+                .where(
+                    UserMetaAdAccount.meta_ad_account_id.in_(missing),
+                    MetaOAuthToken.is_active.is_(True),
+                )
+                .order_by(
+                    UserMetaAdAccount.is_selected.desc(),
+                    MetaOAuthToken.created_at.desc(),
+                )
+            )
+
+            for aid in missing:
+                self._tokens[aid] = None
+
+            for ad_account_id, access_token in result.all():
+                if self._tokens.get(ad_account_id) is None:
+                    self._tokens[ad_account_id] = access_token
+
+        return {aid: self._tokens.get(aid) for aid in ad_account_ids}
 
     # =====================================================
     # CAMPAIGN-LEVEL (PHASE 6.5)
@@ -37,14 +128,171 @@ class MetaCampaignInsightsClient:
         All-zero payload = NO DATA.
         """
 
-        return {
-            "impressions": 0,
-            "clicks": 0,
-            "spend": 0.0,
-            "leads": 0,
-            "purchases": 0,
-            "purchase_value": 0.0,
-        }
+        try:
+            if campaign.ad_account_id not in self._tokens:
+                await self.resolve_access_tokens([campaign.ad_account_id])
+
+            access_token = self._tokens.get(campaign.ad_account_id)
+            if not access_token:
+                return dict(EMPTY_DAILY_INSIGHTS)
+
+            payload = await self._get(
+                account_key=str(campaign.ad_account_id),
+                url=f"{self.GRAPH_BASE}/{campaign.meta_campaign_id}/insights",
+                params={
+                    "level": "campaign",
+                    "fields": DAILY_INSIGHTS_FIELDS,
+                    "time_range": json.dumps(
+                        {
+                            "since": target_date.isoformat(),
+                            "until": target_date.isoformat(),
+                        }
+                    ),
+                    "access_token": access_token,
+                },
+            )
+
+            rows = (payload or {}).get("data") or []
+            if not rows:
+                return dict(EMPTY_DAILY_INSIGHTS)
+
+            return KPINormalizer.normalize_daily_row(insights=rows[0])
+
+        except Exception:
+            return dict(EMPTY_DAILY_INSIGHTS)
+
+    # =====================================================
+    # ACCOUNT-LEVEL DAILY (ALL CAMPAIGNS, ONE RANGED REQUEST)
+    # =====================================================
+    async def fetch_account_daily_insights(
+        self,
+        *,
+        ad_account_id: UUID,
+        meta_account_id: str,
+        since: date,
+        until: date,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        One level=campaign, time_increment=1 request per ad account,
+        following paging.next until exhausted.
+
+        Returns rows with keys:
+        - meta_campaign_id
+        - metric_date
+        - impressions, clicks, spend, leads, purchases, purchase_value
+
+        Returns None when Meta could not be reached (never raises).
+        """
+
+        try:
+            if ad_account_id not in self._tokens:
+                await self.resolve_access_tokens([ad_account_id])
+
+            access_token = self._tokens.get(ad_account_id)
+            if not access_token:
+                return None
+
+            url: Optional[str] = f"{self.GRAPH_BASE}/{meta_account_id}/insights"
+            params: Optional[Dict[str, Any]] = {
+                "level": "campaign",
+                "time_increment": 1,
+                "fields": f"campaign_id,{DAILY_INSIGHTS_FIELDS}",
+                "time_range": json.dumps(
+                    {
+                        "since": since.isoformat(),
+                        "until": until.isoformat(),
+                    }
+                ),
+                "limit": self.PAGE_SIZE,
+                "access_token": access_token,
+            }
+
+            rows: List[Dict[str, Any]] = []
+
+            while url:
+                payload = await self._get(
+                    account_key=str(ad_account_id),
+                    url=url,
+                    params=params,
+                )
+                if payload is None:
+                    return None
+
+                for item in payload.get("data") or []:
+                    rows.append(
+                        {
+                            "meta_campaign_id": item.get("campaign_id"),
+                            "metric_date": date.fromisoformat(item["date_start"]),
+                            **KPINormalizer.normalize_daily_row(insights=item),
+                        }
+                    )
+
+                # paging.next already carries every query param
+                url = (payload.get("paging") or {}).get("next")
+                params = None
+
+            return rows
+
+        except Exception:
+            return None
+
+    # =====================================================
+    # HTTP (RATE LIMITED, RETRIED, NEVER RAISES)
+    # =====================================================
+    async def _get(
+        self,
+        *,
+        account_key: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Retries here (not in the shared client) so every attempt
+        goes back through the rate limiter.
+        """
+
+        for attempt in range(self.MAX_ATTEMPTS):
+            throttled = False
+
+            async with self.rate_limiter.slot(account_key):
+                self.requests_made += 1
+                try:
+                    response = await self.graph.get(
+                        url,
+                        params=params,
+                        max_retries=0,
+                    )
+                except httpx.HTTPError:
+                    response = None
+
+            if response is not None:
+                self.rate_limiter.observe(account_key, response.headers)
+
+                if response.status_code == 200:
+                    return response.json()
+
+                try:
+                    throttled = is_throttle_error(response.json())
+                except ValueError:
+                    throttled = False
+
+                if (
+                    not throttled
+                    and response.status_code not in RETRYABLE_STATUS_CODES
+                ):
+                    break
+
+            if attempt + 1 < self.MAX_ATTEMPTS:
+                await asyncio.sleep(
+                    self.rate_limiter.backoff(
+                        account_key,
+                        attempt,
+                        throttled=throttled,
+                    )
+                )
+
+        self.failed_requests += 1
+        return None
 
     # =====================================================
     # BREAKDOWN-LEVEL (PHASE 8)
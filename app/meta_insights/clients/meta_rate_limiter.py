@@ -0,0 +1,186 @@
+"""
+Meta Graph Rate Limiter
+
+Purpose:
+- Bound concurrent Graph calls (global + per ad account)
+- Read Meta usage headers after every response and slow down
+  BEFORE Meta starts rejecting calls
+- Jittered exponential backoff for throttled / transient errors
+
+Headers understood:
+- x-app-usage                 {"call_count": 28, "total_time": 25, "total_cputime": 25}
+- x-ad-account-usage          {"acc_id_util_pct": 9.67, "reset_time_duration": 0}
+- x-business-use-case-usage   {"<business_id>": [{"type": "ads_insights",
+                                "call_count": 98, "total_time": 30,
+                                "total_cputime": 20,
+                                "estimated_time_to_regain_access": 0}]}
+
+All usage numbers are percentages of the allowed budget.
+"""
+
+import asyncio
+import json
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Mapping, Optional
+
+
+# Graph error codes that mean "slow down" (app / account / BUC throttling)
+THROTTLE_ERROR_CODES = {4, 17, 32, 613, 80000, 80003, 80004, 80014}
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class MetaRateLimiter:
+    """
+    Shared by every call made through one insights client.
+
+    - Global semaphore caps total in-flight Graph calls
+    - Per-account semaphores stop one ad account from
+      monopolising the pool (and its own BUC budget)
+    - Usage headers set a per-account / app-wide pause
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 16,
+        per_account_concurrency: int = 4,
+        high_watermark: float = 75.0,
+        max_throttle_delay: float = 60.0,
+        base_backoff: float = 1.0,
+        max_backoff: float = 120.0,
+    ):
+        self.per_account_concurrency = per_account_concurrency
+        self.high_watermark = high_watermark
+        self.max_throttle_delay = max_throttle_delay
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._global = asyncio.Semaphore(max_concurrency)
+        self._accounts: Dict[str, asyncio.Semaphore] = {}
+        self._paused_until: Dict[Optional[str], float] = {}
+
+        # Observability (last seen usage + throttle counters)
+        self.last_usage: Dict[Optional[str], float] = {}
+        self.throttled_waits = 0
+        self.backoffs = 0
+
+    # =====================================================
+    # CONCURRENCY SLOT
+    # =====================================================
+    @asynccontextmanager
+    async def slot(self, account_key: str) -> AsyncIterator[None]:
+        semaphore = self._accounts.get(account_key)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_account_concurrency)
+            self._accounts[account_key] = semaphore
+
+        async with semaphore:
+            await self._wait_if_paused(account_key)
+            async with self._global:
+                await self._wait_if_paused(None)
+                yield
+
+    async def _wait_if_paused(self, account_key: Optional[str]) -> None:
+        delay = self._paused_until.get(account_key, 0.0) - time.monotonic()
+        if delay > 0:
+            self.throttled_waits += 1
+            await asyncio.sleep(delay)
+
+    def _pause(self, account_key: Optional[str], seconds: float) -> None:
+        seconds = min(seconds, self.max_backoff)
+        until = time.monotonic() + seconds
+        if until > self._paused_until.get(account_key, 0.0):
+            self._paused_until[account_key] = until
+
+    # =====================================================
+    # USAGE HEADERS → ADAPTIVE THROTTLE
+    # =====================================================
+    def observe(self, account_key: str, headers: Mapping[str, str]) -> None:
+        """
+        Feed response headers back into the limiter.
+
+        Above the high watermark the delay grows linearly up to
+        max_throttle_delay at 100%. A BUC regain estimate (minutes)
+        always wins.
+        """
+
+        app_usage = _parse_json_header(headers.get("x-app-usage"))
+        account_usage = _parse_json_header(headers.get("x-ad-account-usage"))
+        buc_usage = _parse_json_header(headers.get("x-business-use-case-usage"))
+
+        app_pct = _max_pct(app_usage)
+        account_pct = float(account_usage.get("acc_id_util_pct") or 0)
+        regain_minutes = 0.0
+
+        for entries in buc_usage.values():
+            for entry in entries if isinstance(entries, list) else []:
+                account_pct = max(account_pct, _max_pct(entry))
+                regain_minutes = max(
+                    regain_minutes,
+                    float(entry.get("estimated_time_to_regain_access") or 0),
+                )
+
+        self.last_usage[None] = app_pct
+        self.last_usage[account_key] = account_pct
+
+        if app_pct >= self.high_watermark:
+            self._pause(None, self._throttle_delay(app_pct))
+
+        if regain_minutes > 0:
+            self._pause(account_key, regain_minutes * 60)
+        elif account_pct >= self.high_watermark:
+            self._pause(account_key, self._throttle_delay(account_pct))
+
+    def _throttle_delay(self, pct: float) -> float:
+        headroom = max(100.0 - self.high_watermark, 1.0)
+        ratio = min((pct - self.high_watermark) / headroom, 1.0)
+        return max(ratio, 0.05) * self.max_throttle_delay
+
+    # =====================================================
+    # BACKOFF
+    # =====================================================
+    def backoff(self, account_key: str, attempt: int, *, throttled: bool) -> float:
+        """
+        Full-jitter exponential backoff. Throttle errors also pause
+        every other call for the same account.
+        """
+
+        self.backoffs += 1
+        ceiling = min(self.max_backoff, self.base_backoff * (2 ** attempt))
+        delay = random.uniform(ceiling / 2, ceiling)
+
+        if throttled:
+            self._pause(account_key, delay)
+
+        return delay
+
+
+# =====================================================
+# HELPERS
+# =====================================================
+def is_throttle_error(payload: Any) -> bool:
+    if not isinstance(payload, dict):
+        return False
+    error = payload.get("error") or {}
+    return error.get("code") in THROTTLE_ERROR_CODES
+
+
+def _parse_json_header(value: Optional[str]) -> Dict[str, Any]:
+    if not value:
+        return {}
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+
+def _max_pct(usage: Dict[str, Any]) -> float:
+    return max(
+        float(usage.get("call_count") or 0),
+        float(usage.get("total_time") or 0),
+        float(usage.get("total_cputime") or 0),
+    )
@@ -6,6 +6,8 @@ from sqlalchemy import (
     Numeric,
     String,
     Index,
+    func,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column
 from datetime import datetime, date
@@ -32,6 +34,9 @@ class CampaignBreakdownDailyMetrics(Base):
 
     __tablename__ = "campaign_breakdown_daily_metrics"
 
+    # Monthly partitions: app.meta_insights.services.metrics_partition_service
+    __table_args__ = {"postgresql_partition_by": "RANGE (metric_date)"}
+
     # =========================
     # PRIMARY IDENTITY
     # =========================
@@ -46,8 +51,10 @@ class CampaignBreakdownDailyMetrics(Base):
         index=True,
     )
 
+    # Partition key: part of the primary key on a partitioned table
     metric_date: Mapped[date] = mapped_column(
         Date,
+        primary_key=True,
         nullable=False,
         index=True,
     )
@@ -185,21 +192,34 @@ class CampaignBreakdownDailyMetrics(Base):
         nullable=False,
     )
 
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        server_default=text("timezone('utc', now())"),
+        nullable=False,
+        doc="Last write — used to detect late-arriving rows",
+    )
+
 
 # =========================
 # IDEMPOTENCY & PERFORMANCE
 # =========================
 
+# Breakdown dimensions are NULL when not part of the breakdown set.
+# NULLs never collide in a plain unique index, so the key is built on
+# COALESCE(dim, '') — Meta never returns an empty dimension value.
+# Must match BREAKDOWN_CONFLICT_TARGET in the breakdown writer.
 Index(
-    "ux_campaign_breakdown_daily_unique",
+    "ux_campaign_breakdown_daily_dims",
     CampaignBreakdownDailyMetrics.campaign_id,
     CampaignBreakdownDailyMetrics.metric_date,
-    CampaignBreakdownDailyMetrics.ad_id,
-    CampaignBreakdownDailyMetrics.platform,
-    CampaignBreakdownDailyMetrics.placement,
-    CampaignBreakdownDailyMetrics.age_group,
-    CampaignBreakdownDailyMetrics.gender,
-    CampaignBreakdownDailyMetrics.region,
+    func.coalesce(CampaignBreakdownDailyMetrics.ad_id, ""),
+    func.coalesce(CampaignBreakdownDailyMetrics.platform, ""),
+    func.coalesce(CampaignBreakdownDailyMetrics.placement, ""),
+    func.coalesce(CampaignBreakdownDailyMetrics.age_group, ""),
+    func.coalesce(CampaignBreakdownDailyMetrics.gender, ""),
+    func.coalesce(CampaignBreakdownDailyMetrics.region, ""),
     unique=True,
 )
 
@@ -208,3 +228,8 @@ Index(
     CampaignBreakdownDailyMetrics.campaign_id,
     CampaignBreakdownDailyMetrics.metric_date,
 )
+
+Index(
+    "ix_campaign_breakdown_daily_updated_at",
+    CampaignBreakdownDailyMetrics.updated_at,
+)
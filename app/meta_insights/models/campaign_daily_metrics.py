@@ -25,6 +25,9 @@ class CampaignDailyMetrics(Base):
 
     __tablename__ = "campaign_daily_metrics"
 
+    # Monthly partitions: app.meta_insights.services.metrics_partition_service
+    __table_args__ = {"postgresql_partition_by": "RANGE (date)"}
+
     # =========================
     # PRIMARY IDENTITY
     # =========================
@@ -36,11 +39,12 @@ class CampaignDailyMetrics(Base):
     campaign_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("campaigns.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
+    # Partition key: part of the primary key on a partitioned table
     date: Mapped[date] = mapped_column(
         Date,
+        primary_key=True,
         nullable=False,
     )
 
@@ -135,3 +139,8 @@ Index(
     "ix_campaign_daily_metrics_date",
     CampaignDailyMetrics.date,
 )
+
+Index(
+    "ix_campaign_daily_metrics_updated_at",
+    CampaignDailyMetrics.updated_at,
+)
@@ -7,6 +7,8 @@ from sqlalchemy import (
     String,
     Boolean,
     Index,
+    func,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column
 from datetime import datetime, date
@@ -304,6 +306,13 @@ class CampaignBreakdownAggregate(Base):
         nullable=False,
     )
 
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        server_default=text("timezone('utc', now())"),
+        nullable=False,
+    )
+
 
 Index(
     "ix_campaign_breakdown_lookup",
@@ -316,3 +325,27 @@ Index(
     CampaignBreakdownAggregate.age_group,
     CampaignBreakdownAggregate.platform,
 )
+
+
+# Incremental mode: previous day's lifetime rows (roll-forward candidates)
+Index(
+    "ix_campaign_breakdown_aggregates_window_end",
+    CampaignBreakdownAggregate.window_type,
+    CampaignBreakdownAggregate.window_end_date,
+)
+
+
+# One row per campaign × window × slice; NULL and '' dimensions are
+# the same slice (conflict target of the breakdown aggregation upsert)
+Index(
+    "ux_campaign_breakdown_aggregate_slice",
+    CampaignBreakdownAggregate.campaign_id,
+    CampaignBreakdownAggregate.window_type,
+    func.coalesce(CampaignBreakdownAggregate.creative_id, ""),
+    func.coalesce(CampaignBreakdownAggregate.placement, ""),
+    func.coalesce(CampaignBreakdownAggregate.region, ""),
+    func.coalesce(CampaignBreakdownAggregate.gender, ""),
+    func.coalesce(CampaignBreakdownAggregate.age_group, ""),
+    func.coalesce(CampaignBreakdownAggregate.platform, ""),
+    unique=True,
+)
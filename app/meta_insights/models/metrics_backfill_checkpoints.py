@@ -0,0 +1,86 @@
+from sqlalchemy import (
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime, date
+import uuid
+
+from app.core.database import Base
+
+
+class MetricsBackfillCheckpoint(Base):
+    """
+    One finished backfill unit: (kind, ad account, date chunk).
+
+    kind:
+    - "daily"                      → campaign_daily_metrics
+    - "breakdown:<dim>,<dim>"      → one breakdown set of
+                                     campaign_breakdown_daily_metrics
+
+    Written after the chunk is committed; a restarted backfill skips
+    every unit that already has a row.
+    """
+
+    __tablename__ = "metrics_backfill_checkpoints"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+
+    kind: Mapped[str] = mapped_column(
+        String,
+        nullable=False,
+    )
+
+    ad_account_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("meta_ad_accounts.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    chunk_start: Mapped[date] = mapped_column(
+        Date,
+        nullable=False,
+    )
+
+    chunk_end: Mapped[date] = mapped_column(
+        Date,
+        nullable=False,
+    )
+
+    rows: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    seconds: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        default=0.0,
+    )
+
+    completed_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False,
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "kind",
+            "ad_account_id",
+            "chunk_start",
+            "chunk_end",
+            name="uq_metrics_backfill_checkpoint",
+        ),
+    )
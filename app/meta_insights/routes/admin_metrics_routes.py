@@ -9,12 +9,13 @@ SAFE to retry
 """
 
 from datetime import date
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db_session import get_db
 from app.auth.dependencies import require_admin_user
+from app.meta_api.graph_client import get_graph_client
 from app.meta_insights.services.campaign_daily_metrics_sync_service import (
     CampaignDailyMetricsSyncService,
 )
@@ -51,3 +52,57 @@ async def sync_daily_campaign_metrics(
         "target_date": target_date,
         **result,
     }
+
+
+# =====================================================
+# MANUAL RANGED BACKFILL (ONE REQUEST PER AD ACCOUNT)
+# =====================================================
+@router.post("/sync-range")
+async def sync_campaign_metrics_range(
+    *,
+    since: date = Query(..., description="YYYY-MM-DD"),
+    until: date = Query(..., description="YYYY-MM-DD"),
+    db: AsyncSession = Depends(get_db),
+    admin=Depends(require_admin_user),
+):
+    """
+    Backfills campaign daily metrics for [since, until].
+
+    - One ranged, paginated Meta request per ad account
+    - Idempotent
+    - Admin-only
+    """
+
+    if since > until:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="since must be on or before until",
+        )
+
+    service = CampaignDailyMetricsSyncService(db)
+    result = await service.sync_for_range(since, until)
+
+    return {
+        "status": "ok",
+        "since": since,
+        "until": until,
+        **result,
+    }
+
+
+# =====================================================
+# META GRAPH CLIENT METRICS (THIS PROCESS)
+# =====================================================
+@router.get("/graph-client")
+async def graph_client_metrics(
+    admin=Depends(require_admin_user),
+):
+    """
+    Per-endpoint Graph request counts, retries and latency (ms)
+    since this worker started.
+    """
+
+    return {
+        "status": "ok",
+        "endpoints": get_graph_client().metrics(),
+    }
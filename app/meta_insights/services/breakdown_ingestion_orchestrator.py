@@ -0,0 +1,257 @@
+"""
+Breakdown Ingestion Orchestrator
+
+PHASE 8 — FLEET-LEVEL BREAKDOWN INGESTION
+
+Purpose:
+- Ingest breakdown insights for EVERY selected, active ad account
+- Fan out (ad account × breakdown set) jobs over a bounded worker pool
+- One BatchSessionLocal session per job (sessions are never shared
+  across concurrent tasks)
+- One rate limiter for the whole run, so Graph budgets stay global
+- Resumable: finished jobs are recorded in a progress file and
+  skipped on the next run for the same date range
+
+A slow or failing account only occupies one worker; the rest of
+the fleet keeps moving.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.db_session import BatchSessionLocal
+from app.meta_api.models import MetaAdAccount, UserMetaAdAccount
+from app.meta_insights.clients.meta_campaign_insights_client import (
+    MetaCampaignInsightsClient,
+)
+from app.meta_insights.clients.meta_rate_limiter import MetaRateLimiter
+from app.meta_insights.services.campaign_breakdown_insights_ingestion_service import (
+    BREAKDOWN_SETS,
+    CampaignBreakdownInsightsIngestionService,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# (ad_account_id, breakdown set)
+BreakdownJob = Tuple[UUID, Tuple[str, ...]]
+
+
+def _job_key(job: BreakdownJob) -> str:
+    ad_account_id, breakdowns = job
+    return f"{ad_account_id}:{','.join(breakdowns)}"
+
+
+# =========================================================
+# PROGRESS (RESUME SUPPORT)
+# =========================================================
+class IngestionProgress:
+    """
+    JSON file of finished job keys for one (since, until) range.
+    Written atomically after every finished job.
+    """
+
+    def __init__(self, path: Path, since: date, until: date):
+        self.path = path
+        self.range_key = f"{since.isoformat()}..{until.isoformat()}"
+        self.done: Dict[str, int] = {}
+
+    def load(self) -> None:
+        if not self.path.exists():
+            return
+
+        try:
+            state = json.loads(self.path.read_text())
+        except ValueError:
+            logger.warning("Ignoring unreadable progress file %s", self.path)
+            return
+
+        if state.get("range") == self.range_key:
+            self.done = dict(state.get("done") or {})
+
+    def mark_done(self, key: str, rows: int) -> None:
+        self.done[key] = rows
+
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(
+            json.dumps({"range": self.range_key, "done": self.done}, indent=1)
+        )
+        os.replace(tmp_path, self.path)
+
+
+# =========================================================
+# ORCHESTRATOR
+# =========================================================
+class BreakdownIngestionOrchestrator:
+    def __init__(
+        self,
+        *,
+        since: date,
+        until: date,
+        workers: int = 8,
+        job_timeout: Optional[float] = None,
+        progress_path: Optional[Path] = None,
+        batch_size: Optional[int] = None,
+    ):
+        self.since = since
+        self.until = until
+        self.workers = workers
+        self.job_timeout = job_timeout
+        self.batch_size = batch_size
+
+        self.progress = (
+            IngestionProgress(progress_path, since, until)
+            if progress_path
+            else None
+        )
+
+        # Shared by every worker's client: Graph budgets are per
+        # app / ad account, not per worker
+        self.rate_limiter = MetaRateLimiter(
+            max_concurrency=settings.META_INSIGHTS_MAX_CONCURRENCY,
+            per_account_concurrency=settings.META_INSIGHTS_PER_ACCOUNT_CONCURRENCY,
+        )
+
+        self.stats = {
+            "jobs_total": 0,
+            "jobs_skipped": 0,
+            "jobs_succeeded": 0,
+            "jobs_failed": 0,
+            "rows_ingested": 0,
+        }
+
+    # -----------------------------------------------------
+    # ENTRY POINT
+    # -----------------------------------------------------
+    async def run(self) -> Dict[str, float]:
+        started = time.perf_counter()
+
+        if self.progress:
+            self.progress.load()
+
+        account_ids = await self._get_selected_account_ids()
+        jobs: List[BreakdownJob] = [
+            (account_id, tuple(breakdowns))
+            for account_id in account_ids
+            for breakdowns in BREAKDOWN_SETS
+        ]
+        self.stats["jobs_total"] = len(jobs)
+
+        done: Set[str] = set(self.progress.done) if self.progress else set()
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for job in jobs:
+            if _job_key(job) in done:
+                self.stats["jobs_skipped"] += 1
+                continue
+            queue.put_nowait(job)
+
+        logger.info(
+            "Breakdown ingestion %s..%s: %d accounts, %d jobs (%d already done), "
+            "%d workers",
+            self.since,
+            self.until,
+            len(account_ids),
+            len(jobs),
+            self.stats["jobs_skipped"],
+            self.workers,
+        )
+
+        await asyncio.gather(
+            *[self._worker(queue) for _ in range(max(1, self.workers))]
+        )
+
+        elapsed = time.perf_counter() - started
+        result = {
+            **self.stats,
+            "seconds": round(elapsed, 2),
+            "rows_per_sec": (
+                round(self.stats["rows_ingested"] / elapsed, 1) if elapsed else 0.0
+            ),
+        }
+        logger.info("Breakdown ingestion finished: %s", result)
+        return result
+
+    # -----------------------------------------------------
+    # WORKER — ONE SESSION PER JOB
+    # -----------------------------------------------------
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            try:
+                job: BreakdownJob = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            started = time.perf_counter()
+
+            try:
+                rows = await asyncio.wait_for(
+                    self._run_job(job),
+                    timeout=self.job_timeout,
+                )
+            except Exception as exc:
+                self.stats["jobs_failed"] += 1
+                logger.error(
+                    "Job %s failed after %.1fs → %r",
+                    _job_key(job),
+                    time.perf_counter() - started,
+                    exc,
+                )
+                continue
+
+            self.stats["jobs_succeeded"] += 1
+            self.stats["rows_ingested"] += rows
+
+            if self.progress:
+                self.progress.mark_done(_job_key(job), rows)
+
+    async def _run_job(self, job: BreakdownJob) -> int:
+        ad_account_id, breakdowns = job
+
+        async with BatchSessionLocal() as db:
+            ad_account = await db.get(MetaAdAccount, ad_account_id)
+            if ad_account is None:
+                return 0
+
+            client = MetaCampaignInsightsClient(db, rate_limiter=self.rate_limiter)
+            await client.resolve_access_tokens([ad_account.id])
+
+            return await CampaignBreakdownInsightsIngestionService.ingest_breakdown_set(
+                db=db,
+                ad_account=ad_account,
+                since=self.since,
+                until=self.until,
+                breakdowns=list(breakdowns),
+                client=client,
+                batch_size=self.batch_size,
+            )
+
+    # -----------------------------------------------------
+    # FLEET — SELECTED + ACTIVE AD ACCOUNTS (DEDUPED)
+    # -----------------------------------------------------
+    async def _get_selected_account_ids(self) -> List[UUID]:
+        async with BatchSessionLocal() as db:
+            result = await db.execute(
+                select(MetaAdAccount.id)
+                .join(
+                    UserMetaAdAccount,
+                    UserMetaAdAccount.meta_ad_account_id == MetaAdAccount.id,
+                )
+                .where(
+                    UserMetaAdAccount.is_selected.is_(True),
+                    MetaAdAccount.is_active.is_(True),
+                )
+                .distinct()
+                .order_by(MetaAdAccount.id)
+            )
+            return list(result.scalars().all())
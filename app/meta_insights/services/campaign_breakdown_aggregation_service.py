@@ -7,14 +7,38 @@ Purpose:
 - Aggregate performance by creative, placement, geography, demographics, device
 - Windowed (1D, 3D, 7D, 14D, 30D, 90D, Lifetime)
 - Source of truth: campaign_breakdown_daily_metrics
+
+Full mode:
+- ONE INSERT ... SELECT per window aggregates every campaign's
+  breakdown slices server-side
+- Upserts on ux_campaign_breakdown_aggregate_slice
+  (campaign × window × COALESCE(dim, '')), so values refresh on
+  every run; slices that left the window are removed
+- Timing is logged per window
+
+Incremental mode:
+- Rolls yesterday's breakdown aggregates forward by one day
+  (add the new day, subtract the day leaving each window)
+- Campaigns with late-arriving daily rows (updated_at newer than
+  their aggregates) or without yesterday's aggregates are recomputed
+
+Partition pruning (monthly partitions on metric_date):
+- bounded windows filter metric_date BETWEEN start AND as_of_date
+- touched-day lookups add a range next to = ANY(array) so generic
+  prepared plans prune too
 """
 
+import logging
+import time
 from datetime import date, timedelta, datetime
-from typing import List
+from typing import Any, Dict, List, Optional, Set
+from uuid import UUID
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+logger = logging.getLogger(__name__)
+
 
 WINDOW_DEFINITIONS = {
     "1d": 1,
@@ -26,6 +50,33 @@ WINDOW_DEFINITIONS = {
     "lifetime": None,
 }
 
+SLICE_DIMENSIONS = (
+    "creative_id",
+    "placement",
+    "region",
+    "gender",
+    "age_group",
+    "platform",
+)
+
+# Must match the expressions of ux_campaign_breakdown_aggregate_slice
+SLICE_CONFLICT_TARGET = ", ".join(
+    ["campaign_id", "window_type"]
+    + [f"COALESCE({dim}, '')" for dim in SLICE_DIMENSIONS]
+)
+
+
+def _touched_dates(as_of_date: date) -> List[date]:
+    """
+    New day + the day leaving each bounded window.
+    """
+
+    return [as_of_date] + [
+        as_of_date - timedelta(days=days)
+        for days in WINDOW_DEFINITIONS.values()
+        if days is not None
+    ]
+
 
 class CampaignBreakdownAggregationService:
     def __init__(self, db: AsyncSession):
@@ -34,19 +85,49 @@ class CampaignBreakdownAggregationService:
     # =====================================================
     # PUBLIC ENTRY POINT
     # =====================================================
-    async def aggregate_for_date(self, as_of_date: date) -> None:
-        campaign_ids = await self._get_campaign_ids()
+    async def aggregate_for_date(
+        self,
+        as_of_date: date,
+        *,
+        incremental: bool = False,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns per-window stats: rows_upserted, rows_removed, seconds.
+        """
 
-        for campaign_id in campaign_ids:
+        campaign_ids: Optional[List[UUID]] = None
+
+        if incremental:
+            rolled = await self._roll_forward_breakdowns(as_of_date)
+            campaign_ids = [
+                UUID(campaign_id)
+                for campaign_id in await self._get_campaign_ids()
+                if UUID(campaign_id) not in rolled
+            ]
+
+        timings: Dict[str, Dict[str, Any]] = {}
+
+        if campaign_ids is None or campaign_ids:
             for window_type, days in WINDOW_DEFINITIONS.items():
-                await self._aggregate_campaign_breakdowns(
-                    campaign_id=campaign_id,
+                timings[window_type] = await self._aggregate_window(
                     window_type=window_type,
                     as_of_date=as_of_date,
                     days=days,
+                    campaign_ids=campaign_ids,
+                )
+                logger.info(
+                    "Breakdown aggregates %s window=%s campaigns=%s "
+                    "upserted=%d removed=%d in %.3fs",
+                    as_of_date,
+                    window_type,
+                    "all" if campaign_ids is None else len(campaign_ids),
+                    timings[window_type]["rows_upserted"],
+                    timings[window_type]["rows_removed"],
+                    timings[window_type]["seconds"],
                 )
 
         await self.db.commit()
+        return timings
 
     # =====================================================
     # FETCH ACTIVE CAMPAIGNS
@@ -64,97 +145,197 @@ class CampaignBreakdownAggregationService:
         return [str(row[0]) for row in result.fetchall()]
 
     # =====================================================
-    # CORE AGGREGATION LOGIC (FIXED)
+    # CHANGE DETECTION (NIGHTLY PIPELINE)
     # =====================================================
-    async def _aggregate_campaign_breakdowns(
+    async def get_affected_campaign_ids(
         self,
-        campaign_id: str,
-        window_type: str,
         as_of_date: date,
-        days: int | None,
-    ) -> None:
-        if days is None:
-            date_filter = "metric_date <= :as_of_date"
-            window_start = None
-        else:
-            window_start = as_of_date - timedelta(days=days - 1)
-            date_filter = "metric_date BETWEEN :window_start AND :as_of_date"
-
-        query = f"""
-            SELECT
-                creative_id,
-                placement,
-                region,
-                gender,
-                age_group,
-                platform,
-                SUM(impressions)      AS impressions,
-                SUM(clicks)           AS clicks,
-                SUM(spend)            AS spend,
-                SUM(conversions)      AS conversions,
-                SUM(conversion_value) AS revenue
-            FROM campaign_breakdown_daily_metrics
-            WHERE campaign_id = :campaign_id
-              AND {date_filter}
-            GROUP BY
-                creative_id,
-                placement,
-                region,
-                gender,
-                age_group,
-                platform
+        changed_campaign_ids: Set[UUID],
+    ) -> Set[UUID]:
+        """
+        Campaigns whose breakdown aggregates for as_of_date differ
+        from the previous day's (changed sources + window edges).
         """
 
-        params = {
-            "campaign_id": campaign_id,
-            "as_of_date": as_of_date,
-            "window_start": window_start,
-        }
+        touched_dates = _touched_dates(as_of_date)
 
-        result = await self.db.execute(text(query), params)
-        rows = result.fetchall()
-
-        for row in rows:
-            impressions = int(row.impressions or 0)
-            clicks = int(row.clicks or 0)
-            spend = float(row.spend or 0)
-            conversions = int(row.conversions or 0)
-            revenue = float(row.revenue or 0)
-
-            ctr = (clicks / impressions) if impressions else None
-            cpl = (spend / conversions) if conversions else None
-            cpa = (spend / conversions) if conversions else None
-            roas = (revenue / spend) if spend else None
-
-            await self._upsert_breakdown(
-                campaign_id=campaign_id,
-                window_type=window_type,
-                window_start=window_start,
-                window_end=as_of_date,
-                creative_id=row.creative_id,
-                placement=row.placement,
-                region=row.region,
-                gender=row.gender,
-                age_group=row.age_group,
-                platform=row.platform,
-                impressions=impressions,
-                clicks=clicks,
-                spend=spend,
-                conversions=conversions,
-                revenue=revenue,
-                ctr=ctr,
-                cpl=cpl,
-                cpa=cpa,
-                roas=roas,
-            )
+        result = await self.db.execute(
+            text(
+                """
+                SELECT DISTINCT b.campaign_id
+                FROM campaign_breakdown_daily_metrics b
+                JOIN campaigns c
+                    ON c.id = b.campaign_id
+                WHERE c.is_archived = FALSE
+                  AND b.metric_date = ANY(CAST(:touched_dates AS DATE[]))
+                  AND b.metric_date BETWEEN :first_touched AND :as_of_date
+                """
+            ),
+            {
+                "touched_dates": touched_dates,
+                "first_touched": min(touched_dates),
+                "as_of_date": as_of_date,
+            },
+        )
+        return set(changed_campaign_ids) | {row[0] for row in result.fetchall()}
 
     # =====================================================
-    # UPSERT AGGREGATES (IDEMPOTENT)
+    # INCREMENTAL ROLL-FORWARD (as_of_date - 1 → as_of_date)
     # =====================================================
-    async def _upsert_breakdown(self, **data) -> None:
-        await self.db.execute(
+    async def _roll_forward_breakdowns(self, as_of_date: date) -> Set[UUID]:
+        """
+        Rolls yesterday's breakdown aggregates forward in one statement:
+        - existing slices are updated in place with (new day - dropped day)
+        - slices that no longer have data in the window are removed
+        - slices first seen on the new day are inserted
+
+        Returns the campaign ids that were rolled forward.
+        """
+
+        previous_date = as_of_date - timedelta(days=1)
+
+        result = await self.db.execute(
             text(
                 """
+                SELECT DISTINCT a.campaign_id
+                FROM campaign_breakdown_aggregates a
+                JOIN campaigns c
+                    ON c.id = a.campaign_id
+                WHERE c.is_archived = FALSE
+                  AND a.window_type = 'lifetime'
+                  AND a.window_end_date = :previous_date
+                """
+            ),
+            {"previous_date": previous_date},
+        )
+        candidate_ids = {row[0] for row in result.fetchall()}
+
+        if not candidate_ids:
+            return set()
+
+        late_ids = await self._get_late_campaign_ids(as_of_date, previous_date)
+        campaign_ids = candidate_ids - late_ids
+
+        if not campaign_ids:
+            return set()
+
+        touched_dates = _touched_dates(as_of_date)
+
+        windows_sql = ", ".join(
+            f"('{window_type}', CAST({'NULL' if days is None else days} AS INTEGER))"
+            for window_type, days in WINDOW_DEFINITIONS.items()
+        )
+
+        # Same slice as ux_campaign_breakdown_aggregate_slice
+        same_slice = " AND ".join(
+            [
+                "{a}.campaign_id = {b}.campaign_id",
+                "{a}.window_type = {b}.window_type",
+            ]
+            + [
+                f"COALESCE({{a}}.{dim}, '') = COALESCE({{b}}.{dim}, '')"
+                for dim in SLICE_DIMENSIONS
+            ]
+        )
+        delta_matches_existing = same_slice.format(a="delta", b="x")
+        existing_matches_delta = same_slice.format(a="x", b="delta")
+
+        await self.db.execute(
+            text(
+                f"""
+                WITH windows (window_type, days) AS (
+                    VALUES {windows_sql}
+                ),
+                touched AS (
+                    SELECT *
+                    FROM campaign_breakdown_daily_metrics
+                    WHERE metric_date = ANY(CAST(:touched_dates AS DATE[]))
+                      AND metric_date BETWEEN :first_touched AND :as_of_date
+                      AND campaign_id = ANY(CAST(:campaign_ids AS UUID[]))
+                ),
+                delta AS (
+                    SELECT
+                        d.campaign_id,
+                        w.window_type,
+                        w.days,
+                        d.creative_id,
+                        d.placement,
+                        d.region,
+                        d.gender,
+                        d.age_group,
+                        d.platform,
+                        SUM(CASE WHEN d.metric_date = :as_of_date
+                            THEN d.impressions ELSE -d.impressions END)                        AS impressions,
+                        SUM(CASE WHEN d.metric_date = :as_of_date
+                            THEN d.clicks ELSE -d.clicks END)                                  AS clicks,
+                        SUM(CASE WHEN d.metric_date = :as_of_date
+                            THEN d.spend ELSE -d.spend END)                                    AS spend,
+                        SUM(CASE WHEN d.metric_date = :as_of_date
+                            THEN d.conversions ELSE -d.conversions END)                        AS conversions,
+                        SUM(CASE WHEN d.metric_date = :as_of_date
+                            THEN COALESCE(d.conversion_value, 0)
+                            ELSE -COALESCE(d.conversion_value, 0) END)                         AS revenue
+                    FROM touched d
+                    JOIN windows w
+                        ON d.metric_date = :as_of_date
+                        OR d.metric_date = CAST(:as_of_date AS DATE) - w.days
+                    GROUP BY
+                        d.campaign_id,
+                        w.window_type,
+                        w.days,
+                        d.creative_id,
+                        d.placement,
+                        d.region,
+                        d.gender,
+                        d.age_group,
+                        d.platform
+                ),
+                merged AS (
+                    SELECT
+                        x.id,
+                        w.days,
+                        x.impressions + COALESCE(delta.impressions, 0)              AS impressions,
+                        x.clicks + COALESCE(delta.clicks, 0)                        AS clicks,
+                        x.spend + COALESCE(delta.spend, 0)                          AS spend,
+                        x.conversions + COALESCE(delta.conversions, 0)              AS conversions,
+                        COALESCE(x.revenue, 0) + COALESCE(delta.revenue, 0)         AS revenue
+                    FROM campaign_breakdown_aggregates x
+                    JOIN windows w
+                        ON w.window_type = x.window_type
+                    LEFT JOIN delta
+                        ON {delta_matches_existing}
+                    WHERE x.campaign_id = ANY(CAST(:campaign_ids AS UUID[]))
+                      AND x.window_end_date = :previous_date
+                ),
+                emptied AS (
+                    DELETE FROM campaign_breakdown_aggregates a
+                    USING merged m
+                    WHERE a.id = m.id
+                      AND m.impressions = 0
+                      AND m.spend = 0
+                ),
+                rolled AS (
+                    UPDATE campaign_breakdown_aggregates a
+                    SET
+                        window_start_date = CASE
+                            WHEN m.days IS NULL THEN a.window_start_date
+                            ELSE CAST(:as_of_date AS DATE) - (m.days - 1)
+                        END,
+                        window_end_date = :as_of_date,
+                        impressions = m.impressions,
+                        clicks = m.clicks,
+                        spend = m.spend,
+                        conversions = m.conversions,
+                        revenue = m.revenue,
+                        ctr = CAST(m.clicks AS NUMERIC) / NULLIF(m.impressions, 0),
+                        cpl = m.spend / NULLIF(m.conversions, 0),
+                        cpa = m.spend / NULLIF(m.conversions, 0),
+                        roas = m.revenue / NULLIF(m.spend, 0),
+                        updated_at = :now
+                    FROM merged m
+                    WHERE a.id = m.id
+                      AND NOT (m.impressions = 0 AND m.spend = 0)
+                )
                 INSERT INTO campaign_breakdown_aggregates (
                     id,
                     campaign_id,
@@ -176,36 +357,259 @@ class CampaignBreakdownAggregationService:
                     cpl,
                     cpa,
                     roas,
-                    created_at
+                    created_at,
+                    updated_at
                 )
-                VALUES (
+                SELECT
                     gen_random_uuid(),
-                    :campaign_id,
-                    :window_type,
-                    :window_start,
-                    :window_end,
-                    :creative_id,
-                    :placement,
-                    :region,
-                    :gender,
-                    :age_group,
-                    :platform,
-                    :impressions,
-                    :clicks,
-                    :spend,
-                    :conversions,
-                    :revenue,
-                    :ctr,
-                    :cpl,
-                    :cpa,
-                    :roas,
+                    delta.campaign_id,
+                    delta.window_type,
+                    CASE
+                        WHEN delta.days IS NULL THEN CAST(:as_of_date AS DATE)
+                        ELSE CAST(:as_of_date AS DATE) - (delta.days - 1)
+                    END,
+                    :as_of_date,
+                    delta.creative_id,
+                    delta.placement,
+                    delta.region,
+                    delta.gender,
+                    delta.age_group,
+                    delta.platform,
+                    delta.impressions,
+                    delta.clicks,
+                    delta.spend,
+                    delta.conversions,
+                    delta.revenue,
+                    CAST(delta.clicks AS NUMERIC) / NULLIF(delta.impressions, 0),
+                    delta.spend / NULLIF(delta.conversions, 0),
+                    delta.spend / NULLIF(delta.conversions, 0),
+                    delta.revenue / NULLIF(delta.spend, 0),
+                    :now,
                     :now
+                FROM delta
+                WHERE (delta.impressions > 0 OR delta.spend > 0)
+                  AND NOT EXISTS (
+                        SELECT 1
+                        FROM campaign_breakdown_aggregates x
+                        WHERE x.window_end_date = :previous_date
+                          AND {existing_matches_delta}
+                  )
+                """
+            ),
+            {
+                "campaign_ids": list(campaign_ids),
+                "touched_dates": touched_dates,
+                "first_touched": min(touched_dates),
+                "as_of_date": as_of_date,
+                "previous_date": previous_date,
+                "now": datetime.utcnow(),
+            },
+        )
+
+        return campaign_ids
+
+    async def _get_late_campaign_ids(
+        self,
+        as_of_date: date,
+        previous_date: date,
+    ) -> Set[UUID]:
+        """
+        Campaigns whose already-aggregated breakdown history changed
+        after their aggregates were written.
+        """
+
+        result = await self.db.execute(
+            text(
+                """
+                WITH aggregated AS (
+                    SELECT campaign_id, MIN(updated_at) AS aggregated_at
+                    FROM campaign_breakdown_aggregates
+                    WHERE window_type = 'lifetime'
+                      AND window_end_date = :previous_date
+                    GROUP BY campaign_id
                 )
-                ON CONFLICT DO NOTHING
+                SELECT DISTINCT b.campaign_id
+                FROM campaign_breakdown_daily_metrics b
+                JOIN aggregated a
+                    ON a.campaign_id = b.campaign_id
+                WHERE b.metric_date < :as_of_date
+                  AND b.updated_at > a.aggregated_at
+                  AND b.updated_at > (SELECT MIN(aggregated_at) FROM aggregated)
                 """
             ),
             {
-                **data,
+                "as_of_date": as_of_date,
+                "previous_date": previous_date,
+            },
+        )
+        return {row[0] for row in result.fetchall()}
+
+
+    # =====================================================
+    # SET-BASED AGGREGATION — ONE STATEMENT PER WINDOW
+    # =====================================================
+    async def _aggregate_window(
+        self,
+        *,
+        window_type: str,
+        as_of_date: date,
+        days: int | None,
+        campaign_ids: Optional[List[UUID]],
+    ) -> Dict[str, Any]:
+        """
+        Aggregates every in-scope campaign's breakdown slices for one
+        window server-side and upserts them on
+        ux_campaign_breakdown_aggregate_slice.
+
+        Slices of in-scope campaigns that no longer have data in the
+        window are removed in the same statement.
+        """
+
+        window_start = (
+            None if days is None else as_of_date - timedelta(days=days - 1)
+        )
+        window_filter = (
+            "" if days is None else "AND d.metric_date >= :window_start"
+        )
+        campaign_filter = (
+            ""
+            if campaign_ids is None
+            else "AND c.id = ANY(CAST(:campaign_ids AS UUID[]))"
+        )
+
+        # NULL and '' are one slice (matches the unique index)
+        same_slice = " AND ".join(
+            ["x.campaign_id = agg.campaign_id"]
+            + [
+                f"COALESCE(x.{dim}, '') = COALESCE(agg.{dim}, '')"
+                for dim in SLICE_DIMENSIONS
+            ]
+        )
+        slice_select = ",\n                        ".join(
+            f"NULLIF(d.{dim}, '') AS {dim}" for dim in SLICE_DIMENSIONS
+        )
+        slice_group = ", ".join(str(i + 2) for i in range(len(SLICE_DIMENSIONS)))
+
+        started = time.perf_counter()
+
+        result = await self.db.execute(
+            text(
+                f"""
+                WITH scope AS (
+                    SELECT c.id
+                    FROM campaigns c
+                    WHERE c.is_archived = FALSE
+                      {campaign_filter}
+                ),
+                agg AS (
+                    SELECT
+                        d.campaign_id,
+                        {slice_select},
+                        MIN(d.metric_date)                       AS first_date,
+                        COALESCE(SUM(d.impressions), 0)          AS impressions,
+                        COALESCE(SUM(d.clicks), 0)               AS clicks,
+                        COALESCE(SUM(d.spend), 0)                AS spend,
+                        COALESCE(SUM(d.conversions), 0)          AS conversions,
+                        COALESCE(SUM(d.conversion_value), 0)     AS revenue
+                    FROM campaign_breakdown_daily_metrics d
+                    JOIN scope s
+                        ON s.id = d.campaign_id
+                    WHERE d.metric_date <= :as_of_date
+                      {window_filter}
+                    GROUP BY 1, {slice_group}
+                ),
+                removed AS (
+                    DELETE FROM campaign_breakdown_aggregates x
+                    USING scope s
+                    WHERE x.campaign_id = s.id
+                      AND x.window_type = :window_type
+                      AND NOT EXISTS (
+                            SELECT 1 FROM agg WHERE {same_slice}
+                      )
+                    RETURNING 1
+                ),
+                upserted AS (
+                    INSERT INTO campaign_breakdown_aggregates (
+                        id,
+                        campaign_id,
+                        window_type,
+                        window_start_date,
+                        window_end_date,
+                        creative_id,
+                        placement,
+                        region,
+                        gender,
+                        age_group,
+                        platform,
+                        impressions,
+                        clicks,
+                        spend,
+                        conversions,
+                        revenue,
+                        ctr,
+                        cpl,
+                        cpa,
+                        roas,
+                        created_at,
+                        updated_at
+                    )
+                    SELECT
+                        gen_random_uuid(),
+                        agg.campaign_id,
+                        :window_type,
+                        COALESCE(CAST(:window_start AS DATE), agg.first_date),
+                        :as_of_date,
+                        agg.creative_id,
+                        agg.placement,
+                        agg.region,
+                        agg.gender,
+                        agg.age_group,
+                        agg.platform,
+                        agg.impressions,
+                        agg.clicks,
+                        agg.spend,
+                        agg.conversions,
+                        agg.revenue,
+                        CAST(agg.clicks AS NUMERIC) / NULLIF(agg.impressions, 0),
+                        agg.spend / NULLIF(agg.conversions, 0),
+                        agg.spend / NULLIF(agg.conversions, 0),
+                        agg.revenue / NULLIF(agg.spend, 0),
+                        :now,
+                        :now
+                    FROM agg
+                    ON CONFLICT ({SLICE_CONFLICT_TARGET})
+                    DO UPDATE SET
+                        window_start_date = EXCLUDED.window_start_date,
+                        window_end_date = EXCLUDED.window_end_date,
+                        impressions = EXCLUDED.impressions,
+                        clicks = EXCLUDED.clicks,
+                        spend = EXCLUDED.spend,
+                        conversions = EXCLUDED.conversions,
+                        revenue = EXCLUDED.revenue,
+                        ctr = EXCLUDED.ctr,
+                        cpl = EXCLUDED.cpl,
+                        cpa = EXCLUDED.cpa,
+                        roas = EXCLUDED.roas,
+                        updated_at = EXCLUDED.updated_at
+                    RETURNING 1
+                )
+                SELECT
+                    (SELECT COUNT(*) FROM upserted) AS upserted,
+                    (SELECT COUNT(*) FROM removed)  AS removed
+                """
+            ),
+            {
+                "window_type": window_type,
+                "window_start": window_start,
+                "as_of_date": as_of_date,
+                "campaign_ids": campaign_ids,
                 "now": datetime.utcnow(),
             },
         )
+        row = result.one()
+
+        return {
+            "rows_upserted": int(row.upserted),
+            "rows_removed": int(row.removed),
+            "seconds": round(time.perf_counter() - started, 3),
+        }
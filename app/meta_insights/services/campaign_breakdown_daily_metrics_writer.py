@@ -0,0 +1,267 @@
+"""
+Campaign Breakdown Daily Metrics Writer
+
+PHASE 8 — BATCHED UPSERT INTO campaign_breakdown_daily_metrics
+
+Purpose:
+- Accumulate breakdown rows
+- Flush them as ONE multi-row INSERT ... ON CONFLICT per batch
+- Optionally commit after every batch (long backfills)
+- Report ingest rate
+
+Conflict target is the COALESCE(dim, '') unique index
+(ux_campaign_breakdown_daily_dims), so NULL dimensions dedupe.
+"""
+
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+
+BREAKDOWN_DIMENSIONS = (
+    "ad_id",
+    "platform",
+    "placement",
+    "age_group",
+    "gender",
+    "region",
+)
+
+BREAKDOWN_COLUMNS = (
+    "campaign_id",
+    "metric_date",
+    *BREAKDOWN_DIMENSIONS,
+    "impressions",
+    "clicks",
+    "spend",
+    "conversions",
+    "conversion_value",
+    "ctr",
+    "cpl",
+    "cpa",
+    "roas",
+    "objective_type",
+    "meta_account_id",
+    "meta_fetched_at",
+)
+
+_NUMERIC_COLUMNS = {"spend", "conversion_value", "ctr", "cpl", "cpa", "roas"}
+
+# Must match the expressions of ux_campaign_breakdown_daily_dims
+BREAKDOWN_CONFLICT_TARGET = ", ".join(
+    ["campaign_id", "metric_date"]
+    + [f"COALESCE({dim}, '')" for dim in BREAKDOWN_DIMENSIONS]
+)
+
+
+UPSERT_SQL = text(
+    f"""
+    INSERT INTO campaign_breakdown_daily_metrics (
+        id,
+        campaign_id,
+        metric_date,
+        ad_id,
+        platform,
+        placement,
+        age_group,
+        gender,
+        region,
+        impressions,
+        clicks,
+        spend,
+        conversions,
+        conversion_value,
+        ctr,
+        cpl,
+        cpa,
+        roas,
+        objective_type,
+        meta_account_id,
+        meta_fetched_at,
+        created_at,
+        updated_at
+    )
+    SELECT
+        gen_random_uuid(),
+        r.campaign_id,
+        r.metric_date,
+        r.ad_id,
+        r.platform,
+        r.placement,
+        r.age_group,
+        r.gender,
+        r.region,
+        r.impressions,
+        r.clicks,
+        r.spend,
+        r.conversions,
+        r.conversion_value,
+        r.ctr,
+        r.cpl,
+        r.cpa,
+        r.roas,
+        r.objective_type,
+        r.meta_account_id,
+        r.meta_fetched_at,
+        :now,
+        :now
+    FROM unnest(
+        CAST(:campaign_id AS UUID[]),
+        CAST(:metric_date AS DATE[]),
+        CAST(:ad_id AS VARCHAR[]),
+        CAST(:platform AS VARCHAR[]),
+        CAST(:placement AS VARCHAR[]),
+        CAST(:age_group AS VARCHAR[]),
+        CAST(:gender AS VARCHAR[]),
+        CAST(:region AS VARCHAR[]),
+        CAST(:impressions AS INTEGER[]),
+        CAST(:clicks AS INTEGER[]),
+        CAST(:spend AS NUMERIC[]),
+        CAST(:conversions AS INTEGER[]),
+        CAST(:conversion_value AS NUMERIC[]),
+        CAST(:ctr AS NUMERIC[]),
+        CAST(:cpl AS NUMERIC[]),
+        CAST(:cpa AS NUMERIC[]),
+        CAST(:roas AS NUMERIC[]),
+        CAST(:objective_type AS VARCHAR[]),
+        CAST(:meta_account_id AS VARCHAR[]),
+        CAST(:meta_fetched_at AS TIMESTAMP[])
+    ) AS r (
+        campaign_id,
+        metric_date,
+        ad_id,
+        platform,
+        placement,
+        age_group,
+        gender,
+        region,
+        impressions,
+        clicks,
+        spend,
+        conversions,
+        conversion_value,
+        ctr,
+        cpl,
+        cpa,
+        roas,
+        objective_type,
+        meta_account_id,
+        meta_fetched_at
+    )
+    ON CONFLICT ({BREAKDOWN_CONFLICT_TARGET})
+    DO UPDATE SET
+        impressions = EXCLUDED.impressions,
+        clicks = EXCLUDED.clicks,
+        spend = EXCLUDED.spend,
+        conversions = EXCLUDED.conversions,
+        conversion_value = EXCLUDED.conversion_value,
+        ctr = EXCLUDED.ctr,
+        cpl = EXCLUDED.cpl,
+        cpa = EXCLUDED.cpa,
+        roas = EXCLUDED.roas,
+        meta_fetched_at = EXCLUDED.meta_fetched_at,
+        updated_at = EXCLUDED.updated_at
+    """
+)
+
+
+class CampaignBreakdownDailyMetricsWriter:
+    """
+    Usage:
+        writer = CampaignBreakdownDailyMetricsWriter(db, commit_batches=True)
+        for row in rows:
+            await writer.add(row)
+        await writer.flush()
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        *,
+        batch_size: Optional[int] = None,
+        commit_batches: bool = False,
+    ):
+        self.db = db
+        self.batch_size = batch_size or settings.META_INSIGHTS_UPSERT_BATCH_SIZE
+        self.commit_batches = commit_batches
+
+        # Keyed on the conflict target: last row for a slice wins
+        self._pending: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+
+        self.rows_written = 0
+        self.batches_flushed = 0
+        self.write_seconds = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        if not self.write_seconds:
+            return 0.0
+        return round(self.rows_written / self.write_seconds, 1)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rows_written": self.rows_written,
+            "batches_flushed": self.batches_flushed,
+            "write_seconds": round(self.write_seconds, 3),
+            "rows_per_sec": self.rows_per_sec,
+        }
+
+    # =====================================================
+    # ACCUMULATE
+    # =====================================================
+    async def add(self, row: Dict[str, Any]) -> None:
+        key = (
+            str(row["campaign_id"]),
+            row["metric_date"],
+            *(row.get(dim) or "" for dim in BREAKDOWN_DIMENSIONS),
+        )
+        self._pending[key] = row
+
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+
+    # =====================================================
+    # FLUSH — ONE STATEMENT (+ OPTIONAL COMMIT) PER BATCH
+    # =====================================================
+    async def flush(self) -> int:
+        if not self._pending:
+            return 0
+
+        rows = list(self._pending.values())
+        self._pending = {}
+
+        now = datetime.utcnow()
+        params: Dict[str, Any] = {
+            col: [_to_param(col, row.get(col)) for row in rows]
+            for col in BREAKDOWN_COLUMNS
+        }
+        params["meta_fetched_at"] = [
+            value or now for value in params["meta_fetched_at"]
+        ]
+        params["now"] = now
+
+        started = time.perf_counter()
+        await self.db.execute(UPSERT_SQL, params)
+        if self.commit_batches:
+            await self.db.commit()
+        self.write_seconds += time.perf_counter() - started
+
+        self.rows_written += len(rows)
+        self.batches_flushed += 1
+        return len(rows)
+
+
+def _to_param(column: str, value: Any) -> Any:
+    # NUMERIC[] binds need Decimal; Decimal(float) is exact, like a
+    # scalar float bind
+    if column in _NUMERIC_COLUMNS and isinstance(value, float):
+        return Decimal(value)
+    if column == "campaign_id":
+        return str(value)
+    return value
@@ -1,5 +1,7 @@
-from datetime import date, datetime
-from typing import List, Dict, Any
+import logging
+import time
+from datetime import date
+from typing import List, Dict, Any, Optional
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,10 +12,23 @@ from app.meta_api.models import MetaAdAccount, UserMetaAdAccount
 from app.meta_insights.clients.meta_campaign_insights_client import (
     MetaCampaignInsightsClient,
 )
-from app.meta_insights.models.campaign_breakdown_daily_metrics import (
-    CampaignBreakdownDailyMetrics,
+from app.meta_insights.services.campaign_breakdown_daily_metrics_writer import (
+    CampaignBreakdownDailyMetricsWriter,
 )
 
+logger = logging.getLogger(__name__)
+
+
+# -----------------------------------------------------
+# BREAKDOWN SETS (LOCKED)
+# -----------------------------------------------------
+BREAKDOWN_SETS: List[List[str]] = [
+    ["ad_id"],
+    ["platform", "placement"],
+    ["age", "gender"],
+    ["region"],
+]
+
 
 class CampaignBreakdownInsightsIngestionService:
     """
@@ -25,6 +40,14 @@ class CampaignBreakdownInsightsIngestionService:
     - ONLY selected ad account
     - READ-ONLY Meta
     - Stub-safe
+
+    Writes go through CampaignBreakdownDailyMetricsWriter: one
+    multi-row upsert per batch, committed per batch so long
+    backfills never hold one giant transaction.
+
+    The unit of work is (ad account, breakdown set), see
+    ingest_breakdown_set(); the fleet-level orchestrator runs
+    those in parallel, each with its own session.
     """
 
     # -----------------------------------------------------
@@ -37,6 +60,7 @@ class CampaignBreakdownInsightsIngestionService:
         user_id: UUID,
         since: date,
         until: date,
+        batch_size: Optional[int] = None,
     ) -> int:
         """
         Fetches and stores DAILY breakdown metrics
@@ -63,11 +87,52 @@ class CampaignBreakdownInsightsIngestionService:
         if not ad_account:
             return 0
 
-        rows_ingested = 0
         client = MetaCampaignInsightsClient(db)
+        rows_ingested = 0
+
+        for breakdowns in BREAKDOWN_SETS:
+            rows_ingested += (
+                await CampaignBreakdownInsightsIngestionService.ingest_breakdown_set(
+                    db=db,
+                    ad_account=ad_account,
+                    since=since,
+                    until=until,
+                    breakdowns=breakdowns,
+                    client=client,
+                    batch_size=batch_size,
+                )
+            )
+
+        return rows_ingested
+
+    # -----------------------------------------------------
+    # UNIT OF WORK — ONE AD ACCOUNT × ONE BREAKDOWN SET
+    # -----------------------------------------------------
+    @staticmethod
+    async def ingest_breakdown_set(
+        *,
+        db: AsyncSession,
+        ad_account: MetaAdAccount,
+        since: date,
+        until: date,
+        breakdowns: List[str],
+        client: Optional[MetaCampaignInsightsClient] = None,
+        batch_size: Optional[int] = None,
+        raise_errors: bool = False,
+    ) -> int:
+        """
+        Fetches one breakdown set for one ad account and upserts it.
+
+        Returns the number of unique rows written. A failed fetch
+        counts as 0 rows unless raise_errors (callers that checkpoint
+        the unit must not record it as done).
+        """
+
+        client = client or MetaCampaignInsightsClient(db)
+        started = time.perf_counter()
 
         # -------------------------------------------------
-        # CAMPAIGNS FOR SELECTED ACCOUNT
+        # CAMPAIGNS FOR THE AD ACCOUNT
         # -------------------------------------------------
         stmt = (
             select(Campaign)
@@ -82,103 +147,91 @@ class CampaignBreakdownInsightsIngestionService:
         if not campaigns:
             return 0
 
-        campaign_map = {c.meta_campaign_id: c for c in campaigns}
-
-        # -------------------------------------------------
-        # BREAKDOWN SETS (LOCKED)
-        # -------------------------------------------------
-        breakdown_sets = [
-            ["ad_id"],
-            ["platform", "placement"],
-            ["age", "gender"],
-            ["region"],
-        ]
-
-        for breakdowns in breakdown_sets:
-            try:
-                insights: List[Dict[str, Any]] = (
-                    await client.fetch_daily_insights_with_breakdown(
-                        ad_account=ad_account,
-                        since=since,
-                        until=until,
-                        breakdowns=breakdowns,
-                    )
+        # Plain values: the writer commits per batch, which may
+        # expire ORM instances mid-loop
+        campaign_map = {
+            c.meta_campaign_id: (c.id, c.objective) for c in campaigns
+        }
+        meta_account_id = ad_account.meta_account_id
+
+        try:
+            insights: List[Dict[str, Any]] = (
+                await client.fetch_daily_insights_with_breakdown(
+                    ad_account=ad_account,
+                    since=since,
+                    until=until,
+                    breakdowns=breakdowns,
                 )
-            except Exception:
-                continue
+            )
+        except Exception:
+            if raise_errors:
+                raise
+            return 0
 
-            if not insights:
+        if not insights:
+            return 0
+
+        writer = CampaignBreakdownDailyMetricsWriter(
+            db,
+            batch_size=batch_size,
+            commit_batches=True,
+        )
+
+        for row in insights:
+            # -----------------------------
+            # STUB / EMPTY → SKIP
+            # -----------------------------
+            if row.get("impressions", 0) == 0 and row.get("spend", 0) == 0:
                 continue
 
-            for row in insights:
-                # -----------------------------
-                # STUB / EMPTY → SKIP
-                # -----------------------------
-                if row.get("impressions", 0) == 0 and row.get("spend", 0) == 0:
-                    continue
-
-                campaign = campaign_map.get(row.get("campaign_meta_id"))
-                if not campaign:
-                    continue
-
-                stmt = (
-                    select(CampaignBreakdownDailyMetrics)
-                    .where(
-                        CampaignBreakdownDailyMetrics.campaign_id == campaign.id,
-                        CampaignBreakdownDailyMetrics.metric_date == row["metric_date"],
-                        CampaignBreakdownDailyMetrics.ad_id == row.get("ad_id"),
-                        CampaignBreakdownDailyMetrics.platform == row.get("platform"),
-                        CampaignBreakdownDailyMetrics.placement == row.get("placement"),
-                        CampaignBreakdownDailyMetrics.age_group == row.get("age"),
-                        CampaignBreakdownDailyMetrics.gender == row.get("gender"),
-                        CampaignBreakdownDailyMetrics.region == row.get("region"),
-                    )
-                )
+            campaign = campaign_map.get(row.get("campaign_meta_id"))
+            if not campaign:
+                continue
 
-                result = await db.execute(stmt)
-                existing = result.scalar_one_or_none()
-
-                if existing:
-                    existing.impressions = row["impressions"]
-                    existing.clicks = row["clicks"]
-                    existing.spend = row["spend"]
-                    existing.conversions = row["conversions"]
-                    existing.conversion_value = row["conversion_value"]
-                    existing.ctr = row["ctr"]
-                    existing.cpl = row["cpl"]
-                    existing.cpa = row["cpa"]
-                    existing.roas = row["roas"]
-                    existing.meta_fetched_at = row.get(
-                        "meta_fetched_at", datetime.utcnow()
-                    )
-                else:
-                    metric = CampaignBreakdownDailyMetrics(
-                        campaign_id=campaign.id,
-                        metric_date=row["metric_date"],
-                        ad_id=row.get("ad_id"),
-                        platform=row.get("platform"),
-                        placement=row.get("placement"),
-                        age_group=row.get("age"),
-                        gender=row.get("gender"),
-                        region=row.get("region"),
-                        impressions=row["impressions"],
-                        clicks=row["clicks"],
-                        spend=row["spend"],
-                        conversions=row["conversions"],
-                        conversion_value=row["conversion_value"],
-                        ctr=row["ctr"],
-                        cpl=row["cpl"],
-                        cpa=row["cpa"],
-                        roas=row["roas"],
-                        objective_type=campaign.objective,
-                        meta_account_id=ad_account.meta_account_id,
-                        meta_fetched_at=row.get(
-                            "meta_fetched_at", datetime.utcnow()
-                        ),
-                    )
-                    db.add(metric)
-
-                rows_ingested += 1
+            campaign_id, objective = campaign
+
+            await writer.add(
+                {
+                    "campaign_id": campaign_id,
+                    "metric_date": row["metric_date"],
+                    "ad_id": row.get("ad_id"),
+                    "platform": row.get("platform"),
+                    "placement": row.get("placement"),
+                    "age_group": row.get("age"),
+                    "gender": row.get("gender"),
+                    "region": row.get("region"),
+                    "impressions": row["impressions"],
+                    "clicks": row["clicks"],
+                    "spend": row["spend"],
+                    "conversions": row["conversions"],
+                    "conversion_value": row["conversion_value"],
+                    "ctr": row["ctr"],
+                    "cpl": row["cpl"],
+                    "cpa": row["cpa"],
+                    "roas": row["roas"],
+                    "objective_type": objective,
+                    "meta_account_id": meta_account_id,
+                    "meta_fetched_at": row.get("meta_fetched_at"),
+                }
+            )
 
+        await writer.flush()
         await db.commit()
-        return rows_ingested
+
+        elapsed = time.perf_counter() - started
+        stats = writer.stats()
+        logger.info(
+            "Breakdown ingest account=%s breakdowns=%s %s..%s rows=%d "
+            "batches=%d total=%.2fs (%.0f rows/s) upsert=%.0f rows/s",
+            meta_account_id,
+            ",".join(breakdowns),
+            since,
+            until,
+            stats["rows_written"],
+            stats["batches_flushed"],
+            elapsed,
+            stats["rows_written"] / elapsed if elapsed else 0.0,
+            stats["rows_per_sec"],
+        )
+
+        return stats["rows_written"]
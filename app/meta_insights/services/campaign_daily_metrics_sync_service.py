@@ -4,16 +4,30 @@ Campaign Daily Metrics Sync Service
 PHASE 6.5 — META INSIGHTS INGESTION (LOCKED)
 
 Purpose:
-- Fetch daily Meta Insights per campaign
+- Fetch daily Meta Insights per ad account (all campaigns at once)
 - Idempotent upsert into campaign_daily_metrics
 - READ-ONLY Meta
 - NO AI / NO inference
+
+Pipeline:
+1. Load selected ad accounts + their campaigns, resolve access
+   tokens (DB, sequential)
+2. One paginated level=campaign, time_increment=1 request per ad
+   account, accounts fetched concurrently (Graph only, no DB) —
+   bounded globally and per ad account by the client's rate limiter
+3. Fan rows out to campaigns via meta_campaign_id, normalize and
+   hand to CampaignDailyMetricsWriter (batched multi-row upsert)
+
+A backfill of N days is the same single ranged request per account.
 """
 
+import asyncio
+from collections import defaultdict
 from datetime import date, datetime
-from typing import Dict, Any
+from typing import Collection, Dict, Any, List, Optional, Set, Tuple
+from uuid import UUID
 
-from sqlalchemy import text
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.campaigns.models import Campaign
@@ -21,91 +35,180 @@ from app.meta_api.models import MetaAdAccount, UserMetaAdAccount
 from app.meta_insights.clients.meta_campaign_insights_client import (
     MetaCampaignInsightsClient,
 )
+from app.meta_insights.services.campaign_daily_metrics_writer import (
+    CampaignDailyMetricsWriter,
+)
 
 
 class CampaignDailyMetricsSyncService:
-    def __init__(self, db: AsyncSession):
+    def __init__(
+        self,
+        db: AsyncSession,
+        *,
+        client: Optional[MetaCampaignInsightsClient] = None,
+        batch_size: Optional[int] = None,
+    ):
         self.db = db
-        self.client = MetaCampaignInsightsClient(db)
+        self.client = client or MetaCampaignInsightsClient(db)
+        self.batch_size = batch_size
 
     # =====================================================
     # ENTRY POINT — DAILY SYNC (ADMIN ONLY)
     # =====================================================
-    async def sync_for_date(self, target_date: date) -> Dict[str, int]:
-        campaigns = await self._get_active_campaigns()
-
-        synced = 0
-        skipped = 0
-        failed = 0
-
-        for campaign in campaigns:
-            try:
-                insights = await self.client.fetch_daily_insights(
-                    campaign=campaign,
-                    target_date=target_date,
-                )
+    async def sync_for_date(self, target_date: date) -> Dict[str, Any]:
+        return await self.sync_for_range(target_date, target_date)
 
-                if not insights:
-                    skipped += 1
-                    continue
+    # =====================================================
+    # ENTRY POINT — RANGED SYNC / BACKFILL
+    # =====================================================
+    async def sync_for_range(
+        self,
+        since: date,
+        until: date,
+        *,
+        ad_account_ids: Optional[Collection[UUID]] = None,
+    ) -> Dict[str, Any]:
+        if since > until:
+            raise ValueError("since must be on or before until")
 
-                impressions = int(insights.get("impressions", 0))
-                clicks = int(insights.get("clicks", 0))
-                spend = float(insights.get("spend", 0))
-                leads = int(insights.get("leads", 0))
-                purchases = int(insights.get("purchases", 0))
-                revenue = float(insights.get("purchase_value", 0))
-
-                if (
-                    impressions == 0
-                    and clicks == 0
-                    and spend == 0
-                    and leads == 0
-                    and purchases == 0
-                    and revenue == 0
-                ):
-                    skipped += 1
-                    continue
+        accounts = await self._get_selected_accounts(ad_account_ids)
 
-                row = self._normalize_campaign_metrics(
-                    campaign=campaign,
-                    insights=insights,
-                    target_date=target_date,
-                )
+        await self.client.resolve_access_tokens(
+            {ad_account.id for ad_account, _ in accounts}
+        )
+
+        fetched = await self._fetch_all(accounts, since, until)
+
+        writer = CampaignDailyMetricsWriter(self.db, batch_size=self.batch_size)
 
-                await self._upsert_campaign_daily(row)
-                synced += 1
+        synced: Set[UUID] = set()
+        failed: Set[UUID] = set()
+        synced_rows = 0
+        all_campaigns: Set[UUID] = set()
 
-            except Exception:
-                failed += 1
+        for (ad_account, campaigns), rows in fetched:
+            all_campaigns.update(campaign.id for campaign in campaigns)
+
+            if rows is None or isinstance(rows, BaseException):
+                failed.update(campaign.id for campaign in campaigns)
                 continue
 
+            by_meta_id = {
+                campaign.meta_campaign_id: campaign for campaign in campaigns
+            }
+
+            for insights in rows:
+                # Archived / unknown campaigns are not synced
+                campaign = by_meta_id.get(insights.get("meta_campaign_id"))
+                if campaign is None:
+                    continue
+
+                try:
+                    if self._is_empty(insights):
+                        continue
+
+                    row = self._normalize_campaign_metrics(
+                        campaign=campaign,
+                        insights=insights,
+                        target_date=insights["metric_date"],
+                    )
+
+                except Exception:
+                    failed.add(campaign.id)
+                    continue
+
+                await writer.add(row)
+                synced.add(campaign.id)
+                synced_rows += 1
+
+        await writer.flush()
         await self.db.commit()
 
+        synced -= failed
+
         return {
-            "synced_campaigns": synced,
-            "skipped_campaigns": skipped,
-            "failed_campaigns": failed,
+            "synced_campaigns": len(synced),
+            "skipped_campaigns": len(all_campaigns - synced - failed),
+            "failed_campaigns": len(failed),
+            "synced_rows": synced_rows,
+            "api_requests": self.client.requests_made,
+            "upsert_rows_per_sec": writer.rows_per_sec,
         }
 
+    @staticmethod
+    def _is_empty(insights: Dict[str, Any]) -> bool:
+        return (
+            int(insights.get("impressions", 0)) == 0
+            and int(insights.get("clicks", 0)) == 0
+            and float(insights.get("spend", 0)) == 0
+            and int(insights.get("leads", 0)) == 0
+            and int(insights.get("purchases", 0)) == 0
+            and float(insights.get("purchase_value", 0)) == 0
+        )
+
+    # =====================================================
+    # CONCURRENT FETCH — ONE RANGED REQUEST PER ACCOUNT
+    # =====================================================
+    async def _fetch_all(
+        self,
+        accounts: List[Tuple[MetaAdAccount, List[Campaign]]],
+        since: date,
+        until: date,
+    ) -> List[Tuple[Tuple[MetaAdAccount, List[Campaign]], Any]]:
+        """
+        Fans out one paginated fetch per ad account. Concurrency and
+        Meta usage throttling are enforced by the client's rate
+        limiter, so scheduling every task up-front is safe.
+        """
+
+        results = await asyncio.gather(
+            *[
+                self.client.fetch_account_daily_insights(
+                    ad_account_id=ad_account.id,
+                    meta_account_id=ad_account.meta_account_id,
+                    since=since,
+                    until=until,
+                )
+                for ad_account, _ in accounts
+            ],
+            return_exceptions=True,
+        )
+
+        return list(zip(accounts, results))
+
     # =====================================================
-    # FETCH CAMPAIGNS — ONLY SELECTED AD ACCOUNT
+    # FETCH ACCOUNTS + CAMPAIGNS — ONLY SELECTED AD ACCOUNTS
     # =====================================================
-    async def _get_active_campaigns(self):
-        result = await self.db.execute(
-            text(
-                """
-                SELECT c.*
-                FROM campaigns c
-                JOIN meta_ad_accounts ma ON c.ad_account_id = ma.id
-                JOIN user_meta_ad_accounts uma ON uma.meta_ad_account_id = ma.id
-                WHERE
-                    c.is_archived = FALSE
-                    AND uma.is_selected = TRUE
-                """
+    async def _get_selected_accounts(
+        self,
+        ad_account_ids: Optional[Collection[UUID]] = None,
+    ) -> List[Tuple[MetaAdAccount, List[Campaign]]]:
+        selected_accounts = (
+            select(UserMetaAdAccount.meta_ad_account_id)
+            .where(UserMetaAdAccount.is_selected.is_(True))
+        )
+
+        stmt = (
+            select(MetaAdAccount, Campaign)
+            .join(Campaign, Campaign.ad_account_id == MetaAdAccount.id)
+            .where(
+                MetaAdAccount.id.in_(selected_accounts),
+                Campaign.is_archived.is_(False),
             )
         )
-        return result.scalars().all()
+        if ad_account_ids is not None:
+            stmt = stmt.where(MetaAdAccount.id.in_(list(ad_account_ids)))
+
+        result = await self.db.execute(stmt)
+
+        accounts: Dict[UUID, MetaAdAccount] = {}
+        campaigns: Dict[UUID, List[Campaign]] = defaultdict(list)
+
+        for ad_account, campaign in result.all():
+            accounts[ad_account.id] = ad_account
+            campaigns[ad_account.id].append(campaign)
+
+        return [(accounts[aid], campaigns[aid]) for aid in accounts]
 
     # =====================================================
     # NORMALIZATION — CAMPAIGN LEVEL
@@ -152,58 +255,3 @@ class CampaignDailyMetricsSyncService:
             "roas": roas,
             "updated_at": datetime.utcnow(),
         }
-
-    # =====================================================
-    # UPSERT — CAMPAIGN DAILY METRICS (IDEMPOTENT)
-    # =====================================================
-    async def _upsert_campaign_daily(self, row: Dict[str, Any]) -> None:
-        await self.db.execute(
-            text(
-                """
-                INSERT INTO campaign_daily_metrics (
-                    campaign_id,
-                    date,
-                    impressions,
-                    clicks,
-                    spend,
-                    leads,
-                    purchases,
-                    revenue,
-                    ctr,
-                    cpl,
-                    cpa,
-                    roas,
-                    updated_at
-                )
-                VALUES (
-                    :campaign_id,
-                    :date,
-                    :impressions,
-                    :clicks,
-                    :spend,
-                    :leads,
-                    :purchases,
-                    :revenue,
-                    :ctr,
-                    :cpl,
-                    :cpa,
-                    :roas,
-                    :updated_at
-                )
-                ON CONFLICT (campaign_id, date)
-                DO UPDATE SET
-                    impressions = EXCLUDED.impressions,
-                    clicks = EXCLUDED.clicks,
-                    spend = EXCLUDED.spend,
-                    leads = EXCLUDED.leads,
-                    purchases = EXCLUDED.purchases,
-                    revenue = EXCLUDED.revenue,
-                    ctr = EXCLUDED.ctr,
-                    cpl = EXCLUDED.cpl,
-                    cpa = EXCLUDED.cpa,
-                    roas = EXCLUDED.roas,
-                    updated_at = EXCLUDED.updated_at
-                """
-            ),
-            row,
-        )
@@ -0,0 +1,213 @@
+"""
+Campaign Daily Metrics Writer
+
+PHASE 6.5 — BATCHED UPSERT INTO campaign_daily_metrics
+
+Purpose:
+- Accumulate normalized daily rows
+- Flush them as ONE multi-row INSERT ... ON CONFLICT per batch
+- Report rows/sec for backfills
+
+Rows are shipped as one typed array per column and expanded
+server-side with unnest(), so the statement text (and its
+prepared plan) is identical for every batch.
+
+Does NOT commit: the caller owns the transaction.
+"""
+
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+
+DAILY_METRIC_COLUMNS = (
+    "campaign_id",
+    "date",
+    "impressions",
+    "clicks",
+    "spend",
+    "leads",
+    "purchases",
+    "revenue",
+    "ctr",
+    "cpl",
+    "cpa",
+    "roas",
+    "updated_at",
+)
+
+_NUMERIC_COLUMNS = {"spend", "revenue", "ctr", "cpl", "cpa", "roas"}
+
+
+UPSERT_SQL = text(
+    """
+    INSERT INTO campaign_daily_metrics (
+        id,
+        campaign_id,
+        date,
+        impressions,
+        clicks,
+        spend,
+        leads,
+        purchases,
+        revenue,
+        ctr,
+        cpl,
+        cpa,
+        roas,
+        updated_at
+    )
+    SELECT
+        gen_random_uuid(),
+        r.campaign_id,
+        r.date,
+        r.impressions,
+        r.clicks,
+        r.spend,
+        r.leads,
+        r.purchases,
+        r.revenue,
+        r.ctr,
+        r.cpl,
+        r.cpa,
+        r.roas,
+        r.updated_at
+    FROM unnest(
+        CAST(:campaign_id AS UUID[]),
+        CAST(:date AS DATE[]),
+        CAST(:impressions AS INTEGER[]),
+        CAST(:clicks AS INTEGER[]),
+        CAST(:spend AS NUMERIC[]),
+        CAST(:leads AS INTEGER[]),
+        CAST(:purchases AS INTEGER[]),
+        CAST(:revenue AS NUMERIC[]),
+        CAST(:ctr AS NUMERIC[]),
+        CAST(:cpl AS NUMERIC[]),
+        CAST(:cpa AS NUMERIC[]),
+        CAST(:roas AS NUMERIC[]),
+        CAST(:updated_at AS TIMESTAMPTZ[])
+    ) AS r (
+        campaign_id,
+        date,
+        impressions,
+        clicks,
+        spend,
+        leads,
+        purchases,
+        revenue,
+        ctr,
+        cpl,
+        cpa,
+        roas,
+        updated_at
+    )
+    ON CONFLICT (campaign_id, date)
+    DO UPDATE SET
+        impressions = EXCLUDED.impressions,
+        clicks = EXCLUDED.clicks,
+        spend = EXCLUDED.spend,
+        leads = EXCLUDED.leads,
+        purchases = EXCLUDED.purchases,
+        revenue = EXCLUDED.revenue,
+        ctr = EXCLUDED.ctr,
+        cpl = EXCLUDED.cpl,
+        cpa = EXCLUDED.cpa,
+        roas = EXCLUDED.roas,
+        updated_at = EXCLUDED.updated_at
+    """
+)
+
+
+class CampaignDailyMetricsWriter:
+    """
+    Usage:
+        writer = CampaignDailyMetricsWriter(db)
+        for row in rows:
+            await writer.add(row)
+        await writer.flush()
+        await db.commit()
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        *,
+        batch_size: Optional[int] = None,
+    ):
+        self.db = db
+        self.batch_size = batch_size or settings.META_INSIGHTS_UPSERT_BATCH_SIZE
+
+        # Keyed on the conflict target: a batch may not touch the
+        # same (campaign_id, date) twice, so the last row wins
+        self._pending: Dict[Tuple[UUID, date], Dict[str, Any]] = {}
+
+        self.rows_written = 0
+        self.batches_flushed = 0
+        self.write_seconds = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        if not self.write_seconds:
+            return 0.0
+        return round(self.rows_written / self.write_seconds, 1)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rows_written": self.rows_written,
+            "batches_flushed": self.batches_flushed,
+            "write_seconds": round(self.write_seconds, 3),
+            "rows_per_sec": self.rows_per_sec,
+        }
+
+    # =====================================================
+    # ACCUMULATE
+    # =====================================================
+    async def add(self, row: Dict[str, Any]) -> None:
+        key = (UUID(str(row["campaign_id"])), row["date"])
+        self._pending[key] = row
+
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+
+    # =====================================================
+    # FLUSH — ONE STATEMENT PER BATCH
+    # =====================================================
+    async def flush(self) -> int:
+        if not self._pending:
+            return 0
+
+        rows = list(self._pending.values())
+        self._pending = {}
+
+        params: Dict[str, Any] = {
+            col: [_to_param(col, row.get(col)) for row in rows]
+            for col in DAILY_METRIC_COLUMNS
+        }
+        params["campaign_id"] = [UUID(str(cid)) for cid in params["campaign_id"]]
+        params["updated_at"] = [
+            value or datetime.utcnow() for value in params["updated_at"]
+        ]
+
+        started = time.perf_counter()
+        await self.db.execute(UPSERT_SQL, params)
+        self.write_seconds += time.perf_counter() - started
+
+        self.rows_written += len(rows)
+        self.batches_flushed += 1
+        return len(rows)
+
+
+def _to_param(column: str, value: Any) -> Any:
+    # NUMERIC[] binds need Decimal. Decimal(float) is exact, which is
+    # how asyncpg binds a scalar float, so stored values (incl. half-cent
+    # ties) match the old per-row upsert byte for byte
+    if column in _NUMERIC_COLUMNS and isinstance(value, float):
+        return Decimal(value)
+    return value
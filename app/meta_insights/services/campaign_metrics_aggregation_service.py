@@ -7,10 +7,34 @@ Purpose:
 - Safe to re-run (idempotent)
 - No background jobs
 - No Meta calls
+
+Modes:
+- SET-BASED (default): one grouped pass over campaign_daily_metrics
+  computes every window for every campaign, results are written with
+  one multi-row upsert per chunk
+- PER-CAMPAIGN (fallback): one SELECT + one upsert per campaign per window
+- INCREMENTAL: when as_of_date advances by one day, every window is
+  rolled forward from the previous day's totals (add the new day,
+  subtract the day that drops out). Campaigns with late-arriving daily
+  rows (updated_at newer than their aggregates) or without yesterday's
+  aggregates fall back to the set-based full recompute
+
+Conversions: campaign_daily_metrics stores leads and purchases; a
+conversion is a lead for LEAD campaigns, a purchase for SALES
+campaigns and either for any other objective. Value = revenue
+(Meta purchase value).
+
+Partitions (campaign_daily_metrics is partitioned by month on date):
+- every daily-metrics read carries a date RANGE predicate; = ANY(array)
+  alone is not pruned under generic prepared plans
+- the roll-forward reads only the months of the touched days, so the
+  90d and lifetime windows no longer scan the whole history
 """
 
 from datetime import date, timedelta, datetime
-from typing import List, Optional
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Set
+from uuid import UUID
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -26,6 +50,48 @@ WINDOW_DEFINITIONS = {
     "lifetime": None,
 }
 
+# Aggregate rows per multi-row upsert statement
+UPSERT_CHUNK_SIZE = 5000
+
+# Conversions of one daily row d of campaign c (campaigns alias c)
+CONVERSIONS_SQL = """
+    CASE c.objective
+        WHEN 'LEAD' THEN d.leads
+        WHEN 'SALES' THEN d.purchases
+        ELSE d.leads + d.purchases
+    END
+"""
+
+AGGREGATE_COLUMNS = (
+    "campaign_id",
+    "window_type",
+    "window_start_date",
+    "window_end_date",
+    "as_of_date",
+    "impressions",
+    "clicks",
+    "spend",
+    "conversions",
+    "revenue",
+    "ctr",
+    "cpa",
+    "roas",
+    "days_covered",
+    "is_complete_window",
+)
+
+
+def _touched_dates(as_of_date: date) -> List[date]:
+    """
+    New day + the day leaving each bounded window.
+    """
+
+    return [as_of_date] + [
+        as_of_date - timedelta(days=days)
+        for days in WINDOW_DEFINITIONS.values()
+        if days is not None
+    ]
+
 
 class CampaignMetricsAggregationService:
     def __init__(self, db: AsyncSession):
@@ -34,17 +100,38 @@ class CampaignMetricsAggregationService:
     # =====================================================
     # ENTRY POINT
     # =====================================================
-    async def aggregate_for_date(self, as_of_date: date) -> None:
-        campaign_ids = await self._get_campaign_ids()
+    async def aggregate_for_date(
+        self,
+        as_of_date: date,
+        *,
+        set_based: bool = True,
+        incremental: bool = False,
+    ) -> None:
+        if incremental:
+            rolled = await self._roll_forward_windows(as_of_date)
+            remaining = {
+                UUID(campaign_id)
+                for campaign_id in await self._get_campaign_ids()
+            } - rolled
 
-        for campaign_id in campaign_ids:
-            for window_type, days in WINDOW_DEFINITIONS.items():
-                await self._aggregate_campaign_window(
-                    campaign_id=campaign_id,
-                    window_type=window_type,
-                    as_of_date=as_of_date,
-                    days=days,
+            if remaining:
+                await self._aggregate_all_windows(
+                    as_of_date,
+                    campaign_ids=remaining,
                 )
+        elif set_based:
+            await self._aggregate_all_windows(as_of_date)
+        else:
+            campaign_ids = await self._get_campaign_ids()
+
+            for campaign_id in campaign_ids:
+                for window_type, days in WINDOW_DEFINITIONS.items():
+                    await self._aggregate_campaign_window(
+                        campaign_id=campaign_id,
+                        window_type=window_type,
+                        as_of_date=as_of_date,
+                        days=days,
+                    )
 
         await self.db.commit()
 
@@ -55,7 +142,366 @@ class CampaignMetricsAggregationService:
         return [str(row[0]) for row in result.fetchall()]
 
     # =====================================================
-    # WINDOW AGGREGATION
+    # CHANGE DETECTION (NIGHTLY PIPELINE)
+    # =====================================================
+    async def get_affected_campaign_ids(
+        self,
+        as_of_date: date,
+        changed_campaign_ids: Set[UUID],
+    ) -> Set[UUID]:
+        """
+        Campaigns whose aggregates for as_of_date differ from the
+        previous day's: the changed sources plus every campaign with
+        daily data on the new day or on a day leaving a window.
+        """
+
+        touched_dates = _touched_dates(as_of_date)
+
+        result = await self.db.execute(
+            text(
+                """
+                SELECT DISTINCT d.campaign_id
+                FROM campaign_daily_metrics d
+                JOIN campaigns c
+                    ON c.id = d.campaign_id
+                WHERE c.is_archived = false
+                  AND d.date = ANY(CAST(:touched_dates AS DATE[]))
+                  AND d.date BETWEEN :first_touched AND :as_of_date
+                """
+            ),
+            {
+                "touched_dates": touched_dates,
+                "first_touched": min(touched_dates),
+                "as_of_date": as_of_date,
+            },
+        )
+        return set(changed_campaign_ids) | {row[0] for row in result.fetchall()}
+
+    # =====================================================
+    # SET-BASED AGGREGATION (ALL CAMPAIGNS × ALL WINDOWS)
+    # =====================================================
+    async def _aggregate_all_windows(
+        self,
+        as_of_date: date,
+        campaign_ids: Optional[Set[UUID]] = None,
+    ) -> None:
+        """
+        Single grouped pass over campaign_daily_metrics.
+
+        Each bounded window is a conditional SUM (FILTER) over the
+        same scan; lifetime is the unfiltered aggregate.
+        """
+
+        select_parts = [
+            "d.campaign_id AS campaign_id",
+            "MIN(d.date) AS first_date",
+        ]
+        params: Dict[str, Any] = {"as_of_date": as_of_date}
+        campaign_filter = ""
+
+        if campaign_ids is not None:
+            params["campaign_ids"] = list(campaign_ids)
+            campaign_filter = (
+                "AND d.campaign_id = ANY(CAST(:campaign_ids AS UUID[]))"
+            )
+
+        for window_type, days in WINDOW_DEFINITIONS.items():
+            if days is None:
+                condition = ""
+            else:
+                params[f"start_{window_type}"] = as_of_date - timedelta(
+                    days=days - 1
+                )
+                condition = (
+                    f" FILTER (WHERE d.date >= :start_{window_type})"
+                )
+
+            select_parts.extend(
+                [
+                    f'COUNT(*){condition} AS "days_covered_{window_type}"',
+                    f'SUM(d.impressions){condition} AS "impressions_{window_type}"',
+                    f'SUM(d.clicks){condition} AS "clicks_{window_type}"',
+                    f'SUM(d.spend){condition} AS "spend_{window_type}"',
+                    f'SUM({CONVERSIONS_SQL}){condition} AS "conversions_{window_type}"',
+                    f'SUM(d.revenue){condition} AS "revenue_{window_type}"',
+                ]
+            )
+
+        query = f"""
+            SELECT
+                {", ".join(select_parts)}
+            FROM campaign_daily_metrics d
+            JOIN campaigns c
+                ON c.id = d.campaign_id
+            WHERE c.is_archived = false
+              AND d.date <= :as_of_date
+              {campaign_filter}
+            GROUP BY d.campaign_id
+        """
+
+        result = await self.db.execute(text(query), params)
+
+        rows: List[Dict[str, Any]] = []
+
+        for row in result.mappings():
+            for window_type, days in WINDOW_DEFINITIONS.items():
+                if row[f"impressions_{window_type}"] is None:
+                    continue
+
+                window_start = (
+                    row["first_date"]
+                    if days is None
+                    else params[f"start_{window_type}"]
+                )
+
+                rows.append(
+                    self._build_aggregate(
+                        campaign_id=str(row["campaign_id"]),
+                        window_type=window_type,
+                        window_start=window_start,
+                        as_of_date=as_of_date,
+                        days=days,
+                        days_covered=row[f"days_covered_{window_type}"],
+                        impressions=row[f"impressions_{window_type}"],
+                        clicks=row[f"clicks_{window_type}"],
+                        spend=row[f"spend_{window_type}"],
+                        conversions=row[f"conversions_{window_type}"],
+                        revenue=row[f"revenue_{window_type}"],
+                    )
+                )
+
+        await self._upsert_aggregates(rows)
+
+    # =====================================================
+    # INCREMENTAL ROLL-FORWARD (as_of_date - 1 → as_of_date)
+    # =====================================================
+    async def _roll_forward_windows(self, as_of_date: date) -> Set[UUID]:
+        """
+        Rolls yesterday's aggregates forward by one day.
+
+        Touches only the new day and, per bounded window, the day that
+        drops out, so lifetime costs O(days changed), not O(history).
+
+        Returns the campaign ids that were rolled forward; everything
+        else must be recomputed in full.
+        """
+
+        previous_date = as_of_date - timedelta(days=1)
+
+        result = await self.db.execute(
+            text(
+                """
+                SELECT a.campaign_id
+                FROM campaign_metrics_aggregates a
+                JOIN campaigns c
+                    ON c.id = a.campaign_id
+                WHERE c.is_archived = false
+                  AND a.window_type = 'lifetime'
+                  AND a.as_of_date = :previous_date
+                """
+            ),
+            {"previous_date": previous_date},
+        )
+        candidate_ids = {row[0] for row in result.fetchall()}
+
+        if not candidate_ids:
+            return set()
+
+        late_ids = await self._get_late_campaign_ids(as_of_date, previous_date)
+        campaign_ids = candidate_ids - late_ids
+
+        if not campaign_ids:
+            return set()
+
+        touched_dates = _touched_dates(as_of_date)
+
+        windows_sql = ", ".join(
+            f"('{window_type}', CAST({'NULL' if days is None else days} AS INTEGER))"
+            for window_type, days in WINDOW_DEFINITIONS.items()
+        )
+
+        await self.db.execute(
+            text(
+                f"""
+                WITH windows (window_type, days) AS (
+                    VALUES {windows_sql}
+                ),
+                touched AS (
+                    SELECT
+                        d.campaign_id,
+                        d.date,
+                        d.impressions,
+                        d.clicks,
+                        d.spend,
+                        {CONVERSIONS_SQL} AS conversions,
+                        d.revenue
+                    FROM campaign_daily_metrics d
+                    JOIN campaigns c
+                        ON c.id = d.campaign_id
+                    WHERE d.date = ANY(CAST(:touched_dates AS DATE[]))
+                      AND d.date BETWEEN :first_touched AND :as_of_date
+                      AND d.campaign_id = ANY(CAST(:campaign_ids AS UUID[]))
+                ),
+                delta AS (
+                    SELECT
+                        e.campaign_id,
+                        w.window_type,
+                        w.days,
+                        COUNT(d.date)
+                            FILTER (WHERE d.date = :as_of_date)         AS added_days,
+                        COUNT(d.date)
+                            FILTER (WHERE d.date < :as_of_date)         AS dropped_days,
+                        COALESCE(SUM(CASE WHEN d.date = :as_of_date
+                            THEN d.impressions ELSE -d.impressions END), 0)           AS impressions,
+                        COALESCE(SUM(CASE WHEN d.date = :as_of_date
+                            THEN d.clicks ELSE -d.clicks END), 0)                     AS clicks,
+                        COALESCE(SUM(CASE WHEN d.date = :as_of_date
+                            THEN d.spend ELSE -d.spend END), 0)                       AS spend,
+                        COALESCE(SUM(CASE WHEN d.date = :as_of_date
+                            THEN d.conversions ELSE -d.conversions END), 0)           AS conversions,
+                        COALESCE(SUM(CASE WHEN d.date = :as_of_date
+                            THEN d.revenue ELSE -d.revenue END), 0)                   AS revenue
+                    FROM unnest(CAST(:campaign_ids AS UUID[])) AS e(campaign_id)
+                    CROSS JOIN windows w
+                    LEFT JOIN touched d
+                        ON d.campaign_id = e.campaign_id
+                       AND (
+                            d.date = :as_of_date
+                            OR d.date = CAST(:as_of_date AS DATE) - w.days
+                       )
+                    GROUP BY e.campaign_id, w.window_type, w.days
+                ),
+                merged AS (
+                    SELECT
+                        delta.campaign_id,
+                        delta.window_type,
+                        delta.days,
+                        COALESCE(a.window_start_date, :as_of_date)           AS first_date,
+                        COALESCE(a.impressions, 0) + delta.impressions       AS impressions,
+                        COALESCE(a.clicks, 0) + delta.clicks                 AS clicks,
+                        COALESCE(a.spend, 0) + delta.spend                   AS spend,
+                        COALESCE(a.conversions, 0) + delta.conversions       AS conversions,
+                        COALESCE(a.revenue, 0) + delta.revenue               AS revenue,
+                        COALESCE(a.days_covered, 0)
+                            + delta.added_days - delta.dropped_days          AS days_covered
+                    FROM delta
+                    LEFT JOIN campaign_metrics_aggregates a
+                        ON a.campaign_id = delta.campaign_id
+                       AND a.window_type = delta.window_type
+                       AND a.as_of_date = :previous_date
+                )
+                INSERT INTO campaign_metrics_aggregates (
+                    id,
+                    campaign_id,
+                    window_type,
+                    window_start_date,
+                    window_end_date,
+                    as_of_date,
+                    impressions,
+                    clicks,
+                    spend,
+                    conversions,
+                    revenue,
+                    ctr,
+                    cpa,
+                    roas,
+                    days_covered,
+                    is_complete_window,
+                    created_at,
+                    updated_at
+                )
+                SELECT
+                    gen_random_uuid(),
+                    m.campaign_id,
+                    m.window_type,
+                    CASE
+                        WHEN m.days IS NULL THEN m.first_date
+                        ELSE CAST(:as_of_date AS DATE) - (m.days - 1)
+                    END,
+                    :as_of_date,
+                    :as_of_date,
+                    m.impressions,
+                    m.clicks,
+                    m.spend,
+                    m.conversions,
+                    m.revenue,
+                    CAST(m.clicks AS NUMERIC) / NULLIF(m.impressions, 0),
+                    m.spend / NULLIF(m.conversions, 0),
+                    m.revenue / NULLIF(m.spend, 0),
+                    m.days_covered,
+                    m.days IS NULL OR m.days_covered >= m.days,
+                    :now,
+                    :now
+                FROM merged m
+                WHERE m.days_covered > 0
+                ON CONFLICT (campaign_id, window_type)
+                DO UPDATE SET
+                    window_start_date   = EXCLUDED.window_start_date,
+                    window_end_date     = EXCLUDED.window_end_date,
+                    as_of_date          = EXCLUDED.as_of_date,
+                    impressions         = EXCLUDED.impressions,
+                    clicks              = EXCLUDED.clicks,
+                    spend               = EXCLUDED.spend,
+                    conversions         = EXCLUDED.conversions,
+                    revenue             = EXCLUDED.revenue,
+                    ctr                 = EXCLUDED.ctr,
+                    cpa                 = EXCLUDED.cpa,
+                    roas                = EXCLUDED.roas,
+                    days_covered        = EXCLUDED.days_covered,
+                    is_complete_window  = EXCLUDED.is_complete_window,
+                    updated_at          = EXCLUDED.updated_at
+                """
+            ),
+            {
+                "campaign_ids": list(campaign_ids),
+                "touched_dates": touched_dates,
+                "first_touched": min(touched_dates),
+                "as_of_date": as_of_date,
+                "previous_date": previous_date,
+                "now": datetime.utcnow(),
+            },
+        )
+
+        return campaign_ids
+
+    async def _get_late_campaign_ids(
+        self,
+        as_of_date: date,
+        previous_date: date,
+    ) -> Set[UUID]:
+        """
+        Campaigns whose already-aggregated history changed after
+        their aggregates were written (late / restated Meta data).
+        """
+
+        result = await self.db.execute(
+            text(
+                """
+                SELECT DISTINCT d.campaign_id
+                FROM campaign_daily_metrics d
+                JOIN campaign_metrics_aggregates a
+                    ON a.campaign_id = d.campaign_id
+                   AND a.window_type = 'lifetime'
+                   AND a.as_of_date = :previous_date
+                WHERE d.date < :as_of_date
+                  AND d.updated_at > (a.updated_at AT TIME ZONE 'UTC')
+                  AND d.updated_at > (
+                        SELECT MIN(updated_at) AT TIME ZONE 'UTC'
+                        FROM campaign_metrics_aggregates
+                        WHERE window_type = 'lifetime'
+                          AND as_of_date = :previous_date
+                  )
+                """
+            ),
+            {
+                "as_of_date": as_of_date,
+                "previous_date": previous_date,
+            },
+        )
+        return {row[0] for row in result.fetchall()}
+
+    # =====================================================
+    # WINDOW AGGREGATION (PER-CAMPAIGN FALLBACK)
     # =====================================================
     async def _aggregate_campaign_window(
         self,
@@ -65,22 +511,25 @@ class CampaignMetricsAggregationService:
         days: int | None,
     ) -> None:
         if days is None:
-            date_filter = "metric_date <= :as_of_date"
+            date_filter = "d.date <= :as_of_date"
             window_start = None
         else:
             window_start = as_of_date - timedelta(days=days - 1)
-            date_filter = "metric_date BETWEEN :window_start AND :as_of_date"
+            date_filter = "d.date BETWEEN :window_start AND :as_of_date"
 
         query = f"""
             SELECT
                 COUNT(*)              AS days_covered,
-                SUM(impressions)      AS impressions,
-                SUM(clicks)           AS clicks,
-                SUM(spend)            AS spend,
-                SUM(conversions)      AS conversions,
-                SUM(conversion_value) AS revenue
-            FROM campaign_daily_metrics
-            WHERE campaign_id = :campaign_id
+                MIN(d.date)           AS first_date,
+                SUM(d.impressions)    AS impressions,
+                SUM(d.clicks)         AS clicks,
+                SUM(d.spend)          AS spend,
+                SUM({CONVERSIONS_SQL}) AS conversions,
+                SUM(d.revenue)        AS revenue
+            FROM campaign_daily_metrics d
+            JOIN campaigns c
+                ON c.id = d.campaign_id
+            WHERE d.campaign_id = :campaign_id
               AND {date_filter}
         """
 
@@ -96,35 +545,71 @@ class CampaignMetricsAggregationService:
         if not row or row.impressions is None:
             return
 
-        impressions = int(row.impressions or 0)
-        clicks = int(row.clicks or 0)
-        spend = float(row.spend or 0)
-        conversions = int(row.conversions or 0)
-        revenue = float(row.revenue or 0)
+        await self._upsert_aggregate(
+            **self._build_aggregate(
+                campaign_id=campaign_id,
+                window_type=window_type,
+                window_start=window_start or row.first_date,
+                as_of_date=as_of_date,
+                days=days,
+                days_covered=row.days_covered,
+                impressions=row.impressions,
+                clicks=row.clicks,
+                spend=row.spend,
+                conversions=row.conversions,
+                revenue=row.revenue,
+            )
+        )
 
-        ctr = (clicks / impressions) if impressions else None
+    # =====================================================
+    # DERIVED METRICS (SHARED BY BOTH MODES)
+    # =====================================================
+    @staticmethod
+    def _build_aggregate(
+        *,
+        campaign_id: str,
+        window_type: str,
+        window_start: Optional[date],
+        as_of_date: date,
+        days: int | None,
+        days_covered: int,
+        impressions,
+        clicks,
+        spend,
+        conversions,
+        revenue,
+    ) -> Dict[str, Any]:
+        # Exact decimal arithmetic: the SQL paths compute the same
+        # ratios in NUMERIC, so every mode rounds identically
+        impressions = int(impressions or 0)
+        clicks = int(clicks or 0)
+        spend = Decimal(spend or 0)
+        conversions = int(conversions or 0)
+        revenue = Decimal(revenue or 0)
+
+        ctr = (Decimal(clicks) / impressions) if impressions else None
         cpa = (spend / conversions) if conversions else None
         roas = (revenue / spend) if spend else None
 
-        is_complete = days is None or row.days_covered >= days
+        is_complete = days is None or days_covered >= days
 
-        await self._upsert_aggregate(
-            campaign_id=campaign_id,
-            window_type=window_type,
-            window_start=window_start,
-            window_end=as_of_date,
-            as_of_date=as_of_date,
-            impressions=impressions,
-            clicks=clicks,
-            spend=spend,
-            conversions=conversions,
-            revenue=revenue,
-            ctr=ctr,
-            cpa=cpa,
-            roas=roas,
-            days_covered=row.days_covered,
-            is_complete=is_complete,
-        )
+        return {
+            "campaign_id": campaign_id,
+            "window_type": window_type,
+            "window_start_date": window_start,
+            "window_end_date": as_of_date,
+            "as_of_date": as_of_date,
+            "impressions": impressions,
+            "clicks": clicks,
+            "spend": spend,
+            "conversions": conversions,
+            "revenue": revenue,
+            "ctr": ctr,
+            "cpa": cpa,
+            "roas": roas,
+            "days_covered": days_covered,
+            "is_complete_window": is_complete,
+        }
 
     # =====================================================
     # FATIGUE + EXPANSION SIGNALS (PHASE 20)
@@ -192,69 +677,119 @@ class CampaignMetricsAggregationService:
     # UPSERT
     # =====================================================
     async def _upsert_aggregate(self, **data) -> None:
-        await self.db.execute(
-            text(
-                """
-                INSERT INTO campaign_metrics_aggregates (
-                    id,
-                    campaign_id,
-                    window_type,
-                    window_start_date,
-                    window_end_date,
-                    as_of_date,
-                    impressions,
-                    clicks,
-                    spend,
-                    conversions,
-                    revenue,
-                    ctr,
-                    cpa,
-                    roas,
-                    days_covered,
-                    is_complete_window,
-                    created_at,
-                    updated_at
-                )
-                VALUES (
-                    gen_random_uuid(),
-                    :campaign_id,
-                    :window_type,
-                    :window_start,
-                    :window_end,
-                    :as_of_date,
-                    :impressions,
-                    :clicks,
-                    :spend,
-                    :conversions,
-                    :revenue,
-                    :ctr,
-                    :cpa,
-                    :roas,
-                    :days_covered,
-                    :is_complete,
-                    :now,
-                    :now
-                )
-                ON CONFLICT (campaign_id, window_type)
-                DO UPDATE SET
-                    window_start_date   = EXCLUDED.window_start_date,
-                    window_end_date     = EXCLUDED.window_end_date,
-                    as_of_date          = EXCLUDED.as_of_date,
-                    impressions         = EXCLUDED.impressions,
-                    clicks              = EXCLUDED.clicks,
-                    spend               = EXCLUDED.spend,
-                    conversions         = EXCLUDED.conversions,
-                    revenue             = EXCLUDED.revenue,
-                    ctr                 = EXCLUDED.ctr,
-                    cpa                 = EXCLUDED.cpa,
-                    roas                = EXCLUDED.roas,
-                    days_covered        = EXCLUDED.days_covered,
-                    is_complete_window  = EXCLUDED.is_complete_window,
-                    updated_at          = EXCLUDED.updated_at
-                """
-            ),
-            {
-                **data,
-                "now": datetime.utcnow(),
-            },
-        )
+        await self._upsert_aggregates([data])
+
+    async def _upsert_aggregates(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Multi-row upsert, one statement per UPSERT_CHUNK_SIZE rows.
+
+        Rows are shipped as one typed array per column and expanded
+        server-side with unnest(), so the statement text (and its
+        prepared plan) is identical for every chunk.
+        """
+
+        now = datetime.utcnow()
+
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            chunk = rows[start:start + UPSERT_CHUNK_SIZE]
+
+            params: Dict[str, Any] = {
+                col: [row[col] for row in chunk] for col in AGGREGATE_COLUMNS
+            }
+            params["now"] = now
+
+            await self.db.execute(
+                text(
+                    """
+                    INSERT INTO campaign_metrics_aggregates (
+                        id,
+                        campaign_id,
+                        window_type,
+                        window_start_date,
+                        window_end_date,
+                        as_of_date,
+                        impressions,
+                        clicks,
+                        spend,
+                        conversions,
+                        revenue,
+                        ctr,
+                        cpa,
+                        roas,
+                        days_covered,
+                        is_complete_window,
+                        created_at,
+                        updated_at
+                    )
+                    SELECT
+                        gen_random_uuid(),
+                        CAST(t.campaign_id AS UUID),
+                        t.window_type,
+                        t.window_start_date,
+                        t.window_end_date,
+                        t.as_of_date,
+                        t.impressions,
+                        t.clicks,
+                        t.spend,
+                        t.conversions,
+                        t.revenue,
+                        t.ctr,
+                        t.cpa,
+                        t.roas,
+                        t.days_covered,
+                        t.is_complete_window,
+                        :now,
+                        :now
+                    FROM unnest(
+                        CAST(:campaign_id AS TEXT[]),
+                        CAST(:window_type AS TEXT[]),
+                        CAST(:window_start_date AS DATE[]),
+                        CAST(:window_end_date AS DATE[]),
+                        CAST(:as_of_date AS DATE[]),
+                        CAST(:impressions AS BIGINT[]),
+                        CAST(:clicks AS BIGINT[]),
+                        CAST(:spend AS NUMERIC[]),
+                        CAST(:conversions AS BIGINT[]),
+                        CAST(:revenue AS NUMERIC[]),
+                        CAST(:ctr AS NUMERIC[]),
+                        CAST(:cpa AS NUMERIC[]),
+                        CAST(:roas AS NUMERIC[]),
+                        CAST(:days_covered AS INTEGER[]),
+                        CAST(:is_complete_window AS BOOLEAN[])
+                    ) AS t(
+                        campaign_id,
+                        window_type,
+                        window_start_date,
+                        window_end_date,
+                        as_of_date,
+                        impressions,
+                        clicks,
+                        spend,
+                        conversions,
+                        revenue,
+                        ctr,
+                        cpa,
+                        roas,
+                        days_covered,
+                        is_complete_window
+                    )
+                    ON CONFLICT (campaign_id, window_type)
+                    DO UPDATE SET
+                        window_start_date   = EXCLUDED.window_start_date,
+                        window_end_date     = EXCLUDED.window_end_date,
+                        as_of_date          = EXCLUDED.as_of_date,
+                        impressions         = EXCLUDED.impressions,
+                        clicks              = EXCLUDED.clicks,
+                        spend               = EXCLUDED.spend,
+                        conversions         = EXCLUDED.conversions,
+                        revenue             = EXCLUDED.revenue,
+                        ctr                 = EXCLUDED.ctr,
+                        cpa                 = EXCLUDED.cpa,
+                        roas                = EXCLUDED.roas,
+                        days_covered        = EXCLUDED.days_covered,
+                        is_complete_window  = EXCLUDED.is_complete_window,
+                        updated_at          = EXCLUDED.updated_at
+                    """
+                ),
+                params,
+            )
@@ -0,0 +1,405 @@
+"""
+Metrics Backfill Orchestrator
+
+PHASE 8 — RESUMABLE HISTORICAL BACKFILL
+
+Purpose:
+- Backfill campaign_daily_metrics and/or campaign_breakdown_daily_metrics
+  over a long date range (e.g. 37 months when onboarding an account)
+- The range is split into date chunks; the unit of work is
+  (kind, ad account, chunk), newest chunks first so recent history
+  is usable before the oldest months arrive
+- Bounded worker pool, one BatchSessionLocal session per unit, one
+  rate limiter for the whole run
+- Every unit commits its own rows and then records a checkpoint in
+  metrics_backfill_checkpoints; a restarted backfill over the same
+  range and chunk size skips every checkpointed unit
+- Progress log with throughput and ETA
+- Monthly partitions for the whole range are created up front
+
+kind:
+- "daily"                  → CampaignDailyMetricsSyncService
+- "breakdown:<dim>,<dim>"  → one breakdown set (BREAKDOWN_SETS)
+"""
+
+import asyncio
+import logging
+import time
+from datetime import date, datetime, timedelta
+from typing import Collection, Dict, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, text
+
+from app.core.config import settings
+from app.core.db_session import BatchSessionLocal
+from app.meta_api.models import MetaAdAccount, UserMetaAdAccount
+from app.meta_insights.clients.meta_campaign_insights_client import (
+    MetaCampaignInsightsClient,
+)
+from app.meta_insights.clients.meta_rate_limiter import MetaRateLimiter
+from app.meta_insights.services.campaign_breakdown_insights_ingestion_service import (
+    BREAKDOWN_SETS,
+    CampaignBreakdownInsightsIngestionService,
+)
+from app.meta_insights.services.campaign_daily_metrics_sync_service import (
+    CampaignDailyMetricsSyncService,
+)
+from app.meta_insights.services.metrics_partition_service import (
+    MetricsPartitionService,
+)
+
+logger = logging.getLogger(__name__)
+
+
+BACKFILL_DAILY = "daily"
+BACKFILL_BREAKDOWNS = "breakdowns"
+
+BREAKDOWN_KIND_PREFIX = "breakdown:"
+
+# (kind, ad_account_id, chunk_start, chunk_end)
+BackfillUnit = Tuple[str, UUID, date, date]
+
+
+def breakdown_kind(breakdowns: Sequence[str]) -> str:
+    return BREAKDOWN_KIND_PREFIX + ",".join(breakdowns)
+
+
+def split_range(since: date, until: date, chunk_days: int) -> List[Tuple[date, date]]:
+    """
+    [since, until] as consecutive chunks of chunk_days, newest first.
+    """
+
+    if since > until:
+        raise ValueError("since must be on or before until")
+    if chunk_days < 1:
+        raise ValueError("chunk_days must be >= 1")
+
+    chunks: List[Tuple[date, date]] = []
+    chunk_end = until
+    while chunk_end >= since:
+        chunk_start = max(since, chunk_end - timedelta(days=chunk_days - 1))
+        chunks.append((chunk_start, chunk_end))
+        chunk_end = chunk_start - timedelta(days=1)
+    return chunks
+
+
+def _unit_key(unit: BackfillUnit) -> str:
+    kind, ad_account_id, chunk_start, chunk_end = unit
+    return f"{kind}:{ad_account_id}:{chunk_start}..{chunk_end}"
+
+
+def _format_eta(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "?"
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+# =========================================================
+# ORCHESTRATOR
+# =========================================================
+class MetricsBackfillOrchestrator:
+    def __init__(
+        self,
+        *,
+        since: date,
+        until: date,
+        chunk_days: int = 30,
+        kinds: Sequence[str] = (BACKFILL_DAILY, BACKFILL_BREAKDOWNS),
+        ad_account_ids: Optional[Collection[UUID]] = None,
+        workers: int = 8,
+        job_timeout: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        progress_interval: float = 10.0,
+    ):
+        unknown = set(kinds) - {BACKFILL_DAILY, BACKFILL_BREAKDOWNS}
+        if unknown:
+            raise ValueError(f"Unknown backfill kinds: {sorted(unknown)}")
+
+        self.since = since
+        self.until = until
+        self.chunks = split_range(since, until, chunk_days)
+        self.kinds = self._expand_kinds(kinds)
+        self.ad_account_ids = set(ad_account_ids) if ad_account_ids is not None else None
+        self.workers = workers
+        self.job_timeout = job_timeout
+        self.batch_size = batch_size
+        self.progress_interval = progress_interval
+
+        # Shared by every worker's client: Graph budgets are per
+        # app / ad account, not per worker
+        self.rate_limiter = MetaRateLimiter(
+            max_concurrency=settings.META_INSIGHTS_MAX_CONCURRENCY,
+            per_account_concurrency=settings.META_INSIGHTS_PER_ACCOUNT_CONCURRENCY,
+        )
+
+        self.stats = {
+            "units_total": 0,
+            "units_skipped": 0,
+            "units_succeeded": 0,
+            "units_failed": 0,
+            "rows_ingested": 0,
+        }
+        self._started = 0.0
+        self._last_report = 0.0
+
+    @staticmethod
+    def _expand_kinds(kinds: Sequence[str]) -> List[str]:
+        expanded: List[str] = []
+        if BACKFILL_DAILY in kinds:
+            expanded.append(BACKFILL_DAILY)
+        if BACKFILL_BREAKDOWNS in kinds:
+            expanded.extend(breakdown_kind(breakdowns) for breakdowns in BREAKDOWN_SETS)
+        return expanded
+
+    # -----------------------------------------------------
+    # ENTRY POINT
+    # -----------------------------------------------------
+    async def run(self) -> Dict[str, float]:
+        self._started = self._last_report = time.perf_counter()
+
+        # Months without a partition would fill the default partition
+        async with BatchSessionLocal() as db:
+            await MetricsPartitionService(db).ensure_partitions(self.since, self.until)
+
+        account_ids = await self._get_selected_account_ids()
+        done = await self._load_checkpoints(account_ids)
+
+        units: List[BackfillUnit] = [
+            (kind, account_id, chunk_start, chunk_end)
+            for chunk_start, chunk_end in self.chunks
+            for account_id in account_ids
+            for kind in self.kinds
+        ]
+        self.stats["units_total"] = len(units)
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for unit in units:
+            if unit in done:
+                self.stats["units_skipped"] += 1
+                continue
+            queue.put_nowait(unit)
+
+        logger.info(
+            "Backfill %s..%s: %d accounts × %d chunks × %d kinds = %d units "
+            "(%d already checkpointed), %d workers",
+            self.since,
+            self.until,
+            len(account_ids),
+            len(self.chunks),
+            len(self.kinds),
+            len(units),
+            self.stats["units_skipped"],
+            self.workers,
+        )
+
+        await asyncio.gather(
+            *[self._worker(queue) for _ in range(max(1, self.workers))]
+        )
+
+        elapsed = time.perf_counter() - self._started
+        result = {
+            **self.stats,
+            "seconds": round(elapsed, 2),
+            "rows_per_sec": (
+                round(self.stats["rows_ingested"] / elapsed, 1) if elapsed else 0.0
+            ),
+        }
+        logger.info("Backfill finished: %s", result)
+        return result
+
+    # -----------------------------------------------------
+    # WORKER — ONE SESSION PER UNIT
+    # -----------------------------------------------------
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            try:
+                unit: BackfillUnit = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            started = time.perf_counter()
+
+            try:
+                rows = await asyncio.wait_for(
+                    self._run_unit(unit, started),
+                    timeout=self.job_timeout,
+                )
+            except Exception as exc:
+                self.stats["units_failed"] += 1
+                logger.error(
+                    "Unit %s failed after %.1fs → %r",
+                    _unit_key(unit),
+                    time.perf_counter() - started,
+                    exc,
+                )
+            else:
+                self.stats["units_succeeded"] += 1
+                self.stats["rows_ingested"] += rows
+
+            self._report_progress()
+
+    async def _run_unit(self, unit: BackfillUnit, started: float) -> int:
+        kind, ad_account_id, chunk_start, chunk_end = unit
+
+        async with BatchSessionLocal() as db:
+            client = MetaCampaignInsightsClient(db, rate_limiter=self.rate_limiter)
+
+            if kind == BACKFILL_DAILY:
+                result = await CampaignDailyMetricsSyncService(
+                    db,
+                    client=client,
+                    batch_size=self.batch_size,
+                ).sync_for_range(
+                    chunk_start,
+                    chunk_end,
+                    ad_account_ids=[ad_account_id],
+                )
+                if result["failed_campaigns"]:
+                    raise RuntimeError(
+                        f"{result['failed_campaigns']} campaigns failed to sync"
+                    )
+                rows = result["synced_rows"]
+            else:
+                ad_account = await db.get(MetaAdAccount, ad_account_id)
+                if ad_account is None:
+                    return 0
+
+                await client.resolve_access_tokens([ad_account.id])
+                rows = await CampaignBreakdownInsightsIngestionService.ingest_breakdown_set(
+                    db=db,
+                    ad_account=ad_account,
+                    since=chunk_start,
+                    until=chunk_end,
+                    breakdowns=kind[len(BREAKDOWN_KIND_PREFIX):].split(","),
+                    client=client,
+                    batch_size=self.batch_size,
+                    # A failed fetch fails the unit (no checkpoint)
+                    raise_errors=True,
+                )
+
+            # Rows are committed by the services; checkpoint last
+            await db.execute(
+                text(
+                    """
+                    INSERT INTO metrics_backfill_checkpoints (
+                        id,
+                        kind,
+                        ad_account_id,
+                        chunk_start,
+                        chunk_end,
+                        rows,
+                        seconds,
+                        completed_at
+                    )
+                    VALUES (
+                        gen_random_uuid(),
+                        :kind,
+                        :ad_account_id,
+                        :chunk_start,
+                        :chunk_end,
+                        :rows,
+                        :seconds,
+                        :now
+                    )
+                    ON CONFLICT (kind, ad_account_id, chunk_start, chunk_end)
+                    DO UPDATE SET
+                        rows = EXCLUDED.rows,
+                        seconds = EXCLUDED.seconds,
+                        completed_at = EXCLUDED.completed_at
+                    """
+                ),
+                {
+                    "kind": kind,
+                    "ad_account_id": ad_account_id,
+                    "chunk_start": chunk_start,
+                    "chunk_end": chunk_end,
+                    "rows": rows,
+                    "seconds": round(time.perf_counter() - started, 3),
+                    "now": datetime.utcnow(),
+                },
+            )
+            await db.commit()
+
+        return rows
+
+    # -----------------------------------------------------
+    # PROGRESS — THROUGHPUT + ETA
+    # -----------------------------------------------------
+    def _report_progress(self) -> None:
+        now = time.perf_counter()
+        finished = self.stats["units_succeeded"] + self.stats["units_failed"]
+        remaining = (
+            self.stats["units_total"] - self.stats["units_skipped"] - finished
+        )
+
+        if remaining and now - self._last_report < self.progress_interval:
+            return
+        self._last_report = now
+
+        elapsed = now - self._started
+        units_per_sec = finished / elapsed if elapsed else 0.0
+
+        logger.info(
+            "Backfill progress: %d/%d units (%d skipped, %d failed), "
+            "%d rows, %.1f rows/s, %.2f units/s, ETA %s",
+            finished + self.stats["units_skipped"],
+            self.stats["units_total"],
+            self.stats["units_skipped"],
+            self.stats["units_failed"],
+            self.stats["rows_ingested"],
+            self.stats["rows_ingested"] / elapsed if elapsed else 0.0,
+            units_per_sec,
+            _format_eta(remaining / units_per_sec if units_per_sec else None),
+        )
+
+    # -----------------------------------------------------
+    # CHECKPOINTS
+    # -----------------------------------------------------
+    async def _load_checkpoints(self, account_ids: List[UUID]) -> Set[BackfillUnit]:
+        if not account_ids:
+            return set()
+
+        async with BatchSessionLocal() as db:
+            result = await db.execute(
+                text(
+                    """
+                    SELECT kind, ad_account_id, chunk_start, chunk_end
+                    FROM metrics_backfill_checkpoints
+                    WHERE ad_account_id = ANY(CAST(:account_ids AS UUID[]))
+                      AND chunk_start >= :since
+                      AND chunk_end <= :until
+                    """
+                ),
+                {
+                    "account_ids": account_ids,
+                    "since": self.since,
+                    "until": self.until,
+                },
+            )
+            return {tuple(row) for row in result.fetchall()}
+
+    # -----------------------------------------------------
+    # FLEET — SELECTED + ACTIVE AD ACCOUNTS (DEDUPED)
+    # -----------------------------------------------------
+    async def _get_selected_account_ids(self) -> List[UUID]:
+        async with BatchSessionLocal() as db:
+            stmt = (
+                select(MetaAdAccount.id)
+                .join(
+                    UserMetaAdAccount,
+                    UserMetaAdAccount.meta_ad_account_id == MetaAdAccount.id,
+                )
+                .where(
+                    UserMetaAdAccount.is_selected.is_(True),
+                    MetaAdAccount.is_active.is_(True),
+                )
+                .distinct()
+                .order_by(MetaAdAccount.id)
+            )
+            if self.ad_account_ids is not None:
+                stmt = stmt.where(MetaAdAccount.id.in_(list(self.ad_account_ids)))
+
+            result = await db.execute(stmt)
+            return list(result.scalars().all())
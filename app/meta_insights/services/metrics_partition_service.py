@@ -0,0 +1,309 @@
+"""
+Metrics Partition Service
+
+Monthly RANGE partitions for the daily fact tables:
+
+    campaign_daily_metrics            PARTITION BY RANGE (date)
+    campaign_breakdown_daily_metrics  PARTITION BY RANGE (metric_date)
+
+Layout (created by the alembic migration, kept up by this service):
+- one partition per calendar month: <table>_pYYYYMM
+- <table>_default catches rows outside every monthly partition
+  (e.g. a backfill older than the oldest month); ensure_partitions()
+  moves them into their month when that month is created
+
+Maintenance (metrics_partition_maintenance scheduler job, or
+python -m app.scripts.maintain_metrics_partitions):
+- creates partitions up to METRICS_PARTITION_MONTHS_AHEAD months ahead
+- detaches partitions older than METRICS_PARTITION_RETENTION_MONTHS
+  (0 = keep everything) and moves them to
+  METRICS_PARTITION_ARCHIVE_SCHEMA. Detached months no longer count
+  towards lifetime aggregates.
+
+Each call is one transaction serialized by an advisory lock; DDL waits
+at most PARTITION_LOCK_TIMEOUT for the parent table lock.
+"""
+
+import logging
+import re
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# table → partition key column
+PARTITIONED_TABLES: Dict[str, str] = {
+    "campaign_daily_metrics": "date",
+    "campaign_breakdown_daily_metrics": "metric_date",
+}
+
+PARTITION_LOCK_TIMEOUT = "10s"
+
+_BOUND_RE = re.compile(r"FROM \('(\d{4}-\d{2}-\d{2})'\)")
+
+
+# =========================================================
+# MONTH HELPERS (SHARED WITH THE ALEMBIC MIGRATION)
+# =========================================================
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def months_between(first: date, last: date) -> List[date]:
+    """
+    Month starts from first's month through last's month (inclusive).
+    """
+
+    months = []
+    month = month_start(first)
+    while month <= last:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def partition_bounds_sql(month: date) -> str:
+    return (
+        f"FOR VALUES FROM ('{month.isoformat()}') "
+        f"TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def create_partition_sql(table: str, month: date) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} "
+        f"PARTITION OF {table} {partition_bounds_sql(month)}"
+    )
+
+
+def create_default_partition_sql(table: str) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {default_partition_name(table)} "
+        f"PARTITION OF {table} DEFAULT"
+    )
+
+
+class MetricsPartitionService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    # =====================================================
+    # INSPECTION
+    # =====================================================
+    async def is_partitioned(self, table: str) -> bool:
+        result = await self.db.execute(
+            text(
+                """
+                SELECT relkind = 'p'
+                FROM pg_class
+                WHERE oid = to_regclass(:table)
+                """
+            ),
+            {"table": table},
+        )
+        return bool(result.scalar())
+
+    async def list_partitions(self, table: str) -> List[Tuple[str, Optional[date]]]:
+        """
+        (partition name, month) of every attached partition, oldest
+        first; the default partition has month None.
+        """
+
+        result = await self.db.execute(
+            text(
+                """
+                SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+                FROM pg_inherits i
+                JOIN pg_class c
+                    ON c.oid = i.inhrelid
+                WHERE i.inhparent = CAST(:table AS regclass)
+                """
+            ),
+            {"table": table},
+        )
+
+        partitions = []
+        for name, bound in result.fetchall():
+            match = _BOUND_RE.search(bound or "")
+            partitions.append(
+                (name, date.fromisoformat(match.group(1)) if match else None)
+            )
+
+        return sorted(partitions, key=lambda item: (item[1] is not None, item[1]))
+
+    # =====================================================
+    # CREATE
+    # =====================================================
+    async def ensure_partitions(self, since: date, until: date) -> List[str]:
+        """
+        Creates every missing monthly partition covering since..until
+        for both tables. Rows already sitting in the default partition
+        for a new month are moved into it. Commits.
+        """
+
+        created: List[str] = []
+        await self._begin_maintenance()
+
+        for table, key in PARTITIONED_TABLES.items():
+            if not await self.is_partitioned(table):
+                logger.warning("%s is not partitioned (run alembic upgrade); skipped", table)
+                continue
+
+            existing = {month for _, month in await self.list_partitions(table)}
+            default = default_partition_name(table)
+            has_default = None in existing
+
+            for month in months_between(since, until):
+                if month in existing:
+                    continue
+
+                if has_default and await self._default_has_rows(default, key, month):
+                    moved = await self._create_from_default(table, key, month)
+                    logger.info(
+                        "Created %s (moved %d rows out of %s)",
+                        partition_name(table, month),
+                        moved,
+                        default,
+                    )
+                else:
+                    await self.db.execute(text(create_partition_sql(table, month)))
+                    logger.info("Created %s", partition_name(table, month))
+
+                created.append(partition_name(table, month))
+
+        await self.db.commit()
+        return created
+
+    async def _default_has_rows(self, default: str, key: str, month: date) -> bool:
+        result = await self.db.execute(
+            text(
+                f"""
+                SELECT EXISTS (
+                    SELECT 1 FROM {default}
+                    WHERE {key} >= :month_start AND {key} < :next_month
+                )
+                """
+            ),
+            {"month_start": month, "next_month": add_months(month, 1)},
+        )
+        return bool(result.scalar())
+
+    async def _create_from_default(self, table: str, key: str, month: date) -> int:
+        # CREATE ... PARTITION OF fails while the default partition
+        # holds rows of the new range: build it detached, then attach
+        name = partition_name(table, month)
+
+        await self.db.execute(
+            text(
+                f"CREATE TABLE {name} "
+                f"(LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+        )
+        result = await self.db.execute(
+            text(
+                f"""
+                WITH moved AS (
+                    DELETE FROM {default_partition_name(table)}
+                    WHERE {key} >= :month_start AND {key} < :next_month
+                    RETURNING *
+                )
+                INSERT INTO {name}
+                SELECT * FROM moved
+                """
+            ),
+            {"month_start": month, "next_month": add_months(month, 1)},
+        )
+        await self.db.execute(
+            text(f"ALTER TABLE {table} ATTACH PARTITION {name} {partition_bounds_sql(month)}")
+        )
+        return result.rowcount
+
+    # =====================================================
+    # DETACH / ARCHIVE
+    # =====================================================
+    async def detach_partitions_before(
+        self,
+        cutoff: date,
+        *,
+        archive_schema: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Detaches every monthly partition that ends on or before
+        cutoff's month start. The tables are kept (moved to
+        archive_schema when given) so they can be dumped or dropped
+        separately. Commits.
+        """
+
+        cutoff = month_start(cutoff)
+        detached: List[str] = []
+        await self._begin_maintenance()
+
+        if archive_schema:
+            await self.db.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{archive_schema}"'))
+
+        for table in PARTITIONED_TABLES:
+            for name, month in await self.list_partitions(table):
+                if month is None or month >= cutoff:
+                    continue
+
+                await self.db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+                if archive_schema:
+                    await self.db.execute(
+                        text(f'ALTER TABLE {name} SET SCHEMA "{archive_schema}"')
+                    )
+
+                logger.info(
+                    "Detached %s%s",
+                    name,
+                    f" → {archive_schema}.{name}" if archive_schema else "",
+                )
+                detached.append(name)
+
+        await self.db.commit()
+        return detached
+
+    # =====================================================
+    # SCHEDULED MAINTENANCE
+    # =====================================================
+    async def run_maintenance(self, today: Optional[date] = None) -> Dict[str, List[str]]:
+        today = today or date.today()
+        current = month_start(today)
+
+        created = await self.ensure_partitions(
+            current,
+            add_months(current, settings.METRICS_PARTITION_MONTHS_AHEAD),
+        )
+
+        detached: List[str] = []
+        if settings.METRICS_PARTITION_RETENTION_MONTHS > 0:
+            detached = await self.detach_partitions_before(
+                add_months(current, -settings.METRICS_PARTITION_RETENTION_MONTHS),
+                archive_schema=settings.METRICS_PARTITION_ARCHIVE_SCHEMA or None,
+            )
+
+        return {"created": created, "detached": detached}
+
+    async def _begin_maintenance(self) -> None:
+        await self.db.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext('metrics_partition_maintenance'))")
+        )
+        await self.db.execute(text(f"SET LOCAL lock_timeout = '{PARTITION_LOCK_TIMEOUT}'"))
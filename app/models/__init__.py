@@ -2,19 +2,26 @@
 # ⚠️ Order matters — keep models only, no logic
 
 # 1. Global Configuration (No dependencies)
-from app.admin.models import GlobalSettings
+from app.admin.models import GlobalSettings, ConfigVersion, AdminAuditLog, AdminOverride
+from app.admin.models_pricing import AdminPricingConfig
 
 # 2. Base dependencies (Payment, Invoice, Billing Providers)
 from app.billing.payment_models import Payment
 from app.billing.invoice_models import Invoice
 from app.billing.provider_models import BillingProvider  # <-- ADDED
+from app.billing.company_settings_models import BillingCompanySettings
+from app.billing.revenue_rollup_models import RevenueDailyRollup
+from app.billing.webhook_event_models import RazorpayWebhookEvent
 
 # 3. Plans and Subscriptions (depend on Payment)
 from app.plans.models import Plan
 from app.plans.subscription_models import Subscription
+from app.billing.subscription_billing_models import SubscriptionBilling
 
 # 4. User (Depends on Subscription)
 from app.users.models import User
+from app.plans.usage_counter_models import UserUsageCounter
+from app.plans.override_models import UserUsageOverride
 
 # 5. Auth models
 from app.auth.models import MagicLoginToken, Session
@@ -23,3 +30,27 @@ from app.auth.models import MagicLoginToken, Session
 from app.meta_api.models import MetaAdAccount, UserMetaAdAccount, MetaOAuthToken
 from app.campaigns.models import Campaign
 from app.ai_engine.models import AIAction
+from app.chat.models import ChatThread, ChatMessage
+from app.audience_engine.models import AudienceInsight
+
+# 7. Meta Insights metrics (depend on Campaign)
+from app.meta_insights.models.campaign_daily_metrics import CampaignDailyMetrics
+from app.meta_insights.models.campaign_breakdown_daily_metrics import CampaignBreakdownDailyMetrics
+from app.meta_insights.models.campaign_metrics_aggregates import (
+    CampaignMetricsAggregate,
+    CampaignBreakdownAggregate,
+)
+from app.meta_insights.models.metrics_backfill_checkpoints import MetricsBackfillCheckpoint
+
+# 8. AI engine tables (depend on Campaign / MetaAdAccount)
+from app.ai_engine.models.ai_action_feedback import AIActionFeedback
+from app.ai_engine.models.ai_action_snapshots import AIActionSnapshot
+from app.ai_engine.models.campaign_category_map import CampaignCategoryMap
+from app.ai_engine.models.industry_benchmarks import IndustryBenchmark
+from app.ai_engine.models.ml_action_outcomes import MLActionOutcome
+from app.ai_engine.models.ml_breakdown_features import MLBreakdownFeature
+from app.ai_engine.models.ml_campaign_features import MLCampaignFeature
+from app.ai_engine.models.ml_category_breakdown_stats import MLCategoryBreakdownStat
+
+# 9. Scheduler
+from app.scheduler.models import ScheduledJob, ScheduledJobRun
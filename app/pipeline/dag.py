@@ -0,0 +1,227 @@
+"""
+Stage DAG Runner
+
+Purpose:
+- Run pipeline stages in dependency order
+- Independent stages run concurrently (one asyncio task per stage,
+  started as soon as its dependencies finish)
+- Each stage receives the campaign ids its dependencies changed and
+  returns the ids IT changed, so downstream stages only reprocess
+  those
+- A failed stage skips everything downstream of it; independent
+  branches keep running
+- Per-stage timing / status / change counts in the result
+
+Changed ids:
+- A set → only these campaigns changed upstream
+- None  → "everything" (full run, or a stage that cannot tell)
+
+Stages open their own DB sessions: sessions are never shared across
+concurrently running stages.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+
+ChangedIds = Optional[Set[UUID]]
+
+
+class StageStatus:
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
+class StageOutput:
+    """
+    Returned by a stage function.
+    """
+
+    def __init__(
+        self,
+        changed: ChangedIds,
+        detail: Optional[Dict[str, Any]] = None,
+    ):
+        self.changed = changed
+        self.detail = detail or {}
+
+
+StageFunc = Callable[[Any, ChangedIds], Awaitable[StageOutput]]
+
+
+class Stage:
+    def __init__(
+        self,
+        *,
+        name: str,
+        run: StageFunc,
+        depends_on: Sequence[str] = (),
+        description: str = "",
+    ):
+        self.name = name
+        self.run = run
+        self.depends_on = tuple(depends_on)
+        self.description = description
+
+    def __repr__(self) -> str:
+        return f"Stage({self.name!r}, depends_on={self.depends_on!r})"
+
+
+class StageResult:
+    def __init__(self, name: str):
+        self.name = name
+        self.status = StageStatus.SKIPPED
+        self.started_at: Optional[datetime] = None
+        self.seconds: Optional[float] = None
+        self.changed_in: ChangedIds = None
+        self.changed_out: ChangedIds = None
+        self.detail: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "stage": self.name,
+            "status": self.status,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "seconds": self.seconds,
+            "changed_in": _count(self.changed_in),
+            "changed_out": _count(self.changed_out),
+            "detail": self.detail,
+            "error": self.error,
+        }
+
+
+def _count(changed: ChangedIds) -> Optional[int]:
+    return None if changed is None else len(changed)
+
+
+# =========================================================
+# PIPELINE
+# =========================================================
+class Pipeline:
+    def __init__(self, stages: List[Stage]):
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage: {stage.name!r}")
+            self.stages[stage.name] = stage
+
+        for stage in stages:
+            for dependency in stage.depends_on:
+                if dependency not in self.stages:
+                    raise ValueError(
+                        f"Stage {stage.name!r} depends on unknown stage {dependency!r}"
+                    )
+
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        remaining = {name: set(stage.depends_on) for name, stage in self.stages.items()}
+        order: List[str] = []
+
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Stage cycle between: {sorted(remaining)}")
+
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+        return order
+
+    # =====================================================
+    # RUN
+    # =====================================================
+    async def run(self, context: Any) -> Dict[str, StageResult]:
+        """
+        Runs every stage; never raises for a stage failure (see the
+        returned results).
+        """
+
+        results = {name: StageResult(name) for name in self.order}
+        tasks: Dict[str, asyncio.Task] = {}
+
+        for name in self.order:
+            tasks[name] = asyncio.create_task(
+                self._run_stage(self.stages[name], context, results, tasks),
+                name=f"stage:{name}",
+            )
+
+        await asyncio.gather(*tasks.values())
+        return results
+
+    async def _run_stage(
+        self,
+        stage: Stage,
+        context: Any,
+        results: Dict[str, StageResult],
+        tasks: Dict[str, asyncio.Task],
+    ) -> None:
+        if stage.depends_on:
+            await asyncio.gather(*[tasks[name] for name in stage.depends_on])
+
+        result = results[stage.name]
+        upstream = [results[name] for name in stage.depends_on]
+
+        blocked = [item.name for item in upstream if item.status != StageStatus.SUCCEEDED]
+        if blocked:
+            result.error = f"upstream not succeeded: {', '.join(blocked)}"
+            logger.warning("Stage %s skipped (%s)", stage.name, result.error)
+            return
+
+        result.changed_in = _merge_changed(upstream)
+        result.started_at = datetime.utcnow()
+        started = time.perf_counter()
+
+        try:
+            output = await stage.run(context, result.changed_in)
+        except Exception as exc:
+            result.status = StageStatus.FAILED
+            result.error = repr(exc)
+            logger.exception("Stage %s failed", stage.name)
+        else:
+            result.status = StageStatus.SUCCEEDED
+            result.changed_out = output.changed
+            result.detail = output.detail
+        finally:
+            result.seconds = round(time.perf_counter() - started, 3)
+
+        logger.info(
+            "Stage %s %s in %.3fs (changed in=%s out=%s)",
+            stage.name,
+            result.status,
+            result.seconds,
+            _label(result.changed_in),
+            _label(result.changed_out),
+        )
+
+
+def _merge_changed(upstream: List[StageResult]) -> ChangedIds:
+    """
+    Union of the upstream change sets; None (everything) wins.
+    Root stages receive None.
+    """
+
+    if not upstream:
+        return None
+
+    merged: Set[UUID] = set()
+    for item in upstream:
+        if item.changed_out is None:
+            return None
+        merged |= item.changed_out
+    return merged
+
+
+def _label(changed: ChangedIds) -> str:
+    return "all" if changed is None else str(len(changed))
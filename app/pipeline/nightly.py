@@ -0,0 +1,369 @@
+"""
+Nightly Data Pipeline
+
+sync → aggregate → benchmark → decide, as one dependency-ordered DAG
+(app.pipeline.dag) for one data date (yesterday by default):
+
+    sync_daily_metrics ──► aggregate_campaigns ───► industry_benchmarks ──┐
+                                                                          ├─► decide
+    ingest_breakdowns ───► aggregate_breakdowns ──► category_stats ───────┘
+
+- The two branches run concurrently
+- Changed campaign ids flow downstream:
+  - ingestion stages: campaigns whose daily rows were written
+  - aggregation stages: + campaigns with data on a window edge
+    (their rolled windows change too)
+  - benchmark / category stages: recompute only the categories of
+    changed campaigns; every campaign in those categories changes
+  - decide: refreshes AI action snapshots only for the ad accounts
+    owning changed campaigns
+- --full (or a stage that cannot tell) propagates "everything"
+
+Runs as the nightly_pipeline scheduler job (NIGHTLY_PIPELINE_ENABLED,
+in place of sync_daily_metrics), or manually:
+
+    python -m app.pipeline.nightly
+    python -m app.pipeline.nightly --date 2026-08-31 --full --json /tmp/run.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db_session import BatchSessionLocal
+from app.pipeline.dag import ChangedIds, Pipeline, Stage, StageOutput, StageResult
+
+logger = logging.getLogger(__name__)
+
+
+# ml_breakdown_features windows rolled into ml_category_breakdown_stats
+CATEGORY_WINDOWS = ("30d", "90d", "lifetime")
+
+
+class NightlyContext:
+    def __init__(self, *, as_of_date: date, full: bool = False, workers: int = 8):
+        self.as_of_date = as_of_date
+        self.full = full
+        self.workers = workers
+
+
+# =========================================================
+# CHANGE LOOKUPS
+# =========================================================
+async def _written_since(db: AsyncSession, table: str, since: datetime) -> Set[UUID]:
+    # table is one of the two fact tables below, never user input
+    result = await db.execute(
+        text(f"SELECT DISTINCT campaign_id FROM {table} WHERE updated_at >= :since"),
+        {"since": since},
+    )
+    return {row[0] for row in result.fetchall()}
+
+
+async def _categories_of(db: AsyncSession, campaign_ids: Set[UUID]) -> List[str]:
+    result = await db.execute(
+        text(
+            """
+            SELECT DISTINCT final_category
+            FROM campaign_category_map
+            WHERE campaign_id = ANY(CAST(:campaign_ids AS UUID[]))
+            """
+        ),
+        {"campaign_ids": list(campaign_ids)},
+    )
+    return [row[0] for row in result.fetchall()]
+
+
+async def _campaigns_in(db: AsyncSession, categories: List[str]) -> Set[UUID]:
+    result = await db.execute(
+        text(
+            """
+            SELECT campaign_id
+            FROM campaign_category_map
+            WHERE final_category = ANY(CAST(:categories AS TEXT[]))
+            """
+        ),
+        {"categories": categories},
+    )
+    return {row[0] for row in result.fetchall()}
+
+
+# =========================================================
+# STAGES
+# =========================================================
+async def sync_daily_metrics(ctx: NightlyContext, changed: ChangedIds) -> StageOutput:
+    from app.meta_insights.services.campaign_daily_metrics_sync_service import (
+        CampaignDailyMetricsSyncService,
+    )
+
+    started = datetime.utcnow()
+
+    async with BatchSessionLocal() as db:
+        result = await CampaignDailyMetricsSyncService(db).sync_for_date(ctx.as_of_date)
+        written = await _written_since(db, "campaign_daily_metrics", started)
+
+    return StageOutput(
+        None if ctx.full else written,
+        {
+            "synced_rows": result["synced_rows"],
+            "failed_campaigns": result["failed_campaigns"],
+        },
+    )
+
+
+async def ingest_breakdowns(ctx: NightlyContext, changed: ChangedIds) -> StageOutput:
+    from app.meta_insights.services.breakdown_ingestion_orchestrator import (
+        BreakdownIngestionOrchestrator,
+    )
+
+    started = datetime.utcnow()
+
+    result = await BreakdownIngestionOrchestrator(
+        since=ctx.as_of_date,
+        until=ctx.as_of_date,
+        workers=ctx.workers,
+    ).run()
+
+    async with BatchSessionLocal() as db:
+        written = await _written_since(db, "campaign_breakdown_daily_metrics", started)
+
+    return StageOutput(
+        None if ctx.full else written,
+        {
+            "rows_ingested": result["rows_ingested"],
+            "jobs_failed": result["jobs_failed"],
+        },
+    )
+
+
+async def aggregate_campaigns(ctx: NightlyContext, changed: ChangedIds) -> StageOutput:
+    from app.meta_insights.services.campaign_metrics_aggregation_service import (
+        CampaignMetricsAggregationService,
+    )
+
+    async with BatchSessionLocal() as db:
+        service = CampaignMetricsAggregationService(db)
+
+        if changed is None:
+            await service.aggregate_for_date(ctx.as_of_date)
+            return StageOutput(None, {"mode": "full"})
+
+        await service.aggregate_for_date(ctx.as_of_date, incremental=True)
+        affected = await service.get_affected_campaign_ids(ctx.as_of_date, changed)
+
+    return StageOutput(affected, {"mode": "incremental"})
+
+
+async def aggregate_breakdowns(ctx: NightlyContext, changed: ChangedIds) -> StageOutput:
+    from app.meta_insights.services.campaign_breakdown_aggregation_service import (
+        CampaignBreakdownAggregationService,
+    )
+
+    async with BatchSessionLocal() as db:
+        service = CampaignBreakdownAggregationService(db)
+
+        if changed is None:
+            await service.aggregate_for_date(ctx.as_of_date)
+            return StageOutput(None, {"mode": "full"})
+
+        await service.aggregate_for_date(ctx.as_of_date, incremental=True)
+        affected = await service.get_affected_campaign_ids(ctx.as_of_date, changed)
+
+    return StageOutput(affected, {"mode": "incremental"})
+
+
+async def industry_benchmarks(ctx: NightlyContext, changed: ChangedIds) -> StageOutput:
+    from app.ai_engine.services.industry_benchmark_aggregation_service import (
+        IndustryBenchmarkAggregationService,
+    )
+
+    async with BatchSessionLocal() as db:
+        categories = None if changed is None else await _categories_of(db, changed)
+        if categories == []:
+            return StageOutput(changed, {"categories": 0, "rows": 0})
+
+        rows = await IndustryBenchmarkAggregationService(db).compute_for_date(
+            ctx.as_of_date,
+            categories=categories,
+        )
+
+        if categories is None:
+            return StageOutput(None, {"categories": "all", "rows": rows})
+
+        affected = changed | await _campaigns_in(db, categories)
+
+    return StageOutput(affected, {"categories": len(categories), "rows": rows})
+
+
+async def category_stats(ctx: NightlyContext, changed: ChangedIds) -> StageOutput:
+    from app.ai_engine.services.category_aggregation_service import (
+        CategoryAggregationService,
+    )
+
+    async with BatchSessionLocal() as db:
+        categories = None if changed is None else await _categories_of(db, changed)
+        if categories == []:
+            return StageOutput(changed, {"categories": 0})
+
+        service = CategoryAggregationService()
+        for window_type in CATEGORY_WINDOWS:
+            await service.run(db=db, window_type=window_type, categories=categories)
+
+        if categories is None:
+            return StageOutput(None, {"categories": "all"})
+
+        affected = changed | await _campaigns_in(db, categories)
+
+    return StageOutput(affected, {"categories": len(categories)})
+
+
+async def decide(ctx: NightlyContext, changed: ChangedIds) -> StageOutput:
+    from app.ai_engine.jobs.precompute_ai_actions import precompute_all
+
+    ad_account_ids: Optional[List[UUID]] = None
+
+    if changed is not None:
+        async with BatchSessionLocal() as db:
+            result = await db.execute(
+                text(
+                    """
+                    SELECT DISTINCT ad_account_id
+                    FROM campaigns
+                    WHERE id = ANY(CAST(:campaign_ids AS UUID[]))
+                    """
+                ),
+                {"campaign_ids": list(changed)},
+            )
+            ad_account_ids = [row[0] for row in result.fetchall()]
+
+    if ad_account_ids == []:
+        return StageOutput(changed, {"accounts": 0})
+
+    # Snapshots are served from the day after the data date
+    stats = await precompute_all(
+        as_of_date=ctx.as_of_date + timedelta(days=1),
+        workers=ctx.workers,
+        ad_account_ids=ad_account_ids,
+    )
+    return StageOutput(changed, stats)
+
+
+NIGHTLY_PIPELINE = Pipeline(
+    [
+        Stage(name="sync_daily_metrics", run=sync_daily_metrics),
+        Stage(name="ingest_breakdowns", run=ingest_breakdowns),
+        Stage(
+            name="aggregate_campaigns",
+            run=aggregate_campaigns,
+            depends_on=["sync_daily_metrics"],
+        ),
+        Stage(
+            name="aggregate_breakdowns",
+            run=aggregate_breakdowns,
+            depends_on=["ingest_breakdowns"],
+        ),
+        Stage(
+            name="industry_benchmarks",
+            run=industry_benchmarks,
+            depends_on=["aggregate_campaigns"],
+        ),
+        Stage(
+            name="category_stats",
+            run=category_stats,
+            depends_on=["aggregate_breakdowns"],
+        ),
+        Stage(
+            name="decide",
+            run=decide,
+            depends_on=["industry_benchmarks", "category_stats"],
+        ),
+    ]
+)
+
+
+# =========================================================
+# ENTRY POINTS
+# =========================================================
+async def run_nightly_pipeline(
+    as_of_date: date,
+    *,
+    full: bool = False,
+    workers: int = 8,
+) -> Dict[str, StageResult]:
+    context = NightlyContext(as_of_date=as_of_date, full=full, workers=workers)
+    results = await NIGHTLY_PIPELINE.run(context)
+
+    logger.info(
+        "Nightly pipeline %s: %s",
+        as_of_date,
+        ", ".join(
+            f"{result.name}={result.status}"
+            + (f" {result.seconds:.1f}s" if result.seconds is not None else "")
+            for result in results.values()
+        ),
+    )
+    return results
+
+
+def print_results(results: Dict[str, StageResult]) -> None:
+    print(f"{'stage':22} {'status':10} {'seconds':>9} {'in':>8} {'out':>8}")
+    for result in results.values():
+        row = result.as_dict()
+        print(
+            f"{row['stage']:22} {row['status']:10} "
+            f"{'-' if row['seconds'] is None else format(row['seconds'], '.3f'):>9} "
+            f"{_fmt(row['changed_in']):>8} {_fmt(row['changed_out']):>8}"
+        )
+        if row["error"]:
+            print(f"{'':22} {row['error']}")
+
+
+def _fmt(count: Optional[int]) -> str:
+    return "all" if count is None else str(count)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the nightly data pipeline")
+    parser.add_argument(
+        "--date",
+        type=date.fromisoformat,
+        default=None,
+        help="Data date (default: yesterday, UTC)",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Reprocess every campaign instead of only changed ones",
+    )
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--json", help="Also write per-stage results to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [nightly] %(levelname)s: %(message)s",
+    )
+
+    # Stages load ORM models lazily; register them all up front
+    import app.models  # noqa: F401
+
+    as_of_date = args.date or datetime.utcnow().date() - timedelta(days=1)
+    results = asyncio.run(
+        run_nightly_pipeline(as_of_date, full=args.full, workers=args.workers)
+    )
+
+    print_results(results)
+
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump([result.as_dict() for result in results.values()], handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
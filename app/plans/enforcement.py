@@ -2,14 +2,14 @@ from datetime import datetime, timedelta
 from uuid import UUID
 from typing import Optional
 
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.plans.subscription_models import Subscription, SubscriptionAddon
+from app.plans.subscription_models import SubscriptionAddon
 from app.admin.models import GlobalSettings
+from app.core.config_cache import config_cache
 from app.campaigns.models import Campaign, CampaignActionLog
-from app.meta_api.models import MetaAdAccount, UserMetaAdAccount
-from app.plans.usage_override_service import UsageOverrideService
+from app.plans.usage_counter_service import UsageCounterService
 
 
 class EnforcementError(Exception):
@@ -34,58 +34,11 @@ class PlanEnforcementService:
     # =========================
     @staticmethod
     async def _get_global_settings(db: AsyncSession) -> Optional[GlobalSettings]:
-        result = await db.execute(select(GlobalSettings).limit(1))
-        return result.scalar_one_or_none()
-
-    @staticmethod
-    async def _get_active_subscription(
-        db: AsyncSession, user_id: UUID
-    ) -> Optional[Subscription]:
-        result = await db.execute(
-            select(Subscription).where(
-                Subscription.user_id == user_id,
-                Subscription.status.in_(["trial", "active"]),
-            )
-        )
-        return result.scalar_one_or_none()
-
-    @staticmethod
-    async def _count_active_ai_campaigns(
-        db: AsyncSession, user_id: UUID
-    ) -> int:
-        result = await db.execute(
-            select(func.count(Campaign.id))
-            .join(MetaAdAccount, Campaign.ad_account_id == MetaAdAccount.id)
-            .join(
-                UserMetaAdAccount,
-                UserMetaAdAccount.meta_ad_account_id == MetaAdAccount.id,
-            )
-            .where(
-                UserMetaAdAccount.user_id == user_id,
-                UserMetaAdAccount.is_selected.is_(True),
-                Campaign.ai_active.is_(True),
-                Campaign.is_archived.is_(False),
-            )
-        )
-        return result.scalar_one()
+        return await config_cache.get_global_settings(db)
 
     # =====================================================
     # PHASE 9 — AD ACCOUNT LIMIT ENFORCEMENT (OPTION A)
     # =====================================================
-    @staticmethod
-    async def _count_selected_ad_accounts(
-        db: AsyncSession,
-        *,
-        user_id: UUID,
-    ) -> int:
-        result = await db.execute(
-            select(func.count(UserMetaAdAccount.meta_ad_account_id)).where(
-                UserMetaAdAccount.user_id == user_id,
-                UserMetaAdAccount.is_selected.is_(True),
-            )
-        )
-        return result.scalar_one() or 0
-
     @staticmethod
     async def assert_ad_account_allowed(
         db: AsyncSession,
@@ -96,32 +49,15 @@ class PlanEnforcementService:
         Called BEFORE selecting a new Ad Account.
         Now respects Phase-10 override (ad_accounts).
         """
-        subscription = await PlanEnforcementService._get_active_subscription(
-            db=db,
-            user_id=user_id,
-        )
-        if not subscription:
+        usage = await UsageCounterService.get_usage(db, user_id=user_id)
+        if not usage["subscription_id"]:
             raise EnforcementError(
                 code="NO_SUBSCRIPTION",
                 message="No active plan.",
                 action="UPGRADE_PLAN",
             )
 
-        current = await PlanEnforcementService._count_selected_ad_accounts(
-            db=db,
-            user_id=user_id,
-        )
-
-        plan_default = getattr(subscription, "ad_account_limit_snapshot", 0)
-
-        effective_limit = await UsageOverrideService.get_effective_limit(
-            db=db,
-            user_id=user_id,
-            key="ad_accounts",
-            plan_default=plan_default,
-        )
-
-        if current >= effective_limit:
+        if usage["selected_ad_accounts"] >= usage["ad_account_limit"]:
             raise EnforcementError(
                 code="AD_ACCOUNT_LIMIT_REACHED",
                 message="Upgrade to connect more Ad Accounts.",
@@ -129,27 +65,9 @@ class PlanEnforcementService:
             )
 
     # =====================================================
-    # USAGE COUNTERS (PHASE P2)
+    # AI REFRESH COOLDOWN
+    # (usage counters: UsageCounterService)
     # =====================================================
-    @staticmethod
-    async def _count_actions_today(
-        db: AsyncSession,
-        *,
-        user_id: UUID,
-        action_type: str,
-    ) -> int:
-        start = datetime.utcnow().replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-        result = await db.execute(
-            select(func.count(CampaignActionLog.id)).where(
-                CampaignActionLog.user_id == user_id,
-                CampaignActionLog.action_type == action_type,
-                CampaignActionLog.created_at >= start,
-            )
-        )
-        return result.scalar_one()
-
     @staticmethod
     async def _get_last_ai_action_time(
         db: AsyncSession,
@@ -174,7 +92,7 @@ class PlanEnforcementService:
     async def _reserve_addon_slot(
         db: AsyncSession,
         *,
-        subscription: Subscription,
+        subscription_id: UUID,
         campaign: Campaign,
     ) -> Optional[SubscriptionAddon]:
         now = datetime.utcnow()
@@ -182,7 +100,7 @@ class PlanEnforcementService:
         result = await db.execute(
             select(SubscriptionAddon)
             .where(
-                SubscriptionAddon.subscription_id == subscription.id,
+                SubscriptionAddon.subscription_id == subscription_id,
                 SubscriptionAddon.expires_at > now,
                 SubscriptionAddon.consumed_by_campaign_id.is_(None),
             )
@@ -258,14 +176,12 @@ class PlanEnforcementService:
                     action="CONTACT_SUPPORT",
                 )
 
+        usage = await UsageCounterService.get_usage(db, user_id=user_id)
+
         # AI THROTTLING
         if settings:
             if settings.max_optimizations_per_day:
-                used = await PlanEnforcementService._count_actions_today(
-                    db=db,
-                    user_id=user_id,
-                    action_type="optimization",
-                )
+                used = usage["optimizations_today"]
                 if used >= settings.max_optimizations_per_day:
                     raise EnforcementError(
                         code="OPTIMIZATION_LIMIT_REACHED",
@@ -274,11 +190,7 @@ class PlanEnforcementService:
                     )
 
             if settings.max_expansions_per_day:
-                used = await PlanEnforcementService._count_actions_today(
-                    db=db,
-                    user_id=user_id,
-                    action_type="expansion",
-                )
+                used = usage["expansions_today"]
                 if used >= settings.max_expansions_per_day:
                     raise EnforcementError(
                         code="EXPANSION_LIMIT_REACHED",
@@ -304,35 +216,20 @@ class PlanEnforcementService:
                             action="WAIT",
                         )
 
-        subscription = await PlanEnforcementService._get_active_subscription(
-            db=db, user_id=user_id
-        )
-        if not subscription:
+        if not usage["subscription_id"]:
             raise EnforcementError(
                 code="NO_SUBSCRIPTION",
                 message="No active plan.",
                 action="UPGRADE_PLAN",
             )
 
-        base_limit = subscription.ai_campaign_limit_snapshot or 0
-        active_count = await PlanEnforcementService._count_active_ai_campaigns(
-            db=db, user_id=user_id
-        )
-
-        # OVERRIDE integration for AI campaigns
-        effective_limit = await UsageOverrideService.get_effective_limit(
-            db=db,
-            user_id=user_id,
-            key="campaigns",
-            plan_default=base_limit,
-        )
-
-        if active_count < effective_limit:
+        # Limit includes the "campaigns" override
+        if usage["active_ai_campaigns"] < usage["ai_campaign_limit"]:
             return
 
         addon = await PlanEnforcementService._reserve_addon_slot(
             db=db,
-            subscription=subscription,
+            subscription_id=usage["subscription_id"],
             campaign=campaign,
         )
 
@@ -363,17 +260,8 @@ class PlanEnforcementService:
     async def get_ai_limit_status(db: AsyncSession, *, user_id: UUID) -> dict:
         settings = await PlanEnforcementService._get_global_settings(db)
 
-        subscription = await PlanEnforcementService._get_active_subscription(
-            db=db, user_id=user_id
-        )
-
-        active = (
-            await PlanEnforcementService._count_active_ai_campaigns(
-                db=db, user_id=user_id
-            )
-            if subscription
-            else 0
-        )
+        usage = await UsageCounterService.get_usage(db, user_id=user_id)
+        active = usage["active_ai_campaigns"] if usage["subscription_id"] else 0
 
         return {
             "ai_enabled": settings.ai_globally_enabled if settings else True,
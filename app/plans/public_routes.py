@@ -1,17 +1,16 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.db_session import get_db
-from sqlalchemy import select
-from app.plans.models import Plan
+from app.core.config_cache import config_cache
 
 router = APIRouter(prefix="/public", tags=["Public Plans"])
 
 @router.get("/plans")
 async def public_plans(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(Plan).where(Plan.is_active == True, Plan.is_hidden == False)
-    )
-    plans = result.scalars().all()
+    plans = [
+        p for p in await config_cache.get_plans(db)
+        if p.is_active and not p.is_hidden
+    ]
     return [
         {
             "id": p.id,
@@ -2,8 +2,8 @@ from datetime import datetime, date, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app.core.config_cache import config_cache
 from app.plans.subscription_models import Subscription
-from app.plans.models import Plan
 
 
 class TrialService:
@@ -22,14 +22,9 @@ class TrialService:
         if existing:
             return existing
 
-        # Load FREE plan
-        plan = await db.scalar(
-            select(Plan).where(
-                Plan.name == "FREE",
-                Plan.is_active.is_(True),
-            )
-        )
-        if not plan:
+        # Load FREE plan (cached catalog)
+        plan = await config_cache.get_plan_by_name(db, "FREE")
+        if not plan or not plan.is_active:
             return None
 
         # Determine trial period
@@ -0,0 +1,53 @@
+from datetime import datetime, date
+import uuid
+
+from sqlalchemy import Date, DateTime, ForeignKey, Integer, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.base import Base
+
+
+class UserUsageCounter(Base):
+    """
+    Materialized per-user usage for plan enforcement (one row per user).
+
+    Written by SQL only (hence the server defaults): database triggers
+    keep it current in the same transaction as the write
+    (alembic 9e2a6d4c1b37):
+    - campaigns / user_meta_ad_accounts → recount the affected users
+    - campaign_action_logs inserts → bump today's action counters
+
+    Counted like PlanEnforcementService used to:
+    - selected_ad_accounts: links with is_selected
+    - campaigns / active_ai_campaigns: non-archived (AI-active)
+      campaigns of the user's selected ad accounts
+    - *_today: action logs since UTC midnight of actions_date; a row
+      with an older actions_date reads as zero
+
+    The reconcile_usage_counters job recounts every row.
+    """
+
+    __tablename__ = "user_usage_counters"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    linked_ad_accounts: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    selected_ad_accounts: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    campaigns: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    active_ai_campaigns: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+
+    actions_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+    optimizations_today: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    expansions_today: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        server_default=func.timezone("utc", func.now()),
+        nullable=False,
+    )
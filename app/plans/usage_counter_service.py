@@ -0,0 +1,145 @@
+from datetime import datetime
+from typing import List
+from uuid import UUID
+
+from sqlalchemy import bindparam, select, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.plans.usage_counter_models import UserUsageCounter
+from app.users.models import User
+
+
+USAGE_SQL = text(
+    """
+    SELECT
+        -- No counter row yet: the user never linked an account or
+        -- acted (every trigger creates the row), so all zeros
+        COALESCE(c.linked_ad_accounts, 0) AS linked_ad_accounts,
+        COALESCE(c.selected_ad_accounts, 0) AS selected_ad_accounts,
+        COALESCE(c.campaigns, 0) AS campaigns,
+        COALESCE(c.active_ai_campaigns, 0) AS active_ai_campaigns,
+        CASE WHEN c.actions_date = :today THEN c.optimizations_today ELSE 0 END
+            AS optimizations_today,
+        CASE WHEN c.actions_date = :today THEN c.expansions_today ELSE 0 END
+            AS expansions_today,
+        s.id AS subscription_id,
+        COALESCE(o.campaigns, s.ai_campaign_limit_snapshot, 0) AS ai_campaign_limit,
+        COALESCE(o.ad_accounts, s.ad_account_limit_snapshot, 0) AS ad_account_limit
+    FROM users u
+    LEFT JOIN user_usage_counters c ON c.user_id = u.id
+    LEFT JOIN LATERAL (
+        SELECT id, ai_campaign_limit_snapshot, ad_account_limit_snapshot
+        FROM subscriptions
+        WHERE user_id = u.id
+          AND status IN ('trial', 'active')
+          -- not lapsed (app.auth.dependencies._subscription_lapses_at):
+          -- the status is only persisted as expired on the next load
+          AND (status <> 'trial' OR trial_end IS NULL OR trial_end >= :today)
+          AND (ends_at IS NULL OR never_expires OR ends_at > :now)
+        ORDER BY created_at DESC
+        LIMIT 1
+    ) s ON true
+    LEFT JOIN LATERAL (
+        SELECT
+            max(value) FILTER (WHERE key = 'campaigns') AS campaigns,
+            max(value) FILTER (WHERE key = 'ad_accounts') AS ad_accounts
+        FROM user_usage_overrides
+        WHERE user_id = u.id
+          AND key IN ('campaigns', 'ad_accounts')
+          AND (expires_at IS NULL OR expires_at > now())
+    ) o ON true
+    WHERE u.id = :user_id
+    """
+)
+
+REFRESH_SQL = text("SELECT refresh_user_usage_counters(:user_ids)").bindparams(
+    bindparam("user_ids", type_=ARRAY(PG_UUID(as_uuid=True)))
+)
+
+
+class UsageCounterService:
+    """
+    Reads / repairs user_usage_counters (maintained by triggers).
+
+    get_usage() is the enforcement read: the user and counter rows
+    (primary keys, a missing counter row reads as zeros, never
+    written) plus the active, not yet lapsed subscription's limits
+    with overrides applied, in one statement. Limits follow
+    UsageOverrideService: a live override replaces the subscription
+    snapshot.
+    """
+
+    # =====================================================
+    # READ
+    # =====================================================
+    @staticmethod
+    async def get_usage(db: AsyncSession, *, user_id: UUID) -> dict:
+        now = datetime.utcnow()
+        params = {"user_id": user_id, "today": now.date(), "now": now}
+
+        row = (await db.execute(USAGE_SQL, params)).mappings().first()
+        if row is None:
+            raise ValueError(f"Unknown user {user_id}")
+
+        return dict(row)
+
+    # =====================================================
+    # REPAIR
+    # =====================================================
+    @staticmethod
+    async def refresh(db: AsyncSession, *, user_ids: List[UUID]) -> None:
+        """
+        Recounts the users' rows (creating missing ones). Caller commits.
+        """
+
+        await db.execute(REFRESH_SQL, {"user_ids": list(user_ids)})
+
+    @staticmethod
+    async def reconcile(db: AsyncSession, *, batch_size: int = 500) -> int:
+        """
+        Recounts every user in batches (one commit each) and returns
+        how many rows had drifted.
+        """
+
+        drifted = 0
+        last_id = None
+
+        while True:
+            stmt = select(User.id).order_by(User.id).limit(batch_size)
+            if last_id is not None:
+                stmt = stmt.where(User.id > last_id)
+
+            user_ids = (await db.execute(stmt)).scalars().all()
+            if not user_ids:
+                return drifted
+
+            before = await UsageCounterService._snapshot(db, user_ids)
+            await UsageCounterService.refresh(db, user_ids=user_ids)
+            after = await UsageCounterService._snapshot(db, user_ids)
+            await db.commit()
+
+            drifted += sum(1 for user_id in user_ids if before.get(user_id) != after.get(user_id))
+            last_id = user_ids[-1]
+
+    @staticmethod
+    async def _snapshot(db: AsyncSession, user_ids: List[UUID]) -> dict:
+        # Effective values: yesterday's action counters read as zero
+        today = datetime.utcnow().date()
+        result = await db.execute(
+            select(UserUsageCounter).where(UserUsageCounter.user_id.in_(user_ids))
+        )
+
+        snapshot = {}
+        for counter in result.scalars().all():
+            current_day = counter.actions_date == today
+            snapshot[counter.user_id] = (
+                counter.linked_ad_accounts,
+                counter.selected_ad_accounts,
+                counter.campaigns,
+                counter.active_ai_campaigns,
+                counter.optimizations_today if current_day else 0,
+                counter.expansions_today if current_day else 0,
+            )
+            db.expunge(counter)
+        return snapshot
@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from uuid import UUID
 
-from app.core.db_session import get_db
+from app.core.db_session import get_read_db
 from app.auth.dependencies import get_session_context
 from app.campaigns.models import Campaign
 
@@ -16,7 +16,7 @@ router = APIRouter(prefix="/reports", tags=["Reports"])
 # ---------------------------------------------------------
 @router.get("/overview")
 async def reports_overview(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     session: dict = Depends(get_session_context),
 ):
     ad_account = session["ad_account"]
@@ -65,7 +65,7 @@ async def reports_overview(
 # ---------------------------------------------------------
 @router.get("/campaigns")
 async def reports_campaigns(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     session: dict = Depends(get_session_context),
 ):
     ad_account = session["ad_account"]
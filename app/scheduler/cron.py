@@ -0,0 +1,165 @@
+"""
+Cron Expressions (5 fields, UTC)
+
+minute hour day-of-month month day-of-week
+
+Supported per field:
+- *            every value
+- 5            single value
+- 1-5          range
+- */15, 1-5/2  step
+- 1,15,30      list of any of the above
+Day-of-week: 0-6 (0 = Sunday, 7 also accepted).
+When both day-of-month and day-of-week are restricted a day matches
+either one (standard cron semantics).
+
+Pure Python, no I/O.
+"""
+
+from collections import deque
+from datetime import datetime, timedelta
+from typing import FrozenSet, List, Optional, Tuple
+
+
+FIELDS: Tuple[Tuple[str, int, int], ...] = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 7),
+)
+
+# Upper bound for next_after() (covers "29 2 29 2 *"-style schedules)
+MAX_SEARCH_DAYS = 366 * 5
+
+
+class CronExpression:
+    def __init__(self, expression: str):
+        parts = expression.split()
+        if len(parts) != len(FIELDS):
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+
+        self.expression = expression
+
+        values = [
+            _parse_field(part, name, low, high)
+            for part, (name, low, high) in zip(parts, FIELDS)
+        ]
+        self.minutes, self.hours, self.days, self.months, weekdays = values
+        # 7 == Sunday == 0
+        self.weekdays = frozenset(day % 7 for day in weekdays)
+
+        self.any_day = parts[2] == "*"
+        self.any_weekday = parts[4] == "*"
+
+    def __repr__(self) -> str:
+        return f"CronExpression({self.expression!r})"
+
+    # =====================================================
+    # MATCHING
+    # =====================================================
+    def matches_day(self, moment: datetime) -> bool:
+        if moment.month not in self.months:
+            return False
+
+        day_ok = moment.day in self.days
+        # Python: Monday = 0 … Sunday = 6 → cron: Sunday = 0
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+
+        if self.any_day and self.any_weekday:
+            return True
+        if self.any_day:
+            return weekday_ok
+        if self.any_weekday:
+            return day_ok
+        return day_ok or weekday_ok
+
+    def matches(self, moment: datetime) -> bool:
+        return (
+            moment.minute in self.minutes
+            and moment.hour in self.hours
+            and self.matches_day(moment)
+        )
+
+    # =====================================================
+    # ITERATION
+    # =====================================================
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        First matching minute strictly after `moment`.
+        """
+
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=MAX_SEARCH_DAYS)
+
+        while candidate < limit:
+            if not self.matches_day(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate
+
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+    def previous_slot(self, moment: datetime, lookback: timedelta) -> Optional[datetime]:
+        """
+        Latest matching minute <= `moment` within `lookback`.
+        """
+
+        slots, _ = self.slots_between(moment - lookback, moment, limit=1)
+        return slots[-1] if slots else None
+
+    def slots_between(
+        self,
+        after: datetime,
+        until: datetime,
+        *,
+        limit: int,
+    ) -> Tuple[List[datetime], int]:
+        """
+        Matching minutes in (after, until]; keeps the latest `limit`.
+
+        Returns (slots oldest first, number of older slots dropped).
+        """
+
+        kept: deque = deque(maxlen=max(1, limit))
+        total = 0
+
+        slot = self.next_after(after)
+        while slot <= until:
+            kept.append(slot)
+            total += 1
+            slot = self.next_after(slot)
+
+        return list(kept), total - len(kept)
+
+
+def _parse_field(part: str, name: str, low: int, high: int) -> FrozenSet[int]:
+    values = set()
+
+    for item in part.split(","):
+        base, _, step_text = item.partition("/")
+        step = int(step_text) if step_text else 1
+        if step < 1:
+            raise ValueError(f"Invalid step in cron {name}: {item!r}")
+
+        if base == "*":
+            start, end = low, high
+        elif "-" in base:
+            start_text, end_text = base.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = int(base)
+            end = high if step_text else start
+
+        if not (low <= start <= end <= high):
+            raise ValueError(f"Cron {name} out of range {low}-{high}: {item!r}")
+
+        values.update(range(start, end + 1, step))
+
+    return frozenset(values)
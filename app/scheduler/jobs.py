@@ -0,0 +1,219 @@
+"""
+Scheduler Job Registry
+
+Each job wraps an existing entry point (previously a manual admin
+trigger or a standalone script) with the scheduler signature:
+
+    async def run(scheduled_for: datetime) -> Optional[int]
+
+scheduled_for is the cron slot (UTC) being executed; the return
+value is the row / item count recorded on the run.
+
+Targets are imported lazily so registering a job never pulls a
+script's import-time side effects into the API process.
+
+Schedules are UTC.
+"""
+
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.db_session import BatchSessionLocal
+from app.scheduler.cron import CronExpression
+
+
+# Missed slots: run every one (date-parameterized jobs) or only the latest
+CATCH_UP_ALL = "all"
+CATCH_UP_LATEST = "latest"
+
+
+JobFunc = Callable[[datetime], Awaitable[Optional[int]]]
+
+
+class JobSpec:
+    def __init__(
+        self,
+        *,
+        name: str,
+        cron: str,
+        run: JobFunc,
+        catch_up: str = CATCH_UP_LATEST,
+        description: str = "",
+    ):
+        if catch_up not in (CATCH_UP_ALL, CATCH_UP_LATEST):
+            raise ValueError(f"Unknown catch-up policy: {catch_up!r}")
+
+        self.name = name
+        self.cron = CronExpression(cron)
+        self.run = run
+        self.catch_up = catch_up
+        self.description = description
+
+    def __repr__(self) -> str:
+        return f"JobSpec({self.name!r}, {self.cron.expression!r})"
+
+
+# =========================================================
+# JOB WRAPPERS
+# =========================================================
+async def sync_campaigns(scheduled_for: datetime) -> Optional[int]:
+    from app.scripts.sync_campaigns import sync_all_users_campaigns
+
+    return await sync_all_users_campaigns()
+
+
+async def sync_daily_metrics(scheduled_for: datetime) -> Optional[int]:
+    """
+    Yesterday's insights relative to the slot (was POST /metrics/sync-daily).
+    """
+
+    from app.meta_insights.services.campaign_daily_metrics_sync_service import (
+        CampaignDailyMetricsSyncService,
+    )
+
+    target_date = scheduled_for.date() - timedelta(days=1)
+
+    async with BatchSessionLocal() as db:
+        result = await CampaignDailyMetricsSyncService(db).sync_for_date(target_date)
+
+    return result["synced_rows"]
+
+
+async def nightly_pipeline(scheduled_for: datetime) -> Optional[int]:
+    """
+    sync → aggregate → benchmark → decide for yesterday relative to
+    the slot (sync was POST /metrics/sync-daily).
+    """
+
+    from app.pipeline.dag import StageStatus
+    from app.pipeline.nightly import run_nightly_pipeline
+
+    results = await run_nightly_pipeline(scheduled_for.date() - timedelta(days=1))
+
+    failed = [
+        result.name
+        for result in results.values()
+        if result.status != StageStatus.SUCCEEDED
+    ]
+    if failed:
+        raise RuntimeError(f"Nightly pipeline stages not succeeded: {', '.join(failed)}")
+
+    changed = results["decide"].changed_in
+    return None if changed is None else len(changed)
+
+
+async def resolve_categories(scheduled_for: datetime) -> Optional[int]:
+    from app.ai_engine.services.category_resolution_service import (
+        CategoryResolutionService,
+    )
+
+    async with BatchSessionLocal() as db:
+        result = await CategoryResolutionService(db).run()
+
+    return result["updated"]
+
+
+async def metrics_partition_maintenance(scheduled_for: datetime) -> Optional[int]:
+    from app.meta_insights.services.metrics_partition_service import (
+        MetricsPartitionService,
+    )
+
+    async with BatchSessionLocal() as db:
+        result = await MetricsPartitionService(db).run_maintenance(scheduled_for.date())
+
+    return len(result["created"]) + len(result["detached"])
+
+
+async def reconcile_usage_counters(scheduled_for: datetime) -> Optional[int]:
+    from app.plans.usage_counter_service import UsageCounterService
+
+    async with BatchSessionLocal() as db:
+        return await UsageCounterService.reconcile(db)
+
+
+async def prerender_invoices(scheduled_for: datetime) -> Optional[int]:
+    from app.billing.invoice_pdf_cache import prerender_invoices as prerender
+
+    async with BatchSessionLocal() as db:
+        return await prerender(db)
+
+
+async def expire_grace(scheduled_for: datetime) -> Optional[int]:
+    from scripts.expire_grace import (
+        expire_grace_subscriptions,
+        expire_lapsed_subscriptions,
+    )
+
+    return await expire_grace_subscriptions() + await expire_lapsed_subscriptions()
+
+
+# =========================================================
+# REGISTRY
+# =========================================================
+DEFAULT_JOBS: List[JobSpec] = [
+    JobSpec(
+        name="sync_campaigns",
+        cron="15 */6 * * *",
+        run=sync_campaigns,
+        description="Sync Meta campaigns for every connected user",
+    ),
+    JobSpec(
+        name="sync_daily_metrics",
+        cron="30 1 * * *",
+        run=sync_daily_metrics,
+        catch_up=CATCH_UP_ALL,
+        description="Meta Insights → campaign_daily_metrics for yesterday",
+    ),
+    JobSpec(
+        name="resolve_categories",
+        cron="0 3 * * *",
+        run=resolve_categories,
+        description="Resolve missing / low-confidence campaign categories",
+    ),
+    JobSpec(
+        name="metrics_partition_maintenance",
+        cron="0 0 * * *",
+        run=metrics_partition_maintenance,
+        description="Create upcoming monthly metrics partitions, detach expired ones",
+    ),
+    JobSpec(
+        name="reconcile_usage_counters",
+        cron="45 3 * * *",
+        run=reconcile_usage_counters,
+        description="Recount user_usage_counters (returns rows that had drifted)",
+    ),
+    JobSpec(
+        name="prerender_invoices",
+        cron="*/5 * * * *",
+        run=prerender_invoices,
+        description="Render PDFs of newly issued invoices into the invoice PDF store",
+    ),
+    JobSpec(
+        name="expire_grace",
+        cron="*/15 * * * *",
+        run=expire_grace,
+        description="Expire subscriptions whose grace period, trial or term ended",
+    ),
+]
+
+
+# Opt-in (NIGHTLY_PIPELINE_ENABLED): takes over sync_daily_metrics' slot,
+# its first stage is the same sync
+NIGHTLY_PIPELINE_JOB = JobSpec(
+    name="nightly_pipeline",
+    cron="30 1 * * *",
+    run=nightly_pipeline,
+    catch_up=CATCH_UP_ALL,
+    description="Sync → aggregate → benchmark → decide for yesterday",
+)
+
+
+def get_jobs() -> Dict[str, JobSpec]:
+    jobs = {spec.name: spec for spec in DEFAULT_JOBS}
+
+    if settings.NIGHTLY_PIPELINE_ENABLED:
+        del jobs["sync_daily_metrics"]
+        jobs[NIGHTLY_PIPELINE_JOB.name] = NIGHTLY_PIPELINE_JOB
+
+    return jobs
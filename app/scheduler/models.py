@@ -0,0 +1,159 @@
+from sqlalchemy import (
+    String,
+    Boolean,
+    Integer,
+    Text,
+    DateTime,
+    ForeignKey,
+    Index,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+import uuid
+
+from app.core.database import Base
+
+
+# =========================================================
+# RUN STATUS
+# =========================================================
+class JobRunStatus:
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+# =========================================================
+# SCHEDULED JOB STATE
+# =========================================================
+class ScheduledJob(Base):
+    """
+    One row per registered scheduler job.
+
+    Schedules live in code (app.scheduler.jobs); this row holds the
+    shared state every node reads:
+    - last_scheduled_for: latest cron slot that was handled
+      (missed slots after it are caught up)
+    - enabled: admin kill switch
+    """
+
+    __tablename__ = "scheduled_jobs"
+
+    name: Mapped[str] = mapped_column(
+        String,
+        primary_key=True,
+    )
+
+    cron: Mapped[str] = mapped_column(
+        String,
+        nullable=False,
+        doc="Cron expression currently registered in code (UTC)",
+    )
+
+    enabled: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        default=True,
+    )
+
+    last_scheduled_for: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True,
+    )
+
+    last_status: Mapped[str | None] = mapped_column(
+        String,
+        nullable=True,
+    )
+
+    last_finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True,
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False,
+    )
+
+
+# =========================================================
+# JOB RUN HISTORY
+# =========================================================
+class ScheduledJobRun(Base):
+    """
+    One row per execution (one cron slot) of a scheduler job.
+
+    Append-only; updated once when the run finishes.
+    """
+
+    __tablename__ = "scheduled_job_runs"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+
+    job_name: Mapped[str] = mapped_column(
+        String,
+        ForeignKey("scheduled_jobs.name", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    scheduled_for: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        doc="Cron slot this run executed (UTC)",
+    )
+
+    status: Mapped[str] = mapped_column(
+        String,
+        nullable=False,
+        default=JobRunStatus.RUNNING,
+    )
+
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False,
+    )
+
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True,
+    )
+
+    duration_ms: Mapped[int | None] = mapped_column(
+        Integer,
+        nullable=True,
+    )
+
+    rows_affected: Mapped[int | None] = mapped_column(
+        Integer,
+        nullable=True,
+        doc="Row / item count reported by the job",
+    )
+
+    error: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+    )
+
+    node: Mapped[str] = mapped_column(
+        String,
+        nullable=False,
+        doc="hostname:pid of the worker that held the lock",
+    )
+
+
+# =========================================================
+# INDEXES
+# =========================================================
+Index(
+    "ix_scheduled_job_runs_job_started",
+    ScheduledJobRun.job_name,
+    ScheduledJobRun.started_at,
+)
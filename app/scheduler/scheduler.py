@@ -0,0 +1,463 @@
+"""
+In-Process Job Scheduler
+
+PHASE 22 — CRON JOBS WITH ADVISORY-LOCK LEADER ELECTION
+
+Purpose:
+- Run the registered jobs (app.scheduler.jobs) on their cron schedule
+  inside every uvicorn worker / node, or as a dedicated process
+- Exactly ONE worker runs a job at a time: pg_try_advisory_lock per
+  job, held on a dedicated AUTOCOMMIT connection for the whole run
+  (the lock dies with the connection if the worker crashes)
+- Record every run (slot, status, duration, row count, node) in
+  scheduled_job_runs; shared job state lives in scheduled_jobs
+- Catch up slots missed while no worker was up (or while the job was
+  still running): every missed slot in order (CATCH_UP_ALL, capped at
+  SCHEDULER_MAX_CATCH_UP) or only the latest one — always sequentially
+  under the lock, so executions never overlap
+
+Wiring:
+- main.py startup / shutdown: start_scheduler() / stop_scheduler()
+  (no-op unless SCHEDULER_ENABLED=true)
+- Dedicated process: python -m app.scheduler.scheduler
+
+Note: session-level advisory locks need a direct Postgres connection
+(not a transaction-mode pgbouncer).
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import time
+import traceback
+import uuid
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core import db_session
+from app.scheduler.jobs import CATCH_UP_ALL, JobSpec, get_jobs
+from app.scheduler.models import JobRunStatus
+
+logger = logging.getLogger(__name__)
+
+
+# First key of pg_try_advisory_lock(int, int); second key = hashtext(job name)
+SCHEDULER_LOCK_NAMESPACE = 22001
+
+# Longest error text stored on a run
+MAX_ERROR_LENGTH = 4000
+
+
+def _utcnow() -> datetime:
+    return datetime.utcnow().replace(second=0, microsecond=0)
+
+
+class JobScheduler:
+    def __init__(
+        self,
+        jobs: Optional[Dict[str, JobSpec]] = None,
+        *,
+        engine: Optional[AsyncEngine] = None,
+        tick_seconds: Optional[float] = None,
+        max_catch_up: Optional[int] = None,
+    ):
+        self.jobs = jobs if jobs is not None else get_jobs()
+        self.engine = engine or db_session.engine
+        self.tick_seconds = tick_seconds or settings.SCHEDULER_TICK_SECONDS
+        self.max_catch_up = max_catch_up or settings.SCHEDULER_MAX_CATCH_UP
+        self.node = f"{socket.gethostname()}:{os.getpid()}"
+
+        # job name → earliest time this worker should try the job again
+        self._next_due: Dict[str, datetime] = {}
+        # job name → in-flight task in THIS worker
+        self._running: Dict[str, asyncio.Task] = {}
+
+        self._loop_task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    # =====================================================
+    # LIFECYCLE
+    # =====================================================
+    async def start(self) -> None:
+        await self.register()
+        self._loop_task = asyncio.create_task(self._loop(), name="job-scheduler")
+        logger.info(
+            "Scheduler started on %s: %s",
+            self.node,
+            ", ".join(f"{spec.name} [{spec.cron.expression}]" for spec in self.jobs.values()),
+        )
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """
+        Stops ticking; waits up to `timeout` for running jobs, then
+        cancels them (their runs are recorded as failed).
+        """
+
+        self._stopping.set()
+        if self._loop_task:
+            await self._loop_task
+
+        running = list(self._running.values())
+        if running:
+            _, pending = await asyncio.wait(running, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        logger.info("Scheduler stopped on %s", self.node)
+
+    async def _loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                self.tick()
+            except Exception:
+                logger.exception("Scheduler tick failed")
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.tick_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    # =====================================================
+    # REGISTRATION
+    # =====================================================
+    async def register(self) -> None:
+        """
+        Upserts one scheduled_jobs row per job. A new job starts at
+        "now", so the first deploy does not backfill history.
+        """
+
+        now = _utcnow()
+
+        async with self.engine.begin() as conn:
+            for spec in self.jobs.values():
+                result = await conn.execute(
+                    text(
+                        """
+                        INSERT INTO scheduled_jobs (
+                            name,
+                            cron,
+                            enabled,
+                            last_scheduled_for,
+                            updated_at
+                        )
+                        VALUES (:name, :cron, TRUE, :now, :now)
+                        ON CONFLICT (name) DO UPDATE SET
+                            cron = EXCLUDED.cron,
+                            updated_at = CASE
+                                WHEN scheduled_jobs.cron = EXCLUDED.cron
+                                THEN scheduled_jobs.updated_at
+                                ELSE EXCLUDED.updated_at
+                            END
+                        RETURNING last_scheduled_for
+                        """
+                    ),
+                    {"name": spec.name, "cron": spec.cron.expression, "now": now},
+                )
+                last_scheduled_for = result.scalar_one() or now
+                self._next_due[spec.name] = spec.cron.next_after(last_scheduled_for)
+
+    # =====================================================
+    # TICK
+    # =====================================================
+    def tick(self, now: Optional[datetime] = None) -> None:
+        """
+        Starts every due job that is not already running in this worker.
+        """
+
+        now = now or datetime.utcnow()
+
+        for name, spec in self.jobs.items():
+            if name in self._running:
+                continue
+            if self._next_due.get(name, now) > now:
+                continue
+
+            task = asyncio.create_task(self.execute(spec), name=f"job:{name}")
+            self._running[name] = task
+            task.add_done_callback(lambda _, name=name: self._running.pop(name, None))
+
+    async def wait_idle(self) -> None:
+        while self._running:
+            await asyncio.gather(*self._running.values(), return_exceptions=True)
+
+    # =====================================================
+    # EXECUTION (LEADER ONLY)
+    # =====================================================
+    async def execute(self, spec: JobSpec) -> None:
+        async with self.engine.connect() as lock_conn:
+            # No transaction stays open while the job runs
+            lock_conn = await lock_conn.execution_options(isolation_level="AUTOCOMMIT")
+
+            lock_params = {"namespace": SCHEDULER_LOCK_NAMESPACE, "name": spec.name}
+            acquired = await lock_conn.scalar(
+                text("SELECT pg_try_advisory_lock(:namespace, hashtext(:name))"),
+                lock_params,
+            )
+
+            if not acquired:
+                # Another worker / node holds it and advances the shared state
+                self._next_due[spec.name] = spec.cron.next_after(datetime.utcnow())
+                return
+
+            try:
+                await self._run_due_slots(spec)
+            finally:
+                await lock_conn.execute(
+                    text("SELECT pg_advisory_unlock(:namespace, hashtext(:name))"),
+                    lock_params,
+                )
+
+    async def _run_due_slots(self, spec: JobSpec) -> None:
+        now = _utcnow()
+
+        async with self.engine.begin() as conn:
+            # Holding the lock: any "running" row is from a dead worker
+            await conn.execute(
+                text(
+                    """
+                    UPDATE scheduled_job_runs
+                    SET status = :failed,
+                        finished_at = :now,
+                        error = 'abandoned (worker exited while running)'
+                    WHERE job_name = :name
+                      AND status = :running
+                    """
+                ),
+                {
+                    "name": spec.name,
+                    "now": now,
+                    "failed": JobRunStatus.FAILED,
+                    "running": JobRunStatus.RUNNING,
+                },
+            )
+            state = (
+                await conn.execute(
+                    text(
+                        """
+                        SELECT enabled, last_scheduled_for
+                        FROM scheduled_jobs
+                        WHERE name = :name
+                        """
+                    ),
+                    {"name": spec.name},
+                )
+            ).one()
+
+        if not state.enabled:
+            self._next_due[spec.name] = spec.cron.next_after(now)
+            return
+
+        slots, dropped = spec.cron.slots_between(
+            state.last_scheduled_for or now,
+            now,
+            limit=self.max_catch_up if spec.catch_up == CATCH_UP_ALL else 1,
+        )
+
+        if dropped:
+            logger.warning(
+                "Job %s: %d missed slots before %s not caught up",
+                spec.name,
+                dropped,
+                slots[0],
+            )
+
+        for slot in slots:
+            if self._stopping.is_set():
+                break
+            await self._run_slot(spec, slot)
+
+        self._next_due[spec.name] = spec.cron.next_after(now)
+
+    async def _run_slot(self, spec: JobSpec, slot: datetime) -> None:
+        run_id = uuid.uuid4()
+        started_at = datetime.utcnow()
+
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                text(
+                    """
+                    INSERT INTO scheduled_job_runs (
+                        id,
+                        job_name,
+                        scheduled_for,
+                        status,
+                        started_at,
+                        node
+                    )
+                    VALUES (:id, :name, :slot, :status, :started_at, :node)
+                    """
+                ),
+                {
+                    "id": run_id,
+                    "name": spec.name,
+                    "slot": slot,
+                    "status": JobRunStatus.RUNNING,
+                    "started_at": started_at,
+                    "node": self.node,
+                },
+            )
+
+        logger.info("Job %s [%s] started on %s", spec.name, slot, self.node)
+        started = time.perf_counter()
+
+        rows: Optional[int] = None
+        error: Optional[str] = None
+        status = JobRunStatus.SUCCEEDED
+
+        try:
+            result = await spec.run(slot)
+            rows = int(result) if isinstance(result, int) else None
+        except asyncio.CancelledError:
+            status, error = JobRunStatus.FAILED, "cancelled (scheduler stopped)"
+            await self._finish_run(spec, run_id, slot, status, started, rows, error)
+            raise
+        except Exception:
+            status = JobRunStatus.FAILED
+            error = traceback.format_exc()[-MAX_ERROR_LENGTH:]
+            logger.exception("Job %s [%s] failed", spec.name, slot)
+
+        await self._finish_run(spec, run_id, slot, status, started, rows, error)
+
+    async def _finish_run(
+        self,
+        spec: JobSpec,
+        run_id: uuid.UUID,
+        slot: datetime,
+        status: str,
+        started: float,
+        rows: Optional[int],
+        error: Optional[str],
+    ) -> None:
+        duration_ms = int((time.perf_counter() - started) * 1000)
+        finished_at = datetime.utcnow()
+
+        # A failed slot is still handled: it is recorded, not retried
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                text(
+                    """
+                    UPDATE scheduled_job_runs
+                    SET status = :status,
+                        finished_at = :finished_at,
+                        duration_ms = :duration_ms,
+                        rows_affected = :rows,
+                        error = :error
+                    WHERE id = :id
+                    """
+                ),
+                {
+                    "id": run_id,
+                    "status": status,
+                    "finished_at": finished_at,
+                    "duration_ms": duration_ms,
+                    "rows": rows,
+                    "error": error,
+                },
+            )
+            await conn.execute(
+                text(
+                    """
+                    UPDATE scheduled_jobs
+                    SET last_scheduled_for = GREATEST(last_scheduled_for, :slot),
+                        last_status = :status,
+                        last_finished_at = :finished_at
+                    WHERE name = :name
+                    """
+                ),
+                {
+                    "name": spec.name,
+                    "slot": slot,
+                    "status": status,
+                    "finished_at": finished_at,
+                },
+            )
+
+        logger.info(
+            "Job %s [%s] %s in %dms (rows=%s)",
+            spec.name,
+            slot,
+            status,
+            duration_ms,
+            rows,
+        )
+
+
+# =========================================================
+# FASTAPI STARTUP / SHUTDOWN HOOKS
+# =========================================================
+_scheduler: Optional[JobScheduler] = None
+
+
+async def start_scheduler() -> Optional[JobScheduler]:
+    global _scheduler
+
+    if not settings.SCHEDULER_ENABLED:
+        logger.info("Scheduler disabled (SCHEDULER_ENABLED=false)")
+        return None
+
+    if _scheduler is None:
+        _scheduler = JobScheduler()
+        await _scheduler.start()
+    return _scheduler
+
+
+async def stop_scheduler() -> None:
+    global _scheduler
+
+    if _scheduler is not None:
+        await _scheduler.stop()
+        _scheduler = None
+
+
+# =========================================================
+# DEDICATED PROCESS
+# =========================================================
+async def _serve(once: bool) -> None:
+    # Jobs load ORM models lazily; register them all up front
+    import app.models  # noqa: F401
+
+    scheduler = JobScheduler()
+
+    if once:
+        await scheduler.register()
+        scheduler.tick()
+        await scheduler.wait_idle()
+        return
+
+    await scheduler.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    await stop.wait()
+    await scheduler.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the job scheduler")
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Run whatever is due (including catch-up) and exit",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [scheduler] %(levelname)s: %(message)s",
+    )
+    asyncio.run(_serve(args.once))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Background job: Backfill daily + breakdown metrics over a date range.
+
+The range is split into --chunk-days chunks; every finished
+(kind × ad account × chunk) unit is checkpointed in
+metrics_backfill_checkpoints, so re-running the same command after a
+crash or Ctrl-C resumes where it stopped (keep --since / --until /
+--chunk-days unchanged, otherwise chunks do not line up).
+
+SAFE TO RUN:
+- manual CLI (onboarding, history repair)
+- repeated executions (idempotent upserts + checkpoints)
+
+Golden Rules:
+- Uses canonical async DB session (one per unit)
+- No FastAPI dependencies
+- No direct engine usage
+
+Usage:
+    python -m app.scripts.backfill_metrics --since 2023-09-01
+    python -m app.scripts.backfill_metrics --since 2023-09-01 --until 2026-09-30 \\
+        --ad-account-id 3f0c... --kind daily --chunk-days 31 --workers 16
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import date, timedelta
+from uuid import UUID
+
+# =========================================================
+# 🔴 CRITICAL: FORCE ORM REGISTRATION (DO NOT REMOVE)
+# =========================================================
+import app.users.models
+import app.auth.models          # ← registers Session
+import app.meta_api.models
+import app.campaigns.models
+import app.plans.subscription_models
+import app.admin.models
+
+# =========================================================
+# NORMAL IMPORTS (SAFE AFTER REGISTRATION)
+# =========================================================
+from app.meta_api.graph_client import close_graph_client
+from app.meta_insights.services.metrics_backfill_orchestrator import (
+    BACKFILL_BREAKDOWNS,
+    BACKFILL_DAILY,
+    MetricsBackfillOrchestrator,
+)
+
+
+# =========================================================
+# LOGGING
+# =========================================================
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [metrics-backfill] %(levelname)s: %(message)s",
+)
+logger = logging.getLogger("metrics-backfill")
+
+
+# =========================================================
+# CORE JOB
+# =========================================================
+async def backfill_metrics(args: argparse.Namespace) -> None:
+    orchestrator = MetricsBackfillOrchestrator(
+        since=args.since,
+        until=args.until or (date.today() - timedelta(days=1)),
+        chunk_days=args.chunk_days,
+        kinds=args.kind or (BACKFILL_DAILY, BACKFILL_BREAKDOWNS),
+        ad_account_ids=args.ad_account_id or None,
+        workers=args.workers,
+        job_timeout=args.job_timeout,
+        batch_size=args.batch_size,
+        progress_interval=args.progress_interval,
+    )
+
+    try:
+        result = await orchestrator.run()
+    finally:
+        await close_graph_client()
+
+    if result["units_failed"]:
+        logger.warning(
+            "%d units failed — re-run the same command to retry them",
+            result["units_failed"],
+        )
+
+
+# =========================================================
+# ENTRYPOINT
+# =========================================================
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--since", type=date.fromisoformat, required=True)
+    parser.add_argument(
+        "--until",
+        type=date.fromisoformat,
+        help="Last day to backfill (default: yesterday)",
+    )
+    parser.add_argument("--chunk-days", type=int, default=30)
+    parser.add_argument(
+        "--kind",
+        action="append",
+        choices=[BACKFILL_DAILY, BACKFILL_BREAKDOWNS],
+        help="Repeatable (default: both)",
+    )
+    parser.add_argument(
+        "--ad-account-id",
+        action="append",
+        type=UUID,
+        help="Repeatable; default: every selected, active ad account",
+    )
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument(
+        "--job-timeout",
+        type=float,
+        default=None,
+        help="Seconds before one unit is abandoned (retried on the next run)",
+    )
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument(
+        "--progress-interval",
+        type=float,
+        default=10.0,
+        help="Seconds between progress / ETA log lines",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(backfill_metrics(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Background job: Ingest breakdown insights for all selected ad accounts.
+
+SAFE TO RUN:
+- systemd timer
+- manual CLI
+- repeated executions (idempotent upserts)
+- after a crash: finished (account × breakdown set) jobs are
+  skipped when --progress-file points at the previous run's file
+
+Golden Rules:
+- Uses canonical async DB session (one per job)
+- No FastAPI dependencies
+- No direct engine usage
+
+Usage:
+    python -m app.scripts.ingest_breakdowns --days 3
+    python -m app.scripts.ingest_breakdowns --since 2025-01-01 --until 2025-03-31 \\
+        --workers 16 --progress-file /var/tmp/breakdowns-q1.json
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import date, timedelta
+from pathlib import Path
+
+# =========================================================
+# 🔴 CRITICAL: FORCE ORM REGISTRATION (DO NOT REMOVE)
+# =========================================================
+import app.users.models
+import app.auth.models          # ← registers Session
+import app.meta_api.models
+import app.campaigns.models
+import app.plans.subscription_models
+import app.admin.models
+
+# =========================================================
+# NORMAL IMPORTS (SAFE AFTER REGISTRATION)
+# =========================================================
+from app.meta_api.graph_client import close_graph_client
+from app.meta_insights.services.breakdown_ingestion_orchestrator import (
+    BreakdownIngestionOrchestrator,
+)
+
+
+# =========================================================
+# LOGGING
+# =========================================================
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [breakdown-ingest] %(levelname)s: %(message)s",
+)
+logger = logging.getLogger("breakdown-ingest")
+
+
+# =========================================================
+# CORE JOB
+# =========================================================
+async def ingest_all_breakdowns(args: argparse.Namespace) -> None:
+    until = args.until or (date.today() - timedelta(days=1))
+    since = args.since or (until - timedelta(days=args.days - 1))
+
+    orchestrator = BreakdownIngestionOrchestrator(
+        since=since,
+        until=until,
+        workers=args.workers,
+        job_timeout=args.job_timeout,
+        progress_path=args.progress_file,
+        batch_size=args.batch_size,
+    )
+
+    try:
+        result = await orchestrator.run()
+    finally:
+        await close_graph_client()
+
+    if result["jobs_failed"]:
+        logger.warning(
+            "%d jobs failed — re-run with the same --progress-file to retry them",
+            result["jobs_failed"],
+        )
+
+
+# =========================================================
+# ENTRYPOINT
+# =========================================================
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--since", type=date.fromisoformat)
+    parser.add_argument("--until", type=date.fromisoformat)
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=1,
+        help="Window size ending at --until (default: yesterday) when --since is omitted",
+    )
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument(
+        "--job-timeout",
+        type=float,
+        default=None,
+        help="Seconds before one (account × breakdown set) job is abandoned",
+    )
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--progress-file", type=Path, default=None)
+    args = parser.parse_args()
+
+    asyncio.run(ingest_all_breakdowns(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Background job: Monthly partition maintenance for the daily metrics tables.
+
+Default run = the metrics_partition_maintenance scheduler job:
+create partitions up to METRICS_PARTITION_MONTHS_AHEAD months ahead and
+detach partitions past METRICS_PARTITION_RETENTION_MONTHS (if set).
+
+SAFE TO RUN:
+- manual CLI / cron
+- repeated executions (existing partitions are skipped)
+
+Usage:
+    python -m app.scripts.maintain_metrics_partitions
+    python -m app.scripts.maintain_metrics_partitions --list
+    python -m app.scripts.maintain_metrics_partitions --since 2023-01-01 --until 2027-03-31
+    python -m app.scripts.maintain_metrics_partitions --detach-before 2024-01-01 \\
+        --archive-schema archive
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import date
+
+from app.core.db_session import BatchSessionLocal
+from app.meta_insights.services.metrics_partition_service import (
+    PARTITIONED_TABLES,
+    MetricsPartitionService,
+)
+
+
+# =========================================================
+# LOGGING
+# =========================================================
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [metrics-partitions] %(levelname)s: %(message)s",
+)
+logger = logging.getLogger("metrics-partitions")
+
+
+# =========================================================
+# CORE JOB
+# =========================================================
+async def maintain_partitions(args: argparse.Namespace) -> None:
+    async with BatchSessionLocal() as db:
+        service = MetricsPartitionService(db)
+
+        if args.list:
+            for table in PARTITIONED_TABLES:
+                for name, month in await service.list_partitions(table):
+                    print(f"{table:34} {name:48} {month or 'DEFAULT'}")
+            return
+
+        if args.since or args.detach_before:
+            if args.since:
+                created = await service.ensure_partitions(
+                    args.since,
+                    args.until or date.today(),
+                )
+                logger.info("Created %d partitions", len(created))
+
+            if args.detach_before:
+                detached = await service.detach_partitions_before(
+                    args.detach_before,
+                    archive_schema=args.archive_schema,
+                )
+                logger.info("Detached %d partitions", len(detached))
+            return
+
+        result = await service.run_maintenance()
+        logger.info(
+            "Created %d, detached %d partitions",
+            len(result["created"]),
+            len(result["detached"]),
+        )
+
+
+# =========================================================
+# ENTRYPOINT
+# =========================================================
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--list", action="store_true", help="Show attached partitions")
+    parser.add_argument(
+        "--since",
+        type=date.fromisoformat,
+        help="Create monthly partitions from this month ...",
+    )
+    parser.add_argument(
+        "--until",
+        type=date.fromisoformat,
+        help="... through this month (default: current month)",
+    )
+    parser.add_argument(
+        "--detach-before",
+        type=date.fromisoformat,
+        help="Detach partitions of months before this date's month",
+    )
+    parser.add_argument(
+        "--archive-schema",
+        default=None,
+        help="Move detached partitions to this schema (default: keep in place)",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(maintain_partitions(args))
+
+
+if __name__ == "__main__":
+    main()
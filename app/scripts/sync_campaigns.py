@@ -32,8 +32,9 @@ import app.admin.models
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db_session import AsyncSessionLocal
+from app.core.db_session import BatchSessionLocal
 from app.users.models import User
+from app.meta_api.graph_client import close_graph_client, get_graph_client
 from app.meta_api.models import UserMetaAdAccount
 from app.campaigns.service import CampaignService
 
@@ -51,13 +52,15 @@ logger = logging.getLogger("campaign-sync")
 # =========================================================
 # CORE JOB
 # =========================================================
-async def sync_all_users_campaigns() -> None:
+async def sync_all_users_campaigns() -> int:
     """
     Sync campaigns for all users
     who have at least one Meta ad account connected.
+
+    Returns the number of campaigns synced.
     """
 
-    async with AsyncSessionLocal() as db:  # type: AsyncSession
+    async with BatchSessionLocal() as db:  # type: AsyncSession
         stmt = (
             select(User.id)
             .join(
@@ -72,16 +75,19 @@ async def sync_all_users_campaigns() -> None:
 
         if not user_ids:
             logger.info("No users with Meta ad accounts found")
-            return
+            return 0
 
         logger.info("Starting campaign sync for %d users", len(user_ids))
 
+        synced = 0
+
         for user_id in user_ids:
             try:
                 campaigns = await CampaignService.sync_from_meta(
                     db=db,
                     user_id=user_id,
                 )
+                synced += len(campaigns)
                 logger.info(
                     "User %s: synced %d campaigns",
                     user_id,
@@ -95,13 +101,23 @@ async def sync_all_users_campaigns() -> None:
                 )
 
         logger.info("Campaign sync job completed")
+        logger.info("Graph requests: %s", get_graph_client().metrics())
+
+        return synced
+
+
+async def _run() -> None:
+    try:
+        await sync_all_users_campaigns()
+    finally:
+        await close_graph_client()
 
 
 # =========================================================
 # ENTRYPOINT
 # =========================================================
 def main() -> None:
-    asyncio.run(sync_all_users_campaigns())
+    asyncio.run(_run())
 
 
 if __name__ == "__main__":
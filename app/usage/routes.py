@@ -1,13 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
 
 from app.core.db_session import get_db
 from app.auth.dependencies import require_user
 from app.users.models import User
-from app.meta_api.models import UserMetaAdAccount
-from app.campaigns.models import Campaign
-from app.plans.subscription_models import Subscription
+from app.plans.usage_counter_service import UsageCounterService
 
 router = APIRouter(prefix="/usage", tags=["Usage Summary"])
 
@@ -22,66 +19,20 @@ async def usage_summary(
 ):
     """
     Unified Phase-9 Usage Summary (User-Side)
+    Materialized counters + active subscription limits (one read).
     """
-    # -------------------------
-    # Fetch active subscription
-    # -------------------------
-    sub = await db.scalar(
-        select(Subscription)
-        .where(
-            Subscription.user_id == current_user.id,
-            Subscription.status.in_(["trial", "active"])
-        )
-        .order_by(Subscription.created_at.desc())
-        .limit(1)
-    )
+    usage = await UsageCounterService.get_usage(db, user_id=current_user.id)
 
     # -------------------------
     # If no subscription exists
     # -------------------------
-    if not sub:
+    if not usage["subscription_id"]:
         return {
             "ad_accounts": {"used": 0, "limit": 0},
             "campaigns": {"used": 0, "limit": 0},
             "ai_campaigns": {"used": 0, "limit": 0},
         }
 
-    # -------------------------
-    # Ad Account usage
-    # -------------------------
-    ad_accounts_used = await db.scalar(
-        select(func.count(UserMetaAdAccount.id)).where(
-            UserMetaAdAccount.user_id == current_user.id
-        )
-    ) or 0
-
-    ad_account_limit = sub.ad_account_limit_snapshot or 0
-
-    # -------------------------
-    # Campaign usage
-    # -------------------------
-    campaigns_used = await db.scalar(
-        select(func.count(Campaign.id)).where(
-            Campaign.user_id == current_user.id,
-            Campaign.is_archived.is_(False),
-        )
-    ) or 0
-
-    campaign_limit = sub.campaign_limit_snapshot or 0
-
-    # -------------------------
-    # AI Campaign usage
-    # -------------------------
-    ai_campaigns_used = await db.scalar(
-        select(func.count(Campaign.id)).where(
-            Campaign.user_id == current_user.id,
-            Campaign.ai_active.is_(True),
-            Campaign.is_archived.is_(False),
-        )
-    ) or 0
-
-    ai_campaign_limit = sub.ai_campaign_limit_snapshot or 0
-
     # -------------------------
     # Optional future advanced slots
     # -------------------------
@@ -89,15 +40,16 @@ async def usage_summary(
 
     return {
         "ad_accounts": {
-            "used": ad_accounts_used,
-            "limit": ad_account_limit
+            "used": usage["linked_ad_accounts"],
+            "limit": usage["ad_account_limit"],
         },
+        # No plan limit on (non-AI) campaigns
         "campaigns": {
-            "used": campaigns_used,
-            "limit": campaign_limit
+            "used": usage["campaigns"],
+            "limit": 0,
         },
         "ai_campaigns": {
-            "used": ai_campaigns_used,
-            "limit": ai_campaign_limit
+            "used": usage["active_ai_campaigns"],
+            "limit": usage["ai_campaign_limit"],
         },
     }
@@ -13,13 +13,32 @@ import app.models  # registers all SQLAlchemy models
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 # =========================
 # NEW IMPORTS FOR AUTO-ADMIN
 # =========================
 from sqlalchemy import select
 from app.users.models import User
+from app.core.config import settings
 from app.core.db_session import AsyncSessionLocal
+from app.core.database import (
+    get_replica_engine,
+    pool_stats,
+    render_pool_metrics,
+    replica_lag,
+)
+from app.core.pg_listener import pg_listener
+from app.core.config_cache import config_cache
+from app.billing.invoice_pdf_cache import invoice_pdf_cache
+from app.billing.webhook_worker import (
+    render_webhook_metrics,
+    start_webhook_workers,
+    stop_webhook_workers,
+    stats as webhook_stats,
+)
+from app.meta_api.graph_client import close_graph_client, get_graph_client
+from app.scheduler.scheduler import start_scheduler, stop_scheduler
 
 # =========================
 # ROUTERS (API ONLY)
@@ -149,7 +168,20 @@ async def ensure_default_admin():
 
 @app.on_event("startup")
 async def startup_event():
+    get_graph_client()  # open the shared Meta Graph connection pool
     await ensure_default_admin()
+    await start_scheduler()  # no-op unless SCHEDULER_ENABLED=true
+    await pg_listener.start()  # cache invalidation (auth context)
+    await start_webhook_workers()  # no-op unless WEBHOOK_WORKERS_ENABLED=true
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await stop_scheduler()
+    await stop_webhook_workers()
+    await pg_listener.stop()
+    await close_graph_client()
+    invoice_pdf_cache.shutdown()  # PDF render process pool
 
 # =========================
 # HEALTH CHECK
@@ -157,3 +189,49 @@ async def startup_event():
 @app.get("/api/health")
 def health_check():
     return {"status": "ok"}
+
+
+# =========================
+# DB POOL METRICS (PER WORKER PROCESS)
+# =========================
+@app.get("/api/health/db-pool")
+def db_pool_health(format: str = "json"):
+    if format == "prometheus":
+        return PlainTextResponse(render_pool_metrics())
+    return pool_stats()
+
+
+@app.get("/api/health/db-replica")
+def db_replica_health():
+    replica = get_replica_engine()
+    if replica is None:
+        return {"configured": False}
+
+    return {
+        "configured": True,
+        "in_use": replica_lag.healthy,
+        "lag_seconds": replica_lag.lag_seconds,
+        "max_lag_seconds": settings.DB_REPLICA_MAX_LAG_SECONDS,
+        "pool": pool_stats(replica),
+    }
+
+
+# =========================
+# CONFIG CACHE VERSIONS (PER WORKER PROCESS)
+# =========================
+@app.get("/api/health/config-cache")
+async def config_cache_health():
+    async with AsyncSessionLocal() as db:
+        return await config_cache.status(db)
+
+
+# =========================
+# RAZORPAY WEBHOOK INBOX (LAG / THROUGHPUT)
+# =========================
+@app.get("/api/health/webhooks")
+async def webhooks_health(format: str = "json"):
+    async with AsyncSessionLocal() as db:
+        data = await webhook_stats(db)
+    if format == "prometheus":
+        return PlainTextResponse(render_webhook_metrics(data))
+    return data
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Backtest: replay decision rule thresholds over stored history
+
+Replays the campaign-level rules day by day between --start and
+--end, scores suggestions against ml_action_outcomes and prints
+precision / recall per rule and per confidence band for the baseline
+thresholds and every --grid variant (variants run in a process pool).
+
+Input:
+- Postgres (DATABASE_URL), read-only
+- or a Parquet export (--parquet DIR), written by --export-parquet
+
+SAFE:
+- Never writes to the database
+
+Usage:
+    python scripts/backtest_rules.py --start 2026-06-01 --end 2026-08-31
+    python scripts/backtest_rules.py --start 2026-06-01 --end 2026-08-31 \\
+        --export-parquet /tmp/backtest
+    python scripts/backtest_rules.py --start 2026-06-01 --end 2026-08-31 \\
+        --parquet /tmp/backtest --workers 8 \\
+        --grid LeadPerformanceDropRule.CTR_DROP_THRESHOLD=0.7,0.8,0.9 \\
+        --grid CONFIDENCE_BANDS.HIGH=0.85,0.9
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import date
+from typing import Dict, List
+
+from app.core.db_session import BatchSessionLocal
+from app.ai_engine.decision_engine.backtest import (
+    HORIZONS,
+    BacktestDataset,
+    baseline_parameters,
+    build_variants,
+    load_tables,
+    read_parquet,
+    run_backtest,
+    write_parquet,
+)
+
+
+def parse_grid(entries: List[str]) -> Dict[str, List[float]]:
+    grid: Dict[str, List[float]] = {}
+    for entry in entries:
+        name, _, values = entry.partition("=")
+        if not values:
+            raise SystemExit(f"--grid expects NAME=v1,v2,…: {entry!r}")
+        grid[name] = [float(value) for value in values.split(",")]
+    return grid
+
+
+async def extract(start: date, end: date):
+    async with BatchSessionLocal() as db:
+        return await load_tables(db, start=start, end=end)
+
+
+def print_results(rows: List[Dict], variants: List[Dict]) -> None:
+    header = (
+        f"{'rule':32} {'band':6} {'suggested':>9} {'events':>7} "
+        f"{'tp':>6} {'fp':>6} {'precision':>9} {'recall':>7}"
+    )
+
+    for index, overrides in enumerate(variants):
+        label = (
+            ", ".join(f"{name}={value}" for name, value in overrides.items())
+            or "baseline"
+        )
+        print(f"\nVariant {index}: {label}")
+        print(header)
+
+        for row in rows:
+            if row["variant"] != index:
+                continue
+            band = row["band"] if row["emitted"] else f"({row['band']})"
+            print(
+                f"{row['rule']:32} {band:6} {row['suggestions']:9d} {row['events']:7d} "
+                f"{row['tp']:6d} {row['fp']:6d} "
+                f"{_fmt(row['precision']):>9} {_fmt(row['recall']):>7}"
+            )
+
+
+def _fmt(value) -> str:
+    return "-" if value is None else f"{value:.3f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--start", type=date.fromisoformat, required=True)
+    parser.add_argument("--end", type=date.fromisoformat, required=True)
+    parser.add_argument("--parquet", help="Read the Parquet export in DIR instead of Postgres")
+    parser.add_argument("--export-parquet", help="Write the Postgres extract to DIR and exit")
+    parser.add_argument(
+        "--grid",
+        action="append",
+        default=[],
+        help="NAME=v1,v2,… (repeatable; see --list-parameters)",
+    )
+    parser.add_argument("--list-parameters", action="store_true")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--horizon", choices=HORIZONS, default="7d")
+    parser.add_argument(
+        "--tolerance",
+        type=int,
+        default=1,
+        help="Days a suggestion may precede the recorded decision",
+    )
+    parser.add_argument("--json", help="Also write all result rows to this file")
+    args = parser.parse_args()
+
+    if args.list_parameters:
+        for name, value in baseline_parameters().items():
+            print(f"{name} = {value}")
+        return
+
+    try:
+        variants = build_variants(parse_grid(args.grid))
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+
+    started = time.perf_counter()
+    if args.parquet:
+        tables = read_parquet(args.parquet)
+    else:
+        tables = asyncio.run(extract(args.start, args.end))
+
+    if args.export_parquet:
+        write_parquet(tables, args.export_parquet)
+        print(f"Exported extract to {args.export_parquet}")
+        return
+
+    dataset = BacktestDataset(start=args.start, end=args.end, tables=tables)
+    loaded = time.perf_counter()
+
+    rows = run_backtest(
+        dataset,
+        variants,
+        workers=args.workers,
+        horizon=args.horizon,
+        tolerance=args.tolerance,
+    )
+    finished = time.perf_counter()
+
+    print(
+        f"{len(dataset)} campaigns × {dataset.replay_days} days, "
+        f"{len(dataset.outcome_days)} outcomes, {len(variants)} variants "
+        f"(load {loaded - started:.1f}s, replay {finished - loaded:.1f}s)"
+    )
+    print_results(rows, variants)
+
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump(rows, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Benchmark: campaign metrics aggregation (per-campaign vs set-based)
+
+Creates the model tables (ORM metadata, monthly partitions) in a
+scratch schema, seeds a synthetic dataset (default 10k campaigns ×
+365 days), runs CampaignMetricsAggregationService in every mode
+and prints wall time + a checksum of the resulting aggregates.
+
+The incremental mode is timed as a roll-forward from a full run
+for the previous day, so its checksum must match the full modes.
+
+SAFE:
+- Everything lives in its own schema (dropped afterwards)
+- Never touches the real campaign tables
+
+Usage:
+    python scripts/benchmark_campaign_aggregation.py --campaigns 10000 --days 365
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import date, timedelta
+from typing import List
+
+from sqlalchemy import Table, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.models  # noqa: F401  (registers every model on Base)
+from app.core.database import Base
+from app.core.db_session import engine
+from app.campaigns.models import Campaign
+from app.meta_api.models import MetaAdAccount
+from app.meta_insights.models.campaign_daily_metrics import CampaignDailyMetrics
+from app.meta_insights.models.campaign_metrics_aggregates import CampaignMetricsAggregate
+from app.meta_insights.services.campaign_metrics_aggregation_service import (
+    CampaignMetricsAggregationService,
+)
+from app.meta_insights.services.metrics_partition_service import (
+    create_default_partition_sql,
+    create_partition_sql,
+    months_between,
+)
+
+
+SCHEMA = "bench_campaign_aggregation"
+
+OBJECTIVES = ("LEAD", "SALES", "TRAFFIC")
+
+
+def _tables_with_parents(*tables: Table) -> List[Table]:
+    """
+    The given ORM tables plus every table their foreign keys reference,
+    parents first.
+    """
+
+    needed = set()
+
+    def visit(table: Table) -> None:
+        if table in needed:
+            return
+        needed.add(table)
+        for fk in table.foreign_keys:
+            visit(fk.column.table)
+
+    for table in tables:
+        visit(table)
+
+    return [t for t in Base.metadata.sorted_tables if t in needed]
+
+
+BENCH_TABLES = _tables_with_parents(
+    CampaignDailyMetrics.__table__,
+    CampaignMetricsAggregate.__table__,
+)
+
+
+async def _create_tables(conn, days: int, as_of_date: date) -> None:
+    """
+    Tables, indexes and monthly partitions exactly as the models define
+    them, created in SCHEMA (first on the search_path).
+    """
+
+    await conn.run_sync(
+        lambda sync_conn: Base.metadata.create_all(
+            sync_conn,
+            tables=BENCH_TABLES,
+            checkfirst=False,
+        )
+    )
+
+    for month in months_between(as_of_date - timedelta(days=days), as_of_date):
+        await conn.execute(text(create_partition_sql("campaign_daily_metrics", month)))
+    await conn.execute(text(create_default_partition_sql("campaign_daily_metrics")))
+
+
+CHECKSUM_SQL = """
+    SELECT COUNT(*) AS row_count, md5(string_agg(
+        concat_ws('|', campaign_id, window_type, window_start_date,
+                  impressions, clicks, spend, conversions, revenue,
+                  ctr, cpa, roas, days_covered, is_complete_window),
+        ',' ORDER BY campaign_id, window_type
+    )) AS checksum
+    FROM campaign_metrics_aggregates
+"""
+
+
+async def _seed(conn, campaigns: int, days: int, as_of_date: date) -> None:
+    ad_account_id = uuid.uuid4()
+    await conn.execute(
+        insert(MetaAdAccount.__table__),
+        [{"id": ad_account_id, "meta_account_id": "act_bench", "account_name": "bench"}],
+    )
+
+    # Mixed objectives: conversions are leads, purchases or both
+    await conn.execute(
+        insert(Campaign.__table__),
+        [
+            {
+                "id": uuid.uuid4(),
+                "meta_campaign_id": f"bench_{i}",
+                "ad_account_id": ad_account_id,
+                "name": f"bench {i}",
+                "objective": OBJECTIVES[i % len(OBJECTIVES)],
+                "status": "ACTIVE",
+            }
+            for i in range(campaigns)
+        ],
+    )
+
+    # Ragged history: every campaign starts at a different day
+    await conn.execute(
+        text(
+            """
+            INSERT INTO campaign_daily_metrics (
+                id, campaign_id, date, impressions, clicks, spend,
+                leads, purchases, revenue, updated_at
+            )
+            SELECT
+                gen_random_uuid(),
+                c.id,
+                CAST(:as_of_date AS DATE) - g.d,
+                (random() * 5000)::int,
+                (random() * 150)::int,
+                round((random() * 300)::numeric, 2),
+                (random() * 10)::int,
+                (random() * 4)::int,
+                round((random() * 900)::numeric, 2),
+                now()
+            FROM campaigns c
+            CROSS JOIN generate_series(0, :days - 1) AS g(d)
+            WHERE g.d < :days - (abs(hashtext(c.id::text)) % 30)
+            """
+        ),
+        {"as_of_date": as_of_date, "days": days},
+    )
+
+    await conn.execute(text("ANALYZE"))
+
+
+async def _run_mode(
+    conn,
+    as_of_date: date,
+    set_based: bool,
+    incremental: bool = False,
+) -> dict:
+    await conn.execute(text("TRUNCATE campaign_metrics_aggregates"))
+    await conn.commit()
+
+    session = AsyncSession(bind=conn, expire_on_commit=False)
+    service = CampaignMetricsAggregationService(session)
+
+    if incremental:
+        await service.aggregate_for_date(as_of_date - timedelta(days=1))
+
+    started = time.perf_counter()
+    await service.aggregate_for_date(
+        as_of_date,
+        set_based=set_based,
+        incremental=incremental,
+    )
+    elapsed = time.perf_counter() - started
+    await session.close()
+
+    row = (await conn.execute(text(CHECKSUM_SQL))).mappings().one()
+    await conn.commit()
+
+    return {
+        "seconds": elapsed,
+        "rows": row["row_count"],
+        "checksum": row["checksum"],
+    }
+
+
+async def run_benchmark(campaigns: int, days: int, skip_per_campaign: bool) -> None:
+    as_of_date = date.today()
+
+    async with engine.connect() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await conn.execute(text(f"SET search_path TO {SCHEMA}, public"))
+        # Batch work: lift the web statement_timeout for this connection
+        await conn.execute(text("SET statement_timeout = 0"))
+
+        try:
+            await _create_tables(conn, days, as_of_date)
+
+            print(f"[BENCH] seeding {campaigns} campaigns × {days} days ...")
+            started = time.perf_counter()
+            await _seed(conn, campaigns, days, as_of_date)
+            await conn.commit()
+            print(f"[BENCH] seeded in {time.perf_counter() - started:.1f}s")
+
+            results = {}
+            results["set_based"] = await _run_mode(conn, as_of_date, True)
+            results["incremental"] = await _run_mode(
+                conn, as_of_date, True, incremental=True
+            )
+
+            if not skip_per_campaign:
+                results["per_campaign"] = await _run_mode(conn, as_of_date, False)
+
+            for mode, result in results.items():
+                print(
+                    f"[BENCH] {mode:<13} {result['seconds']:>9.2f}s "
+                    f"rows={result['rows']} checksum={result['checksum']}"
+                )
+
+            baseline = results.get("per_campaign", results["set_based"])
+            for mode, result in results.items():
+                if result is baseline:
+                    continue
+                print(
+                    f"[BENCH] {mode} vs baseline: "
+                    f"speedup={baseline['seconds'] / result['seconds']:.1f}x "
+                    f"identical={result['checksum'] == baseline['checksum']}"
+                )
+        finally:
+            await conn.rollback()
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            await conn.commit()
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--campaigns", type=int, default=10_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument(
+        "--skip-per-campaign",
+        action="store_true",
+        help="Only time the set-based mode",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(
+        run_benchmark(args.campaigns, args.days, args.skip_per_campaign)
+    )
+
+
+if __name__ == "__main__":
+    main()
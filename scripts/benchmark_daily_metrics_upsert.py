@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Benchmark: campaign_daily_metrics writes (per-row vs batched unnest)
+
+Builds a synthetic backfill (default 2k campaigns × 30 days) in
+memory and writes it into a scratch schema twice per mode (insert
+pass + update pass), comparing the old one-statement-per-row upsert
+with CampaignDailyMetricsWriter.
+
+SAFE:
+- Everything lives in its own schema (dropped afterwards)
+- Never touches the real campaign tables
+
+Usage:
+    python scripts/benchmark_daily_metrics_upsert.py --campaigns 2000 --days 30
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db_session import engine
+from app.meta_insights.services.campaign_daily_metrics_writer import (
+    CampaignDailyMetricsWriter,
+)
+
+
+SCHEMA = "bench_daily_metrics_upsert"
+
+DDL = [
+    """
+    CREATE TABLE campaign_daily_metrics (
+        id UUID PRIMARY KEY,
+        campaign_id UUID NOT NULL,
+        date DATE NOT NULL,
+        impressions INTEGER NOT NULL DEFAULT 0,
+        clicks INTEGER NOT NULL DEFAULT 0,
+        spend NUMERIC(12, 2) NOT NULL DEFAULT 0,
+        leads INTEGER NOT NULL DEFAULT 0,
+        purchases INTEGER NOT NULL DEFAULT 0,
+        revenue NUMERIC(12, 2) NOT NULL DEFAULT 0,
+        ctr NUMERIC(6, 4),
+        cpl NUMERIC(12, 2),
+        cpa NUMERIC(12, 2),
+        roas NUMERIC(8, 4),
+        updated_at TIMESTAMPTZ NOT NULL
+    )
+    """,
+    """
+    CREATE UNIQUE INDEX uq_campaign_date
+    ON campaign_daily_metrics (campaign_id, date)
+    """,
+]
+
+# The pre-batching statement, one round-trip per row
+PER_ROW_SQL = text(
+    """
+    INSERT INTO campaign_daily_metrics (
+        id, campaign_id, date, impressions, clicks, spend, leads,
+        purchases, revenue, ctr, cpl, cpa, roas, updated_at
+    )
+    VALUES (
+        gen_random_uuid(), :campaign_id, :date, :impressions, :clicks,
+        :spend, :leads, :purchases, :revenue, :ctr, :cpl, :cpa, :roas,
+        :updated_at
+    )
+    ON CONFLICT (campaign_id, date)
+    DO UPDATE SET
+        impressions = EXCLUDED.impressions,
+        clicks = EXCLUDED.clicks,
+        spend = EXCLUDED.spend,
+        leads = EXCLUDED.leads,
+        purchases = EXCLUDED.purchases,
+        revenue = EXCLUDED.revenue,
+        ctr = EXCLUDED.ctr,
+        cpl = EXCLUDED.cpl,
+        cpa = EXCLUDED.cpa,
+        roas = EXCLUDED.roas,
+        updated_at = EXCLUDED.updated_at
+    """
+)
+
+CHECKSUM_SQL = """
+    SELECT COUNT(*) AS row_count, md5(string_agg(
+        concat_ws('|', campaign_id, date, impressions, clicks, spend,
+                  leads, purchases, revenue, ctr, cpa, roas),
+        ',' ORDER BY campaign_id, date
+    )) AS checksum
+    FROM campaign_daily_metrics
+"""
+
+
+def _build_rows(campaigns: int, days: int, seed: int) -> list:
+    rng = random.Random(seed)
+    until = date.today() - timedelta(days=1)
+    campaign_ids = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(campaigns)]
+    now = datetime.utcnow()
+    rows = []
+
+    for campaign_id in campaign_ids:
+        for offset in range(days):
+            impressions = rng.randint(100, 5000)
+            clicks = rng.randint(1, 150)
+            spend = round(rng.uniform(1, 300), 2)
+            purchases = rng.randint(0, 5)
+            revenue = round(rng.uniform(0, 900), 2)
+            rows.append(
+                {
+                    "campaign_id": str(campaign_id),
+                    "date": until - timedelta(days=offset),
+                    "impressions": impressions,
+                    "clicks": clicks,
+                    "spend": spend,
+                    "leads": 0,
+                    "purchases": purchases,
+                    "revenue": revenue,
+                    "ctr": clicks / impressions,
+                    "cpl": None,
+                    "cpa": spend / purchases if purchases else None,
+                    "roas": revenue / spend,
+                    "updated_at": now,
+                }
+            )
+
+    return rows
+
+
+async def _write(conn, rows: list, batch_size: int) -> float:
+    session = AsyncSession(bind=conn, expire_on_commit=False)
+    started = time.perf_counter()
+
+    if batch_size:
+        writer = CampaignDailyMetricsWriter(session, batch_size=batch_size)
+        for row in rows:
+            await writer.add(row)
+        await writer.flush()
+    else:
+        for row in rows:
+            await session.execute(PER_ROW_SQL, row)
+
+    await session.commit()
+    elapsed = time.perf_counter() - started
+    await session.close()
+    return elapsed
+
+
+async def _run_mode(conn, label: str, inserts: list, updates: list, batch_size: int) -> dict:
+    await conn.execute(text("TRUNCATE campaign_daily_metrics"))
+    await conn.commit()
+
+    insert_seconds = await _write(conn, inserts, batch_size)
+    update_seconds = await _write(conn, updates, batch_size)
+
+    row = (await conn.execute(text(CHECKSUM_SQL))).mappings().one()
+    await conn.commit()
+
+    for phase, seconds in (("insert", insert_seconds), ("update", update_seconds)):
+        print(
+            f"[BENCH] {label:<14} {phase:<6} {seconds:>8.2f}s "
+            f"{len(inserts) / seconds:>10.0f} rows/s"
+        )
+
+    return {
+        "seconds": insert_seconds + update_seconds,
+        "rows": row["row_count"],
+        "checksum": row["checksum"],
+    }
+
+
+async def run_benchmark(args) -> None:
+    inserts = _build_rows(args.campaigns, args.days, seed=1)
+    updates = _build_rows(args.campaigns, args.days, seed=1)
+    # Same keys, restated numbers (what a re-run backfill looks like)
+    for row in updates:
+        row["impressions"] += 1
+
+    async with engine.connect() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await conn.execute(text(f"SET search_path TO {SCHEMA}, public"))
+        # Batch work: lift the web statement_timeout for this connection
+        await conn.execute(text("SET statement_timeout = 0"))
+
+        try:
+            for statement in DDL:
+                await conn.execute(text(statement))
+            await conn.commit()
+
+            print(f"[BENCH] {len(inserts)} rows ({args.campaigns} campaigns × {args.days} days)")
+
+            results = {}
+            for batch_size in args.batch_sizes:
+                label = f"batch={batch_size}"
+                results[label] = await _run_mode(conn, label, inserts, updates, batch_size)
+
+            if not args.skip_per_row:
+                results["per_row"] = await _run_mode(conn, "per_row", inserts, updates, 0)
+
+            baseline = results.get("per_row")
+            for label, result in results.items():
+                line = f"[BENCH] {label:<14} total={result['seconds']:.2f}s rows={result['rows']}"
+                if baseline and result is not baseline:
+                    line += (
+                        f" speedup={baseline['seconds'] / result['seconds']:.1f}x"
+                        f" identical={result['checksum'] == baseline['checksum']}"
+                    )
+                print(line)
+        finally:
+            await conn.rollback()
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            await conn.commit()
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--campaigns", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument(
+        "--batch-sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 5000],
+    )
+    parser.add_argument("--skip-per-row", action="store_true")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Meta daily insights fetch throughput (OFFLINE)
+
+Runs MetaCampaignInsightsClient against the fake Graph server
+(scripts/fake_graph_server.py) in-process, comparing:
+- sequential       one request per campaign per day, one at a time
+- concurrent       one request per campaign per day, rate limited
+- account          one paginated time_increment=1 request per ad
+                   account covering every campaign and every day
+
+No database and no network access needed.
+
+Usage:
+    python scripts/benchmark_insights_fetch.py --campaigns 2000 --accounts 20 --days 7
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+# Settings require a DATABASE_URL at import time; it is never used here
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://offline/benchmark")
+
+import httpx  # noqa: E402
+
+from app.meta_api.graph_client import MetaGraphClient  # noqa: E402
+from app.meta_insights.clients.meta_campaign_insights_client import (  # noqa: E402
+    MetaCampaignInsightsClient,
+)
+from app.meta_insights.clients.meta_rate_limiter import MetaRateLimiter  # noqa: E402
+from scripts.fake_graph_server import (  # noqa: E402
+    create_fake_graph_app,
+    fake_account_campaign_ids,
+)
+
+
+def _fake_accounts(campaigns: int, accounts: int):
+    per_account = max(campaigns // accounts, 1)
+    fake_accounts = []
+
+    for a in range(accounts):
+        ad_account = SimpleNamespace(
+            id=uuid.uuid4(),
+            meta_account_id=f"act_{1000 + a}",
+        )
+        ad_account.campaigns = [
+            SimpleNamespace(
+                id=uuid.uuid4(),
+                ad_account_id=ad_account.id,
+                meta_campaign_id=meta_campaign_id,
+                objective="SALES",
+            )
+            for meta_campaign_id in fake_account_campaign_ids(
+                ad_account.meta_account_id, per_account
+            )
+        ]
+        fake_accounts.append(ad_account)
+
+    return fake_accounts
+
+
+async def _fetch_per_campaign(client, accounts, days):
+    results = await asyncio.gather(
+        *[
+            client.fetch_daily_insights(campaign=c, target_date=day)
+            for day in days
+            for a in accounts
+            for c in a.campaigns
+        ]
+    )
+    return sum(1 for r in results if r["impressions"] > 0)
+
+
+async def _fetch_per_account(client, accounts, days):
+    results = await asyncio.gather(
+        *[
+            client.fetch_account_daily_insights(
+                ad_account_id=a.id,
+                meta_account_id=a.meta_account_id,
+                since=days[0],
+                until=days[-1],
+            )
+            for a in accounts
+        ]
+    )
+    return sum(len(rows) for rows in results if rows)
+
+
+async def _run(label: str, accounts, args, limiter: MetaRateLimiter) -> None:
+    app = create_fake_graph_app(
+        latency=args.latency,
+        calls_per_window=args.calls_per_window,
+        window_seconds=args.window_seconds,
+        campaigns_per_account=len(accounts[0].campaigns),
+    )
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        timeout=30,
+    ) as http_client:
+        client = MetaCampaignInsightsClient(
+            db=None,
+            rate_limiter=limiter,
+            graph_client=MetaGraphClient(http_client=http_client),
+        )
+
+        # Token resolution normally hits the DB; every account gets
+        # its own fake token so the server can budget per account
+        client._tokens.update({a.id: f"token-{a.id}" for a in accounts})
+
+        until = date.today() - timedelta(days=1)
+        days = [until - timedelta(days=n) for n in range(args.days - 1, -1, -1)]
+        started = time.perf_counter()
+
+        if label == "account":
+            with_data = await _fetch_per_account(client, accounts, days)
+        else:
+            with_data = await _fetch_per_campaign(client, accounts, days)
+
+        elapsed = time.perf_counter() - started
+
+    campaign_days = sum(len(a.campaigns) for a in accounts) * len(days)
+    print(
+        f"[BENCH] {label:<11} {elapsed:>8.2f}s "
+        f"{campaign_days / elapsed:>9.1f} campaign-days/s "
+        f"requests={client.requests_made} with_data={with_data} "
+        f"failed={client.failed_requests} "
+        f"server_throttled={app.state.stats['throttled']} "
+        f"backoffs={limiter.backoffs} paused_waits={limiter.throttled_waits}"
+    )
+
+
+def _limiter(args) -> MetaRateLimiter:
+    return MetaRateLimiter(
+        max_concurrency=args.concurrency,
+        per_account_concurrency=args.per_account,
+        max_throttle_delay=args.window_seconds,
+        base_backoff=0.25,
+        max_backoff=args.window_seconds,
+    )
+
+
+async def run_benchmark(args) -> None:
+    accounts = _fake_accounts(args.campaigns, args.accounts)
+
+    if not args.skip_sequential:
+        await _run(
+            "sequential",
+            accounts,
+            args,
+            MetaRateLimiter(max_concurrency=1, per_account_concurrency=1),
+        )
+
+    if not args.skip_per_campaign:
+        await _run("concurrent", accounts, args, _limiter(args))
+
+    await _run("account", accounts, args, _limiter(args))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--campaigns", type=int, default=2000)
+    parser.add_argument("--accounts", type=int, default=20)
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--per-account", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--calls-per-window", type=int, default=200)
+    parser.add_argument("--window-seconds", type=float, default=10.0)
+    parser.add_argument("--skip-sequential", action="store_true")
+    parser.add_argument("--skip-per-campaign", action="store_true")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
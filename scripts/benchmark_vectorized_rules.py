@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Benchmark: threshold rule evaluation (per-campaign vs vectorized)
+
+Builds a synthetic DecisionContext in memory (default 100k campaigns,
+3 breakdown slices each), times VectorizedRuleEngine over all of it
+(masks alone, actions for a sample, actions for every fired row)
+and checks that a random sample produces exactly the actions of the
+per-campaign rule.evaluate() path.
+
+SAFE:
+- No database access (feedback comes from the in-memory context)
+
+Usage:
+    python scripts/benchmark_vectorized_rules.py --campaigns 100000 --sample 2000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import date, timedelta
+
+from app.ai_engine.campaign_ai_readiness_service import (
+    CampaignAIReadinessService,
+)
+from app.ai_engine.decision_engine.decision_context import DecisionContext
+from app.ai_engine.decision_engine.vectorized_rules import (
+    BreakdownArrays,
+    CampaignWindowArrays,
+    VectorizedRuleEngine,
+)
+
+
+OBJECTIVES = ["LEAD", "OUTCOME_LEADS", "TRAFFIC", "SALES", "CONVERSIONS", "AWARENESS"]
+CATEGORIES = ["fitness", "education", "ecommerce", "real_estate"]
+PLACEMENTS = ["feed", "stories", "reels", "right_column"]
+REGIONS = ["Maharashtra", "Karnataka", "Delhi"]
+GENDERS = ["male", "female"]
+AGE_GROUPS = ["18-24", "25-34", "35-44"]
+
+
+class SyntheticCampaign:
+    def __init__(self, objective: str):
+        self.id = uuid.uuid4()
+        self.objective = objective
+
+
+def _maybe(rng: random.Random, value, null_rate: float = 0.05):
+    return None if rng.random() < null_rate else value
+
+
+def _window(rng: random.Random) -> dict:
+    impressions = rng.randint(0, 50_000)
+    return {
+        "impressions": impressions,
+        "clicks": impressions // 100,
+        "conversions": rng.randint(0, 40),
+        "ctr": _maybe(rng, round(rng.uniform(0.002, 0.03), 5)),
+        "cpl": _maybe(rng, round(rng.uniform(5, 120), 2)),
+        "cpa": _maybe(rng, round(rng.uniform(5, 200), 2)),
+        "roas": _maybe(rng, round(rng.uniform(0.2, 4.0), 3)),
+    }
+
+
+def _breakdown(rng: random.Random, campaign_id: uuid.UUID) -> dict:
+    row = {
+        "campaign_id": campaign_id,
+        "creative_id": None,
+        "placement": None,
+        "region": None,
+        "age_group": None,
+        "gender": None,
+        "impressions": rng.randint(0, 5_000),
+        "conversions": rng.randint(0, 10),
+        "roas": _maybe(rng, round(rng.uniform(0.2, 4.0), 1), 0.2),
+        "cpl": _maybe(rng, round(rng.uniform(5, 120), 0), 0.2),
+        "ctr": _maybe(rng, round(rng.uniform(0.002, 0.03), 3), 0.2),
+    }
+    if row["roas"] is None:
+        # rules report roas, else cpl, of the winning slice
+        row["cpl"] = round(rng.uniform(5, 120), 0)
+
+    kind = rng.randrange(3)
+    if kind == 0:
+        row["creative_id"] = f"cr_{rng.randrange(1000)}"
+    elif kind == 1:
+        row["placement"] = rng.choice(PLACEMENTS)
+    else:
+        row["region"] = _maybe(rng, rng.choice(REGIONS), 0.3)
+        row["age_group"] = _maybe(rng, rng.choice(AGE_GROUPS), 0.3)
+        row["gender"] = _maybe(rng, rng.choice(GENDERS), 0.3)
+    return row
+
+
+def build_dataset(campaign_count: int, slices: int, seed: int):
+    rng = random.Random(seed)
+    context = DecisionContext()
+    campaigns = []
+
+    for category in CATEGORIES:
+        for objective in OBJECTIVES:
+            for days_ago in range(3):
+                context.benchmarks[(category, objective, "7d")] = {
+                    "as_of_date": date.today() - timedelta(days=days_ago),
+                    "avg_cpl": _maybe(rng, round(rng.uniform(10, 60), 2), 0.2),
+                    "avg_roas": _maybe(rng, round(rng.uniform(1, 3), 3), 0.2),
+                }
+
+    for _ in range(campaign_count):
+        campaign = SyntheticCampaign(rng.choice(OBJECTIVES))
+        campaigns.append(campaign)
+
+        for window in ("7d", "30d"):
+            if rng.random() < 0.95:
+                context.windows[campaign.id][window] = _window(rng)
+
+        if rng.random() < 0.9:
+            context.categories[campaign.id] = {
+                "final_category": rng.choice(CATEGORIES),
+                "confidence_score": 0.9,
+            }
+
+        for _ in range(slices):
+            context.breakdowns[campaign.id].append(_breakdown(rng, campaign.id))
+
+        if rng.random() < 0.1:
+            context.feedback[
+                (campaign.id, "LeadPerformanceDropRule", "REDUCE_BUDGET")
+            ] = (rng.randint(0, 5), rng.randint(0, 5))
+            context.feedback[
+                (campaign.id, "SalesROASDropRule", "REDUCE_BUDGET")
+            ] = (rng.randint(0, 5), rng.randint(0, 5))
+
+    return campaigns, context
+
+
+def _comparable(action) -> dict:
+    # generated_at / reasoning timestamps differ between the two runs
+    return action.model_dump(
+        exclude={
+            "generated_at": True,
+            "explainability": {"decision_path": {"__all__": {"timestamp"}}},
+        }
+    )
+
+
+async def per_campaign(engine: VectorizedRuleEngine, campaign, context) -> list:
+    """
+    The runner's former path: ai_context per campaign, rule.evaluate().
+    """
+
+    ai_context = CampaignAIReadinessService(None).build_campaign_ai_score(
+        campaign_id=str(campaign.id),
+        short=context.campaign_window(campaign.id, "7d"),
+        long=context.campaign_window(campaign.id, "30d"),
+        benchmark=context.benchmark(campaign.id, "7d", campaign.objective),
+    )
+    ai_context["decision_context"] = context
+
+    actions = []
+    for rule in [engine.lead_rule, engine.sales_rule, *engine.breakdown_rules]:
+        actions += await rule.evaluate(db=None, campaign=campaign, ai_context=ai_context)
+    return actions
+
+
+async def main(campaign_count: int, slices: int, sample: int, seed: int):
+    print(f"Building {campaign_count} campaigns × {slices} slices …")
+    campaigns, context = build_dataset(campaign_count, slices, seed)
+    engine = VectorizedRuleEngine()
+
+    started = time.perf_counter()
+    arrays = CampaignWindowArrays.from_context(campaigns, context)
+    breakdowns = BreakdownArrays.from_context(context, arrays)
+    built = time.perf_counter()
+
+    firings = engine.fire(arrays, breakdowns)
+    masked = time.perf_counter()
+
+    checked = random.Random(seed).sample(campaigns, min(sample, len(campaigns)))
+    sampled = await engine.build_actions(
+        firings,
+        campaign_ids=[campaign.id for campaign in checked],
+        context=context,
+    )
+    sample_built = time.perf_counter()
+
+    actions = await engine.evaluate(arrays, breakdowns, context=context)
+    finished = time.perf_counter()
+
+    print(f"  columnar build   : {built - started:8.3f}s")
+    print(f"  fire (masks)     : {masked - built:8.3f}s")
+    print(f"  actions, sample  : {sample_built - masked:8.3f}s for {len(checked)} campaigns")
+    print(f"  evaluate (all)   : {finished - sample_built:8.3f}s")
+    print(
+        "  fired            : "
+        + " ".join(f"{name}={count}" for name, count in firings.counts().items())
+    )
+    print(f"  campaigns w/ actions: {len(firings)}")
+
+    started = time.perf_counter()
+    mismatches = 0
+    for campaign in checked:
+        expected = [
+            _comparable(action)
+            for action in await per_campaign(engine, campaign, context)
+        ]
+        got = [_comparable(action) for action in sampled.get(campaign.id, [])]
+        full = [_comparable(action) for action in actions.get(campaign.id, [])]
+        if expected != got or expected != full:
+            mismatches += 1
+    scalar_seconds = time.perf_counter() - started
+
+    print(
+        f"  per-campaign path: {scalar_seconds:8.3f}s for {len(checked)} campaigns "
+        f"(≈{scalar_seconds / max(len(checked), 1) * campaign_count:.1f}s projected)"
+    )
+    print(f"  mismatches       : {mismatches}/{len(checked)}")
+
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--campaigns", type=int, default=100_000)
+    parser.add_argument("--slices", type=int, default=3)
+    parser.add_argument("--sample", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=21)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.campaigns, args.slices, args.sample, args.seed))
@@ -1,14 +1,16 @@
 #!/usr/bin/env python3
 """
 Auto-expire grace subscriptions
++ lapsed trial / paid subscriptions (the request path expires them
+  only when their user comes back)
 
 Handles naive + aware timestamps safely for PostgreSQL.
 """
 
 import asyncio
-from datetime import datetime, timezone
-from sqlalchemy import select
-from app.core.db_session import AsyncSessionLocal
+from datetime import date, datetime, timezone
+from sqlalchemy import and_, or_, select, update
+from app.core.db_session import BatchSessionLocal
 from app.plans.subscription_models import Subscription
 
 
@@ -24,11 +26,15 @@ def to_utc_naive(dt):
     return dt
 
 
-async def expire_grace_subscriptions():
+async def expire_grace_subscriptions() -> int:
+    """
+    Returns the number of subscriptions expired.
+    """
+
     # (A) normalize now to UTC naive
     now = to_utc_naive(datetime.now(timezone.utc))
 
-    async with AsyncSessionLocal() as db:
+    async with BatchSessionLocal() as db:
         # (B) load all grace subs first (safer than direct timestamp filter)
         result = await db.execute(
             select(Subscription)
@@ -39,7 +45,7 @@ async def expire_grace_subscriptions():
 
         if not subs:
             print("[GRACE-CHECK] no grace subscriptions found")
-            return
+            return 0
 
         expired = 0
 
@@ -54,7 +60,43 @@ async def expire_grace_subscriptions():
             await db.commit()
 
         print(f"[GRACE-CHECK] expired={expired}, checked={len(subs)}")
+        return expired
+
+
+async def expire_lapsed_subscriptions() -> int:
+    """
+    Persists what the auth dependency treats as lapsed:
+    trials past trial_end, subscriptions past ends_at.
+    Returns the number of subscriptions expired.
+    """
+
+    now = to_utc_naive(datetime.now(timezone.utc))
+
+    async with BatchSessionLocal() as db:
+        result = await db.execute(
+            update(Subscription)
+            .where(Subscription.status.in_(["active", "trial", "grace"]))
+            .where(
+                or_(
+                    and_(
+                        Subscription.status == "trial",
+                        Subscription.trial_end < date.today(),
+                    ),
+                    and_(
+                        Subscription.ends_at.is_not(None),
+                        Subscription.never_expires.is_not(True),
+                        Subscription.ends_at < now,
+                    ),
+                )
+            )
+            .values(status="expired", is_active=False)
+        )
+        await db.commit()
+
+        print(f"[EXPIRY-CHECK] expired={result.rowcount}")
+        return result.rowcount
 
 
 if __name__ == "__main__":
     asyncio.run(expire_grace_subscriptions())
+    asyncio.run(expire_lapsed_subscriptions())
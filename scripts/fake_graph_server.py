@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Fake Meta Graph API (insights only) — OFFLINE BENCHMARKING
+
+Simulates what matters for sync throughput:
+- per-call latency
+- a rolling per-account call budget
+- x-app-usage / x-business-use-case-usage headers
+- error 80000 (ads_insights BUC throttled) once the budget is spent
+- account-level (act_*) level=campaign, time_increment=1 reports,
+  paginated with limit / after cursors and paging.next
+
+Endpoints:
+    GET /{version}/{object_id}/insights
+
+Usage:
+    # in-process (httpx.ASGITransport)
+    app = create_fake_graph_app(latency=0.05)
+
+    # standalone
+    python scripts/fake_graph_server.py --port 8787
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict, deque
+from datetime import date, timedelta
+from typing import Any, Deque, Dict, List
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+def fake_account_campaign_ids(meta_account_id: str, campaigns_per_account: int) -> List[str]:
+    """Deterministic campaign ids served under an act_* object."""
+    account_number = meta_account_id.removeprefix("act_")
+    return [f"{account_number}{i:05d}" for i in range(campaigns_per_account)]
+
+
+def _fake_insights_row(campaign_id: str, day: str) -> Dict[str, Any]:
+    return {
+        "campaign_id": campaign_id,
+        "date_start": day,
+        "date_stop": day,
+        "impressions": str(random.randint(100, 5000)),
+        "clicks": str(random.randint(1, 150)),
+        "spend": f"{random.uniform(1, 300):.2f}",
+        "actions": [
+            {"action_type": "lead", "value": str(random.randint(0, 10))},
+            {"action_type": "purchase", "value": str(random.randint(0, 5))},
+        ],
+        "action_values": [
+            {"action_type": "purchase", "value": f"{random.uniform(0, 900):.2f}"},
+        ],
+    }
+
+
+def create_fake_graph_app(
+    *,
+    latency: float = 0.05,
+    calls_per_window: int = 200,
+    window_seconds: float = 10.0,
+    rows_per_call: int = 1,
+    campaigns_per_account: int = 100,
+) -> FastAPI:
+    app = FastAPI(title="Fake Meta Graph API")
+
+    calls: Dict[str, Deque[float]] = defaultdict(deque)
+    app_calls: Deque[float] = deque()
+    stats = {"requests": 0, "throttled": 0}
+    app.state.stats = stats
+
+    def _usage_pct(window: Deque[float], budget: int, now: float) -> float:
+        while window and window[0] < now - window_seconds:
+            window.popleft()
+        return round(100.0 * len(window) / budget, 1)
+
+    @app.get("/{version}/{object_id}/insights")
+    async def insights(version: str, object_id: str, request: Request):
+        stats["requests"] += 1
+        await asyncio.sleep(latency * random.uniform(0.5, 1.5))
+
+        account_key = request.query_params.get("access_token", object_id)
+        now = time.monotonic()
+
+        account_pct = _usage_pct(calls[account_key], calls_per_window, now)
+        app_pct = _usage_pct(app_calls, calls_per_window * 20, now)
+
+        regain_minutes = 0.0
+        if account_pct >= 100:
+            regain_minutes = round(window_seconds / 60, 3)
+
+        headers = {
+            "x-app-usage": json.dumps(
+                {"call_count": app_pct, "total_time": app_pct, "total_cputime": 0}
+            ),
+            "x-business-use-case-usage": json.dumps(
+                {
+                    "fake_business": [
+                        {
+                            "type": "ads_insights",
+                            "call_count": account_pct,
+                            "total_time": account_pct,
+                            "total_cputime": 0,
+                            "estimated_time_to_regain_access": regain_minutes,
+                        }
+                    ]
+                }
+            ),
+        }
+
+        if account_pct >= 100:
+            stats["throttled"] += 1
+            return JSONResponse(
+                status_code=400,
+                headers=headers,
+                content={
+                    "error": {
+                        "message": "(#80000) Too many calls to this ad-account.",
+                        "type": "OAuthException",
+                        "code": 80000,
+                    }
+                },
+            )
+
+        calls[account_key].append(now)
+        app_calls.append(now)
+
+        time_range = json.loads(request.query_params.get("time_range", "{}") or "{}")
+        since = time_range.get("since")
+
+        if not object_id.startswith("act_"):
+            data = [_fake_insights_row(object_id, since) for _ in range(rows_per_call)]
+            return JSONResponse(content={"data": data}, headers=headers)
+
+        # Account-level report: one row per campaign per day
+        first = date.fromisoformat(since)
+        last = date.fromisoformat(time_range.get("until") or since)
+        days = [
+            (first + timedelta(days=offset)).isoformat()
+            for offset in range((last - first).days + 1)
+        ]
+        campaign_ids = fake_account_campaign_ids(object_id, campaigns_per_account)
+        total = len(days) * len(campaign_ids)
+
+        limit = int(request.query_params.get("limit", 25))
+        offset = int(request.query_params.get("after", 0))
+        stop = min(offset + limit, total)
+
+        data = [
+            _fake_insights_row(
+                campaign_ids[i % len(campaign_ids)],
+                days[i // len(campaign_ids)],
+            )
+            for i in range(offset, stop)
+        ]
+
+        body: Dict[str, Any] = {
+            "data": data,
+            "paging": {"cursors": {"before": str(offset), "after": str(stop)}},
+        }
+        if stop < total:
+            body["paging"]["next"] = str(
+                request.url.include_query_params(after=str(stop))
+            )
+
+        return JSONResponse(content=body, headers=headers)
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--calls-per-window", type=int, default=200)
+    parser.add_argument("--window-seconds", type=float, default=10.0)
+    parser.add_argument("--campaigns-per-account", type=int, default=100)
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_fake_graph_app(
+            latency=args.latency,
+            calls_per_window=args.calls_per_window,
+            window_seconds=args.window_seconds,
+            campaigns_per_account=args.campaigns_per_account,
+        ),
+        host="127.0.0.1",
+        port=args.port,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Rebuild revenue_daily_rollups from payments
+
+The rollups are maintained by triggers on payments; run this after
+restoring / bulk-fixing payments or to repair drift.
+
+Payment writes wait while the rebuild runs (table lock), so prefer a
+day range over a full rebuild on a busy system.
+
+Usage:
+    python scripts/rebuild_revenue_rollups.py
+    python scripts/rebuild_revenue_rollups.py --start 2026-09-01 --end 2026-09-30
+"""
+
+import argparse
+import asyncio
+from datetime import date
+
+from app.core.db_session import BatchSessionLocal
+from app.billing.revenue_rollup_service import RevenueRollupService
+
+
+async def rebuild(start: date | None, end: date | None) -> int:
+    async with BatchSessionLocal() as db:
+        return await RevenueRollupService.rebuild(db, start=start, end=end)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild revenue_daily_rollups")
+    parser.add_argument("--start", type=date.fromisoformat, help="First day (UTC), default: all")
+    parser.add_argument("--end", type=date.fromisoformat, help="Last day (UTC), default: all")
+    args = parser.parse_args()
+
+    if args.start and args.end and args.start > args.end:
+        parser.error("--start must be <= --end")
+
+    rows = asyncio.run(rebuild(args.start, args.end))
+    print(f"[REVENUE-ROLLUPS] rebuilt {rows} rollup rows")
+
+
+if __name__ == "__main__":
+    main()
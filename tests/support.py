@@ -0,0 +1,217 @@
+"""
+Shared helpers for the database tests (see conftest.py).
+"""
+
+import asyncio
+import uuid
+from datetime import date, datetime, timedelta
+from typing import List, Sequence
+from uuid import UUID
+
+from sqlalchemy import insert
+
+
+def run(coro):
+    """
+    Runs a coroutine on a fresh event loop. Pooled connections belong
+    to the loop that opened them, so the engine is disposed before the
+    loop closes.
+    """
+
+    from app.core.db_session import engine
+
+    async def _run():
+        try:
+            return await coro
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(_run())
+
+
+# =========================================================
+# SEED DATA
+# =========================================================
+async def seed_user(conn) -> UUID:
+    from app.users.models import User
+
+    user_id = uuid.uuid4()
+    await conn.execute(
+        insert(User.__table__),
+        [{"id": user_id, "email": f"{user_id}@example.com", "name": "test"}],
+    )
+    return user_id
+
+
+async def seed_subscription(conn, user_id: UUID, status: str, **fields) -> UUID:
+    """
+    A subscription of `status` on a fresh plan (2 AI campaigns, 1 ad
+    account); fields override the subscription columns.
+    """
+
+    from app.plans.models import Plan
+    from app.plans.subscription_models import Subscription
+
+    plan_id = (
+        await conn.execute(
+            insert(Plan.__table__).returning(Plan.__table__.c.id),
+            {
+                "name": f"plan {uuid.uuid4()}",
+                "monthly_price": 999,
+                "max_ai_campaigns": 2,
+                "max_ad_accounts": 1,
+            },
+        )
+    ).scalar_one()
+
+    subscription_id = uuid.uuid4()
+    await conn.execute(
+        insert(Subscription.__table__),
+        [
+            {
+                "id": subscription_id,
+                "user_id": user_id,
+                "plan_id": plan_id,
+                "status": status,
+                "billing_cycle": "monthly",
+                "starts_at": datetime.utcnow() - timedelta(days=30),
+                **fields,
+            }
+        ],
+    )
+    return subscription_id
+
+
+async def seed_campaigns(
+    conn,
+    objectives: Sequence[str],
+    *,
+    category: str = "ecommerce",
+    meta_account_id: str = "act_test",
+) -> List[UUID]:
+    """
+    One user with one selected ad account holding one campaign per
+    objective, all mapped to `category`.
+    """
+
+    from app.ai_engine.models.campaign_category_map import CampaignCategoryMap
+    from app.campaigns.models import Campaign
+    from app.meta_api.models import MetaAdAccount, UserMetaAdAccount
+
+    user_id = await seed_user(conn)
+
+    ad_account_id = uuid.uuid4()
+    await conn.execute(
+        insert(MetaAdAccount.__table__),
+        [{"id": ad_account_id, "meta_account_id": meta_account_id, "account_name": "test"}],
+    )
+    await conn.execute(
+        insert(UserMetaAdAccount.__table__),
+        [{"user_id": user_id, "meta_ad_account_id": ad_account_id, "is_selected": True}],
+    )
+
+    campaign_ids = [uuid.uuid4() for _ in objectives]
+    await conn.execute(
+        insert(Campaign.__table__),
+        [
+            {
+                "id": campaign_id,
+                "meta_campaign_id": f"test_{i}",
+                "ad_account_id": ad_account_id,
+                "name": f"test {i}",
+                "objective": objective,
+                "status": "ACTIVE",
+            }
+            for i, (campaign_id, objective) in enumerate(zip(campaign_ids, objectives))
+        ],
+    )
+
+    await conn.execute(
+        insert(CampaignCategoryMap.__table__),
+        [
+            {
+                "campaign_id": campaign_id,
+                "user_category": category,
+                "final_category": category,
+                "source": "user",
+                "confidence_score": 1.0,
+            }
+            for campaign_id in campaign_ids
+        ],
+    )
+
+    return campaign_ids
+
+
+async def seed_daily_metrics(
+    conn,
+    campaign_ids: Sequence[UUID],
+    as_of_date: date,
+    days: int,
+) -> None:
+    """
+    `days` days ending on as_of_date per campaign: 1000 impressions,
+    20 clicks, 50.00 spend, 2 leads, 1 purchase, 120.00 revenue.
+    """
+
+    from app.meta_insights.models.campaign_daily_metrics import CampaignDailyMetrics
+
+    await conn.execute(
+        insert(CampaignDailyMetrics.__table__),
+        [
+            {
+                "id": uuid.uuid4(),
+                "campaign_id": campaign_id,
+                "date": as_of_date - timedelta(days=offset),
+                "impressions": 1000,
+                "clicks": 20,
+                "spend": 50,
+                "leads": 2,
+                "purchases": 1,
+                "revenue": 120,
+            }
+            for campaign_id in campaign_ids
+            for offset in range(days)
+        ],
+    )
+
+
+async def seed_breakdown_metrics(
+    conn,
+    campaign_ids: Sequence[UUID],
+    as_of_date: date,
+    days: int,
+    placements: Sequence[str] = ("feed", "stories"),
+) -> None:
+    """
+    `days` days ending on as_of_date per campaign and placement:
+    500 impressions, 10 clicks, 25.00 spend, 1 conversion worth 60.00.
+    """
+
+    from app.meta_insights.models.campaign_breakdown_daily_metrics import (
+        CampaignBreakdownDailyMetrics,
+    )
+
+    await conn.execute(
+        insert(CampaignBreakdownDailyMetrics.__table__),
+        [
+            {
+                "id": uuid.uuid4(),
+                "campaign_id": campaign_id,
+                "metric_date": as_of_date - timedelta(days=offset),
+                "platform": "facebook",
+                "placement": placement,
+                "impressions": 500,
+                "clicks": 10,
+                "spend": 25,
+                "conversions": 1,
+                "conversion_value": 60,
+                "objective_type": "LEAD",
+                "meta_account_id": "act_test",
+                "meta_fetched_at": datetime.utcnow(),
+            }
+            for campaign_id in campaign_ids
+            for placement in placements
+            for offset in range(days)
+        ],
+    )
@@ -0,0 +1,173 @@
+"""
+Precomputed AI action snapshots (AIActionSnapshotService): the inputs
+fingerprint must move whenever a decision input changes.
+"""
+
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import insert, text
+
+from app.ai_engine.services.ai_action_snapshot_service import AIActionSnapshotService
+from app.meta_insights.services.campaign_metrics_aggregation_service import (
+    CampaignMetricsAggregationService,
+)
+from tests.support import run, seed_campaigns, seed_daily_metrics
+
+AS_OF = date(2026, 9, 30)
+
+
+async def _seed_snapshot():
+    from app.core.db_session import AsyncSessionLocal, engine
+
+    async with engine.begin() as conn:
+        campaign_ids = await seed_campaigns(conn, ["LEAD", "SALES"])
+        await seed_daily_metrics(conn, campaign_ids, AS_OF, 30)
+        ad_account_id = (
+            await conn.execute(
+                text("SELECT ad_account_id FROM campaigns WHERE id = :id"),
+                {"id": campaign_ids[0]},
+            )
+        ).scalar_one()
+
+    async with AsyncSessionLocal() as db:
+        await CampaignMetricsAggregationService(db).aggregate_for_date(AS_OF)
+
+        service = AIActionSnapshotService(db)
+        await service.compute_and_store(ad_account_id=ad_account_id, as_of_date=AS_OF)
+        fresh, _ = await service.is_fresh(ad_account_id=ad_account_id, as_of_date=AS_OF)
+
+    return campaign_ids, ad_account_id, fresh
+
+
+async def _is_fresh(ad_account_id):
+    from app.core.db_session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        fresh, _ = await AIActionSnapshotService(db).is_fresh(
+            ad_account_id=ad_account_id,
+            as_of_date=AS_OF,
+        )
+    return fresh
+
+
+def test_snapshot_is_fresh_after_store(db):
+    async def scenario():
+        _, ad_account_id, fresh = await _seed_snapshot()
+        return fresh, await _is_fresh(ad_account_id)
+
+    stored, reread = run(scenario())
+
+    assert stored is True
+    assert reread is True
+
+
+def test_new_aggregates_mark_the_snapshot_stale(db):
+    async def scenario():
+        from app.core.db_session import AsyncSessionLocal, engine
+
+        campaign_ids, ad_account_id, _ = await _seed_snapshot()
+
+        # Late-arriving daily row, re-aggregated the next night
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    """
+                    UPDATE campaign_daily_metrics
+                    SET clicks = 90, updated_at = now()
+                    WHERE campaign_id = :campaign_id AND date = :day
+                    """
+                ),
+                {"campaign_id": campaign_ids[0], "day": AS_OF},
+            )
+
+        async with AsyncSessionLocal() as db:
+            await CampaignMetricsAggregationService(db).aggregate_for_date(AS_OF)
+
+        return await _is_fresh(ad_account_id)
+
+    assert run(scenario()) is False
+
+
+def test_campaign_change_marks_the_snapshot_stale(db):
+    async def scenario():
+        from app.core.db_session import engine
+
+        campaign_ids, ad_account_id, _ = await _seed_snapshot()
+
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    """
+                    UPDATE campaigns
+                    SET ai_execution_locked = NOT ai_execution_locked
+                    WHERE id = :id
+                    """
+                ),
+                {"id": campaign_ids[1]},
+            )
+
+        return await _is_fresh(ad_account_id)
+
+    assert run(scenario()) is False
+
+
+def test_missing_snapshot_is_not_fresh(db):
+    async def scenario():
+        from app.core.db_session import engine
+
+        async with engine.begin() as conn:
+            await seed_campaigns(conn, ["LEAD"])
+            ad_account_id = (
+                await conn.execute(text("SELECT ad_account_id FROM campaigns"))
+            ).scalar_one()
+
+        return await _is_fresh(ad_account_id)
+
+    assert run(scenario()) is False
+
+
+def test_feedback_of_the_accounts_users_marks_the_snapshot_stale(db):
+    async def scenario():
+        from app.ai_engine.models.ai_action_feedback import (
+            ActionApprovalStatus,
+            AIActionFeedback,
+        )
+        from app.core.db_session import engine
+
+        _, ad_account_id, _ = await _seed_snapshot()
+
+        async with engine.begin() as conn:
+            user_id = (
+                await conn.execute(
+                    text(
+                        """
+                        SELECT user_id FROM user_meta_ad_accounts
+                        WHERE meta_ad_account_id = :ad_account_id
+                        """
+                    ),
+                    {"ad_account_id": ad_account_id},
+                )
+            ).scalar_one()
+            # A campaign of another account: matched through the user
+            (other_campaign_id,) = await seed_campaigns(
+                conn, ["LEAD"], meta_account_id="act_other"
+            )
+
+            await conn.execute(
+                insert(AIActionFeedback.__table__),
+                {
+                    "id": uuid.uuid4(),
+                    "user_id": user_id,
+                    "campaign_id": other_campaign_id,
+                    "rule_name": "test_rule",
+                    "action_type": "SCALE_BUDGET",
+                    "approval_status": ActionApprovalStatus.REJECTED,
+                    "confidence_at_time": 0.8,
+                    "created_at": datetime.utcnow(),
+                },
+            )
+
+        return await _is_fresh(ad_account_id)
+
+    assert run(scenario()) is False
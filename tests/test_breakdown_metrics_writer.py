@@ -0,0 +1,116 @@
+"""
+Batched campaign_breakdown_daily_metrics upserts
+(CampaignBreakdownDailyMetricsWriter) on the NULL-safe unique key.
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import text
+
+from app.meta_insights.services.campaign_breakdown_daily_metrics_writer import (
+    CampaignBreakdownDailyMetricsWriter,
+)
+from tests.support import run, seed_campaigns
+
+DAY = date(2026, 9, 30)
+
+
+def _row(campaign_id, *, gender, age_group, clicks: int) -> dict:
+    # Only the age x gender breakdown: every other dimension is NULL
+    return {
+        "campaign_id": campaign_id,
+        "metric_date": DAY,
+        "gender": gender,
+        "age_group": age_group,
+        "impressions": 500,
+        "clicks": clicks,
+        "spend": 25.5,
+        "conversions": 1,
+        "conversion_value": 60.0,
+        "ctr": clicks / 500,
+        "cpl": 25.5,
+        "cpa": 25.5,
+        "roas": 2.35,
+        "objective_type": "LEAD",
+        "meta_account_id": "act_test",
+        "meta_fetched_at": datetime.utcnow(),
+    }
+
+
+def _rows(campaign_id, clicks: int) -> list:
+    return [
+        _row(campaign_id, gender=gender, age_group=age_group, clicks=clicks)
+        for gender in ("male", "female", None)
+        for age_group in ("18-24", "25-34")
+    ]
+
+
+async def _write(rows, **options):
+    from app.core.db_session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        writer = CampaignBreakdownDailyMetricsWriter(db, **options)
+        for row in rows:
+            await writer.add(row)
+        await writer.flush()
+        await db.commit()
+
+    return writer.stats()
+
+
+async def _stored():
+    from app.core.db_session import engine
+
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            text(
+                """
+                SELECT gender, age_group, placement, clicks
+                FROM campaign_breakdown_daily_metrics
+                ORDER BY gender NULLS LAST, age_group
+                """
+            )
+        )
+        return [tuple(row) for row in result]
+
+
+def test_null_dimensions_upsert_instead_of_duplicating(db):
+    async def scenario():
+        from app.core.db_session import engine
+
+        async with engine.begin() as conn:
+            (campaign_id,) = await seed_campaigns(conn, ["LEAD"])
+
+        await _write(_rows(campaign_id, clicks=10), batch_size=4, commit_batches=True)
+        first = await _stored()
+
+        stats = await _write(_rows(campaign_id, clicks=20))
+        return first, stats, await _stored()
+
+    first, stats, second = run(scenario())
+
+    assert len(first) == 6
+    assert stats["rows_written"] == 6
+    assert len(second) == 6
+    assert {row[3] for row in second} == {20}
+    assert (None, "18-24", None, 20) in second
+
+
+def test_duplicate_slices_in_one_batch_collapse(db):
+    async def scenario():
+        from app.core.db_session import engine
+
+        async with engine.begin() as conn:
+            (campaign_id,) = await seed_campaigns(conn, ["LEAD"])
+
+        rows = [
+            _row(campaign_id, gender=None, age_group="18-24", clicks=10),
+            _row(campaign_id, gender=None, age_group="18-24", clicks=15),
+        ]
+        stats = await _write(rows)
+        return stats, await _stored()
+
+    stats, stored = run(scenario())
+
+    assert stats["rows_written"] == 1
+    assert stored == [(None, "18-24", None, 15)]
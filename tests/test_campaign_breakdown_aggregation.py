@@ -0,0 +1,154 @@
+"""
+Breakdown window aggregation (CampaignBreakdownAggregationService) on
+the real breakdown tables and the slice unique key.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import text
+
+from app.meta_insights.services.campaign_breakdown_aggregation_service import (
+    CampaignBreakdownAggregationService,
+)
+from tests.support import run, seed_breakdown_metrics, seed_campaigns
+
+AS_OF = date(2026, 9, 30)
+
+SNAPSHOT_SQL = """
+    SELECT
+        campaign_id, window_type, window_start_date, window_end_date,
+        creative_id, placement, region, gender, age_group, platform,
+        impressions, clicks, spend, conversions, revenue,
+        ctr, cpl, cpa, roas
+    FROM campaign_breakdown_aggregates
+    ORDER BY campaign_id, window_type, placement
+"""
+
+
+async def _seed(campaigns: int = 2):
+    from app.core.db_session import engine
+
+    async with engine.begin() as conn:
+        campaign_ids = await seed_campaigns(conn, ["LEAD"] * campaigns)
+        await seed_breakdown_metrics(conn, campaign_ids, AS_OF, 100)
+
+    return campaign_ids
+
+
+async def _aggregate(as_of_date: date, **options):
+    from app.core.db_session import AsyncSessionLocal, engine
+
+    async with AsyncSessionLocal() as db:
+        await CampaignBreakdownAggregationService(db).aggregate_for_date(as_of_date, **options)
+
+    async with engine.connect() as conn:
+        rows = (await conn.execute(text(SNAPSHOT_SQL))).mappings().all()
+
+    aggregates = {
+        (row["campaign_id"], row["window_type"], row["placement"]): dict(row)
+        for row in rows
+    }
+    assert len(aggregates) == len(rows), "one row per slice"
+    return aggregates
+
+
+def test_slices_per_window(db):
+    async def scenario():
+        campaign_ids = await _seed()
+        return campaign_ids, await _aggregate(AS_OF)
+
+    campaign_ids, aggregates = run(scenario())
+
+    assert len(aggregates) == len(campaign_ids) * 2 * 7
+
+    feed = aggregates[(campaign_ids[0], "7d", "feed")]
+    assert feed["window_start_date"] == AS_OF - timedelta(days=6)
+    assert feed["window_end_date"] == AS_OF
+    assert feed["platform"] == "facebook"
+    assert feed["gender"] is None
+    assert feed["impressions"] == 3500
+    assert feed["clicks"] == 70
+    assert feed["spend"] == Decimal("175.00")
+    assert feed["conversions"] == 7
+    assert feed["revenue"] == Decimal("420.00")
+    assert feed["cpa"] == Decimal("25.00")
+
+    lifetime = aggregates[(campaign_ids[0], "lifetime", "stories")]
+    assert lifetime["window_start_date"] == AS_OF - timedelta(days=99)
+    assert lifetime["impressions"] == 50000
+
+
+def test_rerun_upserts_on_the_slice_key(db):
+    async def scenario():
+        await _seed()
+        first = await _aggregate(AS_OF)
+        return first, await _aggregate(AS_OF)
+
+    first, second = run(scenario())
+
+    assert first == second
+
+
+def test_slices_leaving_a_window_are_removed(db):
+    async def scenario():
+        from app.core.db_session import engine
+
+        campaign_ids = await _seed(campaigns=1)
+        await _aggregate(AS_OF)
+
+        # No stories delivery in the last week
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    """
+                    DELETE FROM campaign_breakdown_daily_metrics
+                    WHERE placement = 'stories' AND metric_date > :cutoff
+                    """
+                ),
+                {"cutoff": AS_OF - timedelta(days=7)},
+            )
+
+        return campaign_ids[0], await _aggregate(AS_OF)
+
+    campaign_id, aggregates = run(scenario())
+
+    for window_type in ("1d", "3d", "7d"):
+        assert (campaign_id, window_type, "stories") not in aggregates
+        assert (campaign_id, window_type, "feed") in aggregates
+    assert aggregates[(campaign_id, "14d", "stories")]["impressions"] == 500 * 7
+
+
+def test_incremental_matches_full_recompute(db):
+    async def scenario():
+        from app.core.db_session import engine
+
+        campaign_ids = await _seed()
+        await _aggregate(AS_OF - timedelta(days=1))
+
+        # Late-arriving correction inside yesterday's windows
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    """
+                    UPDATE campaign_breakdown_daily_metrics
+                    SET clicks = 40, conversions = 3,
+                        updated_at = timezone('utc', now())
+                    WHERE campaign_id = :campaign_id
+                      AND metric_date = :day
+                      AND placement = 'feed'
+                    """
+                ),
+                {"campaign_id": campaign_ids[0], "day": AS_OF - timedelta(days=5)},
+            )
+
+        incremental = await _aggregate(AS_OF, incremental=True)
+
+        async with engine.begin() as conn:
+            await conn.execute(text("TRUNCATE campaign_breakdown_aggregates"))
+
+        return incremental, await _aggregate(AS_OF)
+
+    incremental, full = run(scenario())
+
+    assert incremental == full
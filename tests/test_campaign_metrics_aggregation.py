@@ -0,0 +1,140 @@
+"""
+Campaign window aggregation (CampaignMetricsAggregationService) on
+the real daily / aggregate tables.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import text
+
+from app.meta_insights.services.campaign_metrics_aggregation_service import (
+    CampaignMetricsAggregationService,
+)
+from tests.support import run, seed_campaigns, seed_daily_metrics
+
+AS_OF = date(2026, 9, 30)
+
+SNAPSHOT_SQL = """
+    SELECT
+        campaign_id, window_type, window_start_date, window_end_date,
+        impressions, clicks, spend, conversions, revenue,
+        ctr, cpa, roas, days_covered, is_complete_window
+    FROM campaign_metrics_aggregates
+    ORDER BY campaign_id, window_type
+"""
+
+
+async def _seed():
+    from app.core.db_session import engine
+
+    async with engine.begin() as conn:
+        lead, sales, traffic = await seed_campaigns(conn, ["LEAD", "SALES", "TRAFFIC"])
+        await seed_daily_metrics(conn, [lead, sales], AS_OF, 100)
+        # Short history: incomplete 30d / 90d windows
+        await seed_daily_metrics(conn, [traffic], AS_OF, 20)
+
+    return lead, sales, traffic
+
+
+async def _aggregate(as_of_date: date, **options):
+    from app.core.db_session import AsyncSessionLocal, engine
+
+    async with AsyncSessionLocal() as db:
+        await CampaignMetricsAggregationService(db).aggregate_for_date(as_of_date, **options)
+
+    async with engine.connect() as conn:
+        rows = (await conn.execute(text(SNAPSHOT_SQL))).mappings().all()
+
+    aggregates = {(row["campaign_id"], row["window_type"]): dict(row) for row in rows}
+    assert len(aggregates) == len(rows), "one row per campaign and window"
+    return aggregates
+
+
+def test_windows_on_real_columns(db):
+    async def scenario():
+        campaign_ids = await _seed()
+        return campaign_ids, await _aggregate(AS_OF)
+
+    (lead, sales, traffic), aggregates = run(scenario())
+
+    week = aggregates[(lead, "7d")]
+    assert week["window_start_date"] == AS_OF - timedelta(days=6)
+    assert week["window_end_date"] == AS_OF
+    assert week["impressions"] == 7000
+    assert week["clicks"] == 140
+    assert week["spend"] == Decimal("350.00")
+    assert week["revenue"] == Decimal("840.00")
+    assert week["is_complete_window"] is True
+
+    # Conversions follow the objective: leads, purchases, or both
+    assert week["conversions"] == 14
+    assert aggregates[(sales, "7d")]["conversions"] == 7
+    assert aggregates[(traffic, "7d")]["conversions"] == 21
+
+    assert aggregates[(lead, "lifetime")]["days_covered"] == 100
+    assert aggregates[(lead, "lifetime")]["window_start_date"] == AS_OF - timedelta(days=99)
+    assert aggregates[(traffic, "30d")]["days_covered"] == 20
+    assert aggregates[(traffic, "30d")]["is_complete_window"] is False
+
+    assert len(aggregates) == 3 * 7
+
+
+def test_set_based_matches_per_campaign(db):
+    async def scenario():
+        await _seed()
+        set_based = await _aggregate(AS_OF)
+
+        from app.core.db_session import engine
+
+        async with engine.begin() as conn:
+            await conn.execute(text("TRUNCATE campaign_metrics_aggregates"))
+
+        return set_based, await _aggregate(AS_OF, set_based=False)
+
+    set_based, per_campaign = run(scenario())
+
+    assert set_based == per_campaign
+
+
+def test_rerun_updates_in_place(db):
+    async def scenario():
+        await _seed()
+        first = await _aggregate(AS_OF)
+        return first, await _aggregate(AS_OF)
+
+    first, second = run(scenario())
+
+    assert first == second
+
+
+def test_incremental_matches_full_recompute(db):
+    async def scenario():
+        from app.core.db_session import engine
+
+        lead, _, _ = await _seed()
+        await _aggregate(AS_OF - timedelta(days=1))
+
+        # Late-arriving correction inside yesterday's windows
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    """
+                    UPDATE campaign_daily_metrics
+                    SET clicks = 90, leads = 9, updated_at = now()
+                    WHERE campaign_id = :campaign_id AND date = :day
+                    """
+                ),
+                {"campaign_id": lead, "day": AS_OF - timedelta(days=5)},
+            )
+
+        incremental = await _aggregate(AS_OF, incremental=True)
+
+        async with engine.begin() as conn:
+            await conn.execute(text("TRUNCATE campaign_metrics_aggregates"))
+
+        return incremental, await _aggregate(AS_OF)
+
+    incremental, full = run(scenario())
+
+    assert incremental == full
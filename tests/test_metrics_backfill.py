@@ -0,0 +1,99 @@
+"""
+Resumable metrics backfill (MetricsBackfillOrchestrator) checkpoints.
+
+The Graph API client is replaced; a unit whose fetch fails must not be
+checkpointed, so a resumed backfill retries it.
+"""
+
+from datetime import date
+
+from sqlalchemy import text
+
+from app.meta_insights.clients.meta_campaign_insights_client import (
+    MetaCampaignInsightsClient,
+)
+from app.meta_insights.services.campaign_breakdown_insights_ingestion_service import (
+    BREAKDOWN_SETS,
+)
+from app.meta_insights.services.metrics_backfill_orchestrator import (
+    BACKFILL_BREAKDOWNS,
+    MetricsBackfillOrchestrator,
+    breakdown_kind,
+)
+from tests.support import run, seed_campaigns
+
+SINCE = date(2026, 9, 1)
+UNTIL = date(2026, 9, 30)
+
+FAILING_KIND = breakdown_kind(BREAKDOWN_SETS[0])
+
+
+def _stub_client(monkeypatch, calls):
+    async def resolve_access_tokens(self, ad_account_ids):
+        return {}
+
+    async def fetch_daily_insights_with_breakdown(
+        self, *, ad_account, since, until, breakdowns
+    ):
+        calls.append(breakdown_kind(breakdowns))
+        if breakdown_kind(breakdowns) == FAILING_KIND:
+            raise RuntimeError("Graph API error")
+        return []
+
+    monkeypatch.setattr(
+        MetaCampaignInsightsClient,
+        "resolve_access_tokens",
+        resolve_access_tokens,
+    )
+    monkeypatch.setattr(
+        MetaCampaignInsightsClient,
+        "fetch_daily_insights_with_breakdown",
+        fetch_daily_insights_with_breakdown,
+    )
+
+
+async def _backfill():
+    return await MetricsBackfillOrchestrator(
+        since=SINCE,
+        until=UNTIL,
+        chunk_days=30,
+        kinds=(BACKFILL_BREAKDOWNS,),
+        workers=2,
+    ).run()
+
+
+async def _checkpointed_kinds():
+    from app.core.db_session import engine
+
+    async with engine.connect() as conn:
+        result = await conn.execute(text("SELECT kind FROM metrics_backfill_checkpoints"))
+        return {row.kind for row in result}
+
+
+def test_failed_breakdown_fetch_is_not_checkpointed(db, monkeypatch):
+    calls = []
+    _stub_client(monkeypatch, calls)
+
+    async def scenario():
+        from app.core.db_session import engine
+
+        async with engine.begin() as conn:
+            await seed_campaigns(conn, ["LEAD"])
+
+        first = await _backfill()
+        checkpointed = await _checkpointed_kinds()
+
+        calls.clear()
+        resumed = await _backfill()
+        return first, checkpointed, resumed
+
+    first, checkpointed, resumed = run(scenario())
+
+    assert first["units_failed"] == 1
+    assert first["units_succeeded"] == len(BREAKDOWN_SETS) - 1
+    assert FAILING_KIND not in checkpointed
+    assert len(checkpointed) == len(BREAKDOWN_SETS) - 1
+
+    # Only the failed unit runs again
+    assert resumed["units_skipped"] == len(BREAKDOWN_SETS) - 1
+    assert calls == [FAILING_KIND]
@@ -0,0 +1,116 @@
+"""
+Nightly pipeline (app.pipeline.nightly) on the real schema.
+
+Only the two Meta ingestion stages are replaced (they call the Graph
+API); they seed the rows the real ones would write. Every other stage
+runs unchanged.
+"""
+
+from datetime import date
+
+from sqlalchemy import text
+
+from app.pipeline.dag import Pipeline, Stage, StageOutput, StageStatus
+from app.pipeline.nightly import NIGHTLY_PIPELINE, NightlyContext
+from tests.support import run, seed_breakdown_metrics, seed_campaigns, seed_daily_metrics
+
+AS_OF = date(2026, 9, 30)
+DAYS = 100
+
+
+def _pipeline(campaign_ids):
+    async def sync_daily_metrics(ctx, changed):
+        from app.core.db_session import engine
+
+        async with engine.begin() as conn:
+            await seed_daily_metrics(conn, campaign_ids, ctx.as_of_date, DAYS)
+        return StageOutput(set(campaign_ids))
+
+    async def ingest_breakdowns(ctx, changed):
+        from app.core.db_session import engine
+
+        async with engine.begin() as conn:
+            await seed_breakdown_metrics(conn, campaign_ids, ctx.as_of_date, DAYS)
+        return StageOutput(set(campaign_ids))
+
+    stubs = {"sync_daily_metrics": sync_daily_metrics, "ingest_breakdowns": ingest_breakdowns}
+
+    return Pipeline(
+        [
+            Stage(
+                name=stage.name,
+                run=stubs.get(stage.name, stage.run),
+                depends_on=stage.depends_on,
+            )
+            for stage in NIGHTLY_PIPELINE.stages.values()
+        ]
+    )
+
+
+async def _run_pipeline(full: bool):
+    from app.core.db_session import engine
+
+    async with engine.begin() as conn:
+        campaign_ids = await seed_campaigns(conn, ["LEAD", "SALES", "LEAD"])
+
+    results = await _pipeline(campaign_ids).run(
+        NightlyContext(as_of_date=AS_OF, full=full, workers=2)
+    )
+
+    async with engine.connect() as conn:
+        counts = {
+            table: (await conn.execute(text(f"SELECT COUNT(*) FROM {table}"))).scalar_one()
+            for table in (
+                "campaign_metrics_aggregates",
+                "campaign_breakdown_aggregates",
+                "industry_benchmarks",
+                "ai_action_snapshots",
+            )
+        }
+
+    return campaign_ids, results, counts
+
+
+def _assert_all_succeeded(results):
+    failed = {
+        name: result.error
+        for name, result in results.items()
+        if result.status != StageStatus.SUCCEEDED
+    }
+    assert failed == {}
+
+
+def test_incremental_run_succeeds_on_every_stage(db):
+    campaign_ids, results, counts = run(_run_pipeline(full=False))
+
+    _assert_all_succeeded(results)
+    assert results["decide"].changed_in == set(campaign_ids)
+
+    assert counts["campaign_metrics_aggregates"] > 0
+    assert counts["campaign_breakdown_aggregates"] > 0
+    assert counts["industry_benchmarks"] > 0
+    assert results["decide"].detail["computed"] == 1
+    assert counts["ai_action_snapshots"] == 1
+
+
+def test_full_run_succeeds_on_every_stage(db):
+    _, results, counts = run(_run_pipeline(full=True))
+
+    _assert_all_succeeded(results)
+    assert counts["campaign_metrics_aggregates"] > 0
+    assert counts["ai_action_snapshots"] == 1
+
+
+def test_pipeline_job_is_opt_in(monkeypatch):
+    from app.core.config import settings
+    from app.scheduler.jobs import get_jobs
+
+    monkeypatch.setattr(settings, "NIGHTLY_PIPELINE_ENABLED", False)
+    jobs = get_jobs()
+    assert "sync_daily_metrics" in jobs
+    assert "nightly_pipeline" not in jobs
+
+    monkeypatch.setattr(settings, "NIGHTLY_PIPELINE_ENABLED", True)
+    jobs = get_jobs()
+    assert "nightly_pipeline" in jobs
+    assert "sync_daily_metrics" not in jobs
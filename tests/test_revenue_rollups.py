@@ -0,0 +1,158 @@
+"""
+Admin revenue from revenue_daily_rollups (payments delta triggers,
+RevenueRollupService, /admin/revenue endpoints).
+"""
+
+import uuid
+from datetime import date, datetime
+from types import SimpleNamespace
+
+from sqlalchemy import insert, text
+
+from app.admin.revenue_monthly_routes import monthly_revenue
+from app.billing.payment_models import Payment
+from tests.support import run, seed_user
+
+ADMIN = SimpleNamespace(role="admin")
+
+
+async def _seed_payments(conn, rows) -> list:
+    """
+    rows: (created_at, amount, status[, payment_for])
+    """
+
+    user_id = await seed_user(conn)
+    payment_ids = [uuid.uuid4() for _ in rows]
+
+    await conn.execute(
+        insert(Payment.__table__),
+        [
+            {
+                "id": payment_id,
+                "user_id": user_id,
+                "created_at": row[0],
+                "amount": row[1],
+                "status": row[2],
+                "payment_for": row[3] if len(row) > 3 else "subscription",
+                "currency": "INR",
+            }
+            for payment_id, row in zip(payment_ids, rows)
+        ],
+    )
+    return payment_ids
+
+
+def test_monthly_revenue_ignores_the_session_timezone(db):
+    async def scenario():
+        from app.core.db_session import AsyncSessionLocal, engine
+
+        async with engine.begin() as conn:
+            await _seed_payments(
+                conn,
+                [
+                    (datetime(2026, 9, 30, 12), 100, "paid"),
+                    (datetime(2026, 10, 1, 0, 30), 250, "paid"),
+                    (datetime(2026, 10, 31, 23, 0), 50, "paid"),
+                ],
+            )
+
+        async with AsyncSessionLocal() as db:
+            await db.execute(text("SET timezone = 'Asia/Kolkata'"))
+            return await monthly_revenue(db=db, current_user=ADMIN)
+
+    assert run(scenario()) == [
+        {"month": "2026-09", "total": 100},
+        {"month": "2026-10", "total": 300},
+    ]
+
+
+ROLLUPS_SQL = """
+    SELECT day, payment_for, status, currency, amount_total, payment_count
+    FROM revenue_daily_rollups
+    WHERE payment_count <> 0
+    ORDER BY day, payment_for, status, currency
+"""
+
+
+async def _rollups():
+    from app.core.db_session import engine
+
+    async with engine.connect() as conn:
+        return [tuple(row) for row in await conn.execute(text(ROLLUPS_SQL))]
+
+
+async def _rebuild(**options):
+    from app.billing.revenue_rollup_service import RevenueRollupService
+    from app.core.db_session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        await RevenueRollupService.rebuild(db, **options)
+
+    return await _rollups()
+
+
+def test_triggers_match_a_rebuild(db):
+    async def scenario():
+        from app.core.db_session import engine
+
+        async with engine.begin() as conn:
+            first, second, third, fourth = await _seed_payments(
+                conn,
+                [
+                    (datetime(2026, 10, 1, 9), 100, "created"),
+                    (datetime(2026, 10, 1, 10), 150, "paid"),
+                    (datetime(2026, 10, 2, 11), 200, "paid", "addon"),
+                    (datetime(2026, 10, 3, 12), 75, "paid"),
+                ],
+            )
+
+        async with engine.begin() as conn:
+            # Status change moves the payment between keys
+            await conn.execute(
+                text("UPDATE payments SET status = 'paid' WHERE id = :id"),
+                {"id": first},
+            )
+            # Unrelated column: no delta
+            await conn.execute(
+                text("UPDATE payments SET paid_at = now() WHERE id = :id"),
+                {"id": second},
+            )
+            await conn.execute(
+                text("UPDATE payments SET amount = 250 WHERE id = :id"),
+                {"id": third},
+            )
+            await conn.execute(text("DELETE FROM payments WHERE id = :id"), {"id": fourth})
+
+        triggered = await _rollups()
+        return triggered, await _rebuild()
+
+    triggered, rebuilt = run(scenario())
+
+    assert triggered == rebuilt
+    assert [row[1:] for row in triggered] == [
+        ("subscription", "paid", "INR", 250, 2),
+        ("addon", "paid", "INR", 250, 1),
+    ]
+
+
+def test_rebuild_of_a_day_range_keeps_other_days(db):
+    async def scenario():
+        from app.core.db_session import engine
+
+        async with engine.begin() as conn:
+            await _seed_payments(
+                conn,
+                [
+                    (datetime(2026, 10, 1, 9), 100, "paid"),
+                    (datetime(2026, 10, 2, 9), 200, "paid"),
+                    (datetime(2026, 10, 3, 9), 300, "paid"),
+                ],
+            )
+            # Drift on every day
+            await conn.execute(text("UPDATE revenue_daily_rollups SET amount_total = 0"))
+
+        return await _rebuild(start=date(2026, 10, 2), end=date(2026, 10, 2))
+
+    rollups = run(scenario())
+
+    assert [(row[0].day, row[4]) for row in rollups] == [(1, 0), (2, 200), (3, 0)]
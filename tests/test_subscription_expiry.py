@@ -0,0 +1,64 @@
+"""
+Subscription expiry on the request path (app.auth.dependencies).
+
+A lapsed subscription must be persisted as expired when it is loaded,
+whether or not the expire_grace scheduler job runs.
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.auth.dependencies import _load_active_subscription
+from app.plans.subscription_models import Subscription
+from app.users.models import User
+from tests.support import run, seed_subscription, seed_user
+
+PAST = datetime.utcnow() - timedelta(days=1)
+FUTURE = datetime.utcnow() + timedelta(days=10)
+
+
+async def _load(status: str, **fields):
+    from app.core.db_session import AsyncSessionLocal, engine
+
+    async with engine.begin() as conn:
+        user_id = await seed_user(conn)
+        subscription_id = await seed_subscription(conn, user_id, status, **fields)
+
+    async with AsyncSessionLocal() as db:
+        user = await db.get(User, user_id)
+        loaded, lapses_at = await _load_active_subscription(db, user)
+
+    async with AsyncSessionLocal() as db:
+        stored = await db.scalar(select(Subscription).where(Subscription.id == subscription_id))
+
+    return loaded, lapses_at, stored
+
+
+@pytest.mark.parametrize(
+    "status, fields",
+    [
+        ("active", {"ends_at": PAST}),
+        ("trial", {"is_trial": True, "trial_end": date.today() - timedelta(days=2)}),
+        ("grace", {"ends_at": FUTURE, "grace_ends_at": PAST}),
+    ],
+)
+def test_lapsed_subscription_is_persisted_as_expired(db, status, fields):
+    loaded, lapses_at, stored = run(_load(status, **fields))
+
+    assert loaded is None
+    assert lapses_at is None
+    assert stored.status == "expired"
+    assert stored.is_active is False
+
+
+def test_grace_subscription_lapses_at_grace_end(db):
+    grace_ends_at = datetime.utcnow() + timedelta(days=2)
+    loaded, lapses_at, stored = run(
+        _load("grace", ends_at=FUTURE, grace_ends_at=grace_ends_at)
+    )
+
+    assert loaded["in_grace"] is True
+    assert lapses_at == grace_ends_at
+    assert stored.status == "grace"
@@ -0,0 +1,309 @@
+"""
+Usage counters (app.plans.usage_counter_service): the trigger-maintained
+user_usage_counters rows (alembic 9e2a6d4c1b37) against a recount, and
+the plan enforcement read (get_usage).
+"""
+
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import insert, text
+
+from app.campaigns.models import CampaignActionLog
+from app.plans.usage_counter_service import UsageCounterService
+from tests.support import run, seed_campaigns, seed_subscription, seed_user
+
+COUNTERS_SQL = text(
+    """
+    SELECT
+        linked_ad_accounts,
+        selected_ad_accounts,
+        campaigns,
+        active_ai_campaigns,
+        CASE WHEN actions_date = CAST(timezone('utc', now()) AS date)
+             THEN optimizations_today ELSE 0 END,
+        CASE WHEN actions_date = CAST(timezone('utc', now()) AS date)
+             THEN expansions_today ELSE 0 END
+    FROM user_usage_counters
+    WHERE user_id = :user_id
+    """
+)
+
+
+async def _usage(status: str, **fields):
+    from app.core.db_session import AsyncSessionLocal, engine
+
+    async with engine.begin() as conn:
+        user_id = await seed_user(conn)
+        subscription_id = await seed_subscription(
+            conn,
+            user_id,
+            status,
+            ai_campaign_limit_snapshot=2,
+            ad_account_limit_snapshot=1,
+            **fields,
+        )
+
+    async with AsyncSessionLocal() as db:
+        usage = await UsageCounterService.get_usage(db, user_id=user_id)
+
+    return subscription_id, usage
+
+
+def test_active_subscription_limits(db):
+    subscription_id, usage = run(
+        _usage("active", ends_at=datetime.utcnow() + timedelta(days=10))
+    )
+
+    assert usage["subscription_id"] == subscription_id
+    assert usage["ai_campaign_limit"] == 2
+    assert usage["ad_account_limit"] == 1
+
+
+@pytest.mark.parametrize(
+    "status, fields",
+    [
+        ("active", {"ends_at": datetime.utcnow() - timedelta(minutes=1)}),
+        ("trial", {"is_trial": True, "trial_end": date.today() - timedelta(days=2)}),
+    ],
+)
+def test_lapsed_subscription_grants_no_limits(db, status, fields):
+    _, usage = run(_usage(status, **fields))
+
+    assert usage["subscription_id"] is None
+    assert usage["ai_campaign_limit"] == 0
+    assert usage["ad_account_limit"] == 0
+
+
+def test_never_expiring_subscription_ignores_ends_at(db):
+    subscription_id, usage = run(
+        _usage(
+            "active",
+            ends_at=datetime.utcnow() - timedelta(days=1),
+            never_expires=True,
+        )
+    )
+
+    assert usage["subscription_id"] == subscription_id
+
+
+# =========================================================
+# TRIGGER-MAINTAINED COUNTERS
+# =========================================================
+async def _counters(user_id):
+    """
+    (stored counters, the same counters recounted from the source
+    tables by UsageCounterService.refresh, rolled back)
+    """
+
+    from app.core.db_session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        stored = (await db.execute(COUNTERS_SQL, {"user_id": user_id})).first()
+        await UsageCounterService.refresh(db, user_ids=[user_id])
+        recounted = (await db.execute(COUNTERS_SQL, {"user_id": user_id})).first()
+        await db.rollback()
+
+    return tuple(stored) if stored else None, tuple(recounted)
+
+
+async def _execute(sql: str, **params):
+    from app.core.db_session import engine
+
+    async with engine.begin() as conn:
+        await conn.execute(text(sql), params)
+
+
+async def _log_actions(user_id, campaign_id, action_types, created_at=None):
+    from app.core.db_session import engine
+
+    async with engine.begin() as conn:
+        await conn.execute(
+            insert(CampaignActionLog.__table__),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "campaign_id": campaign_id,
+                    "user_id": user_id,
+                    "actor_type": "ai",
+                    "action_type": action_type,
+                    "before_state": {},
+                    "after_state": {},
+                    "created_at": created_at or datetime.utcnow(),
+                }
+                for action_type in action_types
+            ],
+        )
+
+
+async def _seed_account():
+    from app.core.db_session import engine
+
+    async with engine.begin() as conn:
+        campaign_ids = await seed_campaigns(conn, ["LEAD", "SALES", "LEAD"])
+        user_id, ad_account_id = (
+            await conn.execute(
+                text("SELECT user_id, meta_ad_account_id FROM user_meta_ad_accounts")
+            )
+        ).one()
+
+    return user_id, ad_account_id, campaign_ids
+
+
+def test_triggers_match_a_recount_after_every_change(db):
+    async def scenario():
+        user_id, ad_account_id, (first, second, third) = await _seed_account()
+        steps = {"seeded": await _counters(user_id)}
+
+        await _execute(
+            "UPDATE campaigns SET ai_active = TRUE WHERE id IN (:first, :second)",
+            first=first,
+            second=second,
+        )
+        steps["ai_active"] = await _counters(user_id)
+
+        await _execute("UPDATE campaigns SET is_archived = TRUE WHERE id = :id", id=second)
+        steps["archived"] = await _counters(user_id)
+
+        # Columns the counters don't depend on: no recount needed
+        await _execute("UPDATE campaigns SET name = 'renamed' WHERE id = :id", id=third)
+        steps["renamed"] = await _counters(user_id)
+
+        await _log_actions(user_id, first, ["optimization", "optimization", "expansion"])
+        await _log_actions(user_id, first, ["ai_toggle"])
+        steps["actions"] = await _counters(user_id)
+
+        await _execute(
+            "UPDATE user_meta_ad_accounts SET is_selected = FALSE WHERE user_id = :user_id",
+            user_id=user_id,
+        )
+        steps["deselected"] = await _counters(user_id)
+
+        await _execute(
+            "UPDATE user_meta_ad_accounts SET is_selected = TRUE WHERE user_id = :user_id",
+            user_id=user_id,
+        )
+        steps["reselected"] = await _counters(user_id)
+
+        await _execute("DELETE FROM campaign_action_logs")
+        await _execute("DELETE FROM campaigns WHERE id = :id", id=third)
+        steps["deleted"] = await _counters(user_id)
+
+        return steps
+
+    steps = run(scenario())
+
+    for step, (stored, recounted) in steps.items():
+        assert stored == recounted, step
+
+    assert steps["seeded"][0] == (1, 1, 3, 0, 0, 0)
+    assert steps["ai_active"][0] == (1, 1, 3, 2, 0, 0)
+    assert steps["archived"][0] == (1, 1, 2, 1, 0, 0)
+    assert steps["actions"][0] == (1, 1, 2, 1, 2, 1)
+    assert steps["deselected"][0] == (1, 0, 0, 0, 2, 1)
+    assert steps["reselected"][0] == (1, 1, 2, 1, 2, 1)
+
+
+def test_action_counters_roll_over_at_the_utc_day(db):
+    async def scenario():
+        user_id, _, (campaign_id, _, _) = await _seed_account()
+        yesterday = datetime.utcnow() - timedelta(days=1)
+
+        # Yesterday's counts, as the trigger left them
+        await _log_actions(user_id, campaign_id, ["optimization"] * 3)
+        await _execute(
+            """
+            UPDATE user_usage_counters
+            SET actions_date = actions_date - 1
+            WHERE user_id = :user_id
+            """,
+            user_id=user_id,
+        )
+        await _execute("UPDATE campaign_action_logs SET created_at = :at", at=yesterday)
+        rolled_over = await _counters(user_id)
+
+        # A late log dated yesterday doesn't count for today
+        await _log_actions(user_id, campaign_id, ["expansion"], created_at=yesterday)
+        late = await _counters(user_id)
+
+        await _log_actions(user_id, campaign_id, ["optimization"])
+        today = await _counters(user_id)
+
+        from app.core.db_session import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as db:
+            usage = await UsageCounterService.get_usage(db, user_id=user_id)
+
+        return rolled_over, late, today, usage
+
+    rolled_over, late, today, usage = run(scenario())
+
+    for stored, recounted in (rolled_over, late, today):
+        assert stored == recounted
+    assert rolled_over[0][4:] == (0, 0)
+    assert late[0][4:] == (0, 0)
+    assert today[0][4:] == (1, 0)
+    assert usage["optimizations_today"] == 1
+    assert usage["expansions_today"] == 0
+
+
+def test_reconcile_reports_and_repairs_drift(db):
+    async def scenario():
+        from app.core.db_session import AsyncSessionLocal
+
+        user_id, _, _ = await _seed_account()
+        async with AsyncSessionLocal() as db:
+            clean = await UsageCounterService.reconcile(db)
+
+        await _execute(
+            "UPDATE user_usage_counters SET campaigns = 99 WHERE user_id = :user_id",
+            user_id=user_id,
+        )
+        async with AsyncSessionLocal() as db:
+            drifted = await UsageCounterService.reconcile(db, batch_size=1)
+        async with AsyncSessionLocal() as db:
+            repaired = await UsageCounterService.reconcile(db)
+
+        return clean, drifted, repaired, await _counters(user_id)
+
+    clean, drifted, repaired, (stored, recounted) = run(scenario())
+
+    assert (clean, drifted, repaired) == (0, 1, 0)
+    assert stored == recounted
+    assert stored[2] == 3
+
+
+def test_user_without_counter_row_reads_zeros_without_writing(db):
+    async def scenario():
+        from app.core.db_session import AsyncSessionLocal, engine
+
+        async with engine.begin() as conn:
+            user_id = await seed_user(conn)
+
+        async with AsyncSessionLocal() as db:
+            usage = await UsageCounterService.get_usage(db, user_id=user_id)
+            # Would persist a row created by the read
+            await db.commit()
+
+        stored, _ = await _counters(user_id)
+        return usage, stored
+
+    usage, stored = run(scenario())
+
+    assert stored is None
+    assert usage["linked_ad_accounts"] == 0
+    assert usage["campaigns"] == 0
+    assert usage["optimizations_today"] == 0
+    assert usage["subscription_id"] is None
+
+
+def test_unknown_user_is_an_error(db):
+    async def scenario():
+        from app.core.db_session import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as db:
+            await UsageCounterService.get_usage(db, user_id=uuid.uuid4())
+
+    with pytest.raises(ValueError):
+        run(scenario())
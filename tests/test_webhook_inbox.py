@@ -0,0 +1,145 @@
+"""
+Razorpay webhook inbox claims (app.billing.webhook_worker).
+
+Concurrent workers must never apply an event twice, and events of one
+ordering_key must be applied one at a time, in received order.
+"""
+
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import insert, text
+
+from app.billing import webhook_worker
+from app.billing.webhook_event_models import RazorpayWebhookEvent, WebhookEventStatus
+from app.billing.webhook_worker import WebhookWorkerPool
+from tests.support import run
+
+KEYS = ("subscription:a", "subscription:b", "subscription:c")
+EVENTS_PER_KEY = 4
+
+
+async def _enqueue():
+    from app.core.db_session import engine
+
+    async with engine.begin() as conn:
+        await conn.execute(
+            insert(RazorpayWebhookEvent.__table__),
+            [
+                {
+                    "event_id": f"{key}:{seq}",
+                    "event": "test.event",
+                    "ordering_key": key,
+                    "payload": {"event": "test.event", "key": key, "seq": seq},
+                    "status": WebhookEventStatus.PENDING,
+                    "attempts": 0,
+                    "received_at": datetime.utcnow(),
+                    "available_at": datetime.utcnow(),
+                }
+                for seq in range(EVENTS_PER_KEY)
+                for key in KEYS
+            ],
+        )
+
+
+async def _events():
+    from app.core.db_session import engine
+
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            text(
+                """
+                SELECT event_id, status, attempts, available_at, last_error
+                FROM razorpay_webhook_events
+                ORDER BY id
+                """
+            )
+        )
+        return {row.event_id: row for row in result}
+
+
+def test_concurrent_workers_claim_each_event_once(db, monkeypatch):
+    applied = []
+    overlapping = []
+    in_flight = {"now": 0, "max": 0, "keys": set()}
+
+    async def dispatch_event(payload, session):
+        # Recorded, not raised: the worker would treat it as a handler error
+        key = payload["key"]
+        if key in in_flight["keys"]:
+            overlapping.append(key)
+
+        in_flight["keys"].add(key)
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+
+        await asyncio.sleep(0.05)
+        applied.append((key, payload["seq"]))
+
+        in_flight["now"] -= 1
+        in_flight["keys"].discard(key)
+        return {"status": "ok"}
+
+    monkeypatch.setattr(webhook_worker, "dispatch_event", dispatch_event)
+
+    async def scenario():
+        await _enqueue()
+        pool = WebhookWorkerPool(concurrency=4)
+
+        async def drain():
+            while await pool.process_next():
+                pass
+
+        # A worker also stops when every remaining event is locked or
+        # waiting behind a locked one: drain again until nothing is left
+        for _ in range(len(KEYS) * EVENTS_PER_KEY):
+            await asyncio.gather(*(drain() for _ in range(pool.concurrency)))
+            if len(applied) == len(KEYS) * EVENTS_PER_KEY:
+                break
+
+        return pool, await _events()
+
+    pool, events = run(scenario())
+
+    assert overlapping == []
+    assert len(applied) == len(set(applied)) == len(KEYS) * EVENTS_PER_KEY
+    for key in KEYS:
+        assert [seq for k, seq in applied if k == key] == list(range(EVENTS_PER_KEY))
+    assert in_flight["max"] > 1
+
+    assert pool.processed == len(applied)
+    assert {row.status for row in events.values()} == {WebhookEventStatus.PROCESSED}
+    assert {row.attempts for row in events.values()} == {1}
+
+
+def test_failed_event_backs_off_and_holds_its_key(db, monkeypatch):
+    applied = []
+
+    async def dispatch_event(payload, session):
+        if payload["key"] == KEYS[0] and payload["seq"] == 0:
+            raise RuntimeError("handler failed")
+        applied.append((payload["key"], payload["seq"]))
+        return {"status": "ok"}
+
+    monkeypatch.setattr(webhook_worker, "dispatch_event", dispatch_event)
+
+    async def scenario():
+        await _enqueue()
+        pool = WebhookWorkerPool(concurrency=1)
+        while await pool.process_next():
+            pass
+        return pool, await _events()
+
+    pool, events = run(scenario())
+
+    failed = events[f"{KEYS[0]}:0"]
+    assert failed.status == WebhookEventStatus.PENDING
+    assert failed.attempts == 1
+    assert failed.available_at > datetime.utcnow()
+    assert "handler failed" in failed.last_error
+
+    # Later events of the failing key wait for its retry
+    assert all(key != KEYS[0] for key, _ in applied)
+    assert events[f"{KEYS[0]}:1"].status == WebhookEventStatus.PENDING
+    assert len(applied) == (len(KEYS) - 1) * EVENTS_PER_KEY
+    assert pool.errors == 1